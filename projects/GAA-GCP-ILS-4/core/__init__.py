@@ -6,11 +6,15 @@ Contiene:
     - GraphColoringProblem: Representación de instancias
     - ColoringSolution: Representación de soluciones
     - ColoringEvaluator: Evaluación de soluciones
+    - ColoringState: Estado con k fijo y matriz de conflictos (búsquedas rápidas)
+    - reduce_instance: Reducción del grafo a un núcleo (pelado, dominancia, componentes)
 """
 
 from core.problem import GraphColoringProblem
 from core.solution import ColoringSolution
 from core.evaluation import ColoringEvaluator, compare_solutions
+from core.coloring_state import ColoringState
+from core.reduction import ReducedInstance, reduce_instance
 
 __version__ = "1.0.0"
 __author__ = "GCP-ILS Project"
@@ -20,4 +24,7 @@ __all__ = [
     "ColoringSolution",
     "ColoringEvaluator",
     "compare_solutions",
+    "ColoringState",
+    "ReducedInstance",
+    "reduce_instance",
 ]
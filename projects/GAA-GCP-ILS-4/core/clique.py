@@ -0,0 +1,158 @@
+"""
+core/clique.py
+Clique máximo acotado: cota inferior válida para el número cromático.
+
+Proporciona:
+    - Clique greedy (vértices por grado decreciente)
+    - Branch-and-bound con conjuntos de bits (enteros Python) y cota por
+      coloreo greedy de los candidatos (estilo MCQ de Tomita), con límite
+      de nodos
+
+Todo clique encontrado es una cota inferior válida: χ(G) ≥ ω(G) ≥ |clique|.
+Si el branch-and-bound termina sin agotar el límite de nodos, el clique es
+máximo (optimal=True).
+
+Referencias:
+- Tomita, E., & Seki, T. (2003). An efficient branch-and-bound algorithm
+  for finding a maximum clique.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+
+from core.problem import GraphColoringProblem
+
+
+# Límite de nodos por defecto del branch-and-bound
+DEFAULT_NODE_LIMIT = 20000
+
+
+@dataclass
+class CliqueResult:
+    """Clique encontrado y calidad de la búsqueda"""
+    vertices: List[int] = field(default_factory=list)  # Etiquetas originales
+    optimal: bool = False                              # B&B completo: clique máximo
+    nodes: int = 0                                     # Nodos explorados
+
+    @property
+    def size(self) -> int:
+        return len(self.vertices)
+
+
+def adjacency_bitsets(problem: GraphColoringProblem,
+                      order: Optional[np.ndarray] = None) -> List[int]:
+    """
+    Filas de adyacencia como enteros Python, con los vértices renumerados
+    según `order` (posición p ↔ índice order[p]; por defecto los índices
+    0-based del problema). El bit p de la fila q vale 1 si order[p] y
+    order[q] son adyacentes.
+
+    Compartido por el branch-and-bound del clique y la reducción por
+    dominancia (core/reduction.py).
+    """
+    n = problem.n_vertices
+    if order is None:
+        order = np.arange(n)
+    position = np.empty(n, dtype=np.int64)
+    position[order] = np.arange(n)
+
+    indptr, indices = problem.csr
+    rows = position[np.repeat(np.arange(n), np.diff(indptr))]
+    cols = position[indices]
+    packed = np.zeros((n, (n + 7) // 8), dtype=np.uint8)
+    bits = (np.uint8(1) << (cols & 7).astype(np.uint8)).astype(np.uint8)
+    np.bitwise_or.at(packed, (rows, cols >> 3), bits)
+    return [int.from_bytes(packed[q].tobytes(), 'little') for q in range(n)]
+
+
+def _greedy_clique(adjacency: List[int]) -> List[int]:
+    """
+    Clique greedy sobre las posiciones (ya ordenadas por grado decreciente):
+    se prueba cada vértice como semilla entre los primeros y se extiende
+    tomando siempre el candidato de menor posición.
+    """
+    n = len(adjacency)
+    best: List[int] = []
+    for seed in range(min(n, 32)):
+        clique = [seed]
+        candidates = adjacency[seed]
+        while candidates:
+            low = candidates & -candidates
+            v = low.bit_length() - 1
+            clique.append(v)
+            candidates &= adjacency[v]
+        if len(clique) > len(best):
+            best = clique
+    return best
+
+
+def max_clique(problem: GraphColoringProblem,
+               node_limit: Optional[int] = DEFAULT_NODE_LIMIT) -> CliqueResult:
+    """
+    Clique máximo (o el mayor encontrado dentro del límite de nodos).
+
+    Parametros:
+        problem (GraphColoringProblem): Instancia del problema
+        node_limit (int, opcional): Máximo de nodos del B&B (None = sin límite)
+
+    Retorna:
+        CliqueResult: Clique (etiquetas originales) y si es máximo probado
+    """
+    n = problem.n_vertices
+    if n == 0:
+        return CliqueResult(optimal=True)
+
+    # Grado decreciente: los vértices de mayor grado reciben posiciones bajas
+    order = np.argsort(-np.diff(problem.csr[0]), kind='stable')
+    adjacency = adjacency_bitsets(problem, order)
+
+    best = _greedy_clique(adjacency)
+    nodes = 0
+    exhausted = False
+
+    def color_sort(candidates: int):
+        """Coloreo greedy de los candidatos: (vértices, color de cada uno)"""
+        vertices, colors = [], []
+        color = 0
+        uncolored = candidates
+        while uncolored:
+            color += 1
+            available = uncolored
+            while available:
+                low = available & -available
+                v = low.bit_length() - 1
+                available &= ~adjacency[v]
+                available ^= available & low
+                uncolored ^= low
+                vertices.append(v)
+                colors.append(color)
+        return vertices, colors
+
+    def expand(clique: List[int], candidates: int) -> None:
+        nonlocal best, nodes, exhausted
+        nodes += 1
+        if node_limit is not None and nodes > node_limit:
+            exhausted = True
+            return
+        vertices, colors = color_sort(candidates)
+        # Recorrer de mayor a menor color: la cota |clique| + color decrece
+        for k in range(len(vertices) - 1, -1, -1):
+            if len(clique) + colors[k] <= len(best) or exhausted:
+                return
+            v = vertices[k]
+            clique.append(v)
+            extension = candidates & adjacency[v]
+            if extension:
+                expand(clique, extension)
+            elif len(clique) > len(best):
+                best = list(clique)
+            clique.pop()
+            candidates &= ~(1 << v)
+
+    expand([], (1 << n) - 1)
+
+    offset = problem.vertex_offset
+    labels = sorted(int(order[p]) + offset for p in best)
+    return CliqueResult(vertices=labels, optimal=not exhausted, nodes=nodes)
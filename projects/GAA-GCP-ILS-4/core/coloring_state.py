@@ -0,0 +1,208 @@
+"""
+core/coloring_state.py
+Estado de coloración con número de colores fijo y datos incrementales.
+
+Proporciona:
+    - Colores como array NumPy (índices de vértice 0-based)
+    - Matriz gamma[v, c]: nº de vecinos de v con color c
+    - Conteo total de conflictos y tamaño de cada clase de color
+    - Movimientos en O(grado) y evaluación de deltas en O(1)
+
+Es la representación que usan las búsquedas con k fijo (TabuCol sobre
+gamma, driver de k decreciente). Se convierte desde/hacia ColoringSolution.
+"""
+
+from typing import Optional
+import numpy as np
+
+from core.problem import GraphColoringProblem
+from core.solution import ColoringSolution
+
+
+class ColoringState:
+    """
+    Coloración completa con k colores y matriz de conflictos gamma.
+
+    Los vértices se indexan 0-based (índice i ↔ vértice i + vertex_offset).
+    El conteo de conflictos usa la adyacencia simple del problema
+    (`problem.csr`): cada par de vértices adyacentes cuenta una vez.
+
+    Atributos:
+        colors (np.ndarray): Color de cada vértice, en [0, k)
+        gamma (np.ndarray): Matriz (n, k) de vecinos por color
+        conflicts (int): Número de aristas monocromáticas
+        class_sizes (np.ndarray): Vértices por color
+        k (int): Número de colores disponibles
+
+    Ejemplo:
+        >>> state = ColoringState.from_solution(solution, problem)
+        >>> state.delta(0, 2)      # cambio de conflictos si v0 pasa a color 2
+        >>> state.move(0, 2)
+        >>> state.to_solution()
+    """
+
+    def __init__(self, problem: GraphColoringProblem, colors: np.ndarray,
+                 k: Optional[int] = None):
+        """
+        Parametros:
+            problem (GraphColoringProblem): Instancia del problema
+            colors (np.ndarray): Color de cada vértice (0-based)
+            k (int, opcional): Colores disponibles (default: max color + 1)
+        """
+        self.problem = problem
+        self.indptr, self.indices = problem.csr
+        self.n = problem.n_vertices
+        self.offset = problem.vertex_offset
+
+        self.colors = np.array(colors, dtype=np.int64)
+        if self.colors.shape != (self.n,):
+            raise ValueError(f"Se esperaban {self.n} colores, obtenidos {self.colors.shape}")
+        if self.n and self.colors.min() < 0:
+            raise ValueError("Todos los vértices deben tener color asignado")
+
+        used = int(self.colors.max()) + 1 if self.n else 0
+        self.k = max(used, int(k) if k is not None else used, 1)
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Construir gamma, conflictos y tamaños de clase desde cero."""
+        degrees = np.diff(self.indptr)
+        sources = np.repeat(np.arange(self.n), degrees)
+        gamma = np.zeros((self.n, self.k), dtype=np.int32)
+        np.add.at(gamma, (sources, self.colors[self.indices]), 1)
+        self.gamma = gamma
+        own = gamma[np.arange(self.n), self.colors]
+        self.conflicts = int(own.sum()) // 2
+        self.class_sizes = np.bincount(self.colors, minlength=self.k).astype(np.int64)
+
+    # ========================================================================
+    # CONVERSIÓN
+    # ========================================================================
+
+    @classmethod
+    def from_solution(cls, solution: ColoringSolution,
+                      problem: GraphColoringProblem,
+                      k: Optional[int] = None) -> "ColoringState":
+        """
+        Crear estado desde una ColoringSolution completa.
+
+        Parametros:
+            solution (ColoringSolution): Solución con todos los vértices coloreados
+            problem (GraphColoringProblem): Instancia del problema
+            k (int, opcional): Colores disponibles (default: solution.num_colors)
+        """
+        offset = problem.vertex_offset
+        assignment = solution.assignment
+        try:
+            colors = np.fromiter(
+                (assignment[i + offset] for i in range(problem.n_vertices)),
+                dtype=np.int64, count=problem.n_vertices
+            )
+        except KeyError as e:
+            raise ValueError(f"Vértice sin color en la solución: {e.args[0]}") from None
+        return cls(problem, colors, k)
+
+    def to_solution(self) -> ColoringSolution:
+        """Convertir a ColoringSolution (vértices con su etiqueta original)."""
+        offset = self.offset
+        return ColoringSolution(assignment={
+            i + offset: int(c) for i, c in enumerate(self.colors.tolist())
+        })
+
+    def copy(self) -> "ColoringState":
+        """Copia independiente (comparte el CSR del problema)."""
+        clone = ColoringState.__new__(ColoringState)
+        clone.problem = self.problem
+        clone.indptr, clone.indices = self.indptr, self.indices
+        clone.n, clone.offset, clone.k = self.n, self.offset, self.k
+        clone.colors = self.colors.copy()
+        clone.gamma = self.gamma.copy()
+        clone.conflicts = self.conflicts
+        clone.class_sizes = self.class_sizes.copy()
+        return clone
+
+    # ========================================================================
+    # CONSULTAS
+    # ========================================================================
+
+    @property
+    def num_colors(self) -> int:
+        """Número de clases de color no vacías."""
+        return int(np.count_nonzero(self.class_sizes))
+
+    @property
+    def is_feasible(self) -> bool:
+        """True si no hay aristas monocromáticas."""
+        return self.conflicts == 0
+
+    def neighbors(self, i: int) -> np.ndarray:
+        """Vecinos (0-based) del vértice i."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def delta(self, i: int, color: int) -> int:
+        """Cambio en conflictos si el vértice i pasa a `color`."""
+        return int(self.gamma[i, color] - self.gamma[i, self.colors[i]])
+
+    def conflicting_vertices(self) -> np.ndarray:
+        """Índices de los vértices con al menos un vecino del mismo color."""
+        own = self.gamma[np.arange(self.n), self.colors]
+        return np.flatnonzero(own > 0)
+
+    # ========================================================================
+    # MODIFICACIONES
+    # ========================================================================
+
+    def move(self, i: int, color: int) -> int:
+        """
+        Recolorear el vértice i en O(grado), actualizando gamma.
+
+        Retorna:
+            int: Delta de conflictos aplicado
+        """
+        old = self.colors[i]
+        if old == color:
+            return 0
+        delta = int(self.gamma[i, color] - self.gamma[i, old])
+        neighbors = self.indices[self.indptr[i]:self.indptr[i + 1]]
+        self.gamma[neighbors, old] -= 1
+        self.gamma[neighbors, color] += 1
+        self.colors[i] = color
+        self.class_sizes[old] -= 1
+        self.class_sizes[color] += 1
+        self.conflicts += delta
+        return delta
+
+    def add_color(self) -> int:
+        """Añadir una clase de color vacía. Retorna su índice."""
+        self.gamma = np.hstack([self.gamma, np.zeros((self.n, 1), dtype=self.gamma.dtype)])
+        self.class_sizes = np.append(self.class_sizes, 0)
+        self.k += 1
+        return self.k - 1
+
+    def remove_color(self, color: int,
+                     rng: Optional[np.random.Generator] = None) -> None:
+        """
+        Eliminar una clase de color (k → k-1).
+
+        Cada vértice de la clase pasa al color restante con menos vecinos de
+        ese color (empates al azar); los colores superiores se renumeran para
+        mantener el rango [0, k-1). Es el arranque en caliente del driver de
+        k decreciente: conserva el resto de la coloración.
+        """
+        if self.k <= 1:
+            raise ValueError("No se puede eliminar el único color disponible")
+        rng = rng if rng is not None else np.random.default_rng()
+
+        others = np.array([c for c in range(self.k) if c != color])
+        for i in np.flatnonzero(self.colors == color):
+            row = self.gamma[i, others]
+            best = np.flatnonzero(row == row.min())
+            self.move(int(i), int(others[best[rng.integers(len(best))]]))
+
+        self.gamma = np.delete(self.gamma, color, axis=1)
+        self.class_sizes = np.delete(self.class_sizes, color)
+        self.colors[self.colors > color] -= 1
+        self.k -= 1
+
+    def __repr__(self) -> str:
+        return f"ColoringState(n={self.n}, k={self.k}, conflicts={self.conflicts})"
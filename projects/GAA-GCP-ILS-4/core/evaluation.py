@@ -4,11 +4,12 @@ Evaluador de soluciones para el problema de coloración de grafos.
 
 Proporciona:
     - Cálculo de múltiples métricas de calidad
-    - Evaluación individual y en lote
+    - Evaluación individual y en lote (vectorizada con NumPy)
     - Gap respecto a óptimo conocido
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence
+import numpy as np
 from core.problem import GraphColoringProblem
 from core.solution import ColoringSolution
 
@@ -28,6 +29,9 @@ class ColoringEvaluator:
     # Parámetro de penalización
     CONFLICT_PENALTY = 1000
     
+    # Máximo de elementos (filas × aristas) por bloque en la evaluación en lote
+    BATCH_CHUNK_ELEMENTS = 1 << 24
+    
     @staticmethod
     def evaluate(
         solution: ColoringSolution,
@@ -100,15 +104,18 @@ class ColoringEvaluator:
     
     @staticmethod
     def batch_evaluate(
-        solutions: List[ColoringSolution],
+        solutions: Sequence[ColoringSolution],
         problem: GraphColoringProblem
     ) -> List[Dict[str, Any]]:
         """
-        Evaluar múltiples soluciones.
+        Evaluar múltiples soluciones del mismo grafo.
+        
+        Las soluciones se apilan en una matriz P×n y se evalúan con
+        batch_metrics (sin recorrer aristas en Python).
         
         Parametros:
         -----------
-        solutions : List[ColoringSolution]
+        solutions : Sequence[ColoringSolution]
             Lista de soluciones a evaluar
         problem : GraphColoringProblem
             Instancia del problema
@@ -123,10 +130,113 @@ class ColoringEvaluator:
         >>> results = ColoringEvaluator.batch_evaluate(solutions, problem)
         >>> print(f"Mejor solución: {min(results, key=lambda r: r['num_colors'])}")
         """
-        return [
-            ColoringEvaluator.evaluate(solution, problem)
-            for solution in solutions
-        ]
+        if len(solutions) == 0:
+            return []
+        
+        colorings = ColoringEvaluator.stack_colorings(solutions, problem)
+        metrics = ColoringEvaluator.batch_metrics(colorings, problem)
+        
+        gap_base = problem.colors_known
+        results = []
+        for num_colors, conflicts in zip(metrics['num_colors'].tolist(),
+                                         metrics['conflicts'].tolist()):
+            gap = None
+            gap_percent = None
+            if gap_base is not None:
+                gap = (num_colors - gap_base) / gap_base
+                gap_percent = 100 * gap
+            results.append({
+                'num_colors': num_colors,
+                'conflicts': conflicts,
+                'feasible': conflicts == 0,
+                'fitness': float(num_colors + conflicts * ColoringEvaluator.CONFLICT_PENALTY),
+                'gap': gap,
+                'gap_percent': gap_percent,
+            })
+        return results
+    
+    @staticmethod
+    def stack_colorings(
+        solutions: Sequence[ColoringSolution],
+        problem: GraphColoringProblem
+    ) -> np.ndarray:
+        """
+        Apilar soluciones en una matriz P×n int32 (vértices 0-based).
+        
+        Los vértices sin color se marcan con -1.
+        """
+        colorings = np.empty((len(solutions), problem.n_vertices), dtype=np.int32)
+        for row, solution in enumerate(solutions):
+            colorings[row] = solution.to_array(problem)
+        return colorings
+    
+    @staticmethod
+    def batch_metrics(
+        colorings: np.ndarray,
+        problem: GraphColoringProblem,
+        chunk_size: Optional[int] = None,
+        class_sizes: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """
+        Métricas vectorizadas para P coloraciones del mismo grafo.
+        
+        Conflictos: (C[:, u] == C[:, v]).sum(axis=1) sobre problem.edge_array
+        (mismo criterio que ColoringSolution.num_conflicts: los vértices sin
+        color cuentan como color -1). Tamaños de clase con un único bincount
+        sobre índices desplazados por fila. Las filas se procesan por bloques
+        para acotar la memoria a ~BATCH_CHUNK_ELEMENTS booleanos.
+        
+        Parametros:
+        -----------
+        colorings : np.ndarray
+            Matriz P×n de colores (0-based, -1 = sin color)
+        problem : GraphColoringProblem
+            Instancia del problema
+        chunk_size : Optional[int]
+            Filas por bloque (default: según BATCH_CHUNK_ELEMENTS)
+        class_sizes : bool
+            Incluir la matriz P×k de tamaños de clase
+        
+        Retorna:
+        --------
+        Dict con arrays de longitud P:
+            'conflicts', 'num_colors' (máx. color + 1), 'colors_used'
+            (clases no vacías) y opcionalmente 'class_sizes' (P×k)
+        """
+        colorings = np.atleast_2d(np.asarray(colorings, dtype=np.int32))
+        n_rows = colorings.shape[0]
+        edges = problem.edge_array
+        u, v = edges[:, 0], edges[:, 1]
+        
+        if chunk_size is None:
+            chunk_size = max(1, ColoringEvaluator.BATCH_CHUNK_ELEMENTS // max(len(edges), 1))
+        
+        k = int(colorings.max()) + 1 if colorings.size else 0
+        k = max(k, 1)
+        
+        conflicts = np.empty(n_rows, dtype=np.int64)
+        sizes = np.empty((n_rows, k), dtype=np.int64)
+        
+        for start in range(0, n_rows, chunk_size):
+            block = colorings[start:start + chunk_size]
+            rows = block.shape[0]
+            conflicts[start:start + rows] = (block[:, u] == block[:, v]).sum(axis=1)
+            
+            colored = block >= 0
+            flat = (block + np.arange(rows)[:, None] * k)[colored]
+            sizes[start:start + rows] = np.bincount(
+                flat, minlength=rows * k
+            ).reshape(rows, k)
+        
+        metrics = {
+            'conflicts': conflicts,
+            'num_colors': colorings.max(axis=1).astype(np.int64) + 1
+                          if colorings.shape[1] else np.zeros(n_rows, dtype=np.int64),
+            'colors_used': np.count_nonzero(sizes, axis=1),
+        }
+        if class_sizes:
+            metrics['class_sizes'] = sizes
+        return metrics
     
     @staticmethod
     def get_best(
@@ -10,10 +10,17 @@ Proporciona:
 """
 
 from dataclasses import dataclass, field
-from typing import List, Tuple, Set, Optional, Dict
+from typing import List, Tuple, Set, Optional, Dict, TYPE_CHECKING
 import numpy as np
 from pathlib import Path
 
+if TYPE_CHECKING:
+    from core.clique import CliqueResult
+
+
+# Número de bits a 1 de cada byte (popcount sobre filas empaquetadas)
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
 
 @dataclass
 class GraphColoringProblem:
@@ -51,6 +58,14 @@ class GraphColoringProblem:
     _max_degree: Optional[int] = field(default=None, init=False, repr=False)
     _is_bipartite: Optional[bool] = field(default=None, init=False, repr=False)
     _vertex_offset: int = field(default=1, init=False, repr=False)  # 0 para 0-indexed, 1 para 1-indexed
+    _edge_multiplicity: Optional[Dict[int, Dict[int, int]]] = field(default=None, init=False, repr=False)
+    _csr: Optional[Tuple[np.ndarray, np.ndarray]] = field(default=None, init=False, repr=False)
+    _edge_array: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _csr_lists: Optional[Tuple[List[int], List[int]]] = field(default=None, init=False, repr=False)
+    _csr_weights: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _csr_weights_list: Optional[List[int]] = field(default=None, init=False, repr=False)
+    _packed_adjacency: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _clique: Optional["CliqueResult"] = field(default=None, init=False, repr=False)
     
     def __post_init__(self):
         """Validar e inicializar la instancia después de la construcción."""
@@ -139,6 +154,99 @@ class GraphColoringProblem:
         """Lista de adyacencia: {vértice: {vértices adyacentes}}."""
         return self._adjacency_list
     
+    @property
+    def edge_multiplicity(self) -> Dict[int, Dict[int, int]]:
+        """
+        Adyacencia con multiplicidad: {vértice: {vecino: nº de aristas}}.
+        
+        Algunos ficheros DIMACS listan cada arista en ambos sentidos; el
+        conteo de conflictos recorre `edges` tal cual, así que los deltas
+        incrementales deben ponderar cada vecino por su multiplicidad.
+        """
+        if self._edge_multiplicity is None:
+            multiplicity = {v: {} for v in self._adjacency_list}
+            for u, v in self.edges:
+                multiplicity[u][v] = multiplicity[u].get(v, 0) + 1
+                multiplicity[v][u] = multiplicity[v].get(u, 0) + 1
+            self._edge_multiplicity = multiplicity
+        return self._edge_multiplicity
+    
+    # ========================================================================
+    # REPRESENTACIONES COMPACTAS (ÍNDICES 0-BASED)
+    # ========================================================================
+    
+    @property
+    def csr(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Adyacencia en formato CSR: (indptr, indices), con vértices 0-based
+        (vértice v ↔ índice v - vertex_offset).
+        
+        Los vecinos de i son indices[indptr[i]:indptr[i + 1]], ordenados y sin
+        repeticiones (las aristas duplicadas se fusionan).
+        """
+        if self._csr is None:
+            offset = self._vertex_offset
+            indptr = np.zeros(self.vertices + 1, dtype=np.int64)
+            chunks = []
+            for i in range(self.vertices):
+                neighbors = sorted(self._adjacency_list[i + offset])
+                indptr[i + 1] = indptr[i] + len(neighbors)
+                chunks.append(neighbors)
+            indices = np.fromiter(
+                (w - offset for chunk in chunks for w in chunk),
+                dtype=np.int32, count=int(indptr[-1])
+            )
+            self._csr = (indptr, indices)
+        return self._csr
+    
+    @property
+    def csr_lists(self) -> Tuple[List[int], List[int]]:
+        """
+        El mismo CSR que `csr` como listas Python: indexar listas es más
+        rápido que indexar arrays NumPy elemento a elemento en bucles Python
+        (BFS de cadenas de Kempe, listas de trabajo).
+        """
+        if self._csr_lists is None:
+            indptr, indices = self.csr
+            self._csr_lists = (indptr.tolist(), indices.tolist())
+        return self._csr_lists
+    
+    @property
+    def csr_weights(self) -> np.ndarray:
+        """
+        Multiplicidad de cada entrada de `csr` (alineada con `indices`): los
+        conflictos sobre el CSR, ponderados así, coinciden con num_conflicts.
+        """
+        if self._csr_weights is None:
+            offset = self._vertex_offset
+            multiplicity = self.edge_multiplicity
+            indptr, indices = self.csr_lists
+            self._csr_weights = np.fromiter(
+                (multiplicity[i + offset][indices[k] + offset]
+                 for i in range(self.vertices)
+                 for k in range(indptr[i], indptr[i + 1])),
+                dtype=np.int64, count=len(indices)
+            )
+        return self._csr_weights
+    
+    @property
+    def csr_weights_list(self) -> List[int]:
+        """`csr_weights` como lista Python (mismo motivo que `csr_lists`)."""
+        if self._csr_weights_list is None:
+            self._csr_weights_list = self.csr_weights.tolist()
+        return self._csr_weights_list
+    
+    @property
+    def edge_array(self) -> np.ndarray:
+        """
+        Aristas como array (m, 2) de índices 0-based, tal cual aparecen en
+        `edges` (incluye duplicados, coherente con num_conflicts).
+        """
+        if self._edge_array is None:
+            edges = np.asarray(self.edges, dtype=np.int64).reshape(-1, 2)
+            self._edge_array = edges - self._vertex_offset
+        return self._edge_array
+    
     # ========================================================================
     # PROPIEDADES DE GRADOS
     # ========================================================================
@@ -178,12 +286,21 @@ class GraphColoringProblem:
         """Cota superior trivial: Δ(G) + 1 (Teorema de Brooks)."""
         return self.max_degree + 1
     
+    @property
+    def clique(self) -> "CliqueResult":
+        """
+        Mayor clique encontrado (core/clique.py), calculado una vez por
+        instancia. clique.optimal indica si es un clique máximo probado.
+        """
+        if self._clique is None:
+            from core.clique import max_clique
+            self._clique = max_clique(self)
+        return self._clique
+    
     @property
     def lower_bound(self) -> int:
-        """Cota inferior: ω(G) o clique number (aquí: tamaño máx. clique)."""
-        # Aproximación simple: máximo grado + 1
-        # Para mejor estimación se requeriría detectar cliques
-        return max(2, int(np.sqrt(2 * self.n_edges)))
+        """Cota inferior válida: χ(G) ≥ ω(G) ≥ tamaño del clique encontrado."""
+        return self.clique.size
     
     # ========================================================================
     # PROPIEDADES DE MATRIZ
@@ -192,17 +309,93 @@ class GraphColoringProblem:
     @property
     def edge_weight_matrix(self) -> np.ndarray:
         """
-        Matriz de adyacencia (peso de aristas).
-        W[i-1, j-1] = 1 si existe arista (i, j), 0 en otro caso.
+        Matriz de adyacencia densa (peso de aristas), índices 0-based.
+        W[i, j] = 1 si existe arista entre los vértices i y j, 0 en otro caso.
+        
+        Ocupa 4·n² bytes: para consultas usar packed_adjacency y para
+        visualizar adjacency_density.
         """
         if self._edge_weight_matrix is None:
+            indptr, indices = self.csr
             W = np.zeros((self.vertices, self.vertices), dtype=np.int32)
-            for u, v in self.edges:
-                W[u-1, v-1] = 1
-                W[v-1, u-1] = 1
+            W[np.repeat(np.arange(self.vertices), np.diff(indptr)), indices] = 1
             self._edge_weight_matrix = W
         return self._edge_weight_matrix
     
+    @property
+    def packed_adjacency(self) -> np.ndarray:
+        """
+        Matriz de adyacencia empaquetada a 1 bit por par (formato np.packbits).
+        
+        Fila i: array uint8 de ceil(n/8) bytes; el bit j (orden big-endian de
+        packbits) vale 1 si i y j son adyacentes (0-based). Ocupa n²/8 bytes
+        (125 KB para n=1000) y se construye desde el CSR sin matriz densa.
+        """
+        if self._packed_adjacency is None:
+            indptr, indices = self.csr
+            n = self.vertices
+            packed = np.zeros((n, (n + 7) // 8), dtype=np.uint8)
+            rows = np.repeat(np.arange(n), np.diff(indptr))
+            cols = indices.astype(np.int64)
+            bits = (np.uint8(0x80) >> (cols & 7).astype(np.uint8)).astype(np.uint8)
+            np.bitwise_or.at(packed, (rows, cols >> 3), bits)
+            self._packed_adjacency = packed
+        return self._packed_adjacency
+    
+    def _vertex_mask(self, vertices) -> Tuple[np.ndarray, np.ndarray]:
+        """Índices 0-based y máscara empaquetada de un conjunto de vértices."""
+        index = np.unique(np.asarray(list(vertices), dtype=np.int64)) - self._vertex_offset
+        if index.size and (index[0] < 0 or index[-1] >= self.vertices):
+            raise ValueError("Vértice fuera de rango")
+        indicator = np.zeros(self.vertices, dtype=bool)
+        indicator[index] = True
+        return index, np.packbits(indicator)
+    
+    def _neighbors_within(self, vertices) -> Tuple[np.ndarray, np.ndarray]:
+        """Para cada vértice del conjunto, nº de vecinos dentro del conjunto (AND de filas)."""
+        index, mask = self._vertex_mask(vertices)
+        inside = _POPCOUNT_TABLE[self.packed_adjacency[index] & mask].sum(axis=1, dtype=np.int64)
+        return index, inside
+    
+    def is_clique(self, vertices) -> bool:
+        """
+        Verificar si un conjunto de vértices es un clique (todos adyacentes).
+        
+        Cada fila empaquetada se combina con la máscara del conjunto (AND) y
+        se cuentan los bits: O(|S|·n/8) bytes procesados.
+        """
+        index, inside = self._neighbors_within(vertices)
+        return bool(np.all(inside == index.size - 1))
+    
+    def is_independent_set(self, vertices) -> bool:
+        """Verificar si un conjunto de vértices es independiente (sin aristas internas)."""
+        _, inside = self._neighbors_within(vertices)
+        return not inside.any()
+    
+    def adjacency_density(self, bins: int = 512) -> np.ndarray:
+        """
+        Densidad de aristas por bloques de la matriz de adyacencia.
+        
+        Los vértices se agrupan en `bins` bloques contiguos y se cuenta, desde
+        el CSR, cuántas aristas hay entre cada par de bloques dividido entre
+        los pares posibles. Memoria O(bins²) independientemente de n; si
+        n <= bins el resultado es la matriz de adyacencia exacta (0/1).
+        
+        Retorna:
+            np.ndarray: Matriz (b, b) float con valores en [0, 1], b = min(n, bins)
+        """
+        n = self.vertices
+        b = max(1, min(n, bins))
+        indptr, indices = self.csr
+        block = np.arange(n, dtype=np.int64) * b // n
+        rows = np.repeat(block, np.diff(indptr))
+        counts = np.bincount(rows * b + block[indices], minlength=b * b).reshape(b, b)
+        
+        sizes = np.bincount(block, minlength=b).astype(np.float64)
+        pairs = np.outer(sizes, sizes)
+        np.fill_diagonal(pairs, sizes * (sizes - 1))
+        return np.divide(counts, pairs, out=np.zeros((b, b)), where=pairs > 0)
+    
     # ========================================================================
     # MÉTODOS DE CONSULTA
     # ========================================================================
@@ -287,10 +480,8 @@ class GraphColoringProblem:
     
     @property
     def clique_number(self) -> int:
-        """Estimación del número de clique (≤ tamaño máximo clique)."""
-        # Aproximación simple basada en grado máximo
-        # Un clique es un conjunto de vértices totalmente conectados
-        return min(self.vertices, self.max_degree + 1)
+        """Tamaño del mayor clique encontrado (= ω(G) si clique.optimal)."""
+        return self.clique.size
     
     # ========================================================================
     # CARGA DESDE ARCHIVOS
@@ -427,7 +618,7 @@ class GraphColoringProblem:
             f"Grado promedio:        {self.average_degree:.2f}\n"
             f"Bipartito:             {self.is_bipartite}\n"
             f"Cota superior (Δ+1):   {self.upper_bound}\n"
-            f"Cota inferior:         {self.lower_bound}\n"
+            f"Cota inferior (ω):     {self.lower_bound}{'' if self.clique.optimal else ' (clique parcial)'}\n"
             f"Óptimo conocido (χ):   {self.colors_known if self.colors_known else 'desconocido'}\n"
             f"{'='*60}\n"
         )
@@ -0,0 +1,209 @@
+"""
+core/reduction.py
+Reducciones de preprocesamiento para instancias de coloración de grafos.
+
+Proporciona:
+    - Pelado iterativo de vértices de grado < k (k = cota inferior)
+    - Eliminación de vértices dominados: N(u) ⊆ N(v) con u, v no adyacentes
+    - División del núcleo restante en componentes conexas
+    - Reinserción greedy de los vértices eliminados (lift)
+
+Corrección: los vértices se reinsertan en orden inverso de eliminación con
+el menor color libre entre sus vecinos ya coloreados.
+    - Un vértice pelado tenía < k vecinos al eliminarse: siempre hay un color
+      libre en {0..k-1}, y k ≤ χ(G).
+    - Un vértice dominado por v puede tomar el color de v (sus vecinos lo son
+      también de v), así que el menor color libre no supera al de v.
+En ambos casos la reinserción no añade colores por encima de max(colores del
+núcleo, k): una coloración óptima del núcleo da una óptima del grafo.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from core.problem import GraphColoringProblem
+from core.solution import ColoringSolution
+from core.clique import adjacency_bitsets
+
+
+@dataclass
+class ReducedInstance:
+    """Núcleo reducido de una instancia y datos para reconstruir la solución"""
+    problem: GraphColoringProblem                                         # Instancia original
+    components: List[GraphColoringProblem] = field(default_factory=list)  # Núcleo (1-based)
+    labels: List[List[int]] = field(default_factory=list)                 # Etiqueta original de cada vértice i+1
+    removed: List[int] = field(default_factory=list)                      # Etiquetas, en orden de eliminación
+    peeled: int = 0                                                       # Eliminados por grado
+    dominated: int = 0                                                    # Eliminados por dominancia
+
+    @property
+    def core_size(self) -> int:
+        """Vértices que quedan en el núcleo (suma de componentes)"""
+        return sum(len(labels) for labels in self.labels)
+
+    def lift(self, colorings: Sequence[ColoringSolution]) -> ColoringSolution:
+        """
+        Solución del grafo original a partir de una coloración por componente.
+
+        Los colores de cada componente se conservan (las componentes no
+        comparten aristas); los vértices eliminados se reinsertan en orden
+        inverso con el menor color libre.
+
+        Parámetros:
+            colorings: Una ColoringSolution por componente, en el mismo orden
+
+        Retorna:
+            ColoringSolution sobre las etiquetas del problema original
+        """
+        if len(colorings) != len(self.components):
+            raise ValueError("Se requiere una coloración por componente")
+
+        problem = self.problem
+        offset = problem.vertex_offset
+        indptr, indices = problem.csr_lists
+        colors = [-1] * problem.n_vertices
+
+        for labels, coloring in zip(self.labels, colorings):
+            for i, label in enumerate(labels):
+                colors[label - offset] = coloring.assignment[i + 1]
+
+        for label in reversed(self.removed):
+            v = label - offset
+            used = {colors[u] for u in indices[indptr[v]:indptr[v + 1]]}
+            color = 0
+            while color in used:
+                color += 1
+            colors[v] = color
+
+        return ColoringSolution(assignment={i + offset: c for i, c in enumerate(colors)})
+
+    def solve(self, solver: Callable[[GraphColoringProblem], ColoringSolution]) -> ColoringSolution:
+        """
+        Resolver cada componente del núcleo con `solver` y reconstruir.
+
+        Ejemplo:
+            >>> reduced = reduce_instance(problem)
+            >>> solution = reduced.solve(
+            ...     lambda core: IteratedLocalSearch(core, seed=42).solve()[0])
+        """
+        return self.lift([solver(component) for component in self.components])
+
+
+def reduce_instance(problem: GraphColoringProblem,
+                    k: Optional[int] = None,
+                    dominance: bool = True,
+                    split: bool = True) -> ReducedInstance:
+    """
+    Reducir una instancia hasta un núcleo sin vértices pelables ni dominados.
+
+    Parámetros:
+        problem: Instancia GCP
+        k: Umbral de pelado (default: problem.lower_bound, tamaño del clique)
+        dominance: Eliminar vértices dominados
+        split: Separar el núcleo en componentes conexas (si no, una sola)
+
+    Retorna:
+        ReducedInstance con el núcleo y el orden de eliminación
+    """
+    n = problem.n_vertices
+    offset = problem.vertex_offset
+    if k is None:
+        k = problem.lower_bound
+    indptr, indices = problem.csr_lists
+
+    alive = [True] * n
+    degree = [indptr[v + 1] - indptr[v] for v in range(n)]
+    rows = adjacency_bitsets(problem) if dominance else None
+    removed: List[int] = []
+    counts = {'peeled': 0, 'dominated': 0}
+
+    def remove(v: int, reason: str) -> None:
+        alive[v] = False
+        removed.append(v)
+        counts[reason] += 1
+        mask = ~(1 << v)
+        for u in indices[indptr[v]:indptr[v + 1]]:
+            if alive[u]:
+                degree[u] -= 1
+                if rows is not None:
+                    rows[u] &= mask
+
+    def peel() -> None:
+        stack = [v for v in range(n) if alive[v] and degree[v] < k]
+        while stack:
+            v = stack.pop()
+            if not alive[v]:
+                continue
+            remove(v, 'peeled')
+            for u in indices[indptr[v]:indptr[v + 1]]:
+                if alive[u] and degree[u] == k - 1:
+                    stack.append(u)
+
+    def dominated_pass() -> bool:
+        """Una pasada de dominancia; True si eliminó algún vértice"""
+        found = False
+        for u in range(n):
+            if not alive[u]:
+                continue
+            neighbors = [w for w in indices[indptr[u]:indptr[u + 1]] if alive[w]]
+            if not neighbors:
+                continue  # Lo pelará la siguiente pasada
+            row = rows[u]
+            # Todo dominador es vecino de cada vecino de u: basta el de menor grado
+            pivot = min(neighbors, key=degree.__getitem__)
+            for v in indices[indptr[pivot]:indptr[pivot + 1]]:
+                if v != u and alive[v] and degree[v] >= degree[u] and not row & ~rows[v]:
+                    remove(u, 'dominated')
+                    found = True
+                    break
+        return found
+
+    peel()
+    while dominance and dominated_pass():
+        peel()
+
+    core = [v for v in range(n) if alive[v]]
+    groups = _components(core, indptr, indices, alive) if split else ([core] if core else [])
+
+    components, labels = [], []
+    for index, group in enumerate(groups):
+        position = {v: i + 1 for i, v in enumerate(group)}
+        edges = [(position[v], position[u]) for v in group
+                 for u in indices[indptr[v]:indptr[v + 1]] if alive[u] and v < u]
+        components.append(GraphColoringProblem(
+            vertices=len(group),
+            edges=edges,
+            name=f"{problem.name or 'instance'}#core{index}"
+        ))
+        labels.append([v + offset for v in group])
+
+    return ReducedInstance(
+        problem=problem,
+        components=components,
+        labels=labels,
+        removed=[v + offset for v in removed],
+        peeled=counts['peeled'],
+        dominated=counts['dominated']
+    )
+
+
+def _components(vertices: List[int], indptr: List[int], indices: List[int],
+                alive: List[bool]) -> List[List[int]]:
+    """Componentes conexas del subgrafo inducido por los vértices vivos"""
+    component_of: Dict[int, int] = {}
+    groups: List[List[int]] = []
+    for start in vertices:
+        if start in component_of:
+            continue
+        index = len(groups)
+        component_of[start] = index
+        group = [start]
+        for x in group:
+            for y in indices[indptr[x]:indptr[x + 1]]:
+                if alive[y] and y not in component_of:
+                    component_of[y] = index
+                    group.append(y)
+        groups.append(sorted(group))
+    return groups
@@ -10,7 +10,7 @@ Proporciona:
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, Set, Optional, List
+from typing import Dict, Set, Optional, List, Tuple
 import numpy as np
 from core.problem import GraphColoringProblem
 
@@ -40,6 +40,8 @@ class ColoringSolution:
     _color_sets: Optional[Dict[int, Set[int]]] = field(default=None, init=False, repr=False)
     _conflicts_cache: Optional[int] = field(default=None, init=False, repr=False)
     _last_problem_id: Optional[int] = field(default=None, init=False, repr=False)
+    # Diario de cambios (vértice, color anterior) para deshacer sin copiar
+    _journal: Optional[List[Tuple[int, Optional[int]]]] = field(default=None, init=False, repr=False)
     
     def __post_init__(self):
         """Validar y procesar la asignación después de la construcción."""
@@ -182,11 +184,147 @@ class ColoringSolution:
         Ejemplo:
             >>> sol1 = ColoringSolution({1: 0, 2: 1})
             >>> sol2 = sol1.copy()
-            >>> sol2.assignment[1] = 99
+            >>> sol2.set_color(1, 99)
             >>> sol1.assignment[1]
             0
         """
-        return ColoringSolution(assignment=self.assignment.copy())
+        clone = ColoringSolution(assignment=self.assignment.copy())
+        # El fitness viaja con la copia: evita re-escanear aristas tras copy()
+        clone._num_colors = self._num_colors
+        clone._conflicts_cache = self._conflicts_cache
+        clone._last_problem_id = self._last_problem_id
+        return clone
+    
+    def set_color(self, vertex: int, color: int,
+                  problem: Optional[GraphColoringProblem] = None) -> Optional[int]:
+        """
+        Recolorear un vértice in-place manteniendo los cachés de fitness.
+        
+        Si se pasa el problema y los conflictos están en caché para él, el
+        contador se actualiza con el delta local del vértice (O(grado)) en
+        lugar de invalidarse. Las modificaciones de la asignación deben
+        pasar por aquí (o por clear_color) para que los cachés sigan siendo
+        válidos.
+        
+        Parametros:
+            vertex (int): Vértice a recolorear
+            color (int): Nuevo color
+            problem (GraphColoringProblem, opcional): Instancia del problema
+        
+        Retorna:
+            Optional[int]: Delta de conflictos, o None si no se pudo calcular
+        """
+        return self._update_vertex(vertex, color, problem)
+    
+    def clear_color(self, vertex: int,
+                    problem: Optional[GraphColoringProblem] = None) -> Optional[int]:
+        """
+        Quitar el color de un vértice in-place (queda sin asignar).
+        
+        Retorna:
+            Optional[int]: Delta de conflictos, o None si no se pudo calcular
+        """
+        return self._update_vertex(vertex, None, problem)
+    
+    def conflict_delta(self, vertex: int, color: Optional[int],
+                       problem: GraphColoringProblem) -> int:
+        """
+        Cambio en el número de conflictos si `vertex` pasa a `color`, sin
+        modificar la solución (O(grado)). color=None equivale a quitarle el
+        color; los vértices sin color cuentan como color -1.
+        """
+        assignment = self.assignment
+        old = assignment.get(vertex)
+        before = -1 if old is None else old
+        after = -1 if color is None else color
+        if before == after:
+            return 0
+        delta = 0
+        for neighbor, count in problem.edge_multiplicity[vertex].items():
+            neighbor_color = assignment.get(neighbor, -1)
+            if neighbor_color == after:
+                delta += count
+            elif neighbor_color == before:
+                delta -= count
+        return delta
+    
+    def _update_vertex(self, vertex: int, color: Optional[int],
+                       problem: Optional[GraphColoringProblem]) -> Optional[int]:
+        """Aplicar un cambio de color y actualizar cachés incrementalmente."""
+        old = self.assignment.get(vertex)
+        if old == color:
+            return 0
+        
+        delta = None
+        if (problem is not None and self._conflicts_cache is not None
+                and self._last_problem_id == id(problem)):
+            delta = self.conflict_delta(vertex, color, problem)
+            self._conflicts_cache += delta
+        else:
+            self._conflicts_cache = None
+            self._last_problem_id = None
+        
+        if color is None:
+            del self.assignment[vertex]
+        else:
+            self.assignment[vertex] = color
+        
+        if self._journal is not None:
+            self._journal.append((vertex, old))
+        
+        emptied = False
+        if self._color_sets is not None:
+            if old is not None:
+                members = self._color_sets.get(old)
+                if members is not None:
+                    members.discard(vertex)
+                    if not members:
+                        del self._color_sets[old]
+                        emptied = True
+            if color is not None:
+                self._color_sets.setdefault(color, set()).add(vertex)
+        
+        # Número de colores: sube en O(1); si se vació la clase máxima se
+        # recalcula desde las clases (O(k)) o, sin ellas, se invalida
+        if self._num_colors is not None:
+            if color is not None and color + 1 > self._num_colors:
+                self._num_colors = color + 1
+            elif old is not None and old + 1 == self._num_colors:
+                if self._color_sets is None:
+                    self._num_colors = None
+                elif emptied:
+                    self._num_colors = max(self._color_sets) + 1 if self._color_sets else 0
+        
+        return delta
+    
+    # ========================================================================
+    # DIARIO DE CAMBIOS (DESHACER IN-PLACE)
+    # ========================================================================
+    
+    def start_journal(self) -> None:
+        """
+        Empezar a registrar los cambios de color para poder deshacerlos.
+        
+        Permite probar una modificación in-place y revertirla con rollback()
+        en O(cambios), sin copiar la solución.
+        """
+        self._journal = []
+    
+    def end_journal(self) -> None:
+        """Confirmar los cambios registrados y dejar de registrar."""
+        self._journal = None
+    
+    def rollback(self, problem: Optional[GraphColoringProblem] = None) -> None:
+        """
+        Deshacer los cambios desde start_journal() y dejar de registrar.
+        
+        Parametros:
+            problem (GraphColoringProblem, opcional): Para revertir también
+                el contador de conflictos en caché de forma incremental
+        """
+        journal, self._journal = self._journal, None
+        for vertex, color in reversed(journal or []):
+            self._update_vertex(vertex, color, problem)
     
     def recolor_vertex(self, vertex: int, new_color: int) -> "ColoringSolution":
         """
@@ -248,6 +386,18 @@ class ColoringSolution:
             return 0.0
         return float(np.std(usage))
     
+    def to_array(self, problem: GraphColoringProblem) -> np.ndarray:
+        """
+        Colores como array int32 indexado 0-based (índice i ↔ vértice
+        i + vertex_offset). Vértices sin color: -1.
+        """
+        offset = problem.vertex_offset
+        get = self.assignment.get
+        return np.fromiter(
+            (get(i + offset, -1) for i in range(problem.n_vertices)),
+            dtype=np.int32, count=problem.n_vertices
+        )
+    
     def get_color(self, vertex: int) -> Optional[int]:
         """Obtener color de un vértice."""
         return self.assignment.get(vertex)
@@ -4,9 +4,13 @@ Módulo de experimentación para GAA
 
 Contiene:
 - statistics.py: Análisis estadístico avanzado (Friedman, Wilcoxon, Cohen's d)
-- runner.py: Orquestación de experimentos (cuando se implemente)
+- runner.py: Planificador de réplicas paralelas (instancia, algoritmo, semilla)
+- results_engine.py: Comparación estadística columnar y vectorizada (Holm, bootstrap)
 """
 
 from .statistics import StatisticalAnalyzer
+from .runner import ReplicaJob, ReplicaScheduler, discover_instances
+from .results_engine import ResultsEngine, holm_correction
 
-__all__ = ['StatisticalAnalyzer']
+__all__ = ['StatisticalAnalyzer', 'ReplicaJob', 'ReplicaScheduler', 'discover_instances',
+           'ResultsEngine', 'holm_correction']
@@ -0,0 +1,525 @@
+"""
+experimentation/results_engine.py
+Motor columnar de comparación estadística de algoritmos
+
+Responsabilidades:
+- Cargar todas las ejecuciones (algoritmo, instancia, valor) en una tabla
+  columnar de arrays NumPy
+- Estadísticas descriptivas por algoritmo con operaciones agrupadas
+- Rankings por instancia (Friedman) con caché incremental: añadir un
+  algoritmo nuevo actualiza los rangos existentes en O(A·I) sin reordenar
+- Todas las comparaciones pareadas (Wilcoxon o post-hoc de Friedman) en
+  bloque, con corrección de Holm
+- Intervalos de confianza bootstrap de la media, en lote para todos los
+  algoritmos
+
+Las comparaciones pareadas y el test de Friedman usan la media por
+(algoritmo, instancia) sobre las réplicas, y solo las instancias en las que
+todos los algoritmos tienen resultados.
+
+Referencias:
+- Demšar, J. (2006). Statistical comparisons of classifiers over multiple
+  data sets.
+- Holm, S. (1979). A simple sequentially rejective multiple test procedure.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import stats
+
+from .statistics import StatisticalAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+def holm_correction(p_values: np.ndarray) -> np.ndarray:
+    """
+    p-values ajustados por Holm-Bonferroni (mismo orden que la entrada).
+
+    p_(i) ajustado = max_{j<=i} min(1, (m - j + 1) · p_(j)) con los p
+    ordenados de menor a mayor.
+    """
+    p_values = np.asarray(p_values, dtype=float)
+    m = p_values.size
+    if m == 0:
+        return p_values
+    order = np.argsort(p_values, kind='stable')
+    scaled = np.minimum(1.0, (m - np.arange(m)) * p_values[order])
+    adjusted = np.empty(m)
+    adjusted[order] = np.maximum.accumulate(scaled)
+    return adjusted
+
+
+def _tie_sum(sorted_rows: np.ndarray) -> np.ndarray:
+    """
+    Σ (t³ - t) sobre los grupos de empates de cada fila (filas ya ordenadas).
+    """
+    rows, cols = sorted_rows.shape
+    if cols == 0:
+        return np.zeros(rows)
+    new_group = np.ones_like(sorted_rows, dtype=bool)
+    new_group[:, 1:] = sorted_rows[:, 1:] != sorted_rows[:, :-1]
+    group_id = np.cumsum(new_group, axis=1) - 1 + (np.arange(rows) * cols)[:, None]
+    sizes = np.bincount(group_id.ravel(), minlength=rows * cols).reshape(rows, cols)
+    return (sizes ** 3 - sizes).sum(axis=1).astype(float)
+
+
+class ResultsEngine:
+    """
+    Tabla columnar de resultados y análisis estadístico vectorizado.
+
+    Uso:
+        >>> engine = ResultsEngine(alpha=0.05)
+        >>> engine.add_records(scheduler_results)          # registros del runner
+        >>> comparison = engine.compare()
+        >>> print(StatisticalAnalyzer().generate_comparison_report(comparison))
+        >>> engine.add_algorithm_results({'GAA_4': values})  # rangos incrementales
+        >>> comparison = engine.compare()
+
+    El resultado de compare() tiene la misma estructura que
+    StatisticalAnalyzer.compare_multiple_algorithms (más 'bootstrap_ci'),
+    así que los reportes existentes funcionan sin cambios.
+    """
+
+    # Máximo de elementos (remuestras × ejecuciones) por bloque de bootstrap
+    BOOTSTRAP_CHUNK_ELEMENTS = 1 << 22
+
+    # Hasta este número de instancias scipy.stats.wilcoxon (method='auto')
+    # no usa la aproximación normal: distribución exacta sin empates ni
+    # ceros, permutación en muestras pequeñas con empates
+    WILCOXON_EXACT_MAX_N = 50
+
+    def __init__(self, alpha: float = 0.05, n_bootstrap: int = 1000,
+                 confidence: float = 0.95, seed: Optional[int] = 42):
+        """
+        Inicializa el motor
+
+        Args:
+            alpha: Nivel de significancia (tras corrección de Holm)
+            n_bootstrap: Remuestras para los intervalos bootstrap
+            confidence: Nivel de confianza de los intervalos
+            seed: Semilla del bootstrap
+        """
+        self.alpha = alpha
+        self.n_bootstrap = n_bootstrap
+        self.confidence = confidence
+        self.seed = seed
+        self.analyzer = StatisticalAnalyzer(alpha=alpha)
+
+        self.algorithms: List[str] = []
+        self.instances: List[str] = []
+        self._algorithm_index: Dict[str, int] = {}
+        self._instance_index: Dict[str, int] = {}
+
+        # Columnas (bloques pendientes de concatenar)
+        self._chunks: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._columns: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+        # Sumas y conteos por celda (algoritmo, instancia)
+        self._cell_sum = np.zeros((0, 0))
+        self._cell_count = np.zeros((0, 0), dtype=np.int64)
+
+        # Caché de rangos por instancia (filas = algoritmos ya rankeados)
+        self._ranks: Optional[np.ndarray] = None
+        self.rank_updates = {'full': 0, 'incremental': 0}
+
+    # ========================================================================
+    # CARGA
+    # ========================================================================
+
+    @staticmethod
+    def _intern(names: Iterable[str], index: Dict[str, int], table: List[str]) -> np.ndarray:
+        """Índices enteros de los nombres (registrando los nuevos)"""
+        codes = []
+        for name in names:
+            code = index.get(name)
+            if code is None:
+                code = index[name] = len(table)
+                table.append(name)
+            codes.append(code)
+        return np.asarray(codes, dtype=np.int64)
+
+    def add_runs(self, algorithms: Sequence[str], instances: Sequence[str],
+                 values: Sequence[float]) -> None:
+        """
+        Añade ejecuciones en forma columnar
+
+        Args:
+            algorithms: Nombre del algoritmo de cada ejecución
+            instances: Nombre de la instancia de cada ejecución
+            values: Valor (p.ej. número de colores) de cada ejecución
+        """
+        if not (len(algorithms) == len(instances) == len(values)):
+            raise ValueError("Las columnas deben tener la misma longitud")
+        if len(values) == 0:
+            return
+
+        known_instances = len(self.instances)
+        alg = self._intern(algorithms, self._algorithm_index, self.algorithms)
+        inst = self._intern(instances, self._instance_index, self.instances)
+        val = np.asarray(values, dtype=float)
+
+        self._chunks.append((alg, inst, val))
+        self._columns = None
+
+        shape = (len(self.algorithms), len(self.instances))
+        if shape != self._cell_sum.shape:
+            pad = ((0, shape[0] - self._cell_sum.shape[0]), (0, shape[1] - self._cell_sum.shape[1]))
+            self._cell_sum = np.pad(self._cell_sum, pad)
+            self._cell_count = np.pad(self._cell_count, pad)
+        np.add.at(self._cell_sum, (alg, inst), val)
+        np.add.at(self._cell_count, (alg, inst), 1)
+
+        # Los rangos en caché siguen valiendo solo si se añadieron algoritmos nuevos
+        if self._ranks is not None:
+            ranked = self._ranks.shape[0]
+            if len(self.instances) != known_instances or (alg < ranked).any():
+                self._ranks = None
+
+    def add_records(self, records: Iterable[Dict[str, Any]], value_key: str = 'num_colors') -> None:
+        """Añade registros del ReplicaScheduler (solo status == 'ok')"""
+        algorithms, instances, values = [], [], []
+        for record in records:
+            if record.get('status', 'ok') != 'ok' or record.get(value_key) is None:
+                continue
+            algorithms.append(record['algorithm'])
+            instances.append(record['instance'])
+            values.append(record[value_key])
+        self.add_runs(algorithms, instances, values)
+
+    def add_algorithm_results(self, algorithm_results: Dict[str, Sequence[float]],
+                              instances: Optional[Sequence[str]] = None) -> None:
+        """
+        Añade resultados en el formato de StatisticalAnalyzer:
+        {algoritmo: [valor por instancia]}. Las instancias se nombran por
+        posición si no se indican.
+        """
+        algorithms, names, values = [], [], []
+        for algorithm, row in algorithm_results.items():
+            for position, value in enumerate(row):
+                if value is None or not np.isfinite(value):
+                    continue
+                algorithms.append(algorithm)
+                names.append(instances[position] if instances is not None else f"instance_{position}")
+                values.append(value)
+        self.add_runs(algorithms, names, values)
+
+    @classmethod
+    def from_algorithm_results(cls, algorithm_results: Dict[str, Sequence[float]],
+                               **kwargs) -> "ResultsEngine":
+        """Motor cargado con {algoritmo: [valor por instancia]}"""
+        engine = cls(**kwargs)
+        engine.add_algorithm_results(algorithm_results)
+        return engine
+
+    def columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Columnas (algoritmo, instancia, valor) de todas las ejecuciones"""
+        if self._columns is None:
+            if self._chunks:
+                self._columns = tuple(np.concatenate(parts) for parts in zip(*self._chunks))
+                self._chunks = [self._columns]
+            else:
+                empty = np.zeros(0, dtype=np.int64)
+                self._columns = (empty, empty, np.zeros(0))
+        return self._columns
+
+    def __len__(self) -> int:
+        return len(self.columns()[2])
+
+    # ========================================================================
+    # DESCRIPTIVAS
+    # ========================================================================
+
+    def descriptive_statistics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Estadísticas por algoritmo sobre todas sus ejecuciones (mismas claves
+        que StatisticalAnalyzer.descriptive_statistics).
+        """
+        alg, _, val = self.columns()
+        n_alg = len(self.algorithms)
+        if n_alg == 0:
+            return {}
+
+        counts = np.bincount(alg, minlength=n_alg)
+        mean = np.bincount(alg, weights=val, minlength=n_alg) / counts
+        std = np.sqrt(np.bincount(alg, weights=(val - mean[alg]) ** 2, minlength=n_alg) / counts)
+
+        order = np.lexsort((val, alg))
+        sorted_values = val[order]
+        starts = np.cumsum(counts) - counts
+
+        def quantile(q: float) -> np.ndarray:
+            position = starts + q * (counts - 1)
+            lo = np.floor(position).astype(np.int64)
+            hi = np.ceil(position).astype(np.int64)
+            return sorted_values[lo] + (position - lo) * (sorted_values[hi] - sorted_values[lo])
+
+        q1, median, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+        minimum, maximum = sorted_values[starts], sorted_values[starts + counts - 1]
+
+        return {
+            name: {
+                'mean': float(mean[a]),
+                'std': float(std[a]),
+                'min': float(minimum[a]),
+                'max': float(maximum[a]),
+                'median': float(median[a]),
+                'q1': float(q1[a]),
+                'q3': float(q3[a]),
+                'iqr': float(q3[a] - q1[a]),
+                'count': int(counts[a]),
+            }
+            for a, name in enumerate(self.algorithms)
+        }
+
+    def bootstrap_ci(self) -> Dict[str, Tuple[float, float]]:
+        """
+        Intervalo bootstrap percentil de la media de cada algoritmo.
+
+        Las remuestras de todos los algoritmos se generan juntas: una matriz
+        (remuestras × ejecuciones) de índices dentro del bloque de cada
+        algoritmo y una suma por bloques con np.add.reduceat.
+        """
+        alg, _, val = self.columns()
+        n_alg = len(self.algorithms)
+        if n_alg == 0:
+            return {}
+
+        order = np.argsort(alg, kind='stable')
+        sorted_values = val[order]
+        counts = np.bincount(alg, minlength=n_alg)
+        starts = np.cumsum(counts) - counts
+        block_start = np.repeat(starts, counts)
+        block_size = np.repeat(counts, counts)
+
+        rng = np.random.default_rng(self.seed)
+        total = len(sorted_values)
+        chunk = max(1, self.BOOTSTRAP_CHUNK_ELEMENTS // max(total, 1))
+        means = np.empty((self.n_bootstrap, n_alg))
+        for first in range(0, self.n_bootstrap, chunk):
+            size = min(chunk, self.n_bootstrap - first)
+            picks = block_start + (rng.random((size, total)) * block_size).astype(np.int64)
+            means[first:first + size] = np.add.reduceat(sorted_values[picks], starts, axis=1) / counts
+
+        tail = 100 * (1 - self.confidence) / 2
+        lower, upper = np.percentile(means, [tail, 100 - tail], axis=0)
+        return {name: (float(lower[a]), float(upper[a])) for a, name in enumerate(self.algorithms)}
+
+    # ========================================================================
+    # RANGOS Y TEST DE FRIEDMAN
+    # ========================================================================
+
+    def cell_means(self) -> np.ndarray:
+        """Matriz algoritmos × instancias de medias por réplica (NaN = sin datos)"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self._cell_count > 0, self._cell_sum / np.maximum(self._cell_count, 1), np.nan)
+
+    def complete_instances(self) -> np.ndarray:
+        """Máscara de instancias con resultados de todos los algoritmos"""
+        return (self._cell_count > 0).all(axis=0)
+
+    def ranks(self) -> np.ndarray:
+        """
+        Rangos por instancia (1 = mejor, empates promediados), algoritmos × instancias.
+
+        Si desde el último cálculo solo se añadieron algoritmos nuevos, sus
+        filas se insertan sin reordenar: cada rango existente sube 1 por
+        cada valor nuevo menor y 0.5 por cada empate.
+        """
+        cells = self.cell_means()
+        n_alg = cells.shape[0]
+
+        if self._ranks is None or self._ranks.shape[1] != cells.shape[1]:
+            filled = np.where(np.isnan(cells), np.inf, cells)
+            self._ranks = stats.rankdata(filled, axis=0) if n_alg else np.zeros(cells.shape)
+            self.rank_updates['full'] += 1
+            return self._ranks
+
+        ranks = self._ranks
+        for a in range(ranks.shape[0], n_alg):
+            known, new = cells[:a], cells[a]
+            below = (known < new).sum(axis=0)
+            ties = (known == new).sum(axis=0)
+            ranks = ranks + (new < known) + 0.5 * (new == known)
+            ranks = np.vstack([ranks, 1 + below + 0.5 * ties])
+            self.rank_updates['incremental'] += 1
+        self._ranks = ranks
+        return ranks
+
+    def average_rankings(self) -> Dict[str, float]:
+        """Rango medio de cada algoritmo sobre las instancias completas"""
+        complete = self.complete_instances()
+        if not complete.any():
+            return {name: float('nan') for name in self.algorithms}
+        mean_ranks = self.ranks()[:, complete].mean(axis=1)
+        return {name: float(mean_ranks[a]) for a, name in enumerate(self.algorithms)}
+
+    def friedman_test(self) -> Dict[str, Any]:
+        """
+        Test de Friedman sobre las instancias completas, a partir de los
+        rangos en caché (con corrección por empates, como scipy).
+        """
+        complete = self.complete_instances()
+        k, n = len(self.algorithms), int(complete.sum())
+        rankings = self.average_rankings()
+        ordered = sorted(rankings, key=rankings.get)
+
+        statistic, p_value = float('nan'), 1.0
+        if k >= 2 and n >= 1:
+            ranks = self.ranks()[:, complete]
+            rank_sums = ranks.sum(axis=1)
+            statistic = 12.0 / (n * k * (k + 1)) * np.sum(rank_sums ** 2) - 3.0 * n * (k + 1)
+            ties = _tie_sum(np.sort(self.cell_means()[:, complete].T, axis=1)).sum()
+            correction = 1.0 - ties / (n * k * (k * k - 1))
+            if correction > 0:
+                statistic = float(statistic / correction)
+                p_value = float(stats.chi2.sf(statistic, k - 1))
+            else:
+                statistic = 0.0
+
+        return {
+            'test_name': 'Friedman',
+            'statistic': statistic,
+            'p_value': p_value,
+            'significant': p_value < self.alpha,
+            'interpretation': self.analyzer._interpret_friedman(p_value),
+            'average_rankings': rankings,
+            'ranking_order': ordered,
+            'best_algorithm': ordered[0] if ordered else None,
+            'instances_used': n,
+        }
+
+    # ========================================================================
+    # COMPARACIONES PAREADAS
+    # ========================================================================
+
+    def _pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        return np.triu_indices(len(self.algorithms), 1)
+
+    def posthoc(self, method: str = 'wilcoxon') -> Dict[str, np.ndarray]:
+        """
+        Todas las comparaciones pareadas en bloque, con corrección de Holm.
+
+        Métodos:
+        - 'wilcoxon': rangos signados pareados por instancia, con los mismos
+          p-values que scipy.stats.wilcoxon: con más de WILCOXON_EXACT_MAX_N
+          instancias, aproximación normal con corrección por empates en
+          bloque; con menos, scipy por par (exacto o por permutación)
+        - 'friedman': diferencia de rangos medios, z = ΔR / sqrt(k(k+1)/6N)
+
+        Returns:
+            Dict de arrays por par (i, j): 'i', 'j', 'statistic', 'p_value',
+            'p_holm', 'mean_difference', 'median_difference', 'cohens_d'
+        """
+        first, second = self._pairs()
+        complete = self.complete_instances()
+        values = self.cell_means()[:, complete]
+        k, n = values.shape
+
+        differences = values[first] - values[second]
+        if method == 'wilcoxon':
+            statistic, p_values = self._wilcoxon(differences)
+        elif method == 'friedman':
+            mean_ranks = self.ranks()[:, complete].mean(axis=1) if n else np.zeros(k)
+            se = np.sqrt(k * (k + 1) / (6.0 * n)) if n else np.inf
+            statistic = (mean_ranks[first] - mean_ranks[second]) / se
+            p_values = 2 * stats.norm.sf(np.abs(statistic))
+        else:
+            raise ValueError(f"Método post-hoc desconocido: {method}")
+
+        # Cohen's d con las medias por instancia (desviación combinada)
+        if n >= 2:
+            means, variances = values.mean(axis=1), values.var(axis=1, ddof=1)
+            pooled = np.sqrt((variances[first] + variances[second]) / 2)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                cohens_d = np.where(pooled > 0, (means[first] - means[second]) / pooled, 0.0)
+        else:
+            cohens_d = np.zeros(len(first))
+
+        empty = np.full(len(first), np.nan)
+        return {
+            'i': first,
+            'j': second,
+            'statistic': statistic,
+            'p_value': p_values,
+            'p_holm': holm_correction(p_values),
+            'mean_difference': differences.mean(axis=1) if n else empty,
+            'median_difference': np.median(differences, axis=1) if n else empty,
+            'cohens_d': cohens_d,
+        }
+
+    @classmethod
+    def _wilcoxon(cls, differences: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Wilcoxon bilateral por filas: (min(T+, T-), p-value)"""
+        pairs, n = differences.shape
+        if n == 0:
+            return np.zeros(pairs), np.ones(pairs)
+
+        magnitude = np.abs(differences)
+        zeros = magnitude == 0
+        n_zero = zeros.sum(axis=1)
+        nonzero = n - n_zero
+
+        # Los ceros quedan al fondo del ranking: restar su número da el rango
+        # entre los no nulos
+        ranks = stats.rankdata(magnitude, axis=1) - n_zero[:, None]
+        t_plus = np.where(differences > 0, ranks, 0).sum(axis=1)
+        t_minus = np.where(differences < 0, ranks, 0).sum(axis=1)
+
+        ties = _tie_sum(np.sort(magnitude, axis=1)) - (n_zero ** 3 - n_zero)
+        mean = nonzero * (nonzero + 1) / 4.0
+        variance = nonzero * (nonzero + 1) * (2 * nonzero + 1) / 24.0 - ties / 48.0
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z = np.where(variance > 0, (t_plus - mean) / np.sqrt(variance), 0.0)
+        p_values = np.where(variance > 0, 2 * stats.norm.sf(np.abs(z)), 1.0)
+
+        # Muestras pequeñas: la aproximación normal se aleja del p exacto
+        if n <= cls.WILCOXON_EXACT_MAX_N:
+            for row in np.flatnonzero(nonzero > 0):
+                p_values[row] = stats.wilcoxon(differences[row]).pvalue
+        return np.minimum(t_plus, t_minus), p_values
+
+    # ========================================================================
+    # COMPARACIÓN COMPLETA
+    # ========================================================================
+
+    def compare(self) -> Dict[str, Any]:
+        """
+        Comparación completa con la estructura de
+        StatisticalAnalyzer.compare_multiple_algorithms: descriptivas,
+        Friedman, Wilcoxon pareado (Holm) + Cohen's d, y 'bootstrap_ci'.
+        """
+        global_test = self.friedman_test()
+        posthoc = self.posthoc('wilcoxon')
+
+        pairwise = {}
+        for pos, (i, j) in enumerate(zip(posthoc['i'], posthoc['j'])):
+            p_holm = float(posthoc['p_holm'][pos])
+            mean_diff = float(posthoc['mean_difference'][pos])
+            cohens_d = float(posthoc['cohens_d'][pos])
+            pairwise[f"{self.algorithms[i]}_vs_{self.algorithms[j]}"] = {
+                'wilcoxon': {
+                    'test_name': 'Wilcoxon Signed-Rank',
+                    'statistic': float(posthoc['statistic'][pos]),
+                    'p_value': float(posthoc['p_value'][pos]),
+                    'p_holm': p_holm,
+                    'significant': p_holm < self.alpha,
+                    'interpretation': self.analyzer._interpret_wilcoxon(p_holm, mean_diff),
+                    'mean_difference': mean_diff,
+                    'median_difference': float(posthoc['median_difference'][pos]),
+                },
+                'cohens_d': cohens_d,
+                'cohens_d_interpretation': self.analyzer.interpret_cohens_d(cohens_d),
+            }
+
+        return {
+            'descriptive_statistics': self.descriptive_statistics(),
+            'global_test': global_test,
+            'pairwise_comparisons': pairwise,
+            'best_algorithm': global_test['best_algorithm'],
+            'average_rankings': global_test['average_rankings'],
+            'bootstrap_ci': self.bootstrap_ci(),
+        }
@@ -0,0 +1,486 @@
+"""
+experimentation/runner.py
+Planificador de réplicas independientes para experimentos GCP
+
+Responsabilidades:
+- Definir trabajos (instancia, algoritmo, semilla)
+- Distribuir trabajos en un pool de procesos
+- Cargar cada grafo una sola vez por worker (caché compartida)
+- Transmitir resultados a medida que terminan (streaming)
+- Aplicar timeouts por trabajo y reanudar tras una caída
+"""
+
+import os
+import signal
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Familias DIMACS del proyecto
+DEFAULT_FAMILIES = ["CUL", "DSJ", "LEI", "MYC", "REG", "SCH", "SGB"]
+
+# Configuración por defecto del ILS usado como algoritmo de referencia
+DEFAULT_ILS_CONFIG = {
+    'type': 'ILS',
+    'max_iterations': 100,
+    'time_budget': 300.0,
+}
+
+
+@dataclass(frozen=True)
+class ReplicaJob:
+    """Trabajo independiente: una réplica de un algoritmo en una instancia"""
+    instance: str
+    algorithm: str
+    replica: int
+    seed: int
+
+    @property
+    def key(self) -> Tuple[str, str, int]:
+        """Clave única del trabajo (instancia, algoritmo, semilla)"""
+        return (self.instance, self.algorithm, self.seed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def discover_instances(datasets_dir: Path,
+                       families: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """
+    Descubre archivos .col por familia sin cargarlos.
+
+    Args:
+        datasets_dir: Directorio raíz de datasets
+        families: Familias a incluir (default: todas)
+
+    Returns:
+        Dict {nombre_instancia: ruta_archivo}
+    """
+    instances = {}
+    for family in (families or DEFAULT_FAMILIES):
+        family_dir = Path(datasets_dir) / family
+        if not family_dir.exists():
+            logger.warning(f"Familia {family} no encontrada")
+            continue
+        for col_file in sorted(family_dir.glob("*.col")):
+            instances[col_file.stem] = str(col_file)
+    return instances
+
+
+def job_key_from_record(record: Dict[str, Any]) -> Tuple[str, str, int]:
+    """Reconstruye la clave de trabajo a partir de un registro de resultado"""
+    return (record['instance'], record['algorithm'], int(record['seed']))
+
+
+def successful_records(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Registros con status 'ok' (uno por clave, el último)
+
+    Los 'timeout' y 'error' no cuentan como completados: al reanudar, esos
+    trabajos se vuelven a ejecutar.
+    """
+    latest = {}
+    for record in records:
+        if record.get('status') == 'ok':
+            latest[job_key_from_record(record)] = record
+    return list(latest.values())
+
+
+# ============================================================================
+# WORKER (estado por proceso)
+# ============================================================================
+
+# Rutas de instancias y algoritmos disponibles en el worker
+_WORKER_INSTANCES: Dict[str, str] = {}
+_WORKER_ALGORITHMS: Dict[str, Any] = {}
+
+# Caché de grafos del worker: cada grafo se parsea una sola vez por proceso
+_GRAPH_CACHE: Dict[str, Any] = {}
+
+
+def _init_worker(instance_paths: Dict[str, str], algorithms: Dict[str, Any],
+                 pid_queue: Optional[Any] = None) -> None:
+    """Inicializa el estado compartido del worker (y reporta su PID al planificador)"""
+    _WORKER_INSTANCES.clear()
+    _WORKER_INSTANCES.update(instance_paths)
+    _WORKER_ALGORITHMS.clear()
+    _WORKER_ALGORITHMS.update(algorithms)
+    if pid_queue is not None:
+        pid_queue.put(os.getpid())
+
+
+def _get_problem(name: str):
+    """Obtiene un grafo desde la caché del worker (lo carga si es necesario)"""
+    problem = _GRAPH_CACHE.get(name)
+    if problem is None:
+        from core.problem import GraphColoringProblem
+        problem = GraphColoringProblem.load_from_dimacs(_WORKER_INSTANCES[name])
+        _GRAPH_CACHE[name] = problem
+    return problem
+
+
+def _run_metaheuristic(spec: Dict[str, Any], problem, seed: int, time_budget: float):
+    """Ejecuta un ILS o un KFixedSearch configurado por `spec`"""
+    if spec.get('type') == 'KFIXED':
+        from metaheuristic.k_fixed import KFixedSearch
+
+        search = KFixedSearch(
+            problem=problem,
+            time_per_k=spec.get('time_per_k', 10.0),
+            time_budget=time_budget,
+            max_iterations_per_k=spec.get('max_iterations_per_k'),
+            target_k=spec.get('target_k'),
+            seed=seed
+        )
+        return search.solve()
+
+    from metaheuristic.ils_core import IteratedLocalSearch
+    from operators.constructive import GreedyDSATUR
+    from operators.improvement import KempeChain
+    from operators.perturbation import RandomRecolor
+
+    ils = IteratedLocalSearch(
+        problem=problem,
+        constructive=GreedyDSATUR.construct,
+        improvement=KempeChain.improve,
+        perturbation=RandomRecolor.perturb,
+        max_iterations=spec.get('max_iterations', DEFAULT_ILS_CONFIG['max_iterations']),
+        time_budget=time_budget,
+        verbose=False,
+        seed=seed
+    )
+    return ils.solve()
+
+
+def _run_reduced(spec: Dict[str, Any], problem, seed: int, time_budget: float):
+    """
+    Ejecuta la metaheurística sobre el núcleo reducido (core/reduction.py)
+    y reconstruye la solución del grafo completo.
+
+    Las componentes se resuelven en orden con el presupuesto restante; el
+    historial devuelto es el de la componente más grande.
+    """
+    from core.reduction import reduce_instance
+
+    reduced = reduce_instance(problem)
+    start = time.time()
+    histories = []
+
+    def solve_component(component):
+        remaining = max(time_budget - (time.time() - start), 0.0)
+        solution, history = _run_metaheuristic(spec, component, seed, remaining)
+        histories.append((component.n_vertices, history))
+        return solution
+
+    solution = reduced.solve(solve_component)
+    history = max(histories, key=lambda item: item[0])[1] if histories else None
+    return solution, history
+
+
+def _run_algorithm(spec: Any, problem, seed: int, time_limit: Optional[float]):
+    """
+    Ejecuta un algoritmo (ILS/KFIXED configurado o AST de GAA) sobre un problema.
+
+    Con 'reduce': True en la configuración, la metaheurística trabaja sobre
+    el núcleo sin vértices de grado bajo ni dominados.
+
+    Returns:
+        (solution, history) donde history puede ser None
+    """
+    if isinstance(spec, dict) and spec.get('type') in ('ILS', 'KFIXED'):
+        time_budget = spec.get('time_budget', DEFAULT_ILS_CONFIG['time_budget'])
+        if time_limit is not None:
+            time_budget = min(time_budget, time_limit)
+
+        if spec.get('reduce'):
+            return _run_reduced(spec, problem, seed, time_budget)
+        return _run_metaheuristic(spec, problem, seed, time_budget)
+
+    from gaa.interpreter import execute_algorithm
+    return execute_algorithm(spec, problem, seed=seed), None
+
+
+def _run_job(job: ReplicaJob, time_limit: Optional[float] = None,
+             keep_solution: bool = False, keep_history: bool = False) -> Dict[str, Any]:
+    """
+    Ejecuta un trabajo y retorna un registro serializable.
+
+    Se ejecuta dentro del worker; nunca lanza excepciones hacia el planificador.
+    """
+    record = job.to_dict()
+    start = time.time()
+
+    try:
+        from core.evaluation import ColoringEvaluator
+
+        problem = _get_problem(job.instance)
+        solution, history = _run_algorithm(
+            _WORKER_ALGORITHMS[job.algorithm], problem, job.seed, time_limit
+        )
+        elapsed = time.time() - start
+
+        if solution is None:
+            record.update({'status': 'error', 'error': 'sin solución', 'time': elapsed})
+            return record
+
+        metrics = ColoringEvaluator.evaluate(solution, problem)
+        record.update({
+            'status': 'ok',
+            'num_colors': int(metrics['num_colors']),
+            'conflicts': int(metrics['conflicts']),
+            'feasible': bool(metrics['feasible']),
+            'time': elapsed,
+            'vertices': problem.n_vertices,
+            'edges': problem.n_edges,
+            'bks': problem.colors_known,
+            'lower_bound': problem.lower_bound,
+            # Factible con tantos colores como el clique: óptimo probado
+            'proven_optimal': bool(metrics['feasible'])
+                              and int(metrics['num_colors']) <= problem.lower_bound,
+        })
+
+        time_to_target = getattr(history, 'time_to_target', None)
+        if time_to_target:
+            record['time_to_target'] = {str(k): float(t) for k, t in time_to_target.items()}
+
+        if keep_solution:
+            record['assignment'] = {int(v): int(c) for v, c in solution.assignment.items()}
+
+        if keep_history and history is not None:
+            record['history'] = {
+                'current_fitness': [float(x) for x in history.current_fitness],
+                'best_fitness': [float(x) for x in history.best_fitness],
+            }
+
+    except Exception as e:
+        record.update({'status': 'error', 'error': str(e), 'time': time.time() - start})
+
+    return record
+
+
+# ============================================================================
+# PLANIFICADOR
+# ============================================================================
+
+class ReplicaScheduler:
+    """
+    Planificador de réplicas independientes sobre un pool de procesos.
+
+    Cada trabajo (instancia, algoritmo, semilla) es independiente. Los workers
+    reciben las rutas de los grafos y los algoritmos una sola vez (al iniciar)
+    y mantienen una caché de grafos ya parseados.
+
+    Los resultados se entregan a `on_result` en cuanto cada trabajo termina,
+    de modo que pueden persistirse incrementalmente (ver
+    OutputManager.append_replica_result). Los trabajos cuya clave ya aparece en
+    `completed` se omiten, lo que permite reanudar tras una caída (ver
+    successful_records: solo cuentan los registros con status 'ok').
+
+    Uso:
+        >>> scheduler = ReplicaScheduler(instances, {'ILS': DEFAULT_ILS_CONFIG}, workers=8)
+        >>> jobs = scheduler.build_jobs(num_replicas=30, base_seed=42)
+        >>> records = scheduler.run(jobs, on_result=output_mgr.append_replica_result)
+    """
+
+    def __init__(self,
+                 instance_paths: Dict[str, str],
+                 algorithms: Dict[str, Any],
+                 workers: Optional[int] = None,
+                 job_timeout: Optional[float] = None,
+                 keep_solutions: bool = False,
+                 keep_history: bool = False):
+        """
+        Inicializa planificador
+
+        Args:
+            instance_paths: {nombre_instancia: ruta .col}
+            algorithms: {nombre_algoritmo: config ILS (dict) o AST de GAA}
+            workers: Número de procesos (default: núcleos disponibles; 1 = en proceso)
+            job_timeout: Tiempo máximo por trabajo en segundos (None = sin límite)
+            keep_solutions: Incluir la asignación de colores en los registros de la réplica 0
+            keep_history: Incluir el historial de convergencia de la réplica 0 (solo ILS)
+        """
+        self.instance_paths = dict(instance_paths)
+        self.algorithms = dict(algorithms)
+        self.workers = workers or multiprocessing.cpu_count()
+        self.job_timeout = job_timeout
+        self.keep_solutions = keep_solutions
+        self.keep_history = keep_history
+        self.logger = logger
+
+    def build_jobs(self, num_replicas: int, base_seed: int = 42,
+                   instances: Optional[Iterable[str]] = None,
+                   algorithms: Optional[Iterable[str]] = None) -> List[ReplicaJob]:
+        """
+        Genera el producto instancia × algoritmo × réplica.
+
+        La semilla de la réplica r es base_seed + r, compartida entre algoritmos
+        (números aleatorios comunes) para comparaciones pareadas.
+        """
+        jobs = []
+        for instance in (instances or self.instance_paths.keys()):
+            for algorithm in (algorithms or self.algorithms.keys()):
+                for replica in range(num_replicas):
+                    jobs.append(ReplicaJob(
+                        instance=instance,
+                        algorithm=algorithm,
+                        replica=replica,
+                        seed=base_seed + replica
+                    ))
+        return jobs
+
+    def run(self,
+            jobs: List[ReplicaJob],
+            on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+            completed: Optional[Set[Tuple[str, str, int]]] = None) -> List[Dict[str, Any]]:
+        """
+        Ejecuta los trabajos pendientes.
+
+        Args:
+            jobs: Trabajos a ejecutar
+            on_result: Callback invocado con cada registro al terminar
+            completed: Claves de trabajos ya completados (se omiten)
+
+        Returns:
+            Lista de registros de los trabajos ejecutados en esta llamada
+        """
+        completed = completed or set()
+        pending = [job for job in jobs if job.key not in completed]
+        skipped = len(jobs) - len(pending)
+        if skipped:
+            self.logger.info(f"Reanudando: {skipped} trabajos ya completados se omiten")
+
+        if not pending:
+            return []
+
+        if self.workers <= 1:
+            return self._run_inline(pending, on_result)
+        return self._run_pool(pending, on_result)
+
+    def _job_args(self, job: ReplicaJob) -> Tuple[Any, ...]:
+        """Argumentos de _run_job; el detalle solo se conserva para la réplica 0"""
+        detailed = job.replica == 0
+        return (job, self.job_timeout,
+                self.keep_solutions and detailed, self.keep_history and detailed)
+
+    def _emit(self, record: Dict[str, Any], results: List[Dict[str, Any]],
+              on_result: Optional[Callable[[Dict[str, Any]], None]]) -> None:
+        """Registra un resultado y lo entrega al callback"""
+        results.append(record)
+        if on_result is not None:
+            try:
+                on_result(record)
+            except Exception as e:
+                self.logger.error(f"Error procesando resultado {record.get('instance')}: {e}")
+
+    def _run_inline(self, jobs: List[ReplicaJob],
+                    on_result: Optional[Callable]) -> List[Dict[str, Any]]:
+        """Ejecución secuencial en el proceso actual (timeout solo cooperativo)"""
+        _init_worker(self.instance_paths, self.algorithms)
+        results = []
+        for job in jobs:
+            record = _run_job(*self._job_args(job))
+            self._emit(record, results, on_result)
+        return results
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        """
+        Crea un pool cuyos workers reciben instancias y algoritmos al iniciar.
+
+        Cada worker reporta su PID en self._worker_pids al inicializarse, para
+        poder terminarlo si un trabajo se cuelga (ver _kill_executor).
+        """
+        self._worker_pids = multiprocessing.SimpleQueue()
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.instance_paths, self.algorithms, self._worker_pids)
+        )
+
+    def _kill_executor(self, executor: ProcessPoolExecutor, futures: Iterable[Any]) -> None:
+        """Cancela los trabajos enviados y termina los procesos del pool sin esperar"""
+        # Cancelación explícita (shutdown(cancel_futures=True) requiere Python 3.9)
+        for future in futures:
+            future.cancel()
+        # Solo los workers ya inicializados pueden estar ejecutando un trabajo
+        while not self._worker_pids.empty():
+            try:
+                os.kill(self._worker_pids.get(), signal.SIGTERM)
+            except OSError:
+                pass  # El worker ya había terminado
+        executor.shutdown(wait=False)
+
+    def _run_pool(self, jobs: List[ReplicaJob],
+                  on_result: Optional[Callable]) -> List[Dict[str, Any]]:
+        """
+        Ejecución en pool de procesos con ventana de envío acotada.
+
+        Solo se envían tantos trabajos como workers, de modo que el instante de
+        envío coincide con el inicio real y el timeout por trabajo es medible.
+        El timeout es cooperativo (presupuesto de tiempo del ILS) y, como
+        respaldo, duro: si un trabajo lo excede se registra como 'timeout', el
+        pool se recicla y los demás trabajos en curso se reencolan.
+        """
+        results: List[Dict[str, Any]] = []
+        queue = list(reversed(jobs))
+        in_flight: Dict[Any, Tuple[ReplicaJob, float]] = {}
+        hard_limit = None
+        if self.job_timeout is not None:
+            # Margen sobre el presupuesto cooperativo antes de matar el proceso
+            hard_limit = self.job_timeout * 1.5 + 5.0
+
+        executor = self._new_executor()
+
+        try:
+            while queue or in_flight:
+                while queue and len(in_flight) < self.workers:
+                    job = queue.pop()
+                    future = executor.submit(_run_job, *self._job_args(job))
+                    in_flight[future] = (job, time.time())
+
+                done, _ = wait(list(in_flight), timeout=1.0, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    job, _ = in_flight.pop(future)
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        record = job.to_dict()
+                        record.update({'status': 'error', 'error': str(e)})
+                    self._emit(record, results, on_result)
+
+                if hard_limit is None:
+                    continue
+
+                now = time.time()
+                expired = [f for f, (_, started) in in_flight.items() if now - started > hard_limit]
+                if not expired:
+                    continue
+
+                for future in expired:
+                    job, started = in_flight.pop(future)
+                    record = job.to_dict()
+                    record.update({'status': 'timeout', 'time': now - started})
+                    self.logger.warning(
+                        f"Timeout en {job.instance}/{job.algorithm}/seed={job.seed}"
+                    )
+                    self._emit(record, results, on_result)
+
+                # Reciclar el pool: los trabajos interrumpidos vuelven a la cola
+                queue.extend(job for job, _ in in_flight.values())
+                self._kill_executor(executor, expired + list(in_flight))
+                in_flight.clear()
+                executor = self._new_executor()
+        except BaseException:
+            self._kill_executor(executor, list(in_flight))
+            raise
+
+        executor.shutdown(wait=True)
+        return results
@@ -23,6 +23,9 @@ from .interpreter import (
     execute_algorithm
 )
 
+from .fitness import FitnessService, algorithm_key
+from .racing import RacingEvaluator, RaceResult
+
 __all__ = [
     # AST Nodes
     'ASTNode',
@@ -37,5 +40,9 @@ __all__ = [
     'AlgorithmGenerator', 'generate_initial_population',
     
     # Interpreter
-    'ExecutionContext', 'ASTInterpreter', 'execute_algorithm'
+    'ExecutionContext', 'ASTInterpreter', 'execute_algorithm',
+    
+    # Fitness
+    'FitnessService', 'algorithm_key',
+    'RacingEvaluator', 'RaceResult'
 ]
@@ -0,0 +1,319 @@
+"""
+Fitness Service - GAA-GCP-ILS-4
+Evaluación paralela y memoizada de algoritmos (AST) sobre instancias de entrenamiento
+
+Cada evaluación se descompone en trabajos (algoritmo, instancia, semilla):
+- Los trabajos se reparten en un pool de procesos cuyos workers reciben los
+  grafos de entrenamiento una sola vez, al iniciar
+- Cada instancia usa una semilla fija, de modo que el resultado de un trabajo
+  es determinista y se puede memoizar
+- La clave de memoización es un hash canónico de ASTNode.to_dict() más la
+  instancia y la semilla: árboles estructuralmente idénticos (frecuentes tras
+  mutate_ast) no se vuelven a ejecutar
+- La caché puede persistirse en disco (JSONL, solo se añaden líneas) para
+  reutilizarla entre sesiones de evolución. Los fallos del propio algoritmo
+  son deterministas y se memoizan; los errores del pool (worker caído) son
+  transitorios y no se guardan, así que el trabajo se repite más adelante
+"""
+
+import json
+import hashlib
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .ast_nodes import ASTNode
+from .interpreter import execute_algorithm
+from core.problem import GraphColoringProblem
+from core.evaluation import ColoringEvaluator
+
+logger = logging.getLogger(__name__)
+
+
+def algorithm_key(algorithm: ASTNode) -> str:
+    """
+    Hash canónico de un algoritmo.
+
+    Dos árboles con la misma estructura y parámetros producen la misma clave,
+    independientemente de la identidad de los objetos.
+    """
+    canonical = json.dumps(algorithm.to_dict(), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+# ============================================================================
+# WORKER (estado por proceso)
+# ============================================================================
+
+# Grafos de entrenamiento precargados en el worker
+_WORKER_PROBLEMS: List[GraphColoringProblem] = []
+
+
+def _init_worker(problems: List[GraphColoringProblem]) -> None:
+    """Inicializa el worker con los grafos de entrenamiento"""
+    _WORKER_PROBLEMS[:] = problems
+
+
+def _run_job(algorithm: ASTNode, index: int, seed: int) -> Optional[np.ndarray]:
+    """
+    Ejecuta un algoritmo sobre la instancia `index` del worker.
+
+    Returns:
+        Coloración como array int32 (0-based, -1 = sin color) o None si falla
+    """
+    problem = _WORKER_PROBLEMS[index]
+    try:
+        solution = execute_algorithm(algorithm, problem, seed=seed)
+    except Exception:
+        return None  # Instancia problemática
+    if not solution:
+        return None
+    return solution.to_array(problem)
+
+
+# ============================================================================
+# SERVICIO
+# ============================================================================
+
+class FitnessService:
+    """
+    Evaluador de fitness de algoritmos con pool de procesos y memoización.
+
+    Fitness = promedio de colores sobre las instancias de entrenamiento
+    (menor es mejor); las ejecuciones fallidas y las coloraciones no
+    factibles (con conflictos) se omiten del promedio y un algoritmo sin
+    ejecuciones válidas recibe infinito. Las coloraciones de
+    cada instancia se puntúan en lote con ColoringEvaluator.batch_metrics.
+
+    Uso:
+        >>> with FitnessService(instances, seed=42, workers=4,
+        ...                     cache_path="output/fitness_cache.jsonl") as service:
+        ...     fitnesses = service.evaluate_many(population)
+        ...     mutant_fitness = service.evaluate(mutant)
+    """
+
+    def __init__(self,
+                 instances: Sequence[GraphColoringProblem],
+                 seed: int = 42,
+                 instance_seeds: Optional[Sequence[int]] = None,
+                 workers: Optional[int] = None,
+                 cache_path: Optional[str] = None):
+        """
+        Inicializa servicio
+
+        Args:
+            instances: Instancias de entrenamiento
+            seed: Semilla de la que derivan las semillas por instancia
+            instance_seeds: Semillas explícitas, una por instancia
+            workers: Número de procesos (default: núcleos disponibles; 1 = en proceso)
+            cache_path: Archivo JSONL de caché persistente (None = solo memoria)
+        """
+        self.instances = list(instances)
+        if instance_seeds is None:
+            rng = np.random.default_rng(seed)
+            instance_seeds = rng.integers(0, 2**31, size=len(self.instances)).tolist()
+        if len(instance_seeds) != len(self.instances):
+            raise ValueError("Se requiere una semilla por instancia")
+        self.instance_seeds = [int(s) for s in instance_seeds]
+        self.workers = workers or multiprocessing.cpu_count()
+
+        # Identificador estable de cada instancia para la clave de caché
+        self._instance_ids = [
+            f"{problem.name or f'instance_{j}'}:{problem.n_vertices}:{problem.n_edges}"
+            for j, problem in enumerate(self.instances)
+        ]
+
+        self.cache: Dict[str, Optional[int]] = {}
+        self.cache_path = Path(cache_path) if cache_path else None
+        if self.cache_path is not None:
+            self._load_cache()
+
+        self.hits = 0
+        self.misses = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    # ========================================================================
+    # CACHÉ
+    # ========================================================================
+
+    def job_key(self, digest: str, index: int) -> str:
+        """Clave de memoización de (algoritmo, instancia, semilla)"""
+        return f"{digest}|{self._instance_ids[index]}|{self.instance_seeds[index]}"
+
+    def _load_cache(self) -> None:
+        """Carga la caché persistente (ignora líneas corruptas)"""
+        if not self.cache_path.exists():
+            return
+        with open(self.cache_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self.cache[entry['key']] = entry['value']
+                except (ValueError, KeyError, TypeError):
+                    continue
+        logger.info(f"Caché de fitness: {len(self.cache)} entradas cargadas")
+
+    def _persist(self, entries: Dict[str, Optional[int]]) -> None:
+        """Añade entradas nuevas al archivo de caché"""
+        if self.cache_path is None or not entries:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, 'a', encoding='utf-8') as f:
+            for key, value in entries.items():
+                f.write(json.dumps({'key': key, 'value': value}) + '\n')
+
+    # ========================================================================
+    # EVALUACIÓN
+    # ========================================================================
+
+    def evaluate(self, algorithm: ASTNode) -> float:
+        """Fitness de un algoritmo"""
+        return self.evaluate_many([algorithm])[0]
+
+    def evaluate_many(self, algorithms: Sequence[ASTNode]) -> List[float]:
+        """
+        Fitness de varios algoritmos.
+
+        Solo se ejecutan los trabajos (árbol único, instancia) ausentes de la
+        caché; los duplicados dentro del lote se ejecutan una vez.
+
+        Returns:
+            Lista de fitness, uno por algoritmo
+        """
+        if not self.instances:
+            return [float('inf')] * len(algorithms)
+
+        table = self.instance_values(algorithms, range(len(self.instances)))
+        return [self.mean_colors(values) for values in table]
+
+    def instance_values(self, algorithms: Sequence[ASTNode],
+                        indices: Sequence[int]) -> List[List[Optional[int]]]:
+        """
+        Colores obtenidos por cada algoritmo en un subconjunto de instancias.
+
+        Es la primitiva que usa el evaluador por carreras (gaa/racing.py)
+        para avanzar instancia a instancia sin perder la memoización.
+
+        Args:
+            algorithms: ASTs a evaluar
+            indices: Índices de instancias de entrenamiento
+
+        Returns:
+            Matriz [algoritmo][instancia] de colores (None = ejecución fallida
+            o coloración no factible)
+        """
+        indices = list(indices)
+        digests = [algorithm_key(algorithm) for algorithm in algorithms]
+
+        pending: Dict[str, Tuple[ASTNode, int]] = {}
+        for algorithm, digest in zip(algorithms, digests):
+            for j in indices:
+                key = self.job_key(digest, j)
+                if key in self.cache or key in pending:
+                    self.hits += 1
+                else:
+                    pending[key] = (algorithm, j)
+        self.misses += len(pending)
+
+        new_entries: Dict[str, Optional[int]] = {}
+        if pending:
+            new_entries, transient = self._execute(pending)
+            memoised = {key: value for key, value in new_entries.items()
+                        if key not in transient}
+            self.cache.update(memoised)
+            self._persist(memoised)
+
+        def value(key: str) -> Optional[int]:
+            return self.cache[key] if key in self.cache else new_entries[key]
+
+        return [[value(self.job_key(digest, j)) for j in indices] for digest in digests]
+
+    @staticmethod
+    def mean_colors(values: Sequence[Optional[int]]) -> float:
+        """Promedio de colores omitiendo ejecuciones fallidas (inf si no hay)"""
+        valid = [v for v in values if v is not None]
+        return float(np.mean(valid)) if valid else float('inf')
+
+    def _execute(self, pending: Dict[str, Tuple[ASTNode, int]]
+                 ) -> Tuple[Dict[str, Optional[int]], Set[str]]:
+        """
+        Ejecuta trabajos y puntúa en lote las coloraciones de cada instancia.
+
+        Returns:
+            (resultados por clave, claves cuyo fallo fue un error del pool y
+            no deben memoizarse)
+        """
+        keys = list(pending)
+        transient: Set[str] = set()
+        jobs = [(algorithm, j, self.instance_seeds[j]) for algorithm, j in pending.values()]
+
+        if self.workers <= 1:
+            _init_worker(self.instances)
+            colorings = [_run_job(*job) for job in jobs]
+        else:
+            executor = self._get_executor()
+            futures = [executor.submit(_run_job, *job) for job in jobs]
+            colorings = []
+            for key, future in zip(keys, futures):
+                try:
+                    colorings.append(future.result())
+                except Exception as e:
+                    logger.error(f"Error en worker de fitness: {e}")
+                    colorings.append(None)
+                    transient.add(key)
+            if transient:
+                # Un pool roto (BrokenProcessPool) no acepta más trabajos
+                executor.shutdown(wait=False)
+                self._executor = None
+
+        results: Dict[str, Optional[int]] = {key: None for key in keys}
+        by_instance: Dict[int, List[int]] = {}
+        for pos, ((_, j, _), coloring) in enumerate(zip(jobs, colorings)):
+            if coloring is not None:
+                by_instance.setdefault(j, []).append(pos)
+
+        for j, positions in by_instance.items():
+            metrics = ColoringEvaluator.batch_metrics(
+                np.stack([colorings[pos] for pos in positions]), self.instances[j]
+            )
+            for pos, num_colors, conflicts in zip(positions, metrics['num_colors'].tolist(),
+                                                  metrics['conflicts'].tolist()):
+                if conflicts == 0:
+                    results[keys[pos]] = int(num_colors)
+        return results, transient
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Pool perezoso; los workers reciben los grafos una sola vez al iniciar"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.instances,)
+            )
+        return self._executor
+
+    def close(self) -> None:
+        """Cierra el pool de procesos"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self) -> "FitnessService":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Estadísticas de uso de la caché"""
+        total = self.hits + self.misses
+        return {
+            'cache_entries': len(self.cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
@@ -30,8 +30,12 @@ class ExecutionContext:
     Contexto de ejecución para intérprete de AST
     
     Mantiene:
-    - Solución actual
-    - Mejor solución encontrada
+    - Estado de coloración único y mutable (los operadores lo modifican
+      in-place; conflictos, clases de color y número de colores se
+      actualizan incrementalmente en ColoringSolution.set_color)
+    - Mejor solución encontrada (copia solo al mejorar estrictamente)
+    - Óptimo probado: mejor solución factible con tantos colores como la
+      cota inferior del clique; a partir de ahí no se ejecutan más nodos
     - Estadísticas de ejecución
     - Presupuesto de iteraciones
     """
@@ -51,9 +55,11 @@ class ExecutionContext:
         self.rng = rng if rng else np.random.default_rng()
         
         # Estado de solución
-        self.current_solution = None
+        self.state: Optional[ColoringSolution] = None
         self.best_solution = None
         self.best_value = float('inf')  # Minimizar número de colores
+        self.lower_bound = problem.lower_bound
+        self.optimal = False
         
         # Estadísticas
         self.iterations = 0
@@ -62,17 +68,32 @@ class ExecutionContext:
         self.improvement_iterations = []
         self.iterations_without_improvement = 0
     
+    @property
+    def current_solution(self) -> Optional[ColoringSolution]:
+        """Solución actual (el estado mutable compartido por los nodos)"""
+        return self.state
+    
     def update_solution(self, new_solution: ColoringSolution):
-        """Actualiza solución actual y mejor si aplica"""
-        self.current_solution = new_solution
+        """Reemplaza el estado (p.ej. tras construir) y lo registra"""
+        # Preparar la contabilidad incremental una sola vez por estado
+        new_solution.num_conflicts(self.problem)
+        new_solution.color_sets
+        self.state = new_solution
+        self.record_state()
+    
+    def record_state(self):
+        """Registra el estado tras modificarlo in-place; copia solo si mejora"""
         self.evaluations += 1
+        value = self.state.num_colors
         
         # Actualizar mejor solución
-        if new_solution.num_colors < self.best_value:
-            self.best_value = new_solution.num_colors
-            self.best_solution = new_solution.copy()
+        if value < self.best_value:
+            self.best_value = value
+            self.best_solution = self.state.copy()
             self.improvement_iterations.append(self.iterations)
             self.iterations_without_improvement = 0
+            self.optimal = (value <= self.lower_bound
+                            and self.state.num_conflicts(self.problem) == 0)
         else:
             self.iterations_without_improvement += 1
     
@@ -99,6 +120,7 @@ class ExecutionContext:
             'best_colors': self.best_value if self.best_solution else None,
             'best_conflicts': self.best_solution.num_conflicts if self.best_solution else None,
             'improvements': len(self.improvement_iterations),
+            'proven_optimal': self.optimal,
             'final_feasible': self.best_solution.is_feasible(self.problem) if self.best_solution else False
         }
 
@@ -157,7 +179,10 @@ class ASTInterpreter:
         return self.context.best_solution
     
     def _execute_node(self, node: ASTNode):
-        """Ejecuta un nodo del AST"""
+        """Ejecuta un nodo del AST (ninguno tras probar el óptimo)"""
+        if self.context.optimal:
+            return
+        
         if isinstance(node, GreedyConstruct):
             self._execute_construct(node)
         
@@ -193,53 +218,41 @@ class ASTInterpreter:
         self.context.update_solution(solution)
     
     def _execute_improvement(self, node: LocalSearch):
-        """Ejecuta búsqueda local"""
+        """Ejecuta búsqueda local in-place sobre el estado"""
         op_class = self.IMPROVEMENT_OPS.get(node.method)
-        if not op_class or not self.context.current_solution:
+        state = self.context.state
+        if not op_class or not state:
             return
         
-        op = op_class()
-        
-        # Aplicar mejora iterativa
-        best_sol = self.context.current_solution
+        # Aplicar mejora iterativa: cada pasada se conserva solo si reduce
+        # los colores; si no, se deshace con el diario de cambios
         for _ in range(node.max_iterations):
-            improved_sol = op.improve(best_sol, self.problem)
-            if improved_sol.num_colors < best_sol.num_colors:
-                best_sol = improved_sol
+            before = state.num_colors
+            state.start_journal()
+            op_class.improve(state, self.problem, inplace=True)
+            if state.num_colors < before:
+                state.end_journal()
             else:
+                state.rollback(self.problem)
                 break
         
-        self.context.update_solution(best_sol)
+        self.context.record_state()
     
     def _execute_perturbation(self, node: Perturbation):
-        """Ejecuta perturbación"""
+        """Ejecuta perturbación in-place sobre el estado"""
         op_class = self.PERTURBATION_OPS.get(node.method)
-        if not op_class or not self.context.current_solution:
+        if not op_class or not self.context.state:
             return
         
-        op = op_class()
-        
         # Usar parámetro correcto según el operador
-        if node.method == "RandomRecolor":
-            perturbed = op.perturb(
-                self.context.current_solution,
-                self.problem,
-                ratio=node.intensity
-            )
-        elif node.method == "PartialDestroy":
-            perturbed = op.perturb(
-                self.context.current_solution,
-                self.problem,
-                region_size=node.intensity
-            )
+        if node.method == "PartialDestroy":
+            op_class.perturb(self.context.state, self.problem,
+                             region_size=node.intensity, inplace=True)
         else:
-            perturbed = op.perturb(
-                self.context.current_solution,
-                self.problem,
-                ratio=node.intensity
-            )
+            op_class.perturb(self.context.state, self.problem,
+                             ratio=node.intensity, inplace=True)
         
-        self.context.update_solution(perturbed)
+        self.context.record_state()
     
     def _execute_seq(self, node: Seq):
         """Ejecuta secuencia"""
@@ -254,13 +267,15 @@ class ASTInterpreter:
             self.context.iterations += 1
             self._execute_node(node.body)
             
-            # Salir si hay estancamiento
-            if self.context.check_stagnation():
+            # Salir si hay estancamiento u óptimo probado
+            if self.context.check_stagnation() or self.context.optimal:
                 break
     
     def _execute_for(self, node: For):
         """Ejecuta bucle for"""
         for i in range(node.iterations):
+            if self.context.optimal:
+                break
             self._execute_node(node.body)
     
     def _execute_if(self, node: If):
@@ -298,10 +313,9 @@ class ASTInterpreter:
         # Mapear nombre a operador y ejecutar
         if node.operator in self.IMPROVEMENT_OPS:
             op_class = self.IMPROVEMENT_OPS[node.operator]
-            op = op_class()
-            if self.context.current_solution:
-                improved = op.improve(self.context.current_solution, self.problem)
-                self.context.update_solution(improved)
+            if self.context.state:
+                op_class.improve(self.context.state, self.problem, inplace=True)
+                self.context.record_state()
 
 
 def execute_algorithm(algorithm: ASTNode,
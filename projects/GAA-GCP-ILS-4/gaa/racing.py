@@ -0,0 +1,224 @@
+"""
+Racing - GAA-GCP-ILS-4
+Evaluación por carreras (racing) de algoritmos sobre instancias de entrenamiento
+
+Las instancias se recorren de la más barata a la más cara (|V| + |E|) y la
+evaluación de un candidato se corta en cuanto:
+- Cota: ni en el mejor caso (cota inferior de colores en las instancias que
+  faltan) su promedio final podría quedar por debajo del umbral, o
+- Test: un Wilcoxon pareado unilateral frente a una referencia lo declara
+  peor con significancia alpha (opcional)
+
+El corte por cota es exacto: un candidato rechazado nunca habría superado el
+umbral. La cota χ ≥ |clique| solo vale para coloraciones factibles; el
+servicio devuelve None para las no factibles, que cuentan como fallos. El
+corte por test es heurístico y solo se aplica si se fija alpha.
+
+Para poblaciones (race) todos los supervivientes avanzan juntos instancia a
+instancia y se eliminan los que el test declara peores que el líder, al
+estilo F-Race. El coste por generación sigue así al número de candidatos
+prometedores y no al tamaño de la población.
+
+Referencias:
+- Birattari, M. et al. (2002). A racing algorithm for configuring
+  metaheuristics.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy import stats
+
+from .ast_nodes import ASTNode
+from .fitness import FitnessService
+from core.problem import GraphColoringProblem
+
+
+def instance_cost(problem: GraphColoringProblem) -> int:
+    """Coste estimado de ejecutar un algoritmo sobre la instancia"""
+    return problem.n_vertices + problem.n_edges
+
+
+def instance_lower_bound(problem: GraphColoringProblem) -> int:
+    """
+    Cota inferior válida de colores de cualquier coloración factible de la
+    instancia: el tamaño del clique de problem.lower_bound (χ ≥ ω ≥ |clique|).
+    Una coloración con conflictos puede usar menos colores; por eso solo se
+    compara con valores factibles (FitnessService las marca como fallos).
+    """
+    return problem.lower_bound
+
+
+def optimistic_mean(seen: Sequence[Optional[int]], remaining_bounds: Sequence[int]) -> float:
+    """
+    Menor promedio final alcanzable dadas las instancias ya evaluadas.
+
+    Las ejecuciones fallidas (None) no cuentan en el promedio, así que cada
+    instancia pendiente puede aportar su cota inferior o nada: se añaden las
+    cotas, de menor a mayor, mientras bajen el promedio.
+    """
+    valid = [v for v in seen if v is not None]
+    total, count = float(sum(valid)), len(valid)
+    for bound in sorted(remaining_bounds):
+        if count and bound >= total / count:
+            break
+        total += bound
+        count += 1
+    return total / count if count else float('inf')
+
+
+@dataclass
+class RaceResult:
+    """Resultado de la evaluación por carreras de un algoritmo"""
+    values: Dict[int, Optional[int]] = field(default_factory=dict)  # índice instancia -> colores
+    completed: bool = False                  # Evaluado en todas las instancias
+    rejected_by: Optional[str] = None        # 'bound', 'test' o None
+
+    @property
+    def instances_evaluated(self) -> int:
+        return len(self.values)
+
+    @property
+    def fitness(self) -> float:
+        """Promedio de colores (parcial si la carrera se cortó)"""
+        return FitnessService.mean_colors(list(self.values.values()))
+
+
+class RacingEvaluator:
+    """
+    Evaluador por carreras sobre un FitnessService.
+
+    Comparte la memoización del servicio: las instancias ya evaluadas de un
+    árbol no se vuelven a ejecutar, y un candidato cortado pronto que
+    reaparezca solo paga las instancias que le faltan.
+
+    Uso:
+        >>> racer = RacingEvaluator(service, alpha=None)
+        >>> threshold = current_fitness - T * np.log(u)   # umbral de aceptación SA
+        >>> result = racer.evaluate(mutant, threshold, reference=current)
+        >>> accept = result.completed and result.fitness < threshold
+    """
+
+    def __init__(self,
+                 service: FitnessService,
+                 alpha: Optional[float] = 0.05,
+                 min_instances: int = 5,
+                 step: int = 1):
+        """
+        Inicializa evaluador
+
+        Args:
+            service: Servicio de fitness (instancias, semillas, pool y caché)
+            alpha: Significancia del test de Wilcoxon (None = solo corte por cota)
+            min_instances: Instancias pareadas mínimas antes de aplicar el test
+            step: Instancias evaluadas por ronda (en paralelo en el pool)
+        """
+        self.service = service
+        self.alpha = alpha
+        self.min_instances = max(1, min_instances)
+        self.step = max(1, step)
+
+        instances = service.instances
+        self.order = sorted(range(len(instances)), key=lambda j: instance_cost(instances[j]))
+        self.bounds = [instance_lower_bound(problem) for problem in instances]
+
+    def _rounds(self):
+        """Bloques de índices de instancia, de la más barata a la más cara"""
+        for start in range(0, len(self.order), self.step):
+            yield self.order[start:start + self.step]
+
+    def _is_worse(self, values: Dict[int, Optional[int]],
+                  reference: Dict[int, Optional[int]]) -> bool:
+        """Wilcoxon pareado unilateral: ¿`values` usa más colores que `reference`?"""
+        if self.alpha is None:
+            return False
+        diffs = [values[j] - reference[j] for j in values
+                 if values[j] is not None and reference.get(j) is not None]
+        if len(diffs) < self.min_instances or not any(diffs):
+            return False
+        try:
+            p_value = stats.wilcoxon(diffs, alternative='greater').pvalue
+        except ValueError:
+            return False
+        return bool(p_value < self.alpha)
+
+    # ========================================================================
+    # CANDIDATO INDIVIDUAL
+    # ========================================================================
+
+    def evaluate(self, algorithm: ASTNode,
+                 threshold: float = float('inf'),
+                 reference: Optional[ASTNode] = None) -> RaceResult:
+        """
+        Evalúa un algoritmo hasta completar o hasta poder descartarlo.
+
+        Args:
+            algorithm: AST candidato
+            threshold: El candidato solo interesa si su fitness final < threshold
+            reference: AST con el que comparar en el test (p.ej. el miembro actual)
+
+        Returns:
+            RaceResult (completed=False si se cortó la evaluación)
+        """
+        result = RaceResult()
+        reference_values: Dict[int, Optional[int]] = {}
+        pending_bounds = [self.bounds[j] for j in self.order]
+
+        for block in self._rounds():
+            row = self.service.instance_values([algorithm], block)[0]
+            result.values.update(zip(block, row))
+            del pending_bounds[:len(block)]
+
+            if len(result.values) == len(self.order):
+                break
+
+            if optimistic_mean(list(result.values.values()), pending_bounds) >= threshold:
+                result.rejected_by = 'bound'
+                return result
+
+            if reference is not None and self.alpha is not None:
+                # El miembro de referencia ya fue evaluado: sale de la caché
+                reference_row = self.service.instance_values([reference], block)[0]
+                reference_values.update(zip(block, reference_row))
+                if self._is_worse(result.values, reference_values):
+                    result.rejected_by = 'test'
+                    return result
+
+        result.completed = True
+        return result
+
+    # ========================================================================
+    # POBLACIÓN (F-RACE)
+    # ========================================================================
+
+    def race(self, algorithms: Sequence[ASTNode]) -> List[RaceResult]:
+        """
+        Carrera de una población: todos los supervivientes avanzan juntos.
+
+        Tras cada ronda se eliminan los candidatos que el test declara
+        peores que el líder (menor promedio parcial). Con alpha=None no se
+        elimina a nadie y equivale a evaluar la población completa.
+
+        Returns:
+            Un RaceResult por algoritmo; completed=True para los supervivientes
+        """
+        results = [RaceResult() for _ in algorithms]
+        alive = list(range(len(algorithms)))
+
+        for block in self._rounds():
+            table = self.service.instance_values([algorithms[i] for i in alive], block)
+            for i, row in zip(alive, table):
+                results[i].values.update(zip(block, row))
+
+            if len(alive) < 2:
+                continue
+            leader = min(alive, key=lambda i: results[i].fitness)
+            for i in list(alive):
+                if i != leader and self._is_worse(results[i].values, results[leader].values):
+                    results[i].rejected_by = 'test'
+                    alive.remove(i)
+
+        for i in alive:
+            results[i].completed = True
+        return results
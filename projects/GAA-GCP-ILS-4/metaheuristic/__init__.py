@@ -1,7 +1,8 @@
 """
 Metaheurística: Iterated Local Search para Graph Coloring Problem
 
-Módulo que implementa el algoritmo ILS y estrategias de perturbación.
+Módulo que implementa el algoritmo ILS, estrategias de perturbación y el
+driver de k decreciente (búsqueda con k fijo).
 """
 
 from .ils_core import (
@@ -10,6 +11,13 @@ from .ils_core import (
     ILSHistory
 )
 
+from .k_fixed import (
+    KFixedSearch,
+    KFixedHistory,
+    KAttempt,
+    tabucol_search
+)
+
 from .perturbation_schedules import (
     PerturbationSchedule,
     ConstantPerturbation,
@@ -28,6 +36,12 @@ __all__ = [
     'AdaptiveILS',
     'ILSHistory',
     
+    # k fijo
+    'KFixedSearch',
+    'KFixedHistory',
+    'KAttempt',
+    'tabucol_search',
+    
     # Perturbation Schedules
     'PerturbationSchedule',
     'ConstantPerturbation',
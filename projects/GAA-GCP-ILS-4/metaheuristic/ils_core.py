@@ -30,31 +30,161 @@ from operators import (
 )
 
 
-@dataclass
+def _history_series(name: str) -> property:
+    """
+    Propiedad que expone una serie de ILSHistory como vista NumPy recortada;
+    asignarla equivale a ILSHistory.set_series(name, values).
+    """
+    def getter(self) -> np.ndarray:
+        return self._buffers[name][:self._size]
+    
+    def setter(self, values) -> None:
+        self.set_series(name, values)
+    
+    return property(getter, setter, doc=f"Serie '{name}' registrada (vista NumPy)")
+
+
 class ILSHistory:
-    """Registro histórico de la ejecución de ILS"""
-    iterations: List[int] = field(default_factory=list)
-    best_fitness: List[float] = field(default_factory=list)
-    current_fitness: List[float] = field(default_factory=list)
-    num_colors: List[int] = field(default_factory=list)
-    num_conflicts: List[int] = field(default_factory=list)
-    times: List[float] = field(default_factory=list)
-    acceptance_decisions: List[bool] = field(default_factory=list)
-    improvement_steps: List[bool] = field(default_factory=list)
+    """
+    Registro histórico de la ejecución de ILS.
+    
+    Las series se guardan en arrays NumPy preasignados (crecen por duplicación
+    si se supera la capacidad), de modo que registrar una iteración son unas
+    pocas escrituras escalares en lugar de ocho `list.append`. Con
+    `sampling > 1` solo se guarda una de cada `sampling` llamadas a
+    `add_iteration` (la primera siempre se registra).
+    
+    Cada serie (`iterations`, `best_fitness`, `current_fitness`, `num_colors`,
+    `num_conflicts`, `times`, `acceptance_decisions`, `improvement_steps`) se
+    lee como vista de longitud `len(history)`. Para construir o modificar un
+    historial desde listas: `from_lists` y `set_series`.
+    """
+    
+    FIELDS: Dict[str, Any] = {
+        'iterations': np.int64,
+        'best_fitness': np.float64,
+        'current_fitness': np.float64,
+        'num_colors': np.int64,
+        'num_conflicts': np.int64,
+        'times': np.float64,
+        'acceptance_decisions': np.bool_,
+        'improvement_steps': np.bool_,
+    }
+    
+    iterations = _history_series('iterations')
+    best_fitness = _history_series('best_fitness')
+    current_fitness = _history_series('current_fitness')
+    num_colors = _history_series('num_colors')
+    num_conflicts = _history_series('num_conflicts')
+    times = _history_series('times')
+    acceptance_decisions = _history_series('acceptance_decisions')
+    improvement_steps = _history_series('improvement_steps')
+    
+    def __init__(self, capacity: int = 256, sampling: int = 1):
+        """
+        Parámetros:
+            capacity: Número de registros preasignados (p.ej. max_iterations)
+            sampling: Registrar una de cada `sampling` iteraciones
+        """
+        self.sampling = max(1, int(sampling))
+        self._capacity = max(1, int(capacity))
+        self._size = 0
+        self._calls = 0
+        self._buffers: Dict[str, np.ndarray] = {
+            name: np.zeros(self._capacity, dtype=dtype)
+            for name, dtype in self.FIELDS.items()
+        }
+    
+    def __len__(self) -> int:
+        return self._size
     
     def add_iteration(self, iteration: int, best_fitness: float,
                      current_fitness: float, num_colors: int,
                      num_conflicts: int, elapsed_time: float,
                      accepted: bool, improved: bool) -> None:
-        """Registrar información de una iteración"""
-        self.iterations.append(iteration)
-        self.best_fitness.append(best_fitness)
-        self.current_fitness.append(current_fitness)
-        self.num_colors.append(num_colors)
-        self.num_conflicts.append(num_conflicts)
-        self.times.append(elapsed_time)
-        self.acceptance_decisions.append(accepted)
-        self.improvement_steps.append(improved)
+        """Registrar información de una iteración (según muestreo)"""
+        calls = self._calls
+        self._calls = calls + 1
+        if calls % self.sampling:
+            return
+        
+        i = self._size
+        if i == self._capacity:
+            self._grow(2 * self._capacity)
+        buffers = self._buffers
+        buffers['iterations'][i] = iteration
+        buffers['best_fitness'][i] = best_fitness
+        buffers['current_fitness'][i] = current_fitness
+        buffers['num_colors'][i] = num_colors
+        buffers['num_conflicts'][i] = num_conflicts
+        buffers['times'][i] = elapsed_time
+        buffers['acceptance_decisions'][i] = accepted
+        buffers['improvement_steps'][i] = improved
+        self._size = i + 1
+    
+    def to_dict(self) -> Dict[str, List]:
+        """Series como listas Python (serializables a JSON)"""
+        return {name: self._buffers[name][:self._size].tolist()
+                for name in self.FIELDS}
+    
+    def _grow(self, capacity: int) -> None:
+        """Ampliar la capacidad de todos los buffers conservando los datos"""
+        for name, buffer in self._buffers.items():
+            grown = np.zeros(capacity, dtype=buffer.dtype)
+            grown[:self._size] = buffer[:self._size]
+            self._buffers[name] = grown
+        self._capacity = capacity
+    
+    @classmethod
+    def from_lists(cls, sampling: int = 1, **series) -> 'ILSHistory':
+        """
+        Construir un historial a partir de series completas (p.ej. to_dict()).
+        
+        Parámetros:
+            sampling: Muestreo de los registros posteriores
+            **series: Series por nombre de FIELDS, todas de la misma longitud;
+                las no indicadas se rellenan con ceros
+        
+        Returns:
+            ILSHistory con len(history) igual a la longitud de las series
+        """
+        unknown = set(series) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"Series desconocidas: {sorted(unknown)}")
+        lengths = {len(np.atleast_1d(values)) for values in series.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Las series deben tener la misma longitud: {sorted(lengths)}")
+        size = lengths.pop() if lengths else 0
+        
+        history = cls(capacity=max(1, size), sampling=sampling)
+        history._size = size
+        history._calls = size * history.sampling
+        for name, values in series.items():
+            history._buffers[name][:size] = np.atleast_1d(np.asarray(values, dtype=cls.FIELDS[name]))
+        return history
+    
+    def set_series(self, name: str, values) -> None:
+        """
+        Reemplazar una serie completa.
+        
+        La longitud del historial pasa a ser la de la nueva serie; las demás
+        series se recortan o se rellenan con ceros.
+        
+        Parámetros:
+            name: Nombre de la serie (clave de FIELDS)
+            values: Escalar o secuencia de valores
+        """
+        if name not in self.FIELDS:
+            raise ValueError(f"Serie desconocida: {name}")
+        values = np.atleast_1d(np.asarray(values, dtype=self.FIELDS[name]))
+        size = len(values)
+        if size > self._capacity:
+            self._grow(size)
+        if size > self._size:
+            for buffer in self._buffers.values():
+                buffer[self._size:size] = 0
+        self._buffers[name][:size] = values
+        self._size = size
 
 
 class IteratedLocalSearch:
@@ -89,7 +219,9 @@ class IteratedLocalSearch:
                  time_budget: float = 300.0,
                  no_improvement_limit: int = 50,
                  seed: int = None,
-                 verbose: bool = False):
+                 verbose: bool = False,
+                 history_sampling: int = 1,
+                 stop_at_lower_bound: bool = True):
         """
         Inicializar algoritmo ILS.
         
@@ -104,6 +236,9 @@ class IteratedLocalSearch:
             no_improvement_limit: Parar después de N iteraciones sin mejora
             seed: Seed para reproducibilidad
             verbose: Mostrar progreso
+            history_sampling: Registrar en el historial una de cada N iteraciones
+            stop_at_lower_bound: Parar en cuanto la mejor solución factible
+                alcance la cota inferior del clique (óptimo probado)
         """
         self.problem = problem
         self.constructive = constructive or GreedyDSATUR.construct
@@ -115,6 +250,7 @@ class IteratedLocalSearch:
         self.no_improvement_limit = no_improvement_limit
         self.seed = seed
         self.verbose = verbose
+        self.stop_at_lower_bound = stop_at_lower_bound
         
         if seed is not None:
             np.random.seed(seed)
@@ -122,7 +258,12 @@ class IteratedLocalSearch:
         self.best_solution: Optional[ColoringSolution] = None
         self.best_fitness: float = float('inf')
         self.iteration_count: int = 0
-        self.history = ILSHistory()
+        self.proven_optimal: bool = False
+        self.history_sampling = max(1, int(history_sampling))
+        self.history = ILSHistory(
+            capacity=min(max_iterations // self.history_sampling + 1, 65536),
+            sampling=self.history_sampling
+        )
     
     def solve(self) -> Tuple[ColoringSolution, ILSHistory]:
         """
@@ -140,11 +281,14 @@ class IteratedLocalSearch:
         # Paso 2: Mejora inicial
         current_solution = self.improvement(current_solution, self.problem)
         
-        # Paso 3: Mejor global
+        # Paso 3: Mejor global. Los conflictos se calculan una sola vez; a
+        # partir de aquí los operadores mantienen el fitness en caché
+        # (set_color) y la copia lo hereda.
+        current_solution.num_conflicts(self.problem)
+        current_fitness = current_solution.num_colors
         self.best_solution = current_solution.copy()
-        self.best_fitness = ColoringEvaluator.evaluate(
-            current_solution, self.problem
-        )['num_colors']
+        self.best_fitness = current_fitness
+        self.proven_optimal = self._reached_lower_bound()
         
         if self.verbose:
             print(f"Solución inicial: {self.best_fitness} colores")
@@ -154,7 +298,7 @@ class IteratedLocalSearch:
         iteration = 0
         
         # Bucle principal
-        while iteration < self.max_iterations:
+        while iteration < self.max_iterations and not self._should_stop():
             iteration += 1
             self.iteration_count = iteration
             
@@ -172,27 +316,22 @@ class IteratedLocalSearch:
             improved_solution = self.improvement(perturbed, self.problem)
             
             # Paso 6: Aceptación
-            improved_solution = RepairConflicts.repair(
-                improved_solution, self.problem
-            )
-            
-            new_fitness = ColoringEvaluator.evaluate(
-                improved_solution, self.problem
-            )['num_colors']
+            improved_solution = self._repair_if_needed(improved_solution)
             
-            current_fitness = ColoringEvaluator.evaluate(
-                current_solution, self.problem
-            )['num_colors']
+            new_fitness = improved_solution.num_colors
             
             accepted = self._accept(current_fitness, new_fitness)
+            improved = new_fitness < current_fitness
             
             if accepted:
                 current_solution = improved_solution
+                current_fitness = new_fitness
                 
                 # Actualizar mejor global
                 if new_fitness < self.best_fitness:
                     self.best_solution = improved_solution.copy()
                     self.best_fitness = new_fitness
+                    self.proven_optimal = self._reached_lower_bound()
                     no_improvement_count = 0
                     
                     if self.verbose:
@@ -208,11 +347,11 @@ class IteratedLocalSearch:
                 iteration,
                 self.best_fitness,
                 new_fitness,
-                self.best_solution.num_colors if self.best_solution else new_fitness,
-                self.best_solution.num_conflicts(self.problem) if self.best_solution else 0,
+                self.best_solution.num_colors,
+                self.best_solution.num_conflicts(self.problem),
                 elapsed,
                 accepted,
-                new_fitness < current_fitness
+                improved
             )
             
             # Verificar criterio de parada (sin mejora)
@@ -223,11 +362,34 @@ class IteratedLocalSearch:
         
         if self.verbose:
             total_time = time.time() - start_time
+            if self.proven_optimal:
+                print(f"[Parada] Cota inferior alcanzada: óptimo probado")
             print(f"\nResultado final: {self.best_fitness} colores "
                   f"({total_time:.1f}s, {iteration} iteraciones)")
         
         return self.best_solution, self.history
     
+    def _reached_lower_bound(self) -> bool:
+        """
+        ¿La mejor solución es factible y usa tantos colores como la cota
+        inferior del clique? Si es así, es óptima (χ ≥ |clique|).
+        """
+        return (self.best_solution.num_conflicts(self.problem) == 0
+                and self.best_fitness <= self.problem.lower_bound)
+    
+    def _should_stop(self) -> bool:
+        """Parada por óptimo probado (si está habilitada)"""
+        return self.stop_at_lower_bound and self.proven_optimal
+    
+    def _repair_if_needed(self, solution: ColoringSolution) -> ColoringSolution:
+        """
+        Reparar solo si quedan conflictos. Con el contador en caché la
+        comprobación es O(1) y se evita el escaneo de aristas de la reparación.
+        """
+        if solution.num_conflicts(self.problem) == 0:
+            return solution
+        return RepairConflicts.repair(solution, self.problem)
+    
     def _accept(self, current_fitness: float, new_fitness: float) -> bool:
         """
         Criterio de aceptación de nueva solución.
@@ -279,11 +441,12 @@ class AdaptiveILS(IteratedLocalSearch):
         # Mejora inicial
         current_solution = self.improvement(current_solution, self.problem)
         
-        # Mejor global
+        # Mejor global (fitness en caché desde aquí)
+        current_solution.num_conflicts(self.problem)
+        current_fitness = current_solution.num_colors
         self.best_solution = current_solution.copy()
-        self.best_fitness = ColoringEvaluator.evaluate(
-            current_solution, self.problem
-        )['num_colors']
+        self.best_fitness = current_fitness
+        self.proven_optimal = self._reached_lower_bound()
         
         # Variables adaptativas
         perturbation_strength = 0.2
@@ -292,7 +455,7 @@ class AdaptiveILS(IteratedLocalSearch):
         no_improvement_count = 0
         iteration = 0
         
-        while iteration < self.max_iterations:
+        while iteration < self.max_iterations and not self._should_stop():
             iteration += 1
             
             # Verificar tiempo
@@ -319,17 +482,9 @@ class AdaptiveILS(IteratedLocalSearch):
             
             # Mejora
             improved_solution = self.improvement(perturbed, self.problem)
-            improved_solution = RepairConflicts.repair(
-                improved_solution, self.problem
-            )
-            
-            new_fitness = ColoringEvaluator.evaluate(
-                improved_solution, self.problem
-            )['num_colors']
+            improved_solution = self._repair_if_needed(improved_solution)
             
-            current_fitness = ColoringEvaluator.evaluate(
-                current_solution, self.problem
-            )['num_colors']
+            new_fitness = improved_solution.num_colors
             
             # Aceptación
             accepted = self._accept(current_fitness, new_fitness)
@@ -339,10 +494,12 @@ class AdaptiveILS(IteratedLocalSearch):
             
             if accepted:
                 current_solution = improved_solution
+                current_fitness = new_fitness
                 
                 if new_fitness < self.best_fitness:
                     self.best_solution = improved_solution.copy()
                     self.best_fitness = new_fitness
+                    self.proven_optimal = self._reached_lower_bound()
                     no_improvement_count = 0
                 else:
                     no_improvement_count += 1
@@ -0,0 +1,287 @@
+"""
+Búsqueda con k fijo (coloraciones parciales-legales) para Graph Coloring Problem
+
+En lugar de optimizar el objetivo mixto (conflictos, luego colores), se
+fija k y se busca una k-coloración sin conflictos. Al encontrarla se elimina
+una clase de color y se reintenta con k-1, arrancando en caliente desde la
+coloración anterior. Cada k tiene su propio presupuesto de tiempo.
+
+La búsqueda interna es TabuCol sobre la matriz gamma de ColoringState:
+cada iteración evalúa todos los movimientos (v, c) de vértices en conflicto
+en O(|C|·k) y aplica el mejor en O(grado).
+
+Referencias:
+- Hertz, A., & de Werra, D. (1987). Using tabu search techniques for
+  graph coloring.
+- Galinier, P., & Hao, J. K. (1999). Hybrid evolutionary algorithms for
+  graph coloring.
+"""
+
+import time
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+from core import GraphColoringProblem, ColoringSolution
+from core.coloring_state import ColoringState
+from operators import GreedyDSATUR, RepairConflicts
+
+
+@dataclass
+class KAttempt:
+    """Resultado de la búsqueda para un valor de k"""
+    k: int
+    success: bool
+    iterations: int
+    time: float                      # Tiempo dedicado a este k
+    time_to_target: Optional[float]  # Tiempo desde el inicio hasta lograr k
+    best_conflicts: int
+
+
+@dataclass
+class KFixedHistory:
+    """Registro de intentos del driver de k decreciente"""
+    initial_k: Optional[int] = None
+    attempts: List[KAttempt] = field(default_factory=list)
+
+    @property
+    def time_to_target(self) -> Dict[int, float]:
+        """{k: segundos desde el inicio hasta la primera k-coloración legal}"""
+        return {a.k: a.time_to_target for a in self.attempts if a.success}
+
+    @property
+    def best_fitness(self) -> List[int]:
+        """Mejor k legal tras cada intento (compatible con ILSHistory)"""
+        best = self.initial_k
+        series = []
+        for attempt in self.attempts:
+            if attempt.success:
+                best = attempt.k
+            series.append(best)
+        return series
+
+    @property
+    def current_fitness(self) -> List[int]:
+        """k intentado en cada paso"""
+        return [a.k for a in self.attempts]
+
+
+def tabucol_search(state: ColoringState, max_iterations: Optional[int] = None,
+                   time_limit: Optional[float] = None,
+                   rng: Optional[np.random.Generator] = None,
+                   tenure_base: int = 10, tenure_factor: float = 0.6
+                   ) -> Tuple[bool, int, int]:
+    """
+    TabuCol sobre un ColoringState con k fijo (modifica el estado in-place).
+
+    Movimiento: cambiar el color de un vértice en conflicto. Se elige el
+    movimiento no-tabú de menor delta (o tabú si mejora el mejor valor,
+    criterio de aspiración). El par (v, color_anterior) queda tabú durante
+    U(0, tenure_base) + tenure_factor·|C| iteraciones.
+
+    Si no se alcanza 0 conflictos, el estado se deja en la mejor
+    configuración encontrada.
+
+    Parámetros:
+        state: Estado inicial (k colores)
+        max_iterations: Límite de iteraciones (None = sin límite)
+        time_limit: Límite de tiempo en segundos (None = sin límite)
+        rng: Generador aleatorio
+        tenure_base, tenure_factor: Parámetros de la tenencia tabú
+
+    Retorna:
+        (éxito, iteraciones, mejores conflictos)
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    deadline = time.time() + time_limit if time_limit is not None else None
+    big = np.iinfo(np.int64).max // 4
+
+    tabu = np.zeros((state.n, state.k), dtype=np.int64)
+    best_conflicts = state.conflicts
+    best_colors = None
+    iteration = 0
+
+    while state.conflicts > 0:
+        if max_iterations is not None and iteration >= max_iterations:
+            break
+        # Consultar el reloj cada 64 iteraciones basta y abarata el bucle
+        if deadline is not None and iteration % 64 == 0 and time.time() > deadline:
+            break
+        iteration += 1
+
+        conflicted = state.conflicting_vertices()
+        rows = np.arange(len(conflicted))
+        current_colors = state.colors[conflicted]
+
+        deltas = state.gamma[conflicted].astype(np.int64)
+        deltas -= deltas[rows, current_colors][:, None]
+        deltas[rows, current_colors] = big
+
+        aspiration = state.conflicts + deltas < best_conflicts
+        blocked = (tabu[conflicted] > iteration) & ~aspiration
+        deltas[blocked] = big
+
+        best_delta = deltas.min()
+        if best_delta == big:
+            # Todo tabú: movimiento aleatorio para no estancarse
+            r = int(rng.integers(len(conflicted)))
+            c = int(rng.integers(state.k - 1))
+            c = c + 1 if c >= current_colors[r] else c
+        else:
+            candidates_r, candidates_c = np.nonzero(deltas == best_delta)
+            j = int(rng.integers(len(candidates_r)))
+            r, c = int(candidates_r[j]), int(candidates_c[j])
+
+        v = int(conflicted[r])
+        old = int(current_colors[r])
+        state.move(v, c)
+        tabu[v, old] = iteration + int(rng.integers(tenure_base + 1)) \
+            + int(tenure_factor * len(conflicted))
+
+        if state.conflicts < best_conflicts:
+            best_conflicts = state.conflicts
+            best_colors = None if best_conflicts == 0 else state.colors.copy()
+
+    if state.conflicts > best_conflicts and best_colors is not None:
+        # Restaurar la mejor configuración vista
+        state.colors = best_colors
+        state._rebuild()
+
+    return state.conflicts == 0, iteration, state.conflicts
+
+
+class KFixedSearch:
+    """
+    Driver de k decreciente con búsqueda de coloraciones legales para k fijo.
+
+    Pipeline:
+    1. Solución inicial legal (DSATUR por defecto) con k0 colores
+    2. k ← k - 1: eliminar la clase de color más pequeña (arranque en caliente)
+    3. TabuCol hasta 0 conflictos o agotar el presupuesto de este k
+    4. Éxito: guardar solución y volver a 2. Fallo: terminar
+
+    k nunca baja de la cota inferior del clique (problem.lower_bound): al
+    alcanzarla la coloración es óptima y se marca proven_optimal.
+
+    La mejor solución es siempre la última k-coloración legal encontrada.
+    El historial registra el tiempo hasta alcanzar cada k (time-to-target).
+    """
+
+    def __init__(self,
+                 problem: GraphColoringProblem,
+                 constructive: Callable = None,
+                 time_per_k: float = 10.0,
+                 time_budget: float = 300.0,
+                 max_iterations_per_k: Optional[int] = None,
+                 target_k: Optional[int] = None,
+                 tenure_base: int = 10,
+                 tenure_factor: float = 0.6,
+                 seed: int = None,
+                 verbose: bool = False):
+        """
+        Parámetros:
+            problem: Instancia GCP
+            constructive: Operador constructivo (default: GreedyDSATUR)
+            time_per_k: Presupuesto de tiempo para cada valor de k
+            time_budget: Presupuesto total en segundos
+            max_iterations_per_k: Límite de iteraciones TabuCol por k
+            target_k: Parar al alcanzar este k (p.ej. BKS); default: seguir
+            tenure_base, tenure_factor: Parámetros de la tenencia tabú
+            seed: Seed para reproducibilidad
+            verbose: Mostrar progreso
+        """
+        self.problem = problem
+        self.constructive = constructive or GreedyDSATUR.construct
+        self.time_per_k = time_per_k
+        self.time_budget = time_budget
+        self.max_iterations_per_k = max_iterations_per_k
+        self.target_k = target_k
+        self.tenure_base = tenure_base
+        self.tenure_factor = tenure_factor
+        self.seed = seed
+        self.verbose = verbose
+        self.rng = np.random.default_rng(seed)
+
+        self.best_solution: Optional[ColoringSolution] = None
+        self.best_k: Optional[int] = None
+        self.proven_optimal: bool = False
+        self.history = KFixedHistory()
+
+    def solve(self) -> Tuple[ColoringSolution, KFixedHistory]:
+        """
+        Ejecutar el driver de k decreciente.
+
+        Retorna:
+            (best_solution, history): Mejor k-coloración legal e historial
+        """
+        start_time = time.time()
+
+        initial = self.constructive(self.problem, seed=self.seed)
+        if not initial.is_feasible(self.problem):
+            initial = RepairConflicts.repair(initial, self.problem)
+
+        state = ColoringState.from_solution(initial, self.problem)
+
+        # Compactar colores vacíos que pudiera dejar el constructivo
+        for color in np.flatnonzero(state.class_sizes == 0)[::-1]:
+            state.remove_color(int(color), self.rng)
+
+        self.best_solution = state.to_solution()
+        self.best_k = state.k
+        self.history.initial_k = self.best_k
+
+        if self.verbose:
+            print(f"Solución inicial: {self.best_k} colores")
+
+        min_k = self.problem.lower_bound
+        if self.target_k is not None:
+            min_k = max(min_k, self.target_k)
+
+        while state.k > min_k:
+            elapsed = time.time() - start_time
+            remaining = self.time_budget - elapsed
+            if remaining <= 0:
+                if self.verbose:
+                    print("[Parada] Presupuesto de tiempo agotado")
+                break
+
+            # Arranque en caliente: quitar la clase más pequeña
+            state.remove_color(int(np.argmin(state.class_sizes)), self.rng)
+            k = state.k
+
+            attempt_start = time.time()
+            success, iterations, best_conflicts = tabucol_search(
+                state,
+                max_iterations=self.max_iterations_per_k,
+                time_limit=min(self.time_per_k, remaining),
+                rng=self.rng,
+                tenure_base=self.tenure_base,
+                tenure_factor=self.tenure_factor
+            )
+            now = time.time()
+
+            self.history.attempts.append(KAttempt(
+                k=k,
+                success=success,
+                iterations=iterations,
+                time=now - attempt_start,
+                time_to_target=(now - start_time) if success else None,
+                best_conflicts=best_conflicts
+            ))
+
+            if not success:
+                if self.verbose:
+                    print(f"[Parada] k={k} sin coloración legal "
+                          f"({best_conflicts} conflictos)")
+                break
+
+            self.best_solution = state.to_solution()
+            self.best_k = k
+            if self.verbose:
+                print(f"k={k} alcanzado en {now - start_time:.2f}s "
+                      f"({iterations} iteraciones)")
+
+        self.proven_optimal = self.best_k <= self.problem.lower_bound
+        if self.verbose and self.proven_optimal:
+            print("[Parada] Cota inferior alcanzada: óptimo probado")
+        return self.best_solution, self.history
@@ -16,6 +16,8 @@ Referencias:
 import numpy as np
 from typing import Set, Dict, List, Tuple, Optional
 from core import GraphColoringProblem, ColoringSolution
+from operators.kempe import KempeEngine
+from operators.worklist import VertexWorklist
 
 
 class KempeChain:
@@ -36,13 +38,15 @@ class KempeChain:
     - Exploración más profunda del espacio
     
     Desventajas:
-    - Más computacionalmente costoso: O(n + m) por movimiento
+    - Más costoso que un movimiento simple: O(grado de la cadena) por
+      cadena evaluada (ver operators/kempe.py)
     - No garantiza mejora en cada paso
     """
     
     @staticmethod
     def improve(solution: ColoringSolution, problem: GraphColoringProblem,
-                max_iterations: int = 100, seed: int = None) -> ColoringSolution:
+                max_iterations: int = 100, seed: int = None,
+                inplace: bool = False) -> ColoringSolution:
         """
         Mejora solución mediante búsqueda local con cadenas de Kempe.
         
@@ -59,6 +63,7 @@ class KempeChain:
             problem: Instancia GCP
             max_iterations: Máximo número de iteraciones
             seed: Seed para reproducibilidad
+            inplace: Modificar `solution` en lugar de una copia
         
         Retorna:
             ColoringSolution: Solución mejorada (mejor o igual)
@@ -70,7 +75,8 @@ class KempeChain:
         if seed is not None:
             np.random.seed(seed)
         
-        current = solution.copy()
+        engine = KempeEngine(solution, problem)
+        colors = engine.colors
         improved = True
         iteration = 0
         
@@ -78,50 +84,38 @@ class KempeChain:
             improved = False
             iteration += 1
             
-            # Obtener vértices en conflicto
-            conflict_vertices = current.conflict_vertices(problem)
-            
-            if not conflict_vertices:
+            # Vértices en conflicto (mantenidos incrementalmente por el motor)
+            if not engine.conflicted:
                 break  # Solución es factible
             
             # Probar mejoras con cadenas de Kempe
             best_move = None
             best_improvement = 0
             
-            for vertex in conflict_vertices:
-                current_color = current.get_color(vertex)
-                neighbors = problem.neighbors(vertex)
-                neighbor_colors = {current.get_color(n) for n in neighbors}
+            for vertex in sorted(engine.conflicted):
+                current_color = colors[vertex]
+                neighbor_colors = {colors[n] for n in engine.neighbors(vertex)}
                 
-                # Enumerar cadenas de Kempe
+                # Enumerar cadenas de Kempe (delta sin copiar la solución)
                 for target_color in neighbor_colors:
-                    # Encontrar cadena alternante
-                    chain = KempeChain._find_chain(
-                        current, problem, vertex, current_color, target_color
-                    )
+                    if target_color == current_color or target_color < 0:
+                        continue
+                    chain, delta = engine.chain(vertex, target_color)
                     
-                    if chain:
-                        # Evaluar movimiento
-                        temp_solution = current.copy()
-                        KempeChain._swap_chain_colors(
-                            temp_solution, chain, current_color, target_color
-                        )
-                        
-                        # Calcular mejora
-                        improvement = (current.num_conflicts(problem) - 
-                                     temp_solution.num_conflicts(problem))
-                        
-                        if improvement > best_improvement:
-                            best_improvement = improvement
-                            best_move = (chain, current_color, target_color)
+                    if -delta > best_improvement:
+                        best_improvement = -delta
+                        best_move = (chain, current_color, target_color)
             
             # Aplicar mejor movimiento si lo hay
             if best_move is not None:
                 chain, color_a, color_b = best_move
-                KempeChain._swap_chain_colors(current, chain, color_a, color_b)
+                engine.swap(chain, color_a, color_b)
                 improved = True
         
-        return current
+        if inplace:
+            engine.apply_to(solution)
+            return solution
+        return engine.to_solution(solution)
     
     @staticmethod
     def _find_chain(solution: ColoringSolution, problem: GraphColoringProblem,
@@ -141,37 +135,24 @@ class KempeChain:
         Retorna:
             Set[int]: Vértices que forman la cadena (máxima alcanzable)
         """
-        chain = {start_vertex}
-        queue = [start_vertex]
-        visited = {start_vertex}
-        
-        while queue:
-            v = queue.pop(0)
-            current_color = solution.get_color(v)
-            next_color = color_b if current_color == color_a else color_a
-            
-            for neighbor in problem.neighbors(v):
-                if neighbor not in visited:
-                    if solution.get_color(neighbor) == next_color:
-                        visited.add(neighbor)
-                        chain.add(neighbor)
-                        queue.append(neighbor)
-        
-        return chain
+        return KempeEngine.find_chain(solution, problem, start_vertex,
+                                      color_a, color_b)
     
     @staticmethod
     def _swap_chain_colors(solution: ColoringSolution, chain: Set[int],
-                          color_a: int, color_b: int) -> None:
+                          color_a: int, color_b: int,
+                          problem: GraphColoringProblem = None) -> None:
         """
         Intercambiar colores en una cadena: color_a ↔ color_b
         
-        Modifica la solución in-place.
+        Modifica la solución in-place. Con `problem`, el contador de
+        conflictos en caché se actualiza incrementalmente.
         """
         for vertex in chain:
             if solution.get_color(vertex) == color_a:
-                solution.assignment[vertex] = color_b
+                solution.set_color(vertex, color_b, problem)
             elif solution.get_color(vertex) == color_b:
-                solution.assignment[vertex] = color_a
+                solution.set_color(vertex, color_a, problem)
 
 
 class OneVertexMove:
@@ -181,7 +162,11 @@ class OneVertexMove:
     El movimiento más básico de búsqueda local: cambiar el color de un
     único vértice al menor color disponible.
     
-    Complejidad: O(n + m) con evaluación incremental
+    Solo se revisan los vértices de la worklist (ver operators/worklist.py):
+    al inicio todos, después los recoloreados y sus vecinos, que son los
+    únicos cuyo menor color libre puede haber cambiado.
+    
+    Complejidad: O(n + m) la primera pasada, O(worklist · grado) las demás
     
     Ventajas:
     - Simple: fácil de implementar y entender
@@ -195,21 +180,23 @@ class OneVertexMove:
     
     @staticmethod
     def improve(solution: ColoringSolution, problem: GraphColoringProblem,
-                max_iterations: int = 100, seed: int = None) -> ColoringSolution:
+                max_iterations: int = 100, seed: int = None,
+                inplace: bool = False) -> ColoringSolution:
         """
         Mejora solución mediante búsqueda local simple.
         
         Algoritmo:
         1. Mientras no mejore y iteraciones < max:
-           a. Para cada vértice:
+           a. Para cada vértice de la worklist (menor índice primero):
               - Asignar menor color disponible
-              - Si mejora, aplicar y recomenzar
+              - Si mejora, aplicar, reencolar sus vecinos y recomenzar
         
         Parámetros:
             solution: Solución inicial
             problem: Instancia GCP
             max_iterations: Máximo de iteraciones
             seed: Seed para reproducibilidad
+            inplace: Modificar `solution` en lugar de una copia
         
         Retorna:
             ColoringSolution: Solución mejorada
@@ -217,39 +204,37 @@ class OneVertexMove:
         if seed is not None:
             np.random.seed(seed)
         
-        current = solution.copy()
-        improved = True
+        current = solution if inplace else solution.copy()
+        worklist = VertexWorklist(current, problem)
+        offset = problem.vertex_offset
         iteration = 0
         
-        while improved and iteration < max_iterations:
-            improved = False
+        while iteration < max_iterations:
             iteration += 1
+            improved = False
             
-            # Intentar mejorar cada vértice
-            for vertex in range(1, problem.n_vertices + 1):
-                # Colores usados por vecinos
-                neighbor_colors = {
-                    current.get_color(n) 
-                    for n in problem.neighbors(vertex)
-                }
-                
-                # Menor color disponible
-                best_color = 0
-                while best_color in neighbor_colors:
-                    best_color += 1
+            # Primer vértice pendiente (menor índice) con un color libre menor
+            vertex_index = worklist.pop()
+            while vertex_index is not None:
+                best_color = worklist.smallest_free_color(vertex_index)
+                old_color = worklist.colors[vertex_index]
                 
                 # Aplicar si mejora
-                old_color = current.get_color(vertex)
                 if best_color < old_color:  # Usa menos colores
-                    conflicts_before = current.num_conflicts(problem)
-                    current.assignment[vertex] = best_color
-                    conflicts_after = current.num_conflicts(problem)
+                    vertex = vertex_index + offset
+                    current.num_conflicts(problem)
+                    delta = current.set_color(vertex, best_color, problem)
                     
-                    if conflicts_after <= conflicts_before:
+                    if delta <= 0:
+                        worklist.set_color(vertex_index, best_color)
                         improved = True
                         break
                     else:
-                        current.assignment[vertex] = old_color
+                        current.set_color(vertex, old_color, problem)
+                vertex_index = worklist.pop()
+            
+            if not improved:
+                break
         
         return current
 
@@ -275,7 +260,7 @@ class TabuCol:
     @staticmethod
     def improve(solution: ColoringSolution, problem: GraphColoringProblem,
                 max_iterations: int = 100, tenure: int = 10,
-                seed: int = None) -> ColoringSolution:
+                seed: int = None, inplace: bool = False) -> ColoringSolution:
         """
         Mejora solución usando Tabu Search.
         
@@ -292,16 +277,28 @@ class TabuCol:
             max_iterations: Máximo iteraciones
             tenure: Tamaño de la lista tabú (en iteraciones)
             seed: Seed para reproducibilidad
+            inplace: Buscar sobre `solution` y dejar en ella la mejor
+                     solución encontrada (sin copias de la solución completa)
         
         Retorna:
-            ColoringSolution: Mejor solución encontrada
+            ColoringSolution: Mejor solución encontrada (la inicial si
+            ningún movimiento la mejora); ambos modos devuelven la misma
+        
+        La mejor solución no se copia: se guarda el movimiento candidato
+        que la produjo y los movimientos aplicados desde entonces, que al
+        terminar se deshacen en orden inverso.
         """
         if seed is not None:
             np.random.seed(seed)
         
-        current = solution.copy()
-        best_solution = current.copy()
-        best_fitness = current.num_conflicts(problem)
+        current = solution if inplace else solution.copy()
+        current_fitness = current.num_conflicts(problem)
+        best_fitness = current_fitness
+        # Mejor = estado en el que se evaluó best_move, con best_move aplicado
+        # (la solución inicial al empezar); trail: movimientos aplicados desde
+        # ese estado como (vértice, color anterior)
+        best_move: Optional[Tuple[int, int]] = None
+        trail: List[Tuple[int, Optional[int]]] = []
         
         tabu_list: Dict[Tuple[int, int], int] = {}  # (vertex, color) -> iteration
         
@@ -335,14 +332,13 @@ class TabuCol:
                 if move in tabu_list and tabu_list[move] > iteration:
                     continue  # Tabú y no cumple aspiración
                 
-                # Evaluar candidato
-                temp = current.copy()
-                temp.assignment[vertex] = color
-                fitness = temp.num_conflicts(problem)
+                # Evaluar candidato (delta local, sin modificar la solución)
+                fitness = current_fitness + current.conflict_delta(vertex, color, problem)
                 
                 # Actualizar mejor global
                 if fitness < best_fitness:
-                    best_solution = temp.copy()
+                    best_move = move
+                    trail.clear()
                     best_fitness = fitness
                 
                 # Actualizar mejor local
@@ -355,7 +351,9 @@ class TabuCol:
             
             # Aplicar movimiento y actualizar tabú
             vertex, color = best_candidate
-            current.assignment[vertex] = color
+            trail.append((vertex, current.get_color(vertex)))
+            current.set_color(vertex, color, problem)
+            current_fitness = best_candidate_fitness
             tabu_list[best_candidate] = iteration + tenure
             
             # Limpiar entradas tabú expiradas
@@ -363,7 +361,15 @@ class TabuCol:
             for k in expired:
                 del tabu_list[k]
         
-        return best_solution
+        # Volver a la mejor solución vista
+        for vertex, color in reversed(trail):
+            if color is None:
+                current.clear_color(vertex, problem)
+            else:
+                current.set_color(vertex, color, problem)
+        if best_move is not None:
+            current.set_color(best_move[0], best_move[1], problem)
+        return current
 
 
 if __name__ == "__main__":
@@ -0,0 +1,261 @@
+"""
+Motor de Cadenas de Kempe para Graph Coloring Problem (GCP)
+
+Infraestructura de KempeChain.improve:
+- BFS con deque sobre la adyacencia CSR del problema (listas 0-based)
+- Marcas de visitado por generación: no se crean ni limpian sets por cadena
+- Delta de conflictos de un intercambio calculado sin copiar la solución
+- Caché de cadenas por (vértice, par de colores), invalidada cuando cambia
+  el color de un vértice de la cadena o de un vecino suyo
+
+Una cadena (a, b) es la componente conexa que alcanza el BFS desde v
+siguiendo aristas entre vértices de colores alternos a/b. Todos sus
+vértices comparten la misma cadena, así que una búsqueda sirve para todos.
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+
+from core import GraphColoringProblem, ColoringSolution
+
+
+class KempeEngine:
+    """
+    Estado de coloración para búsqueda local con cadenas de Kempe.
+
+    Mantiene colores (lista 0-based), número de vecinos del mismo color de
+    cada vértice y el conjunto de vértices en conflicto, todo actualizado
+    en O(grado) por recoloración. Los conflictos se ponderan por la
+    multiplicidad de cada arista (`problem.csr_weights`), igual que
+    ColoringSolution.num_conflicts y ColoringEvaluator.
+
+    Ejemplo:
+        >>> engine = KempeEngine(solution, problem)
+        >>> chain, delta = engine.chain(0, 2)   # cadena desde el índice 0
+        >>> if delta < 0:
+        ...     engine.swap(chain, engine.colors[0], 2)
+        >>> improved = engine.to_solution(solution)
+    """
+
+    def __init__(self, solution: ColoringSolution, problem: GraphColoringProblem):
+        """
+        Parámetros:
+            solution: Solución de partida (no se modifica)
+            problem: Instancia GCP
+        """
+        self.problem = problem
+        self.n = problem.n_vertices
+        self.offset = problem.vertex_offset
+        self._indptr, self._indices = problem.csr_lists
+        self._weights = problem.csr_weights_list
+
+        colors = solution.to_array(problem)
+        self.colors: List[int] = colors.tolist()
+
+        # Aristas al mismo color por vértice (con multiplicidad), en bloque
+        indptr, indices = problem.csr
+        weights = problem.csr_weights
+        sources = np.repeat(np.arange(self.n), np.diff(indptr))
+        same = colors[sources] == colors[indices]
+        own = np.bincount(sources[same], weights=weights[same],
+                          minlength=self.n).astype(np.int64)
+        self._own: List[int] = own.tolist()
+        self.conflicts = int(weights[same].sum()) // 2
+        self.conflicted: Set[int] = set(np.flatnonzero(own).tolist())
+
+        self._stamp: List[int] = [0] * self.n
+        self._generation = 0
+        self._changed: Set[int] = set()
+
+        # (vértice, color_menor, color_mayor) -> entrada [cadena, delta, claves]
+        self._chains: Dict[Tuple[int, int, int], list] = {}
+        self._entries_by_vertex: Dict[int, List[list]] = {}
+
+    # ========================================================================
+    # CADENAS
+    # ========================================================================
+
+    def neighbors(self, i: int) -> List[int]:
+        """Vecinos (0-based) del índice i."""
+        return self._indices[self._indptr[i]:self._indptr[i + 1]]
+
+    def chain(self, i: int, other: int) -> Tuple[List[int], int]:
+        """
+        Cadena de Kempe desde el índice i entre su color y `other`.
+
+        Retorna:
+            (cadena, delta): índices de la cadena y cambio en el número de
+            conflictos si se intercambian sus colores (negativo = mejora)
+        """
+        a = self.colors[i]
+        key = (i, a, other) if a < other else (i, other, a)
+        entry = self._chains.get(key)
+        if entry is not None:
+            return entry[0], entry[1]
+
+        chain = self._bfs(i, a, other)
+        delta = self._swap_delta(chain, a + other)
+
+        lo, hi = key[1], key[2]
+        entry = [chain, delta, [(u, lo, hi) for u in chain]]
+        for k in entry[2]:
+            self._chains[k] = entry
+        entries = self._entries_by_vertex
+        for u in chain:
+            entries.setdefault(u, []).append(entry)
+        return chain, delta
+
+    @staticmethod
+    def find_chain(solution: ColoringSolution, problem: GraphColoringProblem,
+                   start_vertex: int, color_a: int, color_b: int) -> Set[int]:
+        """
+        Cadena de Kempe (a, b) desde `start_vertex` sin construir el motor.
+
+        Lee los colores directamente de `solution.assignment` y solo recorre
+        la cadena y sus vecinos: O(tamaño de la cadena · grado) en lugar del
+        O(n + m) de inicializar un KempeEngine. Vértices y retorno en la
+        numeración del problema.
+        """
+        indptr, indices = problem.csr_lists
+        offset = problem.vertex_offset
+        assignment = solution.assignment
+        pair_sum = color_a + color_b
+
+        chain = {start_vertex}
+        queue = deque(chain)
+        while queue:
+            x = queue.popleft()
+            next_color = pair_sum - assignment.get(x, -1)
+            i = x - offset
+            for j in indices[indptr[i]:indptr[i + 1]]:
+                y = j + offset
+                if y not in chain and assignment.get(y, -1) == next_color:
+                    chain.add(y)
+                    queue.append(y)
+        return chain
+
+    def _bfs(self, start: int, color_a: int, color_b: int) -> List[int]:
+        """BFS alternante a/b; deja la cadena marcada con la generación actual."""
+        self._generation += 1
+        generation = self._generation
+        stamp, colors = self._stamp, self.colors
+        indptr, indices = self._indptr, self._indices
+        pair_sum = color_a + color_b
+
+        stamp[start] = generation
+        chain = [start]
+        queue = deque(chain)
+        while queue:
+            x = queue.popleft()
+            next_color = pair_sum - colors[x]
+            for y in indices[indptr[x]:indptr[x + 1]]:
+                if stamp[y] != generation and colors[y] == next_color:
+                    stamp[y] = generation
+                    chain.append(y)
+                    queue.append(y)
+        return chain
+
+    def _swap_delta(self, chain: List[int], pair_sum: int) -> int:
+        """
+        Delta de conflictos de intercambiar la cadena recién marcada.
+
+        Las aristas internas conservan igualdad/desigualdad de colores al
+        intercambiar ambos extremos; solo cuentan los vecinos fuera de la
+        cadena: +multiplicidad si tienen el color nuevo, -multiplicidad si
+        tenían el actual.
+        """
+        generation = self._generation
+        stamp, colors = self._stamp, self.colors
+        indptr, indices, weights = self._indptr, self._indices, self._weights
+        delta = 0
+        for x in chain:
+            current = colors[x]
+            new = pair_sum - current
+            start, end = indptr[x], indptr[x + 1]
+            for y, weight in zip(indices[start:end], weights[start:end]):
+                if stamp[y] != generation:
+                    color = colors[y]
+                    if color == new:
+                        delta += weight
+                    elif color == current:
+                        delta -= weight
+        return delta
+
+    # ========================================================================
+    # MODIFICACIONES
+    # ========================================================================
+
+    def swap(self, chain: List[int], color_a: int, color_b: int) -> None:
+        """Intercambiar color_a ↔ color_b en todos los vértices de la cadena."""
+        pair_sum = color_a + color_b
+        colors = self.colors
+        for x in chain:
+            self.set_color(x, pair_sum - colors[x])
+
+    def set_color(self, i: int, color: int) -> None:
+        """Recolorear el índice i en O(grado) e invalidar cadenas afectadas."""
+        colors, own, conflicted = self.colors, self._own, self.conflicted
+        old = colors[i]
+        if old == color:
+            return
+        colors[i] = color
+
+        count = 0
+        start, end = self._indptr[i], self._indptr[i + 1]
+        for y, weight in zip(self._indices[start:end], self._weights[start:end]):
+            neighbor_color = colors[y]
+            if neighbor_color == old:
+                own[y] -= weight
+                if own[y] == 0:
+                    conflicted.discard(y)
+                self.conflicts -= weight
+            elif neighbor_color == color:
+                own[y] += weight
+                conflicted.add(y)
+                count += weight
+                self.conflicts += weight
+            self._invalidate(y)
+        own[i] = count
+        if count:
+            conflicted.add(i)
+        else:
+            conflicted.discard(i)
+        self._invalidate(i)
+        self._changed.add(i)
+
+    def _invalidate(self, i: int) -> None:
+        """Descartar las cadenas en caché que contienen el índice i."""
+        entries = self._entries_by_vertex.pop(i, None)
+        if entries:
+            chains = self._chains
+            for entry in entries:
+                for key in entry[2]:
+                    chains.pop(key, None)
+
+    # ========================================================================
+    # CONVERSIÓN
+    # ========================================================================
+
+    def apply_to(self, solution: ColoringSolution) -> None:
+        """
+        Escribir los vértices modificados sobre `solution` (in-place).
+
+        `solution` debe ser la solución con la que se creó el motor.
+        """
+        offset, colors = self.offset, self.colors
+        for i in sorted(self._changed):
+            color = colors[i]
+            if color >= 0:
+                solution.set_color(i + offset, color, self.problem)
+
+    def to_solution(self, base: ColoringSolution) -> ColoringSolution:
+        """
+        Solución con los colores actuales, derivada de `base`.
+
+        Solo se reescriben los vértices modificados (con set_color), así la
+        copia hereda y actualiza los cachés de fitness de `base`.
+        """
+        result = base.copy()
+        self.apply_to(result)
+        return result
@@ -40,7 +40,8 @@ class RandomRecolor:
     
     @staticmethod
     def perturb(solution: ColoringSolution, problem: GraphColoringProblem,
-                ratio: float = 0.2, seed: int = None) -> ColoringSolution:
+                ratio: float = 0.2, seed: int = None,
+                inplace: bool = False) -> ColoringSolution:
         """
         Perturbar solución recoloreando vértices aleatoriamente.
         
@@ -55,6 +56,7 @@ class RandomRecolor:
             problem: Instancia GCP
             ratio: Fracción de vértices a perturbar (0.0 a 1.0)
             seed: Seed para reproducibilidad
+            inplace: Modificar `solution` en lugar de una copia
         
         Retorna:
             ColoringSolution: Solución perturbada (puede tener conflictos)
@@ -66,7 +68,7 @@ class RandomRecolor:
         if seed is not None:
             np.random.seed(seed)
         
-        perturbed = solution.copy()
+        perturbed = solution if inplace else solution.copy()
         n = problem.n_vertices
         num_to_perturb = max(1, int(ratio * n))
         
@@ -78,10 +80,11 @@ class RandomRecolor:
         )
         
         # Recolorear aleatoriamente
+        max_color = max(perturbed.num_colors, 1)
         for vertex in vertices_to_perturb:
             # Nuevo color aleatorio entre 0 y num_colors
-            new_color = np.random.randint(0, max(perturbed.num_colors, 1) + 1)
-            perturbed.assignment[vertex] = new_color
+            new_color = np.random.randint(0, max_color + 1)
+            perturbed.set_color(int(vertex), int(new_color), problem)
         
         return perturbed
     
@@ -140,7 +143,8 @@ class PartialDestroy:
     
     @staticmethod
     def perturb(solution: ColoringSolution, problem: GraphColoringProblem,
-                region_size: float = 0.2, seed: int = None) -> ColoringSolution:
+                region_size: float = 0.2, seed: int = None,
+                inplace: bool = False) -> ColoringSolution:
         """
         Perturbar solución destruyendo y reconstruyendo una región.
         
@@ -154,6 +158,7 @@ class PartialDestroy:
             problem: Instancia GCP
             region_size: Tamaño relativo de región a destruir (0.0 a 1.0)
             seed: Seed para reproducibilidad
+            inplace: Modificar `solution` en lugar de una copia
         
         Retorna:
             ColoringSolution: Solución perturbada con región reconstruida
@@ -161,7 +166,7 @@ class PartialDestroy:
         if seed is not None:
             np.random.seed(seed)
         
-        perturbed = solution.copy()
+        perturbed = solution if inplace else solution.copy()
         n = problem.n_vertices
         
         # Seleccionar vértice inicial aleatorio
@@ -174,7 +179,7 @@ class PartialDestroy:
         
         # Desasignar colores en la región
         for vertex in region:
-            del perturbed.assignment[vertex]
+            perturbed.clear_color(vertex, problem)
         
         # Reconstruir región (greedy: menor color disponible)
         for vertex in sorted(region):
@@ -188,7 +193,7 @@ class PartialDestroy:
             while color in neighbor_colors:
                 color += 1
             
-            perturbed.assignment[vertex] = color
+            perturbed.set_color(vertex, color, problem)
         
         return perturbed
     
@@ -214,17 +219,17 @@ class PartialDestroy:
         
         # Desasignar
         for vertex in region:
-            del perturbed.assignment[vertex]
+            perturbed.clear_color(vertex, problem)
         
         # Reconstruir aleatoriamente
+        num_colors = perturbed.num_colors
         for vertex in sorted(region):
-            num_colors = perturbed.num_colors
             # Preferencia por colores existentes
             if np.random.random() < 0.7 and num_colors > 0:
-                color = np.random.randint(0, num_colors)
+                color = int(np.random.randint(0, num_colors))
             else:
                 color = num_colors  # Nuevo color
-            perturbed.assignment[vertex] = color
+            perturbed.set_color(vertex, color, problem)
         
         return perturbed
     
@@ -12,6 +12,7 @@ estrategias heurísticas eficientes.
 import numpy as np
 from typing import Set, Dict
 from core import GraphColoringProblem, ColoringSolution
+from operators.worklist import VertexWorklist
 
 
 class RepairConflicts:
@@ -23,8 +24,11 @@ class RepairConflicts:
     
     Algoritmo greedy que es muy efectivo cuando hay pocos conflictos.
     
+    Los vértices en conflicto se mantienen incrementalmente al recolorear
+    (ver operators/worklist.py): cada pasada cuesta O(conflictivos · grado).
+    
     Ventajas:
-    - Muy rápido: O(m) por iteración
+    - Muy rápido: O(m) la construcción inicial, O(conflictivos · grado) por pasada
     - Efectivo cuando num_conflicts es bajo
     - Mantiene estructura general de solución
     
@@ -41,10 +45,10 @@ class RepairConflicts:
         
         Algoritmo:
         1. Mientras haya conflictos y iteraciones < max:
-           a. Obtener vértices en conflicto
-           b. Para cada vértice en conflicto:
-              - Asignar menor color que resuelve sus conflictos
-              - Si no existe, usar nuevo color
+           a. Tomar los vértices en conflicto (mantenidos incrementalmente)
+           b. Ordenarlos por conflictos (desc.); empates: menor grado
+           c. Para cada vértice aún en conflicto:
+              - Asignar el menor color que no usa ningún vecino
         
         Parámetros:
             solution: Solución potencialmente infactible
@@ -64,60 +68,33 @@ class RepairConflicts:
             np.random.seed(seed)
         
         repaired = solution.copy()
+        # Conflictos mantenidos incrementalmente: sin re-escanear aristas
+        worklist = VertexWorklist(repaired, problem, pending=())
+        own = worklist.own
+        offset = problem.vertex_offset
         
         for iteration in range(max_iterations):
-            conflict_vertices = repaired.conflict_vertices(problem)
-            
-            if not conflict_vertices:
+            if not worklist.conflicted:
                 break  # Solución es factible
             
-            # Ordenar conflictivos por número de conflictos (más conflictivos primero)
-            conflicted_with_count = {}
-            for vertex in conflict_vertices:
-                count = sum(
-                    1 for neighbor in problem.neighbors(vertex)
-                    if repaired.get_color(vertex) == repaired.get_color(neighbor)
-                )
-                conflicted_with_count[vertex] = count
-            
+            # Más conflictivos primero; empates: primero el de menor grado
+            # (más fácil de recolorear)
             vertices_to_repair = sorted(
-                conflict_vertices,
-                key=lambda v: conflicted_with_count[v],
-                reverse=True
+                worklist.conflicted,
+                key=lambda i: (-own[i], worklist.degree(i), i)
             )
             
             # Reparar cada vértice
-            for vertex in vertices_to_repair:
-                # Colores de vecinos
-                neighbor_colors = {
-                    repaired.get_color(n) for n in problem.neighbors(vertex)
-                }
-                
-                # Mejor color: que resuelve más conflictos
-                best_color = None
-                best_conflicts = float('inf')
-                
-                for color in range(repaired.num_colors + 2):
-                    if color not in neighbor_colors:
-                        # Evaluar este color
-                        old_color = repaired.get_color(vertex)
-                        repaired.assignment[vertex] = color
-                        
-                        # Contar conflictos de este vértice
-                        num_conflicts = sum(
-                            1 for neighbor in problem.neighbors(vertex)
-                            if repaired.get_color(neighbor) == color
-                        )
-                        
-                        if num_conflicts < best_conflicts:
-                            best_conflicts = num_conflicts
-                            best_color = color
-                        
-                        repaired.assignment[vertex] = old_color
+            for vertex_index in vertices_to_repair:
+                # Ya resuelto por una recoloración anterior de esta pasada
+                if own[vertex_index] == 0:
+                    continue
                 
-                # Aplicar mejor color
-                if best_color is not None:
-                    repaired.assignment[vertex] = best_color
+                # Mejor color: el menor que no usa ningún vecino (resuelve
+                # todos los conflictos del vértice)
+                best_color = worklist.smallest_free_color(vertex_index)
+                repaired.set_color(vertex_index + offset, best_color, problem)
+                worklist.set_color(vertex_index, best_color)
         
         return repaired
     
@@ -154,7 +131,7 @@ class RepairConflicts:
                     
                     for vertex in range(1, problem.n_vertices + 1):
                         if temp.get_color(vertex) == color2:
-                            temp.assignment[vertex] = color1
+                            temp.set_color(vertex, color1, problem)
                     
                     if temp.is_feasible(problem):
                         repaired = temp
@@ -224,7 +201,7 @@ class IntensifyColor:
                 
                 for color in range(max_color):
                     if color not in neighbor_colors:
-                        current.assignment[vertex] = color
+                        current.set_color(vertex, color, problem)
                         break
         
         return current
@@ -271,7 +248,7 @@ class Diversify:
         for vertex in vertices_to_change:
             # Asignar color aleatorio
             new_color = np.random.randint(0, solution.num_colors + 1)
-            perturbed.assignment[vertex] = new_color
+            perturbed.set_color(int(vertex), int(new_color), problem)
         
         # Reparar conflictos
         return RepairConflicts.repair(perturbed, problem)
@@ -0,0 +1,140 @@
+"""
+Worklist de vértices para búsqueda local en Graph Coloring Problem (GCP)
+
+Infraestructura de OneVertexMove.improve y RepairConflicts.repair:
+- Colores (lista 0-based) y vecinos del mismo color de cada vértice,
+  actualizados en O(grado) por recoloración
+- Conjunto de vértices en conflicto mantenido incrementalmente (sin
+  re-escanear las aristas en cada pasada)
+- Worklist de vértices "sucios": solo un vértice cuyo color o el de algún
+  vecino cambió puede tener un movimiento nuevo; al recolorear un vértice
+  se reencolan él y sus vecinos
+
+Así cada pasada cuesta O(worklist · grado) en lugar de O(n + m).
+"""
+
+import heapq
+from typing import Iterable, List, Optional, Set
+
+import numpy as np
+
+from core import GraphColoringProblem, ColoringSolution
+
+
+class VertexWorklist:
+    """
+    Coloración 0-based con conflictos incrementales y worklist de vértices.
+
+    La worklist es un heap de índices: pop() devuelve siempre el menor
+    índice pendiente, así el recorrido conserva el orden 1..n de las
+    versiones con barrido completo.
+
+    Ejemplo:
+        >>> worklist = VertexWorklist(solution, problem)
+        >>> i = worklist.pop()
+        >>> color = worklist.smallest_free_color(i)
+        >>> if color < worklist.colors[i]:
+        ...     worklist.set_color(i, color)   # reencola i y sus vecinos
+    """
+
+    def __init__(self, solution: ColoringSolution, problem: GraphColoringProblem,
+                 pending: Optional[Iterable[int]] = None):
+        """
+        Parámetros:
+            solution: Solución de partida (no se modifica)
+            problem: Instancia GCP
+            pending: Índices iniciales de la worklist (default: todos)
+        """
+        self.problem = problem
+        self.n = problem.n_vertices
+        self.offset = problem.vertex_offset
+        self._indptr, self._indices = problem.csr_lists
+
+        colors = solution.to_array(problem)
+        self.colors: List[int] = colors.tolist()
+
+        # Vecinos del mismo color por vértice, en bloque sobre el CSR
+        # (los vértices sin color, -1, cuentan como un color más)
+        indptr, indices = problem.csr
+        sources = np.repeat(np.arange(self.n), np.diff(indptr))
+        same = colors[sources] == colors[indices]
+        own = np.bincount(sources[same], minlength=self.n)
+        self.own: List[int] = own.tolist()
+        self.conflicted: Set[int] = set(np.flatnonzero(own).tolist())
+
+        self._heap: List[int] = list(range(self.n)) if pending is None else sorted(set(pending))
+        self._queued: List[bool] = [False] * self.n
+        for i in self._heap:
+            self._queued[i] = True
+
+    # ========================================================================
+    # WORKLIST
+    # ========================================================================
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, i: int) -> None:
+        """Encolar el índice i (si no lo está ya)."""
+        if not self._queued[i]:
+            self._queued[i] = True
+            heapq.heappush(self._heap, i)
+
+    def pop(self) -> Optional[int]:
+        """Menor índice pendiente, o None si la worklist está vacía."""
+        if not self._heap:
+            return None
+        i = heapq.heappop(self._heap)
+        self._queued[i] = False
+        return i
+
+    # ========================================================================
+    # CONSULTAS
+    # ========================================================================
+
+    def neighbors(self, i: int) -> List[int]:
+        """Vecinos (0-based) del índice i."""
+        return self._indices[self._indptr[i]:self._indptr[i + 1]]
+
+    def degree(self, i: int) -> int:
+        return self._indptr[i + 1] - self._indptr[i]
+
+    def smallest_free_color(self, i: int) -> int:
+        """Menor color no usado por los vecinos de i (O(grado))."""
+        colors = self.colors
+        used = {colors[y] for y in self._indices[self._indptr[i]:self._indptr[i + 1]]}
+        color = 0
+        while color in used:
+            color += 1
+        return color
+
+    # ========================================================================
+    # MODIFICACIONES
+    # ========================================================================
+
+    def set_color(self, i: int, color: int) -> None:
+        """Recolorear el índice i en O(grado) y reencolar i y sus vecinos."""
+        colors, own, conflicted = self.colors, self.own, self.conflicted
+        old = colors[i]
+        if old == color:
+            return
+        colors[i] = color
+
+        count = 0
+        for y in self._indices[self._indptr[i]:self._indptr[i + 1]]:
+            neighbor_color = colors[y]
+            if neighbor_color == old:
+                own[y] -= 1
+                if own[y] == 0:
+                    conflicted.discard(y)
+            elif neighbor_color == color:
+                own[y] += 1
+                conflicted.add(y)
+                count += 1
+            self.push(y)
+        own[i] = count
+        if count:
+            conflicted.add(i)
+        else:
+            conflicted.discard(i)
+        self.push(i)
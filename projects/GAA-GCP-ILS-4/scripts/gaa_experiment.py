@@ -13,7 +13,7 @@ import json
 import time
 from pathlib import Path
 from datetime import datetime
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 
 import numpy as np
 
@@ -24,7 +24,8 @@ sys.path.insert(0, str(project_root))
 # Imports del proyecto
 from gaa.grammar import Grammar
 from gaa.generator import AlgorithmGenerator
-from gaa.interpreter import execute_algorithm
+from gaa.fitness import FitnessService
+from gaa.racing import RacingEvaluator
 from gaa.ast_nodes import mutate_ast
 from core.problem import GraphColoringProblem
 from data.loader import DatasetLoader
@@ -39,7 +40,10 @@ class GAASolver:
                  pop_size: int = 10,
                  generations: int = 50,
                  seed: int = 42,
-                 output_manager: OutputManager = None):
+                 output_manager: OutputManager = None,
+                 workers: Optional[int] = None,
+                 fitness_cache: Optional[str] = None,
+                 race_alpha: Optional[float] = None):
         """
         Inicializa solucionador GAA
         
@@ -49,6 +53,10 @@ class GAASolver:
             generations: Número de generaciones
             seed: Semilla aleatoria
             output_manager: Gestor de outputs (si None, se crea uno)
+            workers: Procesos para evaluar fitness (default: núcleos; 1 = en proceso)
+            fitness_cache: Archivo JSONL para persistir la caché de fitness
+            race_alpha: Significancia del test que descarta mutantes durante
+                la carrera (None = solo corte exacto por cota)
         """
         self.training_dir = Path(training_dir)
         self.pop_size = pop_size
@@ -65,6 +73,16 @@ class GAASolver:
         self.training_instances = loader.load_folder("training")
         print(f"✅ {len(self.training_instances)} instancias cargadas\n")
         
+        # Evaluación de fitness: pool con grafos precargados + memoización.
+        # Semillas fijas por instancia para que los resultados sean cacheables
+        self.fitness_service = FitnessService(
+            self.training_instances,
+            seed=seed,
+            workers=workers,
+            cache_path=fitness_cache
+        )
+        self.racer = RacingEvaluator(self.fitness_service, alpha=race_alpha)
+        
         # Inicializar generador
         self.grammar = Grammar(min_depth=2, max_depth=5)
         self.generator = AlgorithmGenerator(grammar=self.grammar, seed=seed)
@@ -77,7 +95,8 @@ class GAASolver:
         Evalúa un algoritmo en múltiples instancias
         
         Fitness = promedio de colores en instancias de entrenamiento
-        (menor es mejor)
+        (menor es mejor). Delegado en FitnessService: árboles ya evaluados
+        se resuelven desde la caché.
         
         Args:
             algorithm: AST del algoritmo
@@ -85,31 +104,23 @@ class GAASolver:
         Returns:
             Fitness (promedio de colores)
         """
-        if not self.training_instances:
-            return float('inf')
-        
-        values = []
+        return self.fitness_service.evaluate(algorithm)
+    
+    def evaluate_population(self, population: List[Any]) -> List[float]:
+        """
+        Evalúa una población completa de algoritmos
         
-        for instance in self.training_instances:
-            try:
-                # Ejecutar algoritmo
-                solution = execute_algorithm(
-                    algorithm,
-                    instance,
-                    seed=self.rng.integers(0, 2**31)
-                )
-                
-                if solution:
-                    values.append(solution.num_colors)
-            except Exception as e:
-                pass  # Saltar instancias problemáticas
+        Los trabajos (algoritmo, instancia) no memoizados se reparten en el
+        pool de FitnessService y las coloraciones de cada instancia se
+        puntúan en lote. Fitness igual que en evaluate_algorithm.
         
-        if not values:
-            return float('inf')
+        Args:
+            population: Lista de ASTs
         
-        # Fitness = promedio
-        fitness = np.mean(values)
-        return fitness
+        Returns:
+            Lista de fitness, uno por algoritmo
+        """
+        return self.fitness_service.evaluate_many(population)
     
     def evolve(self) -> Tuple[Any, float]:
         """
@@ -127,13 +138,11 @@ class GAASolver:
         print(f"🧬 Generando población inicial ({self.pop_size} algoritmos)...\n")
         
         population = self.generator.generate_population(self.pop_size)
-        fitnesses = []
         
         start_time = time.time()
         
-        for i, alg in enumerate(population):
-            fitness = self.evaluate_algorithm(alg)
-            fitnesses.append(fitness)
+        fitnesses = self.evaluate_population(population)
+        for i, fitness in enumerate(fitnesses):
             print(f"  Algoritmo {i+1:2d}: fitness = {fitness:.2f}")
         
         print()
@@ -166,20 +175,22 @@ class GAASolver:
             except:
                 mutated_alg = current_alg
             
-            # Evaluar mutante
-            mutated_fitness = self.evaluate_algorithm(mutated_alg)
+            # Umbral de aceptación SA con u sorteado antes de evaluar:
+            # aceptar ⇔ Δ < 0 ó u < exp(-Δ/T) ⇔ fitness < actual - T·ln(u)
+            u = self.rng.random()
+            if T <= 0:
+                threshold = current_fitness
+            elif u > 0:
+                threshold = current_fitness - T * np.log(u)
+            else:
+                threshold = float('inf')
             
-            # Criterio de aceptación (SA)
+            # Evaluar mutante por carreras: se corta en cuanto no puede
+            # bajar del umbral (o el test lo declara peor que el actual)
+            race = self.racer.evaluate(mutated_alg, threshold, reference=current_alg)
+            mutated_fitness = race.fitness
             delta_f = mutated_fitness - current_fitness
-            
-            if delta_f < 0:  # Mejora
-                accept = True
-            else:  # Empeora
-                if T > 0:
-                    prob = np.exp(-delta_f / T)
-                    accept = self.rng.random() < prob
-                else:
-                    accept = False
+            accept = race.completed and mutated_fitness < threshold
             
             if accept:
                 population[current_idx] = mutated_alg
@@ -192,6 +203,9 @@ class GAASolver:
                     best_algorithm = mutated_alg
                     best_fitness = mutated_fitness
                     print(f"  ✨ NUEVO MEJOR: fitness = {best_fitness:.2f}")
+            elif not race.completed:
+                print(f"  ✗ Rechazado en carrera ({race.rejected_by}, "
+                      f"{race.instances_evaluated}/{len(self.training_instances)} instancias)")
             else:
                 print(f"  ✗ Rechazado")
             
@@ -202,6 +216,8 @@ class GAASolver:
                 'best_fitness': best_fitness,
                 'current_fitness': current_fitness,
                 'mutated_fitness': mutated_fitness,
+                'instances_evaluated': race.instances_evaluated,
+                'rejected_by': race.rejected_by,
                 'accepted': accept
             })
             
@@ -210,11 +226,15 @@ class GAASolver:
             print()
         
         elapsed = time.time() - start_time
+        self.fitness_service.close()
+        cache_stats = self.fitness_service.get_statistics()
         
         print("="*80)
         print(f"✅ EVOLUCIÓN COMPLETADA")
         print(f"   Mejor fitness: {best_fitness:.2f}")
         print(f"   Tiempo total: {elapsed:.1f}s")
+        print(f"   Caché de fitness: {cache_stats['hits']} aciertos, "
+              f"{cache_stats['misses']} ejecuciones")
         print("="*80)
         print()
         
@@ -37,6 +37,7 @@ from gaa.generator import AlgorithmGenerator
 from gaa.interpreter import execute_algorithm
 from utils.output_manager import OutputManager
 from experimentation.statistics import StatisticalAnalyzer
+from experimentation.runner import ReplicaScheduler, discover_instances, job_key_from_record, successful_records
 from visualization.plotter import PlotManager
 from core.problem import GraphColoringProblem
 from data.loader import DatasetLoader
@@ -53,8 +54,18 @@ logger = logging.getLogger(__name__)
 class UnifiedExperimentRunner:
     """Orquestador unificado de experimentación con GAA"""
     
-    def __init__(self):
-        """Inicializa el orquestador"""
+    def __init__(self, workers: int = None, num_replicas: int = 1, job_timeout: float = None):
+        """
+        Inicializa el orquestador
+        
+        Args:
+            workers: Procesos paralelos para el experimento completo (default: todos los núcleos)
+            num_replicas: Réplicas por (instancia, algoritmo)
+            job_timeout: Timeout duro por réplica en segundos
+        """
+        self.workers = workers or os.cpu_count()
+        self.num_replicas = num_replicas
+        self.job_timeout = job_timeout
         self.output_mgr = OutputManager()
         self.session_dir = None
         self.algorithms = None
@@ -166,17 +177,52 @@ class UnifiedExperimentRunner:
         print("PASO 2: EXPERIMENTO COMPLETO (múltiples instancias)")
         print("=" * 80 + "\n")
         
-        print("Ejecutando run_full_experiment.py con 3 algoritmos GAA...\n")
+        print(f"Ejecutando {len(self.algorithms)} algoritmos GAA en paralelo ({self.workers} workers)...\n")
         
         try:
-            # Importar y ejecutar run_full_experiment
-            from run_full_experiment import ExperimentRunner
+            instance_paths = discover_instances(project_root / "datasets")
+            algorithms = {algo['name']: algo['ast'] for algo in self.algorithms}
+            
+            scheduler = ReplicaScheduler(
+                instance_paths=instance_paths,
+                algorithms=algorithms,
+                workers=self.workers,
+                job_timeout=self.job_timeout
+            )
+            jobs = scheduler.build_jobs(num_replicas=self.num_replicas, base_seed=42)
+            
+            previous = successful_records(self.output_mgr.load_replica_results())
+            completed = {job_key_from_record(r) for r in previous}
+            
+            def on_result(record):
+                self.output_mgr.append_replica_result(record)
+                if record.get('status') == 'ok':
+                    print(f"  ✓ {record['algorithm']} | {record['instance']} | "
+                          f"seed={record['seed']}: {record['num_colors']} colores "
+                          f"({record['time']:.2f}s)")
+                else:
+                    print(f"  ✗ {record['algorithm']} | {record['instance']} | "
+                          f"seed={record['seed']}: {record.get('status')}")
             
-            # Crear y ejecutar experimento completo
-            runner = ExperimentRunner(mode="all_datasets")
-            runner.run()
+            records = previous + scheduler.run(jobs, on_result=on_result, completed=completed)
+            
+            detailed = [
+                {
+                    'algorithm': r['algorithm'],
+                    'instance': r['instance'],
+                    'seed': r['seed'],
+                    'num_colors': r['num_colors'],
+                    'conflicts': r['conflicts'],
+                    'feasible': r['feasible'],
+                    'time': r['time'],
+                }
+                for r in records if r.get('status') == 'ok'
+            ]
+            results_file = self.output_mgr.results_dir / "detailed_results.json"
+            with open(results_file, 'w', encoding='utf-8') as f:
+                json.dump(detailed, f, indent=2, ensure_ascii=False)
             
-            print("✅ Experimento completo completado\n")
+            print(f"\n✅ Experimento completo completado ({len(detailed)} réplicas)\n")
             
         except Exception as e:
             logger.warning(f"Error ejecutando experimento completo: {e}")
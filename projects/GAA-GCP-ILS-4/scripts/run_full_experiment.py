@@ -17,14 +17,20 @@ Opciones:
     --max-time 300          Tiempo máximo por instancia en segundos
     --num-replicas 1        Número de ejecuciones independientes por instancia
     --seed 42               Semilla aleatoria
+    --workers 8             Procesos paralelos para las réplicas (default: 1)
+    --job-timeout 600       Timeout duro por réplica en segundos
+    --resume DIR            Reanudar una sesión interrumpida (omite réplicas ya completadas)
     --verbose               Mostrar progreso detallado
 
 Ejemplos:
     python scripts/run_full_experiment.py --mode all
     python scripts/run_full_experiment.py --mode family DSJ --num-replicas 3
     python scripts/run_full_experiment.py --mode all --max-time 60 --verbose
+    python scripts/run_full_experiment.py --mode all --num-replicas 30 --workers 16
+    python scripts/run_full_experiment.py --mode all --resume output/01-01-26_10-00-00
 """
 
+import os
 import sys
 import time
 import json
@@ -132,6 +138,7 @@ sys.path.insert(0, str(project_root))
 from core.problem import GraphColoringProblem
 from core.solution import ColoringSolution
 from core.evaluation import ColoringEvaluator
+from experimentation.runner import ReplicaScheduler, job_key_from_record, successful_records
 from metaheuristic.ils_core import IteratedLocalSearch
 from operators.constructive import GreedyDSATUR
 from operators.improvement import KempeChain
@@ -139,6 +146,7 @@ from operators.perturbation import RandomRecolor
 from utils import OutputManager
 from visualization.plotter import PlotManager
 from visualization.plotter_v2 import PlotManagerV2
+from visualization.render_queue import RenderQueue
 
 
 class FullExperiment:
@@ -150,7 +158,13 @@ class FullExperiment:
                  max_time: float = 300.0,
                  num_replicas: int = 1,
                  seed: int = 42,
-                 verbose: bool = False):
+                 verbose: bool = False,
+                 workers: int = 1,
+                 job_timeout: Optional[float] = None,
+                 resume: Optional[str] = None,
+                 race_alpha: Optional[float] = None,
+                 reduce: bool = False,
+                 buffered_output: bool = False):
         """
         Inicializa experimento
         
@@ -159,8 +173,17 @@ class FullExperiment:
             family: Familia específica (CUL, DSJ, LEI, MYC, REG, SCH, SGB)
             max_time: Tiempo máximo por instancia (segundos)
             num_replicas: Número de ejecuciones independientes
-            seed: Semilla aleatoria
+            seed: Semilla aleatoria (la réplica r usa seed + r)
             verbose: Mostrar progreso detallado
+            workers: Procesos paralelos para las réplicas (1 = secuencial)
+            job_timeout: Timeout duro por réplica en segundos (None = sin límite)
+            resume: Directorio de una sesión previa a reanudar
+            race_alpha: Significancia para eliminar algoritmos GAA durante la
+                carrera (None = evaluar todos en todas las instancias)
+            reduce: Ejecutar el ILS sobre el núcleo reducido de cada instancia
+                (core/reduction.py) y reinsertar los vértices eliminados
+            buffered_output: Registrar los artefactos en el SessionStore de la
+                sesión y exportarlos al terminar (sin E/S en el bucle)
         """
         self.mode = mode
         self.family = family
@@ -168,11 +191,21 @@ class FullExperiment:
         self.num_replicas = num_replicas
         self.seed = seed
         self.verbose = verbose
+        self.workers = max(1, workers)
+        self.job_timeout = job_timeout
+        self.race_alpha = race_alpha
+        self.reduce = reduce
         self.rng = np.random.default_rng(seed)
         
         # Gestor de outputs
-        self.output_manager = OutputManager()
-        if mode == "all":
+        self.output_manager = OutputManager(buffered=buffered_output)
+        if resume:
+            self.session_dir = self.output_manager.resume_session(
+                resume,
+                mode="all_datasets" if mode == "all" else "specific_dataset",
+                family=family
+            )
+        elif mode == "all":
             self.session_dir = self.output_manager.create_session(mode="all_datasets")
         else:
             self.session_dir = self.output_manager.create_session(
@@ -180,9 +213,11 @@ class FullExperiment:
                 family=family
             )
         
-        # Gestor de gráficas - usar directorio de sesión
-        self.plot_manager = PlotManager(session_dir=str(self.session_dir))
-        self.plot_manager_v2 = PlotManagerV2(session_dir=str(self.session_dir))
+        # Gestores de gráficas - las llamadas plot_* se encolan y se
+        # renderizan al final en paralelo (ver _render_plots)
+        self.render_queue = RenderQueue(str(self.session_dir), workers=self.workers)
+        self.plot_manager = self.render_queue.proxy(PlotManager)
+        self.plot_manager_v2 = self.render_queue.proxy(PlotManagerV2)
         
         # Configurar logging
         self.output_manager.setup_logging(level=logging.INFO)
@@ -196,6 +231,7 @@ class FullExperiment:
         self.all_solutions = {}
         self.convergence_histories = {}
         self.problems_dict = {}  # Almacenar problemas por nombre para acceder a su matriz de adyacencia
+        self.instance_paths = {}  # Rutas .col por instancia (los workers cargan su propia copia)
         
         # Estructura para ploteos multinivel (PlotManagerV2)
         from collections import defaultdict
@@ -214,6 +250,7 @@ class FullExperiment:
         print(f"🎯 Modo: {mode}" + (f" ({family})" if family else ""))
         print(f"⏱️  Tiempo máximo por instancia: {max_time}s")
         print(f"🔄 Réplicas por instancia: {num_replicas}")
+        print(f"⚙️  Workers: {self.workers}")
         print(f"🌱 Semilla: {seed}\n")
     
     def load_datasets(self) -> List[GraphColoringProblem]:
@@ -242,6 +279,7 @@ class FullExperiment:
                 try:
                     problem = GraphColoringProblem.load_from_dimacs(str(col_file))
                     problems.append(problem)
+                    self.instance_paths[problem.name] = str(col_file)
                 except Exception as e:
                     self.logger.error(f"Error cargando {col_file}: {e}")
         
@@ -291,24 +329,58 @@ class FullExperiment:
         self.timing.start_stage("Ejecución de ILS")
         start_time = time.time()
         
-        for idx, problem in enumerate(problems, 1):
+        for problem in problems:
             # Almacenar problema para acceso posterior (matriz de adyacencia)
             self.problems_dict[problem.name] = problem
-            
-            # Barra de progreso
-            progress = (idx - 1) / len(problems) * 100
-            elapsed = time.time() - start_time
-            eta_per_instance = elapsed / (idx - 1) if idx > 1 else 0
-            eta_total = eta_per_instance * (len(problems) - idx + 1)
-            
-            print(f"\n[{idx:3d}/{len(problems)}] ({progress:5.1f}%) {problem.name}")
-            print(f"   📊 Vértices: {problem.n_vertices:4d} | Aristas: {problem.n_edges:6d}", end="")
-            if problem.colors_known:
-                print(f" | BKS: {problem.colors_known}")
+        
+        # Réplicas independientes: (instancia, algoritmo, semilla) en paralelo
+        scheduler = ReplicaScheduler(
+            instance_paths={p.name: self.instance_paths[p.name] for p in problems},
+            algorithms={'ILS': {
+                'type': 'ILS',
+                'max_iterations': 100,
+                'time_budget': self.max_time,
+                'reduce': self.reduce
+            }},
+            workers=self.workers,
+            job_timeout=self.job_timeout,
+            keep_solutions=True,
+            keep_history=True
+        )
+        jobs = scheduler.build_jobs(num_replicas=self.num_replicas, base_seed=self.seed)
+        
+        # Reanudar: conservar réplicas ya registradas en la sesión
+        previous = successful_records(self.output_manager.load_replica_results())
+        completed = {job_key_from_record(r) for r in previous}
+        if previous:
+            print(f"♻️  Reanudando sesión: {len(completed)}/{len(jobs)} réplicas ya completadas\n")
+        
+        total_pending = sum(1 for job in jobs if job.key not in completed)
+        finished = [0]
+        
+        def on_result(record: Dict[str, Any]):
+            self.output_manager.append_replica_result(record)
+            finished[0] += 1
+            progress = finished[0] / max(total_pending, 1) * 100
+            label = f"[{finished[0]:4d}/{total_pending}] ({progress:5.1f}%) {record['instance']} r{record['replica'] + 1}"
+            if record.get('status') == 'ok':
+                feasible_icon = "✓" if record['feasible'] else "✗"
+                print(f"   {label}: {record['num_colors']} colores "
+                      f"({record['conflicts']} conflictos) {feasible_icon} {record['time']:.2f}s")
             else:
-                print(" | BKS: Desconocido")
-            print(f"   ⏱️  Tiempo promedio/instancia: {eta_per_instance:.1f}s | ETA: {self.timing.format_time(eta_total)}")
-            
+                print(f"   ❌ {label}: {record.get('status')} {record.get('error', '')}")
+                self.logger.error(f"Réplica {record['instance']}/{record['seed']}: "
+                                  f"{record.get('status')} {record.get('error', '')}")
+        
+        records = previous + scheduler.run(jobs, on_result=on_result, completed=completed)
+        
+        # Agrupar réplicas por instancia
+        by_instance: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            if record.get('status') == 'ok':
+                by_instance.setdefault(record['instance'], []).append(record)
+        
+        for problem in problems:
             instance_results = {
                 'instance': problem.name,
                 'family': problem.name.split('_')[0] if '_' in problem.name else 'UNKNOWN',
@@ -322,42 +394,29 @@ class FullExperiment:
                 'feasible': []
             }
             
-            # Ejecutar réplicas
-            for replica in range(self.num_replicas):
-                try:
-                    replica_start = time.time()
-                    print(f"   ⏳ Ejecutando réplica {replica+1}/{self.num_replicas}...", end="", flush=True)
-                    solution, metrics, history = self.run_ils(problem)
-                    replica_time = time.time() - replica_start
-                    
-                    instance_results['colors'].append(metrics['num_colors'])
-                    instance_results['conflicts'].append(metrics['conflicts'])
-                    instance_results['times'].append(replica_time)
-                    instance_results['feasible'].append(metrics['feasible'])
-                    
-                    if problem.colors_known:
-                        gap = (metrics['num_colors'] - problem.colors_known) / problem.colors_known * 100
-                        instance_results['gaps'].append(gap)
-                        gap_str = f"({gap:+.1f}%)"
-                    else:
-                        gap_str = ""
-                    
-                    feasible_icon = "✓" if metrics['feasible'] else "✗"
-                    print(f" ✅ {metrics['num_colors']} colores ({metrics['conflicts']} conflictos) {feasible_icon} {replica_time:.2f}s {gap_str}")
-                    
-                    # Guardar solución e historial de la primera réplica
-                    if replica == 0:
-                        self.all_solutions[problem.name] = solution
-                        # Guardar el historial de current_fitness para la gráfica de convergencia (muestra variación real)
-                        self.convergence_histories[problem.name] = {
-                            'current_fitness': history.current_fitness if hasattr(history, 'current_fitness') else [],
-                            'best_fitness': history.best_fitness if hasattr(history, 'best_fitness') else [],
-                            'metrics': metrics
-                        }
+            for record in sorted(by_instance.get(problem.name, []), key=lambda r: r['replica']):
+                instance_results['colors'].append(record['num_colors'])
+                instance_results['conflicts'].append(record['conflicts'])
+                instance_results['times'].append(record['time'])
+                instance_results['feasible'].append(record['feasible'])
                 
-                except Exception as e:
-                    self.logger.error(f"Error en réplica {replica+1}: {e}")
-                    print(f"   ❌ Error en réplica {replica+1}: {e}")
+                if problem.colors_known:
+                    gap = (record['num_colors'] - problem.colors_known) / problem.colors_known * 100
+                    instance_results['gaps'].append(gap)
+                
+                # Guardar solución e historial de la primera réplica
+                if record['replica'] == 0 and 'assignment' in record:
+                    solution = ColoringSolution(
+                        assignment={int(v): c for v, c in record['assignment'].items()}
+                    )
+                    self.all_solutions[problem.name] = solution
+                    history = record.get('history', {})
+                    # Guardar el historial de current_fitness para la gráfica de convergencia (muestra variación real)
+                    self.convergence_histories[problem.name] = {
+                        'current_fitness': history.get('current_fitness', []),
+                        'best_fitness': history.get('best_fitness', []),
+                        'metrics': ColoringEvaluator.evaluate(solution, problem)
+                    }
             
             # Calcular estadísticas
             if instance_results['colors']:
@@ -369,7 +428,7 @@ class FullExperiment:
                 
                 # Resumen de la instancia
                 feasible_count = sum(instance_results['feasible'])
-                print(f"   📈 Resumen: {instance_results['best_colors']} colores (mejor), "
+                print(f"   📈 {problem.name}: {instance_results['best_colors']} colores (mejor), "
                       f"{instance_results['avg_colors']:.1f}±{instance_results['std_colors']:.1f} (promedio), "
                       f"{feasible_count}/{self.num_replicas} factibles")
             
@@ -392,6 +451,24 @@ class FullExperiment:
         
         # Generar gráficas
         self._generate_plots()
+        
+        # Renderizar las gráficas encoladas (fuera del tiempo del experimento)
+        self._render_plots()
+    
+    def _render_plots(self):
+        """Renderiza en paralelo las gráficas encoladas durante el experimento"""
+        if not len(self.render_queue):
+            return
+        
+        self.timing.start_stage("Renderizado de gráficas")
+        print(f"\n🎨 Renderizando {len(self.render_queue)} gráficas "
+              f"({self.render_queue.workers} procesos)...")
+        stats = self.render_queue.render()
+        render_time = self.timing.end_stage()
+        for path in stats['paths']:
+            print(f"   ✅ Gráfica generada: {Path(path).name}")
+        print(f"   ✅ {stats['rendered']} generadas, {stats['skipped']} sin cambios, "
+              f"{stats['failed']} fallidas ({self.timing.format_time(render_time)})")
     
     def _save_results(self, elapsed_time: float):
         """Guarda resultados en archivos"""
@@ -594,7 +671,7 @@ class FullExperiment:
                         first_history['current_fitness'],
                         instance_name="Convergence - Average"
                     )
-                    print("✅ Gráfica de convergencia generada")
+                    print("🕒 Gráfica de convergencia encolada")
                 else:
                     print("⚠️  No hay datos de current_fitness disponibles")
             else:
@@ -610,7 +687,7 @@ class FullExperiment:
             
             if vertices and times:
                 self.plot_manager.plot_scalability(vertices, times)
-                print("✅ Gráfica de escalabilidad generada")
+                print("🕒 Gráfica de escalabilidad encolada")
             else:
                 print("⚠️  No hay datos suficientes para gráfica de escalabilidad")
         except Exception as e:
@@ -623,7 +700,7 @@ class FullExperiment:
             
             if all_colors:
                 self.plot_manager.plot_robustness(all_colors, instance_name="Robustness - All Instances")
-                print("✅ Gráfica de robustez generada")
+                print("🕒 Gráfica de robustez encolada")
             else:
                 print("⚠️  No hay datos suficientes para gráfica de robustez")
         except Exception as e:
@@ -637,7 +714,7 @@ class FullExperiment:
             
             if vertices and all_colors and len(vertices) == len(all_colors):
                 self.plot_manager.plot_time_quality(vertices, all_colors, instance_name="Time-Quality Tradeoff - All Instances")
-                print("✅ Gráfica tiempo-calidad generada")
+                print("🕒 Gráfica tiempo-calidad encolada")
             else:
                 print("⚠️  No hay datos suficientes para gráfica tiempo-calidad")
         except Exception as e:
@@ -658,7 +735,7 @@ class FullExperiment:
                         conflict_matrix[v][u] = 1
                 
                 self.plot_manager.plot_conflict_heatmap(conflict_matrix, instance_name=f"Conflict Heatmap - {last_problem.name}")
-                print("✅ Gráfica de conflictos generada")
+                print("🕒 Gráfica de conflictos encolada")
             else:
                 print("⚠️  No hay soluciones disponibles para gráfica de conflictos")
         except Exception as e:
@@ -683,7 +760,6 @@ class FullExperiment:
         try:
             from gaa.grammar import Grammar
             from gaa.generator import AlgorithmGenerator
-            from gaa.interpreter import execute_algorithm
             from gaa.ast_nodes import mutate_ast
             
             print("📋 Etapa 1/5: Inicializando GAA con Gramática BNF...")
@@ -774,28 +850,45 @@ class FullExperiment:
                 print("⚠️  No se pudieron extraer problemas de los resultados de ILS.")
                 raise RuntimeError("No hay problemas para ejecutar GAA")
             
-            for algo_idx, algo in enumerate(population):
+            # Carrera sobre la población: instancias de la más barata a la más
+            # cara, evaluadas en el pool; con --race-alpha se eliminan los
+            # algoritmos que un test pareado declara peores que el líder
+            from gaa.fitness import FitnessService
+            from gaa.racing import RacingEvaluator
+            
+            with FitnessService(gaa_problems,
+                                instance_seeds=[42] * len(gaa_problems),
+                                workers=self.workers) as fitness_service:
+                racer = RacingEvaluator(fitness_service, alpha=self.race_alpha)
+                race_results = racer.race(population)
+            
+            eliminated = []
+            for algo_idx, race in enumerate(race_results):
                 algo_name = f"GAA_Algorithm_{algo_idx + 1}"
                 algorithm_results[algo_name] = []
                 
-                print(f"Ejecutando {algo_name} en instancias...\n")
+                print(f"Resultados de {algo_name} en instancias...\n")
                 
-                # Ejecutar en todas las instancias cargadas
                 for result_idx, problem in enumerate(gaa_problems, 1):
-                    try:
-                        solution = execute_algorithm(algo, problem, seed=42)
-                        
-                        num_colors = solution.num_colors
-                        algorithm_results[algo_name].append(num_colors)
-                        
-                        gap = ((num_colors - problem.colors_known) / problem.colors_known * 100) if problem.colors_known else 0
-                        
-                        print(f"  [{result_idx}/{len(gaa_problems)}] {problem.name}: {num_colors} colores (gap: {gap:+.2f}%)")
+                    j = result_idx - 1
+                    if j not in race.values:
+                        print(f"  [{result_idx}/{len(gaa_problems)}] {problem.name}: No evaluado (eliminado en carrera)")
+                        algorithm_results[algo_name].append(float('inf'))
+                        continue
                     
-                    except Exception as e:
-                        print(f"  [{result_idx}/{len(gaa_problems)}] {problem.name}: Error - {e}")
+                    num_colors = race.values[j]
+                    if num_colors is None:
+                        print(f"  [{result_idx}/{len(gaa_problems)}] {problem.name}: Error en la ejecución")
                         algorithm_results[algo_name].append(float('inf'))
+                        continue
+                    
+                    algorithm_results[algo_name].append(num_colors)
+                    gap = ((num_colors - problem.colors_known) / problem.colors_known * 100) if problem.colors_known else 0
+                    print(f"  [{result_idx}/{len(gaa_problems)}] {problem.name}: {num_colors} colores (gap: {gap:+.2f}%)")
                 
+                if not race.completed:
+                    eliminated.append(algo_name)
+                    print(f"  ✗ Eliminado tras {race.instances_evaluated}/{len(gaa_problems)} instancias")
                 print()
             
             # ====================================================================
@@ -894,14 +987,22 @@ class FullExperiment:
             print("PASO 3: COMPARAR 3 ALGORITMOS")
             print("="*80 + "\n")
             
-            # Análisis estadístico
-            from experimentation.statistics import StatisticalAnalyzer
+            # Análisis estadístico (tabla columnar, post-hoc con Holm, bootstrap)
+            from experimentation.results_engine import ResultsEngine
             
-            analyzer = StatisticalAnalyzer(alpha=0.05)
-            comparison = analyzer.compare_multiple_algorithms(algorithm_results)
+            engine = ResultsEngine(alpha=0.05)
+            survivors = {name: values for name, values in algorithm_results.items()
+                         if name not in eliminated}
+            if eliminated:
+                print(f"Eliminados en carrera: {', '.join(eliminated)}\n")
+            engine.add_algorithm_results(
+                survivors if len(survivors) >= 2 else algorithm_results,
+                instances=[problem.name or f"instance_{i}" for i, problem in enumerate(gaa_problems)]
+            )
+            comparison = engine.compare()
             
             # Generar reporte
-            report = analyzer.generate_comparison_report(comparison)
+            report = engine.analyzer.generate_comparison_report(comparison)
             print(report)
             
             # Guardar resultados - convertir booleanos a strings para JSON
@@ -1025,10 +1126,9 @@ class FullExperiment:
                         # Obtener la matriz de adyacencia real del problema
                         if instance_name in self.problems_dict:
                             problem = self.problems_dict[instance_name]
-                            conflict_matrix = problem.edge_weight_matrix
                             self.plot_manager_v2.plot_instance_conflict_heatmap(
                                 instance_name,
-                                conflict_matrix
+                                problem=problem
                             )
                     except Exception as e:
                         pass
@@ -1159,6 +1259,18 @@ def main():
                        help='Semilla aleatoria')
     parser.add_argument('--verbose', action='store_true',
                        help='Mostrar progreso detallado')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Procesos paralelos para las réplicas (0 = todos los núcleos)')
+    parser.add_argument('--job-timeout', type=float, default=None,
+                       help='Timeout duro por réplica (segundos)')
+    parser.add_argument('--resume', type=str, default=None,
+                       help='Directorio de sesión a reanudar')
+    parser.add_argument('--race-alpha', type=float, default=None,
+                       help='Significancia para eliminar algoritmos GAA en carrera (default: sin eliminación)')
+    parser.add_argument('--buffered-output', action='store_true',
+                       help='Escribir artefactos en session.jsonl en segundo plano y exportar al final')
+    parser.add_argument('--reduce', action='store_true',
+                       help='Resolver el núcleo reducido (pelado, dominancia y componentes)')
     
     args = parser.parse_args()
     
@@ -1173,10 +1285,21 @@ def main():
         max_time=args.max_time,
         num_replicas=args.num_replicas,
         seed=args.seed,
-        verbose=args.verbose
+        verbose=args.verbose,
+        workers=args.workers or os.cpu_count(),
+        job_timeout=args.job_timeout,
+        resume=args.resume,
+        race_alpha=args.race_alpha,
+        reduce=args.reduce,
+        buffered_output=args.buffered_output
     )
     
-    experiment.run_experiment()
+    try:
+        experiment.run_experiment()
+    finally:
+        # Modo buffered: materializar la estructura de la sesión y cerrar el store
+        experiment.output_manager.export_session()
+        experiment.output_manager.close()
 
 
 if __name__ == "__main__":
@@ -9,6 +9,7 @@ Uso:
     python scripts/run_full_experiment_myciel.py
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -34,7 +35,8 @@ def main():
         family='MYC',
         max_time=300,  # 5 minutos por instancia
         num_replicas=3,  # 3 réplicas por instancia
-        seed=42
+        seed=42,
+        workers=os.cpu_count()  # Réplicas independientes en paralelo
     )
     
     experiment.run_experiment()
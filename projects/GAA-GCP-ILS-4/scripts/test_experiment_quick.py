@@ -248,9 +248,10 @@ def test_quick_experiment():
             
             # Guardar historial de convergencia (usar current_fitness para ver variación real)
             if history and hasattr(history, 'current_fitness'):
-                current_fitness_histories.append(history.current_fitness)
+                current_fitness = history.current_fitness.tolist()
+                current_fitness_histories.append(current_fitness)
                 convergence_histories[problem.name] = {
-                    'current_fitness': history.current_fitness if hasattr(history, 'current_fitness') else []
+                    'current_fitness': current_fitness
                 }
             
         except Exception as e:
@@ -431,10 +432,9 @@ def test_quick_experiment():
                     # Obtener la matriz de adyacencia real del problema
                     if instance_name in problems_dict:
                         problem = problems_dict[instance_name]
-                        conflict_matrix = problem.edge_weight_matrix
                         plot_mgr_v2.plot_instance_conflict_heatmap(
                             instance_name,
-                            conflict_matrix
+                            problem=problem
                         )
                 except Exception as e:
                     pass  # Ignorar si no se puede generar
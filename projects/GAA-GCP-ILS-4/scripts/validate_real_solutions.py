@@ -17,15 +17,18 @@ Uso:
 
 import sys
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from collections import defaultdict
 import json
 from dataclasses import dataclass
+import numpy as np
 
 # Agregar proyecto al path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from core.problem import GraphColoringProblem
+from core.evaluation import ColoringEvaluator
 
 
 @dataclass
@@ -99,48 +102,66 @@ class RealSolutionValidator:
             SolutionValidationResult con detalles de factibilidad
         """
         
-        # Validaciones básicas
-        assert len(colors) == problem.n_vertices, \
-            f"Tamaño de vector de colores ({len(colors)}) ≠ n_vertices ({problem.n_vertices})"
+        return self.validate_batch(problem, np.asarray(colors)[None, :], [algorithm])[0]
+    
+    def validate_batch(
+        self,
+        problem: GraphColoringProblem,
+        colorings: np.ndarray,
+        algorithms: List[str]
+    ) -> List[SolutionValidationResult]:
+        """
+        Validar P soluciones del mismo grafo de una sola vez.
         
-        assert np.all(colors >= 1), \
-            f"Colores deben ser ≥ 1, encontrados: {np.unique(colors)}"
+        Los conflictos se cuentan con ColoringEvaluator.batch_metrics
+        (matriz P×n contra el array de aristas); solo para las soluciones
+        infactibles se extraen las aristas en conflicto.
         
-        # Detectar conflictos: para cada arista (u,v), verificar que f(u) ≠ f(v)
-        conflicts: List[ConflictInfo] = []
+        Args:
+            problem: Instancia del problema
+            colorings: Matriz P×n de colores (1-indexed)
+            algorithms: Nombre del algoritmo de cada fila
+        """
+        colorings = np.atleast_2d(np.asarray(colorings, dtype=np.int32))
         
-        for u, v in problem.edges:
-            # Convertir de 1-indexed (DIMACS) a 0-indexed (numpy)
-            i, j = u - 1, v - 1
-            
-            # Obtener colores asignados
-            color_u = colors[i]
-            color_v = colors[j]
+        # Validaciones básicas
+        assert colorings.shape[1] == problem.n_vertices, \
+            f"Tamaño de vector de colores ({colorings.shape[1]}) ≠ n_vertices ({problem.n_vertices})"
+        
+        assert np.all(colorings >= 1), \
+            f"Colores deben ser ≥ 1, encontrados: {np.unique(colorings)}"
+        
+        # Restricción f(u) ≠ f(v) para toda arista, en bloque
+        metrics = ColoringEvaluator.batch_metrics(colorings, problem)
+        edges = problem.edge_array
+        offset = problem.vertex_offset
+        
+        results = []
+        for row, algorithm in enumerate(algorithms):
+            colors = colorings[row]
+            conflicts: List[ConflictInfo] = []
+            if metrics['conflicts'][row] > 0:
+                color_u = colors[edges[:, 0]]
+                mask = color_u == colors[edges[:, 1]]
+                for (i, j), color in zip(edges[mask].tolist(), color_u[mask].tolist()):
+                    conflicts.append(ConflictInfo(
+                        edge=(i + offset, j + offset),
+                        color_u=color,
+                        color_v=color
+                    ))
             
-            # Verificar restricción: f(u) ≠ f(v)
-            if color_u == color_v:
-                conflicts.append(ConflictInfo(
-                    edge=(u, v),
-                    color_u=int(color_u),
-                    color_v=int(color_v)
-                ))
-        
-        # Determinar factibilidad
-        is_feasible = len(conflicts) == 0
-        
-        # Crear resultado
-        result = SolutionValidationResult(
-            instance_name=problem.name,
-            algorithm=algorithm,
-            n_vertices=problem.n_vertices,
-            n_edges=problem.n_edges,
-            n_colors=int(np.max(colors)),
-            is_feasible=is_feasible,
-            n_conflicts=len(conflicts),
-            conflicts=conflicts
-        )
-        
-        return result
+            results.append(SolutionValidationResult(
+                instance_name=problem.name,
+                algorithm=algorithm,
+                n_vertices=problem.n_vertices,
+                n_edges=problem.n_edges,
+                n_colors=int(np.max(colors)),
+                is_feasible=len(conflicts) == 0,
+                n_conflicts=len(conflicts),
+                conflicts=conflicts
+            ))
+        
+        return results
     
     def validate_from_test_experiment(self, session_dir: Path) -> None:
         """
@@ -163,43 +184,59 @@ class RealSolutionValidator:
         print(f"\n📁 Encontrados {len(sol_files)} archivos de solución")
         print("="*80)
         
+        # Agrupar por instancia: un grafo cargado y una evaluación en lote por grupo
+        groups: Dict[str, List[tuple]] = defaultdict(list)
         for idx, sol_file in enumerate(sol_files, 1):
+            # Parsear nombre del archivo: instance_name_algorithm.sol
+            parts = sol_file.stem.split('_')
+            
+            # Intentar identificar instancia y algoritmo
+            if len(parts) >= 2:
+                instance_name = '_'.join(parts[:-1])
+                algorithm = parts[-1]
+            else:
+                instance_name = sol_file.stem
+                algorithm = "Unknown"
+            groups[instance_name].append((idx, sol_file, algorithm))
+        
+        for instance_name, entries in groups.items():
             try:
-                # Parsear nombre del archivo: instance_name_algorithm.sol
-                parts = sol_file.stem.split('_')
-                
-                # Intentar identificar instancia y algoritmo
-                if len(parts) >= 2:
-                    instance_name = '_'.join(parts[:-1])
-                    algorithm = parts[-1]
-                else:
-                    instance_name = sol_file.stem
-                    algorithm = "Unknown"
-                
                 # Cargar problema
                 dimacs_file = self._find_dimacs_file(instance_name)
                 if not dimacs_file:
-                    print(f"[{idx:3d}/{len(sol_files)}] ⚠️  DIMACS no encontrado para {instance_name}")
+                    for idx, _, _ in entries:
+                        print(f"[{idx:3d}/{len(sol_files)}] ⚠️  DIMACS no encontrado para {instance_name}")
                     continue
                 
                 problem = GraphColoringProblem.load_from_dimacs(str(dimacs_file))
                 
-                # Cargar solución
-                colors = self._load_solution_file(sol_file, problem.n_vertices)
-                if colors is None:
-                    print(f"[{idx:3d}/{len(sol_files)}] ⚠️  Error cargando solución {sol_file.name}")
+                # Cargar soluciones
+                loaded = []
+                for idx, sol_file, algorithm in entries:
+                    colors = self._load_solution_file(sol_file, problem.n_vertices)
+                    if colors is None:
+                        print(f"[{idx:3d}/{len(sol_files)}] ⚠️  Error cargando solución {sol_file.name}")
+                        continue
+                    loaded.append((idx, algorithm, colors))
+                
+                if not loaded:
                     continue
                 
                 # Validar
-                result = self.validate_solution(problem, colors, algorithm)
-                self.results.append(result)
+                batch = self.validate_batch(
+                    problem,
+                    np.vstack([colors for _, _, colors in loaded]),
+                    [algorithm for _, algorithm, _ in loaded]
+                )
                 
-                status = "✅ FACTIBLE" if result.is_feasible else "❌ NO FACTIBLE"
-                print(f"[{idx:3d}/{len(sol_files)}] {instance_name:20s} {algorithm:15s} "
-                      f"| K:{result.n_colors:2d} | Conflictos: {result.n_conflicts:6d} | {status}")
+                for (idx, algorithm, _), result in zip(loaded, batch):
+                    self.results.append(result)
+                    status = "✅ FACTIBLE" if result.is_feasible else "❌ NO FACTIBLE"
+                    print(f"[{idx:3d}/{len(sol_files)}] {instance_name:20s} {algorithm:15s} "
+                          f"| K:{result.n_colors:2d} | Conflictos: {result.n_conflicts:6d} | {status}")
                 
             except Exception as e:
-                print(f"[{idx:3d}/{len(sol_files)}] ❌ ERROR: {str(e)[:60]}")
+                print(f"[{instance_name}] ❌ ERROR: {str(e)[:60]}")
     
     def _find_dimacs_file(self, instance_name: str) -> Optional[Path]:
         """Buscar archivo DIMACS para una instancia"""
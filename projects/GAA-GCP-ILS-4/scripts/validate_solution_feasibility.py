@@ -22,6 +22,7 @@ sys.path.insert(0, str(project_root))
 
 from core.problem import GraphColoringProblem
 from core.solution import ColoringSolution
+from core.evaluation import ColoringEvaluator
 
 
 @dataclass
@@ -90,6 +91,7 @@ class SolutionFeasibilityValidator:
         Returns:
             SolutionValidationResult con detalles de factibilidad
         """
+        colors = np.asarray(colors, dtype=np.int32)
         
         # Validaciones básicas
         assert len(colors) == problem.n_vertices, \
@@ -98,26 +100,20 @@ class SolutionFeasibilityValidator:
         assert np.all(colors >= 1), \
             f"Colores deben ser ≥ 1, encontrados: {np.unique(colors)}"
         
-        # Obtener matriz de adyacencia real
-        A = problem.edge_weight_matrix
-        
-        # Detectar conflictos: para cada arista (u,v), verificar que f(u) ≠ f(v)
+        # Detectar conflictos: f(u) = f(v) para alguna arista (u,v), en bloque
         conflicts: List[ConflictInfo] = []
         
-        for u, v in problem.edges:
-            # Convertir de 1-indexed (DIMACS) a 0-indexed (numpy)
-            i, j = u - 1, v - 1
-            
-            # Obtener colores asignados
-            color_u = colors[i]
-            color_v = colors[j]
-            
-            # Verificar restricción: f(u) ≠ f(v)
-            if color_u == color_v:
+        metrics = ColoringEvaluator.batch_metrics(colors[None, :], problem)
+        if metrics['conflicts'][0] > 0:
+            edges = problem.edge_array
+            offset = problem.vertex_offset
+            color_u = colors[edges[:, 0]]
+            mask = color_u == colors[edges[:, 1]]
+            for (i, j), color in zip(edges[mask].tolist(), color_u[mask].tolist()):
                 conflicts.append(ConflictInfo(
-                    edge=(u, v),
-                    color_u=int(color_u),
-                    color_v=int(color_v)
+                    edge=(i + offset, j + offset),
+                    color_u=color,
+                    color_v=color
                 ))
         
         # Determinar factibilidad
@@ -18,6 +18,7 @@ from pathlib import Path
 from core.problem import GraphColoringProblem
 from core.solution import ColoringSolution
 from core.evaluation import ColoringEvaluator
+from core.coloring_state import ColoringState
 
 
 class TestGraphColoringProblem:
@@ -164,6 +165,147 @@ class TestGraphColoringProblem:
         """Validar rechazo de autolazos"""
         with pytest.raises(ValueError):
             GraphColoringProblem(vertices=3, edges=[(1, 1)])
+    
+    # ========================================================================
+    # Tests de adyacencia empaquetada
+    # ========================================================================
+    
+    def test_packed_adjacency_matches_dense(self, bipartite_problem):
+        """Validar que la matriz empaquetada coincide con la densa"""
+        packed = bipartite_problem.packed_adjacency
+        unpacked = np.unpackbits(packed, axis=1)[:, :bipartite_problem.n_vertices]
+        assert packed.shape == (4, 1)
+        assert np.array_equal(unpacked, bipartite_problem.edge_weight_matrix)
+    
+    def test_is_clique_and_independent_set(self, complete_graph_5, bipartite_problem):
+        """Validar consultas de clique y conjunto independiente"""
+        assert complete_graph_5.is_clique([1, 2, 3, 4, 5])
+        assert not bipartite_problem.is_clique([1, 2, 3])
+        assert bipartite_problem.is_clique([1, 2])
+        assert bipartite_problem.is_independent_set([1, 3])
+        assert not bipartite_problem.is_independent_set([1, 2])
+    
+    def test_adjacency_density_bins(self, complete_graph_5):
+        """Validar densidad por bloques: exacta si n <= bins, acotada si no"""
+        exact = complete_graph_5.adjacency_density(bins=8)
+        assert np.array_equal(exact, complete_graph_5.edge_weight_matrix)
+        
+        binned = complete_graph_5.adjacency_density(bins=2)
+        assert binned.shape == (2, 2)
+        assert np.allclose(binned, 1.0)
+    
+    # ========================================================================
+    # Tests de clique (cota inferior)
+    # ========================================================================
+    
+    def test_lower_bound_is_clique(self, complete_graph_5, bipartite_problem, empty_problem):
+        """Validar que la cota inferior es el tamaño de un clique real"""
+        assert complete_graph_5.lower_bound == complete_graph_5.clique_number == 5
+        assert bipartite_problem.lower_bound == 2
+        assert empty_problem.lower_bound == 1
+        for problem in (complete_graph_5, bipartite_problem, empty_problem):
+            assert problem.clique.optimal
+            assert problem.is_clique(problem.clique.vertices)
+    
+    def test_max_clique_matches_brute_force(self):
+        """Validar el branch-and-bound contra enumeración exhaustiva"""
+        from itertools import combinations
+        from core.clique import max_clique
+        
+        rng = np.random.default_rng(7)
+        n = 12
+        edges = [(i, j) for i in range(1, n + 1) for j in range(i + 1, n + 1)
+                 if rng.random() < 0.5]
+        problem = GraphColoringProblem(vertices=n, edges=edges)
+        
+        omega = max(size for size in range(1, n + 1)
+                    for subset in combinations(range(1, n + 1), size)
+                    if problem.is_clique(list(subset)))
+        result = max_clique(problem, node_limit=None)
+        assert result.optimal
+        assert result.size == omega
+        assert problem.is_clique(result.vertices)
+    
+    def test_max_clique_node_limit(self):
+        """Validar que con límite de nodos el clique sigue siendo válido"""
+        from core.clique import max_clique
+        
+        rng = np.random.default_rng(3)
+        n = 80
+        edges = [(i, j) for i in range(1, n + 1) for j in range(i + 1, n + 1)
+                 if rng.random() < 0.5]
+        problem = GraphColoringProblem(vertices=n, edges=edges)
+        
+        limited = max_clique(problem, node_limit=1)
+        assert not limited.optimal
+        assert problem.is_clique(limited.vertices)
+        assert limited.size <= max_clique(problem).size
+    
+    def test_adjacency_bitsets(self):
+        """Validar las filas de bits con y sin renumeración"""
+        from core.clique import adjacency_bitsets
+        
+        problem = GraphColoringProblem(vertices=3, edges=[(1, 2), (2, 3)])
+        assert adjacency_bitsets(problem) == [0b010, 0b101, 0b010]
+        # order = [1, 0, 2]: el índice 1 pasa a la posición 0
+        assert adjacency_bitsets(problem, np.array([1, 0, 2])) == [0b110, 0b001, 0b001]
+
+
+class TestGraphReduction:
+    """Tests para las reducciones de preprocesamiento"""
+    
+    MYCIEL3 = [(1, 2), (1, 4), (1, 7), (1, 9), (2, 3), (2, 6), (2, 8),
+               (3, 5), (3, 7), (3, 10), (4, 5), (4, 6), (4, 10), (5, 8),
+               (5, 9), (6, 11), (7, 11), (8, 11), (9, 11), (10, 11)]
+    
+    @staticmethod
+    def dsatur(problem):
+        from operators.constructive import GreedyDSATUR
+        return GreedyDSATUR.construct(problem)
+    
+    def test_peel_clique_with_tail(self):
+        """K4 con una cola: todo se pela y la reinserción usa 4 colores"""
+        from core.reduction import reduce_instance
+        
+        edges = [(i, j) for i in range(1, 5) for j in range(i + 1, 5)]
+        edges += [(4, 5), (5, 6), (6, 7)]
+        problem = GraphColoringProblem(vertices=7, edges=edges)
+        reduced = reduce_instance(problem)
+        
+        assert reduced.core_size == 0
+        assert reduced.peeled == 7
+        solution = reduced.solve(self.dsatur)
+        assert solution.is_feasible(problem)
+        assert solution.num_colors == 4
+    
+    def test_dominated_vertices(self):
+        """En C4 los vértices opuestos tienen la misma vecindad"""
+        from core.reduction import reduce_instance
+        
+        problem = GraphColoringProblem(vertices=4, edges=[(1, 2), (2, 3), (3, 4), (4, 1)])
+        reduced = reduce_instance(problem)
+        
+        assert reduced.dominated >= 1
+        assert reduced.core_size == 0
+        assert reduced.solve(self.dsatur).num_colors == 2
+    
+    def test_components_and_lift(self):
+        """Dos copias disjuntas de myciel3 dan dos componentes del núcleo"""
+        from core.reduction import reduce_instance
+        
+        edges = self.MYCIEL3 + [(u + 11, v + 11) for u, v in self.MYCIEL3]
+        problem = GraphColoringProblem(vertices=22, edges=edges)
+        reduced = reduce_instance(problem)
+        
+        assert [c.n_vertices for c in reduced.components] == [11, 11]
+        assert reduced.labels[1] == list(range(12, 23))
+        solution = reduced.solve(self.dsatur)
+        assert solution.is_feasible(problem)
+        assert len(solution.assignment) == 22
+        assert solution.num_colors == 4
+        
+        with pytest.raises(ValueError):
+            reduced.lift([])
 
 
 class TestColoringSolution:
@@ -278,6 +420,60 @@ class TestColoringSolution:
         """Validar que copia tiene contenido correcto"""
         sol_copy = valid_solution.copy()
         assert sol_copy.assignment == valid_solution.assignment
+    
+    # ========================================================================
+    # Tests de actualización incremental
+    # ========================================================================
+    
+    def test_set_color_updates_conflicts_incrementally(self, valid_solution, triangle_problem):
+        """Validar que set_color mantiene el contador de conflictos en caché"""
+        assert valid_solution.num_conflicts(triangle_problem) == 0
+        delta = valid_solution.set_color(3, 0, triangle_problem)
+        assert delta == 1
+        assert valid_solution.num_conflicts(triangle_problem) == 1
+        assert valid_solution.num_colors == 2
+        fresh = ColoringSolution(assignment=dict(valid_solution.assignment))
+        assert fresh.num_conflicts(triangle_problem) == 1
+    
+    def test_set_color_counts_parallel_edges(self):
+        """Validar delta con aristas repetidas (DIMACS con ambos sentidos)"""
+        problem = GraphColoringProblem(vertices=2, edges=[(1, 2), (1, 2)])
+        solution = ColoringSolution(assignment={1: 0, 2: 1})
+        solution.num_conflicts(problem)
+        assert solution.set_color(2, 0, problem) == 2
+        assert solution.num_conflicts(problem) == 2
+    
+    def test_clear_color_and_copy_carry_cache(self, valid_solution, triangle_problem):
+        """Validar que clear_color y copy conservan cachés coherentes"""
+        valid_solution.num_conflicts(triangle_problem)
+        sol_copy = valid_solution.copy()
+        sol_copy.clear_color(3, triangle_problem)
+        assert 3 not in sol_copy.assignment
+        assert sol_copy.num_colors == 2
+        assert sol_copy.num_conflicts(triangle_problem) == 0
+        assert valid_solution.num_colors == 3
+    
+    def test_journal_rollback_restores_state(self, valid_solution, triangle_problem):
+        """Validar que rollback deshace los cambios y sus cachés"""
+        valid_solution.num_conflicts(triangle_problem)
+        valid_solution.color_sets
+        original = dict(valid_solution.assignment)
+        
+        valid_solution.start_journal()
+        valid_solution.set_color(3, 0, triangle_problem)
+        valid_solution.clear_color(2, triangle_problem)
+        assert valid_solution.num_colors == 1
+        valid_solution.rollback(triangle_problem)
+        
+        assert valid_solution.assignment == original
+        assert valid_solution.num_colors == 3
+        assert valid_solution.num_conflicts(triangle_problem) == 0
+        assert valid_solution.color_sets == {0: {1}, 1: {2}, 2: {3}}
+    
+    def test_conflict_delta_is_read_only(self, valid_solution, triangle_problem):
+        """Validar que conflict_delta no modifica la solución"""
+        assert valid_solution.conflict_delta(3, 0, triangle_problem) == 1
+        assert valid_solution.get_color(3) == 2
 
 
 class TestColoringEvaluator:
@@ -402,6 +598,24 @@ class TestColoringEvaluator:
         batch = ColoringEvaluator.batch_evaluate([solution], problem)[0]
         assert individual == batch
     
+    def test_batch_metrics_chunked(self, conflict_setup):
+        """Validar métricas vectorizadas por bloques contra el cálculo individual"""
+        problem, _ = conflict_setup
+        rng = np.random.default_rng(0)
+        solutions = [
+            ColoringSolution(assignment={v: int(rng.integers(0, 3)) for v in range(1, 4)})
+            for _ in range(7)
+        ]
+        solutions[0].clear_color(2)
+        colorings = ColoringEvaluator.stack_colorings(solutions, problem)
+        metrics = ColoringEvaluator.batch_metrics(colorings, problem, chunk_size=3,
+                                                  class_sizes=True)
+        for row, solution in enumerate(solutions):
+            fresh = ColoringSolution(assignment=dict(solution.assignment))
+            assert metrics['conflicts'][row] == fresh.num_conflicts(problem)
+            assert metrics['num_colors'][row] == fresh.num_colors
+            assert metrics['class_sizes'][row].sum() == len(solution.assignment)
+    
     # ========================================================================
     # Tests de comparación
     # ========================================================================
@@ -414,6 +628,56 @@ class TestColoringEvaluator:
         assert not solution.is_better_than(solution2, problem)
 
 
+class TestColoringState:
+    """Tests para ColoringState (k fijo, matriz gamma)"""
+    
+    @pytest.fixture
+    def wheel_setup(self):
+        """Fixture: Rueda W5 (centro 1, ciclo 2-5) con un conflicto"""
+        edges = [(1, 2), (1, 3), (1, 4), (1, 5), (2, 3), (3, 4), (4, 5), (5, 2)]
+        problem = GraphColoringProblem(vertices=5, edges=edges)
+        solution = ColoringSolution(assignment={1: 0, 2: 1, 3: 2, 4: 1, 5: 1})
+        return problem, solution
+    
+    def test_from_solution_conflicts(self, wheel_setup):
+        """Validar conteo de conflictos y tamaños de clase"""
+        problem, solution = wheel_setup
+        state = ColoringState.from_solution(solution, problem)
+        assert state.k == 3
+        assert state.conflicts == solution.num_conflicts(problem) == 2
+        assert list(state.class_sizes) == [1, 3, 1]
+    
+    def test_move_keeps_gamma_consistent(self, wheel_setup):
+        """Validar que move() coincide con reconstruir desde cero"""
+        problem, solution = wheel_setup
+        state = ColoringState.from_solution(solution, problem)
+        assert state.delta(4, 2) == -2
+        state.move(4, 2)
+        fresh = ColoringState(problem, state.colors, state.k)
+        assert state.conflicts == fresh.conflicts == 0
+        assert np.array_equal(state.gamma, fresh.gamma)
+        assert state.to_solution().is_feasible(problem)
+    
+    def test_remove_color_renumbers(self, wheel_setup):
+        """Validar eliminación de una clase de color"""
+        problem, solution = wheel_setup
+        state = ColoringState.from_solution(solution, problem, k=4)
+        state.remove_color(0, np.random.default_rng(0))
+        assert state.k == 3
+        assert state.colors.max() < 3
+        assert state.gamma.shape == (5, 3)
+        fresh = ColoringState(problem, state.colors, state.k)
+        assert state.conflicts == fresh.conflicts
+    
+    def test_csr_matches_adjacency(self, wheel_setup):
+        """Validar CSR 0-based contra la lista de adyacencia"""
+        problem, _ = wheel_setup
+        indptr, indices = problem.csr
+        for v in range(1, 6):
+            neighbors = set(indices[indptr[v - 1]:indptr[v]] + 1)
+            assert neighbors == problem.adjacency_list[v]
+
+
 # ============================================================================
 # Test de integración
 # ============================================================================
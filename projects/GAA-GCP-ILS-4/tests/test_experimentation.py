@@ -0,0 +1,132 @@
+"""
+Tests para módulo de experimentación
+"""
+
+import pytest
+import numpy as np
+from pathlib import Path
+import sys
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scipy import stats
+
+from experimentation.runner import ReplicaScheduler, successful_records, job_key_from_record
+from experimentation.results_engine import ResultsEngine, holm_correction
+from experimentation.statistics import StatisticalAnalyzer
+
+
+class TestReplicaScheduler:
+    """Tests para el planificador de réplicas"""
+
+    def test_resume_only_skips_successful_records(self):
+        """Los registros 'timeout' y 'error' se reintentan al reanudar"""
+        records = [
+            {'instance': 'a', 'algorithm': 'ILS', 'seed': 1, 'status': 'timeout'},
+            {'instance': 'a', 'algorithm': 'ILS', 'seed': 2, 'status': 'ok'},
+            {'instance': 'a', 'algorithm': 'ILS', 'seed': 3, 'status': 'error'},
+            {'instance': 'a', 'algorithm': 'ILS', 'seed': 1, 'status': 'ok'},
+        ]
+        previous = successful_records(records)
+        completed = {job_key_from_record(r) for r in previous}
+        assert completed == {('a', 'ILS', 1), ('a', 'ILS', 2)}
+
+        scheduler = ReplicaScheduler({'a': 'a.col'}, {'ILS': {}}, workers=1)
+        jobs = scheduler.build_jobs(num_replicas=3, base_seed=1)
+        pending = [job for job in jobs if job.key not in completed]
+        assert [job.seed for job in pending] == [3]
+
+    def test_kill_executor_terminates_busy_workers(self):
+        """Los workers colgados se terminan con los PID que reportan al iniciar"""
+        import time
+        from concurrent.futures import wait
+
+        scheduler = ReplicaScheduler({}, {}, workers=2)
+        executor = scheduler._new_executor()
+        futures = [executor.submit(time.sleep, 60) for _ in range(2)]
+
+        # Dar tiempo a que ambos workers se inicialicen y reporten su PID
+        time.sleep(1.0)
+
+        start = time.time()
+        scheduler._kill_executor(executor, futures)
+        done, _ = wait(futures, timeout=20)
+        assert len(done) == 2
+        assert time.time() - start < 20
+        assert all(f.cancelled() or f.exception() is not None for f in futures)
+
+
+class TestResultsEngine:
+    """Tests de equivalencia con scipy / StatisticalAnalyzer"""
+
+    @staticmethod
+    def _results(n, integer, seed=0):
+        """Tres algoritmos sobre n instancias (enteros = con empates y ceros)"""
+        rng = np.random.default_rng(seed)
+        base = rng.uniform(10, 50, size=n)
+        results = {}
+        for offset, name in enumerate(['A', 'B', 'C']):
+            values = base + offset * 0.7 + rng.normal(0, 2, size=n)
+            results[name] = (np.round(values) if integer else values).tolist()
+        return results
+
+    @staticmethod
+    def _holm(p_values):
+        """Holm-Bonferroni secuencial de referencia"""
+        m = len(p_values)
+        adjusted, running = [0.0] * m, 0.0
+        for rank, index in enumerate(sorted(range(m), key=lambda i: p_values[i])):
+            running = max(running, min(1.0, (m - rank) * p_values[index]))
+            adjusted[index] = running
+        return adjusted
+
+    @pytest.mark.parametrize("n,integer", [(5, False), (12, True), (30, False), (80, True)])
+    def test_compare_matches_statistical_analyzer(self, n, integer):
+        """Friedman, Wilcoxon, Holm y rangos coinciden con la implementación previa"""
+        results = self._results(n, integer)
+        engine = ResultsEngine.from_algorithm_results(results)
+        comparison = engine.compare()
+        baseline = StatisticalAnalyzer().compare_multiple_algorithms(results)
+
+        friedman = comparison['global_test']
+        assert friedman['statistic'] == pytest.approx(baseline['global_test']['statistic'])
+        assert friedman['p_value'] == pytest.approx(baseline['global_test']['p_value'])
+
+        keys = list(baseline['pairwise_comparisons'])
+        assert list(comparison['pairwise_comparisons']) == keys
+        p_values = []
+        for key in keys:
+            expected = baseline['pairwise_comparisons'][key]['wilcoxon']
+            actual = comparison['pairwise_comparisons'][key]['wilcoxon']
+            assert actual['statistic'] == pytest.approx(expected['statistic'])
+            assert actual['p_value'] == pytest.approx(expected['p_value'])
+            p_values.append(expected['p_value'])
+        holm = self._holm(p_values)
+        for key, p_holm in zip(keys, holm):
+            assert comparison['pairwise_comparisons'][key]['wilcoxon']['p_holm'] == pytest.approx(p_holm)
+
+        matrix = np.array([results[name] for name in results])
+        ranks = stats.rankdata(matrix, axis=0)
+        np.testing.assert_allclose(engine.ranks(), ranks)
+        for a, name in enumerate(results):
+            assert comparison['average_rankings'][name] == pytest.approx(ranks[a].mean())
+
+    def test_small_sample_wilcoxon_is_exact(self):
+        """Con pocas instancias sin empates el p-value es el exacto"""
+        engine = ResultsEngine.from_algorithm_results({
+            'A': [2.0, 3.0, 4.0, 5.0, 6.0],
+            'B': [1.0, 1.0, 1.0, 1.0, 1.0],
+        })
+        wilcoxon = engine.compare()['pairwise_comparisons']['A_vs_B']['wilcoxon']
+        assert wilcoxon['p_value'] == pytest.approx(0.0625)
+
+    def test_holm_correction(self):
+        """Holm vectorizado frente a la versión secuencial"""
+        p_values = [0.01, 0.04, 0.03, 0.2, 0.005]
+        np.testing.assert_allclose(holm_correction(np.array(p_values)), self._holm(p_values))
+
+
+# Ejecutar tests
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
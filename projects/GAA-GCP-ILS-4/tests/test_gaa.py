@@ -13,6 +13,8 @@ sys.path.insert(0, str(project_root))
 from gaa.grammar import Grammar
 from gaa.generator import AlgorithmGenerator
 from gaa.interpreter import execute_algorithm
+from gaa.fitness import FitnessService, algorithm_key
+from gaa.racing import RacingEvaluator, optimistic_mean
 from gaa.ast_nodes import (
     Seq, While, For, If, Call,
     GreedyConstruct, LocalSearch, Perturbation,
@@ -217,6 +219,197 @@ class TestInterpreter:
         
         assert solution is not None
         assert solution.num_colors >= 0
+    
+    def test_best_is_snapshot_of_shared_state(self):
+        """La mejor solución es una copia: no cambia con el estado mutable"""
+        from gaa.interpreter import ASTInterpreter
+        
+        problem = GraphColoringProblem(vertices=3, edges=[(1, 2), (2, 3), (1, 3)])
+        alg = Seq(body=[
+            GreedyConstruct("DSATUR"),
+            Perturbation("RandomRecolor", intensity=1.0),
+            LocalSearch("OneVertexMove", max_iterations=5)
+        ])
+        interpreter = ASTInterpreter(problem, np.random.default_rng(0))
+        best = interpreter.execute(alg)
+        
+        assert best is not interpreter.context.state
+        assert best.is_feasible(problem)
+        assert best.num_colors == 3
+    
+    def test_stops_at_proven_optimum(self):
+        """Tras alcanzar la cota del clique no se ejecutan más nodos"""
+        from gaa.interpreter import ASTInterpreter
+        
+        problem = GraphColoringProblem(vertices=3, edges=[(1, 2), (2, 3), (1, 3)])
+        alg = Seq(body=[
+            GreedyConstruct("DSATUR"),
+            While(max_iterations=50, body=Perturbation("RandomRecolor", intensity=1.0))
+        ])
+        interpreter = ASTInterpreter(problem, np.random.default_rng(0))
+        best = interpreter.execute(alg)
+        
+        stats = interpreter.context.get_statistics()
+        assert best.num_colors == 3
+        assert stats['proven_optimal']
+        assert stats['iterations'] == 0
+
+
+
+class TestFitnessService:
+    """Tests para evaluación memoizada de fitness"""
+    
+    @pytest.fixture
+    def instances(self):
+        """Dos instancias pequeñas de entrenamiento"""
+        return [
+            GraphColoringProblem(vertices=3, edges=[(1, 2), (2, 3), (1, 3)], name="triangle"),
+            GraphColoringProblem(vertices=4, edges=[(1, 2), (2, 3), (3, 4), (1, 4)], name="c4"),
+        ]
+    
+    def _algorithm(self):
+        return Seq(body=[
+            GreedyConstruct("DSATUR"),
+            LocalSearch("KempeChain", max_iterations=10)
+        ])
+    
+    def test_algorithm_key_is_structural(self):
+        """Árboles idénticos comparten clave; parámetros distintos no"""
+        assert algorithm_key(self._algorithm()) == algorithm_key(self._algorithm())
+        other = Seq(body=[
+            GreedyConstruct("DSATUR"),
+            LocalSearch("KempeChain", max_iterations=20)
+        ])
+        assert algorithm_key(self._algorithm()) != algorithm_key(other)
+    
+    def test_duplicates_are_memoised(self, instances):
+        """Un árbol repetido solo se ejecuta una vez por instancia"""
+        service = FitnessService(instances, seed=1, workers=1)
+        fitnesses = service.evaluate_many([self._algorithm(), self._algorithm()])
+        
+        assert fitnesses[0] == fitnesses[1]
+        assert service.misses == len(instances)
+        
+        assert service.evaluate(self._algorithm()) == fitnesses[0]
+        assert service.misses == len(instances)
+        assert service.hits == 2 * len(instances)
+    
+    def test_fitness_matches_direct_execution(self, instances):
+        """El fitness es el promedio de colores con la semilla de cada instancia"""
+        service = FitnessService(instances, seed=3, workers=1)
+        algorithm = self._algorithm()
+        expected = np.mean([
+            execute_algorithm(algorithm, problem, seed=seed).num_colors
+            for problem, seed in zip(instances, service.instance_seeds)
+        ])
+        assert service.evaluate(algorithm) == pytest.approx(expected)
+    
+    def test_disk_cache_persists(self, instances, tmp_path):
+        """La caché en disco se reutiliza en una nueva sesión"""
+        cache_file = tmp_path / "fitness_cache.jsonl"
+        first = FitnessService(instances, seed=7, workers=1, cache_path=str(cache_file))
+        fitness = first.evaluate(self._algorithm())
+        
+        second = FitnessService(instances, seed=7, workers=1, cache_path=str(cache_file))
+        assert second.evaluate(self._algorithm()) == fitness
+        assert second.misses == 0
+    
+    def test_pool_errors_are_not_cached(self, instances, tmp_path, monkeypatch):
+        """Un worker caído no deja fitness infinito memoizado ni en disco"""
+        from concurrent.futures import Future
+        from concurrent.futures.process import BrokenProcessPool
+        
+        class BrokenExecutor:
+            def submit(self, *args):
+                future = Future()
+                future.set_exception(BrokenProcessPool("worker caído"))
+                return future
+            
+            def shutdown(self, wait=True):
+                pass
+        
+        cache_file = tmp_path / "fitness_cache.jsonl"
+        service = FitnessService(instances, seed=7, workers=2, cache_path=str(cache_file))
+        monkeypatch.setattr(service, '_get_executor', lambda: BrokenExecutor())
+        assert service.evaluate(self._algorithm()) == float('inf')
+        assert service.cache == {}
+        assert not cache_file.exists()
+        
+        retry = FitnessService(instances, seed=7, workers=1, cache_path=str(cache_file))
+        assert retry.evaluate(self._algorithm()) < float('inf')
+        assert retry.misses == len(instances)
+
+
+
+class TestRacing:
+    """Tests para evaluación por carreras"""
+    
+    @pytest.fixture
+    def service(self):
+        """Servicio con instancias de coste creciente"""
+        instances = [
+            GraphColoringProblem(vertices=4, edges=[(1, 2), (2, 3), (3, 4), (1, 4)], name="c4"),
+            GraphColoringProblem(vertices=3, edges=[(1, 2), (2, 3), (1, 3)], name="triangle"),
+            GraphColoringProblem(vertices=4, edges=[(1, 2), (1, 3), (1, 4), (2, 3), (2, 4), (3, 4)], name="k4"),
+        ]
+        return FitnessService(instances, seed=5, workers=1)
+    
+    def _algorithm(self):
+        return Seq(body=[
+            GreedyConstruct("DSATUR"),
+            LocalSearch("KempeChain", max_iterations=10)
+        ])
+    
+    def test_optimistic_mean(self):
+        """Las cotas pendientes solo se suman mientras bajen el promedio"""
+        assert optimistic_mean([4, 4], [2, 6]) == pytest.approx(10 / 3)
+        assert optimistic_mean([None], [3]) == 3
+        assert optimistic_mean([], []) == float('inf')
+    
+    def test_cheapest_instance_first(self, service):
+        """Las instancias se recorren por |V| + |E| creciente"""
+        racer = RacingEvaluator(service)
+        assert racer.order == [1, 0, 2]
+    
+    def test_complete_race_matches_full_evaluation(self, service):
+        """Sin umbral la carrera evalúa todo y coincide con el fitness"""
+        racer = RacingEvaluator(service, alpha=None)
+        result = racer.evaluate(self._algorithm())
+        
+        assert result.completed
+        assert result.instances_evaluated == 3
+        assert result.fitness == service.evaluate(self._algorithm())
+    
+    def test_bound_rejects_early(self, service):
+        """Un umbral inalcanzable corta tras la primera instancia"""
+        racer = RacingEvaluator(service, alpha=None)
+        result = racer.evaluate(self._algorithm(), threshold=2.0)
+        
+        assert not result.completed
+        assert result.rejected_by == 'bound'
+        assert result.instances_evaluated == 1
+        assert service.misses == 1
+    
+    def test_infeasible_results_are_failures(self, service, monkeypatch):
+        """Una coloración con conflictos cuenta como fallo, no frente a la cota"""
+        import gaa.fitness
+        
+        # Un único color: 1 < |clique| en todas las instancias, pero no factible
+        monkeypatch.setattr(gaa.fitness, '_run_job',
+                            lambda algorithm, index, seed: np.zeros(
+                                service.instances[index].n_vertices, dtype=np.int32))
+        assert service.instance_values([self._algorithm()], [0, 1, 2]) == [[None, None, None]]
+        
+        racer = RacingEvaluator(service, alpha=None)
+        result = racer.evaluate(GreedyConstruct("LF"), threshold=2.5)
+        assert result.rejected_by == 'bound'
+        assert result.fitness == float('inf')
+    
+    def test_population_race_without_test(self, service):
+        """Con alpha=None nadie es eliminado"""
+        racer = RacingEvaluator(service, alpha=None)
+        results = racer.race([self._algorithm(), GreedyConstruct("LF")])
+        assert all(r.completed for r in results)
 
 
 # Ejecutar tests
@@ -24,6 +24,7 @@ from operators.constructive import GreedyDSATUR, RandomSequential
 from operators.improvement import KempeChain, OneVertexMove
 from operators.perturbation import RandomRecolor, PartialDestroy
 from metaheuristic.ils_core import IteratedLocalSearch, AdaptiveILS, ILSHistory
+from metaheuristic.k_fixed import KFixedSearch
 from metaheuristic.perturbation_schedules import (
     ConstantPerturbation, LinearPerturbation, ExponentialPerturbation,
     DynamicPerturbation, create_schedule
@@ -208,6 +209,49 @@ class TestIteratedLocalSearchBasic:
         assert best_solution.is_feasible(small_problem)
 
 
+class TestProvenOptimal:
+    """Tests de parada al alcanzar la cota inferior del clique"""
+    
+    @pytest.fixture
+    def even_cycle(self):
+        """Fixture: Ciclo par (ω = χ = 2)"""
+        edges = [(i, i % 10 + 1) for i in range(1, 11)]
+        return GraphColoringProblem(vertices=10, edges=edges, colors_known=2)
+    
+    def test_ils_stops_at_lower_bound(self, even_cycle):
+        """Validar que ILS no itera si la solución inicial es óptima probada"""
+        ils = IteratedLocalSearch(even_cycle, max_iterations=100, seed=42)
+        best, history = ils.solve()
+        assert best.num_colors == 2
+        assert ils.proven_optimal
+        assert ils.iteration_count == 0
+        assert len(history) == 0
+    
+    def test_ils_stop_can_be_disabled(self, even_cycle):
+        """Validar que sin parada por cota se agota el criterio normal"""
+        ils = IteratedLocalSearch(even_cycle, max_iterations=5, seed=42,
+                                  stop_at_lower_bound=False)
+        ils.solve()
+        assert ils.proven_optimal
+        assert ils.iteration_count == 5
+    
+    def test_adaptive_ils_stops_at_lower_bound(self, even_cycle):
+        """Validar la parada también en AdaptiveILS"""
+        ils = AdaptiveILS(even_cycle, max_iterations=100, seed=42)
+        best, history = ils.solve()
+        assert ils.proven_optimal
+        assert len(history) == 0
+    
+    def test_kfixed_does_not_go_below_lower_bound(self, even_cycle):
+        """Validar que k fijo se detiene en la cota y la marca como óptima"""
+        search = KFixedSearch(even_cycle, time_per_k=0.5, time_budget=2.0,
+                              constructive=RandomSequential.construct, seed=1)
+        best, history = search.solve()
+        assert best.num_colors == 2
+        assert search.proven_optimal
+        assert all(a.k >= 2 for a in history.attempts)
+
+
 class TestILSHistory:
     """Tests para ILSHistory dataclass"""
     
@@ -231,6 +275,34 @@ class TestILSHistory:
         assert len(history.best_fitness) == 3
         assert history.best_fitness[-1] == 6
     
+    def test_history_sampling(self):
+        """Validar muestreo del historial y crecimiento de buffers"""
+        history = ILSHistory(capacity=2, sampling=3)
+        for i in range(10):
+            history.add_iteration(iteration=i, best_fitness=10 - i, current_fitness=10 - i,
+                                num_colors=5, num_conflicts=0, elapsed_time=0.1 * i,
+                                accepted=True, improved=False)
+        assert len(history) == 4
+        assert list(history.iterations) == [0, 3, 6, 9]
+        assert history.to_dict()['best_fitness'] == [10.0, 7.0, 4.0, 1.0]
+
+    def test_history_from_lists_and_set_series(self):
+        """Validar construcción desde listas y reemplazo explícito de series"""
+        history = ILSHistory.from_lists(iterations=[0, 1, 2], best_fitness=[9, 7, 7])
+        assert len(history) == 3
+        assert list(history.num_colors) == [0, 0, 0]
+        history.add_iteration(iteration=3, best_fitness=5, current_fitness=6,
+                            num_colors=4, num_conflicts=0, elapsed_time=0.4,
+                            accepted=True, improved=True)
+        assert history.to_dict()['best_fitness'] == [9.0, 7.0, 7.0, 5.0]
+
+        history.set_series('num_colors', [5, 5])
+        assert len(history) == 2 and list(history.iterations) == [0, 1]
+        with pytest.raises(ValueError):
+            history.set_series('unknown', [1])
+        with pytest.raises(ValueError):
+            ILSHistory.from_lists(iterations=[0, 1], times=[0.1])
+    
     def test_history_track_times(self):
         """Validar registro de tiempos"""
         history = ILSHistory()
@@ -518,6 +590,46 @@ class TestILSIntegration:
         assert best.is_feasible(test_problem)
 
 
+class TestKFixedSearch:
+    """Tests para el driver de k decreciente"""
+    
+    @pytest.fixture
+    def myciel_like(self):
+        """Fixture: Grafo de Grötzsch (myciel4, χ = 4)"""
+        edges = [(1, 2), (1, 4), (1, 7), (1, 9), (2, 3), (2, 6), (2, 8),
+                 (3, 5), (3, 7), (3, 10), (4, 5), (4, 6), (4, 10), (5, 8),
+                 (5, 9), (6, 11), (7, 11), (8, 11), (9, 11), (10, 11)]
+        return GraphColoringProblem(vertices=11, edges=edges, colors_known=4)
+    
+    def test_kfixed_returns_legal_coloring(self, myciel_like):
+        """Validar que la mejor solución es legal y no peor que la inicial"""
+        search = KFixedSearch(myciel_like, time_per_k=0.5, time_budget=2.0, seed=1)
+        best, history = search.solve()
+        assert best.is_feasible(myciel_like)
+        assert best.num_colors == search.best_k <= history.initial_k
+        assert best.num_colors >= 4
+    
+    def test_kfixed_time_to_target(self, myciel_like):
+        """Validar registro de time-to-target por k"""
+        search = KFixedSearch(myciel_like, time_per_k=0.5, time_budget=2.0,
+                              constructive=RandomSequential.construct, seed=3)
+        best, history = search.solve()
+        for k, elapsed in history.time_to_target.items():
+            assert k >= best.num_colors
+            assert elapsed >= 0
+        assert history.attempts[-1].success is False or best.num_colors == 2
+    
+    def test_kfixed_respects_target_k(self, myciel_like):
+        """Validar parada al alcanzar target_k"""
+        search = KFixedSearch(myciel_like, time_per_k=0.5, time_budget=2.0,
+                              constructive=RandomSequential.construct,
+                              target_k=5, seed=1)
+        best, history = search.solve()
+        assert best.is_feasible(myciel_like)
+        assert all(a.k >= 5 for a in history.attempts)
+        assert best.num_colors == min(history.initial_k, 5)
+
+
 if __name__ == "__main__":
     """
     Ejecutar con:
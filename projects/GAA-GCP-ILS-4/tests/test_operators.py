@@ -14,11 +14,14 @@ Cobertura:
 
 import pytest
 import numpy as np
+from pathlib import Path
 
 from core.problem import GraphColoringProblem
 from core.solution import ColoringSolution
 from operators.constructive import GreedyDSATUR, GreedyLF, RandomSequential
 from operators.improvement import KempeChain, OneVertexMove, TabuCol
+from operators.kempe import KempeEngine
+from operators.worklist import VertexWorklist
 from operators.perturbation import RandomRecolor, PartialDestroy, AdaptivePerturbation
 from operators.repair import RepairConflicts, IntensifyColor, Diversify
 
@@ -183,6 +186,78 @@ class TestImprovementOperators:
         improved = KempeChain.improve(suboptimal_solution, simple_graph)
         assert len(improved.assignment) == simple_graph.n_vertices
     
+    def test_kempe_chain_resolves_conflicts(self, conflicting_solution):
+        """Validar que KempeChain reduce conflictos y conserva la caché"""
+        problem, solution = conflicting_solution
+        before = solution.num_conflicts(problem)
+        improved = KempeChain.improve(solution, problem)
+        assert improved.num_conflicts(problem) < before
+        fresh = ColoringSolution(assignment=dict(improved.assignment))
+        assert fresh.num_conflicts(problem) == improved.num_conflicts(problem)
+    
+    def test_kempe_engine_delta_matches_swap(self):
+        """Validar que el delta calculado coincide con el intercambio real"""
+        problem = GraphColoringProblem.load_from_dimacs(str(Path(__file__).parent.parent / "datasets" / "MYC" / "myciel4.col"))
+        rng = np.random.default_rng(1)
+        solution = ColoringSolution(
+            assignment={v: int(rng.integers(0, 4)) for v in range(1, problem.n_vertices + 1)}
+        )
+        engine = KempeEngine(solution, problem)
+        for i in range(problem.n_vertices):
+            for color in range(4):
+                if color == engine.colors[i]:
+                    continue
+                before = engine.conflicts
+                chain, delta = engine.chain(i, color)
+                engine.swap(chain, engine.colors[i], color)
+                assert engine.conflicts == before + delta
+        result = engine.to_solution(solution)
+        assert result.num_conflicts(problem) == engine.conflicts
+        fresh = ColoringSolution(assignment=dict(result.assignment))
+        assert fresh.num_conflicts(problem) == engine.conflicts
+    
+    def test_kempe_engine_chain_cache_invalidation(self):
+        """Validar que la caché se comparte en la cadena y se invalida al cambiar"""
+        edges = [(1, 2), (2, 3), (3, 4)]
+        problem = GraphColoringProblem(vertices=4, edges=edges)
+        solution = ColoringSolution(assignment={1: 0, 2: 1, 3: 0, 4: 2})
+        engine = KempeEngine(solution, problem)
+        chain, _ = engine.chain(0, 1)
+        assert sorted(chain) == [0, 1, 2]
+        assert engine.chain(2, 1)[0] is chain
+        engine.set_color(3, 1)
+        assert sorted(engine.chain(0, 1)[0]) == [0, 1, 2, 3]
+    
+    def test_kempe_engine_weights_parallel_edges(self):
+        """Validar que el motor pondera los conflictos por multiplicidad"""
+        edges = [(1, 2), (2, 1), (2, 3), (3, 4), (4, 3)]
+        problem = GraphColoringProblem(vertices=4, edges=edges)
+        solution = ColoringSolution(assignment={1: 0, 2: 0, 3: 1, 4: 1})
+        engine = KempeEngine(solution, problem)
+        assert engine.conflicts == solution.num_conflicts(problem) == 4
+        chain, delta = engine.chain(0, 1)
+        engine.swap(chain, 0, 1)
+        assert engine.conflicts == 4 + delta
+        result = engine.to_solution(solution)
+        assert ColoringSolution(assignment=dict(result.assignment)).num_conflicts(problem) == engine.conflicts
+    
+    def test_find_chain_matches_engine(self):
+        """Validar que _find_chain coincide con la cadena del motor"""
+        problem = GraphColoringProblem.load_from_dimacs(str(Path(__file__).parent.parent / "datasets" / "MYC" / "myciel4.col"))
+        rng = np.random.default_rng(2)
+        solution = ColoringSolution(
+            assignment={v: int(rng.integers(0, 3)) for v in range(1, problem.n_vertices + 1)}
+        )
+        engine = KempeEngine(solution, problem)
+        offset = problem.vertex_offset
+        for i in range(problem.n_vertices):
+            for color in range(3):
+                if color == engine.colors[i]:
+                    continue
+                chain, _ = engine.chain(i, color)
+                found = KempeChain._find_chain(solution, problem, i + offset, engine.colors[i], color)
+                assert found == {j + offset for j in chain}
+    
     # ========================================================================
     # Tests OneVertexMove
     # ========================================================================
@@ -202,7 +277,69 @@ class TestImprovementOperators:
         """Validar asignación completa"""
         improved = OneVertexMove.improve(suboptimal_solution, simple_graph)
         assert len(improved.assignment) == simple_graph.n_vertices
-    
+
+    @staticmethod
+    def _reference_one_vertex_move(solution, problem, max_iterations=100):
+        """OneVertexMove original: recorre 1..n en cada iteración"""
+        assignment = dict(solution.assignment)
+        improved, iteration = True, 0
+        while improved and iteration < max_iterations:
+            improved = False
+            iteration += 1
+            for vertex in range(1, problem.n_vertices + 1):
+                neighbor_colors = [assignment.get(w) for w in problem.neighbors(vertex)]
+                best_color = 0
+                while best_color in neighbor_colors:
+                    best_color += 1
+                old_color = assignment[vertex]
+                if best_color < old_color:
+                    delta = neighbor_colors.count(best_color) - neighbor_colors.count(old_color)
+                    if delta <= 0:
+                        assignment[vertex] = best_color
+                        improved = True
+                        break
+        return assignment
+
+    @pytest.mark.parametrize("max_iterations", [1, 5, 100])
+    def test_one_vertex_move_matches_full_scan(self, max_iterations):
+        """Validar que la worklist produce lo mismo que el barrido completo original"""
+        rng = np.random.default_rng(6)
+        for _ in range(40):
+            n = int(rng.integers(5, 25))
+            edges = [(u, v) for u in range(1, n + 1) for v in range(u + 1, n + 1)
+                     if rng.random() < 0.3] or [(1, 2)]
+            problem = GraphColoringProblem(vertices=n, edges=edges)
+            solution = ColoringSolution(
+                assignment={v: int(rng.integers(0, 6)) for v in range(1, n + 1)}
+            )
+            expected = self._reference_one_vertex_move(solution, problem, max_iterations)
+
+            improved = OneVertexMove.improve(solution, problem, max_iterations=max_iterations)
+            assert improved.assignment == expected
+            target = solution.copy()
+            OneVertexMove.improve(target, problem, max_iterations=max_iterations, inplace=True)
+            assert target.assignment == expected
+
+    def test_vertex_worklist_tracks_conflicts(self):
+        """Validar que los conflictos incrementales coinciden con un barrido completo"""
+        problem = GraphColoringProblem.load_from_dimacs(str(Path(__file__).parent.parent / "datasets" / "MYC" / "myciel4.col"))
+        rng = np.random.default_rng(3)
+        solution = ColoringSolution(
+            assignment={v: int(rng.integers(0, 4)) for v in range(1, problem.n_vertices + 1)}
+        )
+        worklist = VertexWorklist(solution, problem, pending=())
+        touched = set()
+        for _ in range(50):
+            i, color = int(rng.integers(problem.n_vertices)), int(rng.integers(0, 4))
+            if color != worklist.colors[i]:
+                touched.add(i)
+                touched.update(worklist.neighbors(i))
+            worklist.set_color(i, color)
+            solution.set_color(i + 1, color)
+            assert {i + 1 for i in worklist.conflicted} == solution.conflict_vertices(problem)
+        # Solo quedan pendientes los vértices recoloreados y sus vecinos
+        assert list(iter(worklist.pop, None)) == sorted(touched)
+
     # ========================================================================
     # Tests TabuCol
     # ========================================================================
@@ -227,6 +364,30 @@ class TestImprovementOperators:
         """Validar parámetro de iteraciones"""
         improved = TabuCol.improve(suboptimal_solution, simple_graph, max_iterations=50)
         assert improved.is_feasible(simple_graph) == True
+    
+    def test_tabucol_inplace_matches_copy(self):
+        """Validar que in-place deja la misma mejor solución que el modo copia"""
+        rng = np.random.default_rng(4)
+        for _ in range(20):
+            n = int(rng.integers(6, 14))
+            edges = [(u, v) for u in range(1, n + 1) for v in range(u + 1, n + 1)
+                     if rng.random() < 0.4]
+            if not edges:
+                continue
+            problem = GraphColoringProblem(vertices=n, edges=edges)
+            initial = ColoringSolution(
+                assignment={v: int(rng.integers(0, 3)) for v in range(1, n + 1)}
+            )
+            
+            copied = TabuCol.improve(initial, problem, max_iterations=30, seed=1)
+            target = initial.copy()
+            inplace = TabuCol.improve(target, problem, max_iterations=30, seed=1, inplace=True)
+            
+            assert inplace is target
+            assert inplace.assignment == copied.assignment
+            fresh = ColoringSolution(assignment=dict(inplace.assignment))
+            assert fresh.num_conflicts(problem) == inplace.num_conflicts(problem)
+            assert fresh.num_conflicts(problem) <= initial.num_conflicts(problem)
 
 
 class TestPerturbationOperators:
@@ -269,6 +430,31 @@ class TestPerturbationOperators:
         perturbed = RandomRecolor.perturb(solution, problem, strength=1.0)
         assert len(perturbed.assignment) == problem.n_vertices
     
+    def test_random_recolor_matches_original(self):
+        """Validar misma perturbación que la versión original con la misma semilla"""
+        rng = np.random.default_rng(2)
+        for seed in range(20):
+            n = int(rng.integers(5, 15))
+            edges = [(u, v) for u in range(1, n + 1) for v in range(u + 1, n + 1)
+                     if rng.random() < 0.4] or [(1, 2)]
+            problem = GraphColoringProblem(vertices=n, edges=edges)
+            solution = ColoringSolution(
+                assignment={v: int(rng.integers(0, 4)) for v in range(1, n + 1)}
+            )
+            
+            # Versión original: num_colors se calculaba una vez (caché) antes
+            # de recolorear, sobre la asignación de partida
+            np.random.seed(seed)
+            expected = dict(solution.assignment)
+            max_color = max(max(expected.values()) + 1, 1)
+            vertices = np.random.choice(list(range(1, n + 1)),
+                                        size=max(1, int(0.3 * n)), replace=False)
+            for vertex in vertices:
+                expected[vertex] = np.random.randint(0, max_color + 1)
+            
+            perturbed = RandomRecolor.perturb(solution, problem, ratio=0.3, seed=seed)
+            assert perturbed.assignment == expected
+    
     # ========================================================================
     # Tests PartialDestroy
     # ========================================================================
@@ -352,6 +538,59 @@ class TestRepairOperators:
         repaired = RepairConflicts.repair(solution, problem)
         assert repaired.num_colors <= initial_colors
     
+    @staticmethod
+    def _reference_repair(solution, problem, max_iterations=100):
+        """Reparación con barrido completo de aristas en cada pasada"""
+        assignment = dict(solution.assignment)
+        for _ in range(max_iterations):
+            conflicted = set()
+            for u, v in problem.edges:
+                if assignment.get(u, -1) == assignment.get(v, -1):
+                    conflicted.update((u, v))
+            if not conflicted:
+                break
+            counts = {
+                v: sum(1 for w in problem.neighbors(v) if assignment.get(w) == assignment[v])
+                for v in conflicted
+            }
+            for vertex in sorted(conflicted,
+                                 key=lambda v: (-counts[v], problem.degree(v), v)):
+                neighbor_colors = {assignment.get(w) for w in problem.neighbors(vertex)}
+                if assignment[vertex] not in neighbor_colors:
+                    continue  # Resuelto por una recoloración anterior
+                color = 0
+                while color in neighbor_colors:
+                    color += 1
+                assignment[vertex] = color
+        return assignment
+    
+    @pytest.mark.parametrize("max_iterations", [1, 100])
+    def test_repair_matches_full_scan(self, max_iterations):
+        """Validar misma reparación que el barrido completo de aristas"""
+        rng = np.random.default_rng(8)
+        for _ in range(40):
+            n = int(rng.integers(5, 20))
+            edges = [(u, v) for u in range(1, n + 1) for v in range(u + 1, n + 1)
+                     if rng.random() < 0.35] or [(1, 2)]
+            problem = GraphColoringProblem(vertices=n, edges=edges)
+            solution = ColoringSolution(
+                assignment={v: int(rng.integers(0, 3)) for v in range(1, n + 1)}
+            )
+            
+            repaired = RepairConflicts.repair(solution, problem, max_iterations=max_iterations)
+            assert repaired.assignment == self._reference_repair(solution, problem,
+                                                                 max_iterations)
+            fresh = ColoringSolution(assignment=dict(repaired.assignment))
+            assert fresh.num_conflicts(problem) == repaired.num_conflicts(problem)
+    
+    def test_repair_ties_prefer_lower_degree(self, valid_solution):
+        """Validar que los empates recolorean primero el vértice de menor grado"""
+        problem, solution = valid_solution
+        # 1 y 4 comparten color con un conflicto cada uno; 4 tiene menor grado
+        # y su recoloración resuelve también el conflicto de 1
+        repaired = RepairConflicts.repair(solution, problem)
+        assert repaired.assignment == {1: 0, 2: 1, 3: 2, 4: 1}
+    
     def test_repair_with_color_reduction(self, conflicting_problem_solution):
         """Validar variante con reducción de colores"""
         problem, solution = conflicting_problem_solution
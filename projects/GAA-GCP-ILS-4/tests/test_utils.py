@@ -0,0 +1,133 @@
+"""
+Tests para módulo de utilidades (SessionStore y OutputManager en modo buffered)
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.session_store import SessionStore, SESSION_STORE_FILENAME
+from utils.output_manager import OutputManager
+from core.problem import GraphColoringProblem
+from core.solution import ColoringSolution
+
+
+class TestSessionStore:
+    """Tests para el almacén de sesión append-only"""
+
+    def test_records_in_order_and_filtered(self, tmp_path):
+        """Los registros se leen en orden de llegada y se pueden filtrar"""
+        with SessionStore(tmp_path) as store:
+            store.append('json', 'a.json', {'x': 1})
+            store.append('jsonl', 'r.jsonl', {'y': 2})
+            store.append('json', 'a.json', {'x': 3})
+
+            records = store.records()
+            assert [r['seq'] for r in records] == [1, 2, 3]
+            assert [r['data'] for r in store.records(path='a.json')] == [{'x': 1}, {'x': 3}]
+            assert [r['data'] for r in store.records(kind='jsonl')] == [{'y': 2}]
+
+        assert (tmp_path / SESSION_STORE_FILENAME).exists()
+
+    def test_resumed_store_continues_sequence(self, tmp_path):
+        """Reabrir el almacén continúa la numeración y conserva los registros"""
+        with SessionStore(tmp_path) as store:
+            store.append('text', 'a.txt', 'uno')
+
+        with SessionStore(tmp_path) as store:
+            assert store.append('text', 'a.txt', 'dos') == 2
+            assert [r['data'] for r in store.records()] == ['uno', 'dos']
+
+    def test_append_after_close_fails(self, tmp_path):
+        """Un almacén cerrado no acepta registros"""
+        store = SessionStore(tmp_path)
+        store.close()
+        with pytest.raises(RuntimeError):
+            store.append('text', 'a.txt', 'x')
+
+
+class TestBufferedOutputManager:
+    """Tests para la exportación del modo buffered frente al modo directo"""
+
+    @pytest.fixture
+    def problem(self):
+        return GraphColoringProblem(vertices=3, edges=[(1, 2), (2, 3)], name="path3")
+
+    @staticmethod
+    def _manager(base: Path, buffered: bool) -> OutputManager:
+        """Gestor sobre <base>/session (mismo nombre de sesión = mismo timestamp)"""
+        (base / "session").mkdir(parents=True)
+        manager = OutputManager(base_output_dir=str(base), buffered=buffered)
+        manager.resume_session(base / "session")
+        return manager
+
+    @staticmethod
+    def _files(session_dir: Path) -> dict:
+        """Contenido de todos los artefactos de la sesión (sin el store)"""
+        return {
+            path.relative_to(session_dir).as_posix(): path.read_text(encoding='utf-8')
+            for path in sorted(session_dir.rglob('*'))
+            if path.is_file() and path.name != SESSION_STORE_FILENAME
+        }
+
+    def _save_all(self, manager: OutputManager, problem: GraphColoringProblem):
+        solution = ColoringSolution(assignment={1: 0, 2: 1, 3: 0})
+        manager.save_summary_csv([{'instance': 'path3', 'colors': 2},
+                                  {'instance': 'ñandú', 'colors': 3}])
+        manager.save_detailed_json({'results': [1, 2], 'name': 'ñandú'})
+        manager.save_detailed_json({'results': [3]}, filename="overwritten.json")
+        manager.save_detailed_json({'results': [4]}, filename="overwritten.json")
+        manager.save_statistics_txt("media: 2.5\n")
+        manager.save_solution('path3', solution, problem)
+        manager.append_replica_result({'instance': 'path3', 'seed': 1, 'status': 'ok'})
+        manager.append_replica_result({'instance': 'path3', 'seed': 2, 'status': 'ok'})
+
+    def test_export_matches_unbuffered_output(self, tmp_path, problem):
+        """Exportar (dos veces) produce los mismos archivos que el modo directo"""
+        plain = self._manager(tmp_path / "plain", buffered=False)
+        buffered = self._manager(tmp_path / "buffered", buffered=True)
+        self._save_all(plain, problem)
+        self._save_all(buffered, problem)
+
+        # Nada se materializa hasta exportar, pero las réplicas se pueden leer
+        assert not (buffered.results_dir / "summary.csv").exists()
+        assert buffered.load_replica_results() == plain.load_replica_results()
+
+        buffered.export_session()
+        buffered.export_session()
+        expected = self._files(plain.session_dir)
+        assert 'results/replicas.jsonl' in expected
+        assert self._files(buffered.session_dir) == expected
+        buffered.close()
+
+    def test_jsonl_is_append_only_across_exports(self, tmp_path, problem):
+        """Los JSONL solo reciben líneas nuevas, también tras reanudar la sesión"""
+        plain = self._manager(tmp_path / "plain", buffered=False)
+        buffered = self._manager(tmp_path / "buffered", buffered=True)
+        self._save_all(plain, problem)
+        self._save_all(buffered, problem)
+        buffered.export_session()
+
+        record = {'instance': 'path3', 'seed': 3, 'status': 'timeout'}
+        plain.append_replica_result(record)
+        buffered.append_replica_result(record)
+        assert len(buffered.load_replica_results()) == 3
+        buffered.export_session()
+        buffered.close()
+
+        resumed = OutputManager(base_output_dir=str(tmp_path / "buffered"), buffered=True)
+        resumed.resume_session(tmp_path / "buffered" / "session")
+        assert resumed.export_session()
+        resumed.close()
+
+        replicas = buffered.results_dir / "replicas.jsonl"
+        assert len(replicas.read_text(encoding='utf-8').splitlines()) == 3
+        assert self._files(buffered.session_dir) == self._files(plain.session_dir)
+
+
+# Ejecutar tests
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
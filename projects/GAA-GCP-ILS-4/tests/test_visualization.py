@@ -0,0 +1,83 @@
+"""
+Tests para módulo de visualización (cola de renderizado diferido)
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from visualization.render_queue import RenderQueue, MANIFEST_FILENAME
+
+
+class CountingPlotManager:
+    """Gestor mínimo: escribe los datos en plots/ y cuenta los dibujos"""
+
+    calls = 0
+
+    def __init__(self, session_dir: str):
+        self.plots_dir = Path(session_dir) / "plots"
+        self.plots_dir.mkdir(parents=True, exist_ok=True)
+
+    def plot_values(self, values, name: str = "values") -> str:
+        CountingPlotManager.calls += 1
+        path = self.plots_dir / f"{name}.txt"
+        path.write_text(" ".join(map(str, values)), encoding='utf-8')
+        return str(path)
+
+
+class TestRenderQueue:
+    """Tests para el renderizado incremental con manifiesto"""
+
+    @pytest.fixture(autouse=True)
+    def reset_calls(self):
+        CountingPlotManager.calls = 0
+
+    @staticmethod
+    def _render(session_dir, values, name="values"):
+        queue = RenderQueue(str(session_dir), workers=1)
+        queue.proxy(CountingPlotManager).plot_values(values, name=name)
+        return queue.render()
+
+    def test_manifest_skips_unchanged_plots(self, tmp_path):
+        """Una gráfica con el mismo hash y archivo existente no se redibuja"""
+        first = self._render(tmp_path, [1, 2, 3])
+        assert first['rendered'] == 1
+        assert (tmp_path / "plots" / MANIFEST_FILENAME).exists()
+
+        second = self._render(tmp_path, [1, 2, 3])
+        assert second['rendered'] == 0 and second['skipped'] == 1
+        assert CountingPlotManager.calls == 1
+
+        # Sin el archivo de salida el manifiesto no basta
+        Path(first['paths'][0]).unlink()
+        assert self._render(tmp_path, [1, 2, 3])['rendered'] == 1
+        assert CountingPlotManager.calls == 2
+
+    def test_changed_data_rerenders(self, tmp_path):
+        """Si cambian los datos (nuevo hash) la gráfica se vuelve a dibujar"""
+        self._render(tmp_path, [1, 2, 3])
+        stats = self._render(tmp_path, [1, 2, 4])
+        assert stats['rendered'] == 1 and stats['skipped'] == 0
+        assert CountingPlotManager.calls == 2
+        assert (tmp_path / "plots" / "values.txt").read_text(encoding='utf-8') == "1 2 4"
+
+    def test_serial_render_keeps_caller_backend(self, tmp_path):
+        """Renderizar en el proceso actual no cambia el backend de matplotlib"""
+        matplotlib = pytest.importorskip("matplotlib")
+        import matplotlib.pyplot as plt
+        
+        previous = matplotlib.get_backend()
+        plt.switch_backend('svg')
+        try:
+            self._render(tmp_path, [1])
+            assert matplotlib.get_backend() == 'svg'
+        finally:
+            plt.switch_backend(previous)
+
+
+# Ejecutar tests
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
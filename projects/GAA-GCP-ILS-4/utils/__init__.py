@@ -5,6 +5,7 @@ Utilidades del proyecto
 
 from .config import Config, load_config, get_config, ensure_directories
 from .output_manager import OutputManager, SessionInfo
+from .session_store import SessionStore
 
 __all__ = [
     "Config",
@@ -13,4 +14,5 @@ __all__ = [
     "ensure_directories",
     "OutputManager",
     "SessionInfo",
+    "SessionStore",
 ]
@@ -8,6 +8,8 @@ Responsabilidades:
 - Guardar archivos en ubicaciones correctas
 - Integrar con PlotManager
 - Gestionar logs
+- Modo buffered: registrar artefactos en un SessionStore (un único JSONL
+  escrito en segundo plano) y exportar la estructura de archivos bajo demanda
 """
 
 import json
@@ -19,6 +21,8 @@ from datetime import datetime
 from typing import Dict, Any, Optional, List, Union
 from dataclasses import dataclass, asdict
 
+from .session_store import SessionStore
+
 
 @dataclass
 class SessionInfo:
@@ -56,18 +60,32 @@ class OutputManager:
         >>> session_dir = output_mgr.create_session(mode="all_datasets")
         >>> output_mgr.save_summary_csv(data)
         >>> output_mgr.save_detailed_json(results)
+    
+    Con buffered=True los save_* no tocan el sistema de archivos: encolan
+    el artefacto en el SessionStore de la sesión (session.jsonl) y retornan
+    la ruta que tendrá tras export_session(), que materializa la estructura
+    de directorios de arriba.
+    
+        >>> output_mgr = OutputManager(buffered=True)
+        >>> output_mgr.create_session(mode="gaa_experiment")
+        >>> output_mgr.save_generation_algorithms(gen, population)   # no bloquea
+        >>> output_mgr.export_session()
+        >>> output_mgr.close()
     """
     
     # Formato de timestamp unificado
     TIMESTAMP_FORMAT = "%d-%m-%y_%H-%M-%S"
     
-    def __init__(self, config_path: Optional[str] = None, base_output_dir: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, base_output_dir: Optional[str] = None,
+                 buffered: bool = False):
         """
         Inicializa el gestor de outputs.
         
         Args:
             config_path: Ruta al config.yaml (opcional)
             base_output_dir: Directorio base de output (sobrescribe config)
+            buffered: Registrar los artefactos en un SessionStore y exportarlos
+                bajo demanda (export_session) en lugar de escribirlos uno a uno
         """
         # Inicializar logger primero
         self.logger = logging.getLogger(__name__)
@@ -85,6 +103,10 @@ class OutputManager:
         self.plots_dir: Optional[Path] = None
         self.solutions_dir: Optional[Path] = None
         self.logs_dir: Optional[Path] = None
+        
+        # Almacén de sesión (solo en modo buffered)
+        self.buffered = buffered
+        self.store: Optional[SessionStore] = None
     
     def _load_config(self, config_path: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -169,10 +191,53 @@ class OutputManager:
             family=family,
             session_dir=self.session_dir
         )
+        self._open_store()
         
         self.logger.info(f"Session created: {self.session_dir}")
         return self.session_dir
     
+    def resume_session(self, session_dir: Union[str, Path], mode: str = "all_datasets",
+                       family: Optional[str] = None) -> Path:
+        """
+        Reabre una sesión existente para continuar escribiendo en ella.
+        
+        Se usa para reanudar un experimento interrumpido: los resultados ya
+        registrados en results/replicas.jsonl se conservan.
+        
+        Args:
+            session_dir: Directorio de la sesión a reabrir
+            mode: Tipo de ejecución
+            family: Familia de dataset (opcional)
+        
+        Returns:
+            Path del directorio de sesión
+        """
+        session_dir = Path(session_dir)
+        if not session_dir.exists():
+            raise FileNotFoundError(f"Sesión no encontrada: {session_dir}")
+        
+        self.session_dir = session_dir
+        self.results_dir = session_dir / "results"
+        self.plots_dir = session_dir / "plots"
+        self.solutions_dir = session_dir / "solutions"
+        self.logs_dir = session_dir / "logs"
+        self.gaa_dir = session_dir / "gaa"
+        
+        for directory in (self.results_dir, self.plots_dir, self.solutions_dir,
+                          self.logs_dir, self.gaa_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+        
+        self.session_info = SessionInfo(
+            timestamp=session_dir.name,
+            mode=mode,
+            family=family,
+            session_dir=session_dir
+        )
+        self._open_store()
+        
+        self.logger.info(f"Session resumed: {self.session_dir}")
+        return self.session_dir
+    
     def get_session_dir(self) -> Path:
         """Retorna directorio de sesión actual"""
         if self.session_info is None:
@@ -206,12 +271,7 @@ class OutputManager:
             self.logger.warning("Empty data for CSV")
             return str(filepath)
         
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=data[0].keys())
-            writer.writeheader()
-            writer.writerows(data)
-        
-        self.logger.info(f"CSV saved: {filepath}")
+        self._write('csv', filepath, data, "CSV")
         return str(filepath)
     
     def save_detailed_json(self, data: Dict[str, Any], filename: str = "detailed_results.json") -> str:
@@ -226,14 +286,7 @@ class OutputManager:
             Ruta del archivo guardado
         """
         filepath = self.results_dir / filename
-        
-        # Convertir objetos no serializables
-        serializable_data = self._make_serializable(data)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(serializable_data, f, indent=2, ensure_ascii=False)
-        
-        self.logger.info(f"JSON saved: {filepath}")
+        self._write('json', filepath, data, "JSON")
         return str(filepath)
     
     def save_statistics_txt(self, content: str, filename: str = "statistics.txt") -> str:
@@ -248,11 +301,7 @@ class OutputManager:
             Ruta del archivo guardado
         """
         filepath = self.results_dir / filename
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        self.logger.info(f"TXT saved: {filepath}")
+        self._write('text', filepath, content, "TXT")
         return str(filepath)
     
     def save_solution(self, instance_name: str, solution, problem=None) -> str:
@@ -278,27 +327,78 @@ class OutputManager:
         filename = f"{instance_name}_{self.get_timestamp()}.sol"
         filepath = self.solutions_dir / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"c Solution for {instance_name}\n")
-            f.write(f"c Timestamp: {self.get_timestamp()}\n")
-            f.write(f"c Colors: {solution.num_colors}\n")
-            
-            if problem:
-                conflicts = solution.num_conflicts(problem)
-                feasible = solution.is_feasible(problem)
-                f.write(f"c Conflicts: {conflicts}\n")
-                f.write(f"c Feasible: {feasible}\n")
-            
-            f.write("c\n")
-            f.write("c Format: vertex color\n")
-            f.write("c\n")
-            
-            for vertex, color in sorted(solution.assignment.items()):
-                f.write(f"{vertex} {color}\n")
+        # Carga compacta: la asignación como pares [vértice, color] ordenados
+        payload = {
+            'instance': instance_name,
+            'timestamp': self.get_timestamp(),
+            'num_colors': solution.num_colors,
+            'assignment': sorted(solution.assignment.items()),
+        }
+        if problem:
+            payload['conflicts'] = solution.num_conflicts(problem)
+            payload['feasible'] = solution.is_feasible(problem)
         
-        self.logger.info(f"Solution saved: {filepath}")
+        self._write('solution', filepath, payload, "Solution")
         return str(filepath)
     
+    def append_replica_result(self, record: Dict[str, Any],
+                              filename: str = "replicas.jsonl") -> str:
+        """
+        Agrega el resultado de una réplica al registro incremental de la sesión.
+        
+        Cada línea es un objeto JSON independiente; el archivo se vacía a disco
+        tras cada escritura para que una caída no pierda resultados ya obtenidos.
+        En modo buffered el registro va al SessionStore (vaciado por el hilo
+        de fondo) y se añade al archivo al exportar.
+        
+        Args:
+            record: Resultado de una réplica (instance, algorithm, seed, ...)
+            filename: Nombre del archivo JSONL
+        
+        Returns:
+            Ruta del archivo
+        """
+        filepath = self.results_dir / filename
+        
+        if self.store is not None:
+            self.store.append('jsonl', self._relative(filepath), record)
+            return str(filepath)
+        
+        self._render('jsonl', filepath, [record])
+        return str(filepath)
+    
+    def load_replica_results(self, filename: str = "replicas.jsonl") -> List[Dict[str, Any]]:
+        """
+        Lee los resultados de réplicas ya registrados en la sesión.
+        
+        Las líneas incompletas (p. ej. escritura interrumpida) se ignoran.
+        En modo buffered se incluyen también los registros aún no exportados.
+        
+        Args:
+            filename: Nombre del archivo JSONL
+        
+        Returns:
+            Lista de registros en orden de llegada
+        """
+        filepath = self.results_dir / filename
+        records = []
+        
+        if filepath.exists():
+            with open(filepath, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        self.logger.warning(f"Línea incompleta ignorada en {filepath}")
+        
+        if self.store is not None:
+            records.extend(self._pending_lines(self._relative(filepath)))
+        
+        return records
+    
     # ========================================================================
     # GUARDADO DE ARCHIVOS GAA
     # ========================================================================
@@ -315,11 +415,7 @@ class OutputManager:
             Ruta del archivo guardado
         """
         filepath = self.gaa_dir / filename
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(algorithm.to_dict(), f, indent=2, ensure_ascii=False)
-        
-        self.logger.info(f"Algorithm JSON saved: {filepath}")
+        self._write('json', filepath, algorithm.to_dict(), "Algorithm JSON")
         return str(filepath)
     
     def save_algorithm_pseudocode(self, algorithm, filename: str = "algorithm_pseudocode.txt") -> str:
@@ -334,16 +430,15 @@ class OutputManager:
             Ruta del archivo guardado
         """
         filepath = self.gaa_dir / filename
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write("="*80 + "\n")
-            f.write("ALGORITMO GENERADO POR GAA\n")
-            f.write("="*80 + "\n\n")
-            f.write(algorithm.to_pseudocode(indent=0))
-            f.write("\n\n")
-            f.write("="*80 + "\n")
-        
-        self.logger.info(f"Pseudocode saved: {filepath}")
+        content = "".join([
+            "="*80 + "\n",
+            "ALGORITMO GENERADO POR GAA\n",
+            "="*80 + "\n\n",
+            algorithm.to_pseudocode(indent=0),
+            "\n\n",
+            "="*80 + "\n",
+        ])
+        self._write('text', filepath, content, "Pseudocode")
         return str(filepath)
     
     def save_evolution_history(self, history: Dict[str, Any], filename: str = "evolution_history.json") -> str:
@@ -358,13 +453,7 @@ class OutputManager:
             Ruta del archivo guardado
         """
         filepath = self.gaa_dir / filename
-        
-        serializable_history = self._make_serializable(history)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(serializable_history, f, indent=2, ensure_ascii=False)
-        
-        self.logger.info(f"Evolution history saved: {filepath}")
+        self._write('json', filepath, history, "Evolution history")
         return str(filepath)
     
     def save_population_stats(self, stats: Dict[str, Any], filename: str = "population_stats.json") -> str:
@@ -379,13 +468,7 @@ class OutputManager:
             Ruta del archivo guardado
         """
         filepath = self.gaa_dir / filename
-        
-        serializable_stats = self._make_serializable(stats)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(serializable_stats, f, indent=2, ensure_ascii=False)
-        
-        self.logger.info(f"Population stats saved: {filepath}")
+        self._write('json', filepath, stats, "Population stats")
         return str(filepath)
     
     def save_gaa_summary(self, content: str, filename: str = "evolution_summary.txt") -> str:
@@ -400,11 +483,7 @@ class OutputManager:
             Ruta del archivo guardado
         """
         filepath = self.gaa_dir / filename
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        self.logger.info(f"GAA summary saved: {filepath}")
+        self._write('text', filepath, content, "GAA summary")
         return str(filepath)
     
     def get_gaa_algorithms_dir(self) -> Path:
@@ -415,7 +494,8 @@ class OutputManager:
             Path del directorio gaa/algorithms/
         """
         algorithms_dir = self.gaa_dir / "algorithms"
-        algorithms_dir.mkdir(parents=True, exist_ok=True)
+        if self.store is None:
+            algorithms_dir.mkdir(parents=True, exist_ok=True)
         return algorithms_dir
     
     def save_generation_algorithms(self, generation: int, algorithms: list) -> str:
@@ -430,18 +510,147 @@ class OutputManager:
             Ruta del directorio creado
         """
         gen_dir = self.get_gaa_algorithms_dir() / f"generation_{generation}"
-        gen_dir.mkdir(parents=True, exist_ok=True)
         
-        for idx, algorithm in enumerate(algorithms):
-            filename = f"algorithm_{idx}.json"
-            filepath = gen_dir / filename
-            
+        # Un único registro por generación (no un archivo por algoritmo)
+        payload = [algorithm.to_dict() if hasattr(algorithm, 'to_dict') else algorithm
+                   for algorithm in algorithms]
+        self._write('generation', gen_dir, payload, f"Generation {generation} algorithms")
+        return str(gen_dir)
+    
+    # ========================================================================
+    # ESCRITURA Y EXPORTACIÓN
+    # ========================================================================
+    
+    def _open_store(self):
+        """Abre el SessionStore de la sesión actual (modo buffered)"""
+        if not self.buffered:
+            return
+        if self.store is not None:
+            self.store.close()
+        self.store = SessionStore(self.session_dir)
+    
+    def _relative(self, filepath: Path) -> str:
+        """Ruta relativa a la sesión (clave de los registros del store)"""
+        return Path(filepath).relative_to(self.session_dir).as_posix()
+    
+    def _write(self, kind: str, filepath: Path, data: Any, label: str):
+        """Escribe un artefacto ahora o lo encola en el store (modo buffered)"""
+        if self.store is not None:
+            self.store.append(kind, self._relative(filepath), data)
+            self.logger.debug(f"{label} queued: {filepath}")
+            return
+        self._render(kind, filepath, data)
+        self.logger.info(f"{label} saved: {filepath}")
+    
+    def _render(self, kind: str, filepath: Path, data: Any):
+        """Materializa un artefacto en disco según su tipo"""
+        filepath = Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        
+        if kind == 'json':
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(algorithm.to_dict() if hasattr(algorithm, 'to_dict') else algorithm, 
-                         f, indent=2, ensure_ascii=False)
+                json.dump(self._make_serializable(data), f, indent=2, ensure_ascii=False)
         
-        self.logger.info(f"Generation {generation} algorithms saved: {gen_dir}")
-        return str(gen_dir)
+        elif kind == 'text':
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(data)
+        
+        elif kind == 'csv':
+            with open(filepath, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=data[0].keys())
+                writer.writeheader()
+                writer.writerows(data)
+        
+        elif kind == 'jsonl':
+            # Se añaden líneas: data es una lista de registros
+            with open(filepath, 'a', encoding='utf-8') as f:
+                for record in data:
+                    f.write(json.dumps(self._make_serializable(record), ensure_ascii=False) + "\n")
+                f.flush()
+        
+        elif kind == 'solution':
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(f"c Solution for {data['instance']}\n")
+                f.write(f"c Timestamp: {data['timestamp']}\n")
+                f.write(f"c Colors: {data['num_colors']}\n")
+                if 'conflicts' in data:
+                    f.write(f"c Conflicts: {data['conflicts']}\n")
+                    f.write(f"c Feasible: {data['feasible']}\n")
+                f.write("c\n")
+                f.write("c Format: vertex color\n")
+                f.write("c\n")
+                for vertex, color in data['assignment']:
+                    f.write(f"{vertex} {color}\n")
+        
+        elif kind == 'generation':
+            # filepath es el directorio de la generación
+            filepath.mkdir(parents=True, exist_ok=True)
+            for idx, algorithm in enumerate(data):
+                with open(filepath / f"algorithm_{idx}.json", 'w', encoding='utf-8') as f:
+                    json.dump(algorithm, f, indent=2, ensure_ascii=False)
+        
+        else:
+            raise ValueError(f"Tipo de artefacto desconocido: {kind}")
+    
+    def _exported_upto(self, records: List[Dict[str, Any]]) -> int:
+        """Último número de secuencia ya exportado"""
+        return max((r['data']['upto'] for r in records if r['kind'] == 'export'), default=0)
+    
+    def _pending_lines(self, path: str) -> List[Dict[str, Any]]:
+        """Registros JSONL de `path` aún no añadidos al archivo"""
+        records = self.store.records()
+        upto = self._exported_upto(records)
+        return [r['data'] for r in records
+                if r['kind'] == 'jsonl' and r['path'] == path and r['seq'] > upto]
+    
+    def export_session(self) -> List[str]:
+        """
+        Materializa los artefactos del SessionStore con la estructura de
+        directorios habitual de la sesión.
+        
+        Para cada ruta se escribe la última versión registrada; los JSONL
+        reciben solo las líneas no exportadas antes, así que exportar
+        varias veces es seguro.
+        
+        Returns:
+            Rutas escritas (vacío si no hay modo buffered)
+        """
+        if self.store is None:
+            return []
+        
+        records = self.store.records()
+        upto = self._exported_upto(records)
+        latest: Dict[str, Dict[str, Any]] = {}
+        lines: Dict[str, List[Any]] = {}
+        for record in records:
+            if record['kind'] == 'export':
+                continue
+            if record['kind'] == 'jsonl':
+                if record['seq'] > upto:
+                    lines.setdefault(record['path'], []).append(record['data'])
+            else:
+                latest[record['path']] = record
+        
+        written = []
+        for path, record in latest.items():
+            self._render(record['kind'], self.session_dir / path, record['data'])
+            written.append(str(self.session_dir / path))
+        for path, data in lines.items():
+            self._render('jsonl', self.session_dir / path, data)
+            written.append(str(self.session_dir / path))
+        
+        if records:
+            self.store.append('export', None, {'upto': max(r['seq'] for r in records)})
+            self.store.flush()
+        
+        self.logger.info(f"Session exported: {len(written)} artifacts")
+        return written
+    
+    def close(self):
+        """Vacía y cierra el SessionStore (no exporta)"""
+        if self.store is not None:
+            self.store.close()
+            self.store = None
     
     # ========================================================================
     # GESTIÓN DE LOGS
@@ -0,0 +1,189 @@
+"""
+utils/session_store.py
+Almacén de sesión append-only con escritura en segundo plano
+
+Responsabilidades:
+- Registrar artefactos de la sesión como líneas JSON compactas en un único
+  archivo (session.jsonl) en lugar de un archivo por artefacto
+- Escribir a disco desde un hilo dedicado: quien registra solo serializa
+  y encola, nunca espera al sistema de archivos
+- Releer los registros para exportar la estructura de directorios habitual
+  bajo demanda (ver OutputManager.export_session)
+
+Cada línea es {"seq", "kind", "path", "data"}: `path` es la ruta relativa a
+la sesión del archivo que representa el registro y `kind` indica cómo
+materializarlo. Un registro posterior con la misma ruta reemplaza al
+anterior, salvo para kind="jsonl", cuyos registros se acumulan.
+"""
+
+import json
+import queue
+import logging
+import itertools
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+
+# Nombre del archivo de registros dentro del directorio de sesión
+SESSION_STORE_FILENAME = "session.jsonl"
+
+
+def _to_json(obj: Any) -> Any:
+    """Conversión de tipos no nativos para json.dumps (default=)"""
+    import numpy as np
+
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, (np.floating, np.bool_)):
+        return obj.item()
+    if isinstance(obj, Path):
+        return str(obj)
+    if isinstance(obj, (set, tuple)):
+        return list(obj)
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    if hasattr(obj, '__dict__'):
+        return obj.__dict__
+    raise TypeError(f"Objeto no serializable: {type(obj).__name__}")
+
+
+class SessionStore:
+    """
+    Registro append-only de artefactos de una sesión.
+
+    La serialización (compacta, sin indentación) ocurre en el hilo que
+    llama a append, así los datos quedan fijados aunque el llamador los
+    modifique después; la escritura y el vaciado a disco los hace el hilo
+    de fondo por lotes.
+
+    Uso:
+        >>> store = SessionStore(session_dir)
+        >>> store.append('json', 'gaa/evolution_history.json', history)
+        >>> store.flush()                 # esperar a que todo esté en disco
+        >>> records = store.records()
+        >>> store.close()
+    """
+
+    def __init__(self, session_dir: Union[str, Path]):
+        """
+        Abre (o crea) el almacén de una sesión
+
+        Args:
+            session_dir: Directorio de la sesión
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(session_dir) / SESSION_STORE_FILENAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Continuar la numeración de una sesión reanudada
+        last = max((r['seq'] for r in self._read()), default=0)
+        self._seq = itertools.count(last + 1)
+
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._writer, name="session-store", daemon=True)
+        self._thread.start()
+
+    # ========================================================================
+    # ESCRITURA
+    # ========================================================================
+
+    def append(self, kind: str, path: Optional[str], data: Any) -> int:
+        """
+        Registra un artefacto (no bloquea en E/S)
+
+        Args:
+            kind: Formato del artefacto ('json', 'jsonl', 'text', 'csv', 'solution', ...)
+            path: Ruta relativa a la sesión del archivo que representa
+            data: Contenido serializable a JSON
+
+        Returns:
+            Número de secuencia del registro
+        """
+        if not self._thread.is_alive():
+            raise RuntimeError("SessionStore cerrado")
+        seq = next(self._seq)
+        line = json.dumps({'seq': seq, 'kind': kind, 'path': path, 'data': data},
+                          separators=(',', ':'), ensure_ascii=False, default=_to_json)
+        self._queue.put(line)
+        return seq
+
+    def _writer(self) -> None:
+        """Hilo de fondo: escribe por lotes lo que haya en la cola"""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            while True:
+                batch = [self._queue.get()]
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = None in batch
+                try:
+                    f.write(''.join(line + '\n' for line in batch if line is not None))
+                    f.flush()
+                except OSError as e:
+                    self._error = e
+                    self.logger.error(f"Error escribiendo {self.path}: {e}")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if stop:
+                    return
+
+    def flush(self) -> None:
+        """Espera a que todos los registros encolados estén en disco"""
+        self._queue.join()
+        if self._error is not None:
+            raise self._error
+
+    def close(self) -> None:
+        """Vacía la cola y detiene el hilo de escritura"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "SessionStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # ========================================================================
+    # LECTURA
+    # ========================================================================
+
+    def _read(self) -> List[Dict[str, Any]]:
+        """Registros del archivo (ignora líneas incompletas)"""
+        records = []
+        if not self.path.exists():
+            return records
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(record, dict) and 'seq' in record:
+                    records.append(record)
+        return records
+
+    def records(self, kind: Optional[str] = None,
+                path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Registros escritos hasta ahora, en orden de llegada
+
+        Args:
+            kind: Filtrar por tipo (opcional)
+            path: Filtrar por ruta (opcional)
+        """
+        if self._thread.is_alive():
+            self.flush()
+        return [r for r in self._read()
+                if (kind is None or r['kind'] == kind) and (path is None or r['path'] == path)]
@@ -42,6 +42,9 @@ from .time_quality import (
 # Main plotter manager
 from .plotter import PlotManager
 
+# Deferred rendering
+from .render_queue import RenderQueue, PlotSpec
+
 __all__ = [
     # Convergence
     'plot_convergence_single',
@@ -63,5 +66,8 @@ __all__ = [
     'plot_multiple_algorithms_tradeoff',
     'plot_convergence_speed',
     # Manager
-    'PlotManager'
+    'PlotManager',
+    # Deferred rendering
+    'RenderQueue',
+    'PlotSpec'
 ]
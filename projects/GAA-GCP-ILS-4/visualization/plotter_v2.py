@@ -225,20 +225,39 @@ class PlotManagerV2:
     
     def plot_instance_conflict_heatmap(self,
                                       instance_name: str,
-                                      conflict_matrix: np.ndarray) -> str:
-        """Ploteo 03: Matriz de conflictos (aristas mal coloreadas)"""
+                                      conflict_matrix: Optional[np.ndarray] = None,
+                                      problem: Optional[Any] = None,
+                                      max_bins: int = 512) -> str:
+        """
+        Ploteo 03: Matriz de adyacencia como densidad por bloques
+        
+        Con `problem` la densidad se calcula desde el CSR
+        (GraphColoringProblem.adjacency_density) sin matriz densa; una
+        `conflict_matrix` densa se reduce a bloques. En ambos casos se
+        dibujan a lo sumo max_bins × max_bins celdas.
+        """
         try:
             instance_dir = self.individual_dir / instance_name
             instance_dir.mkdir(parents=True, exist_ok=True)
             
+            if problem is not None:
+                density = problem.adjacency_density(max_bins)
+                n = problem.n_vertices
+            else:
+                density = self._block_density(np.asarray(conflict_matrix), max_bins)
+                n = len(conflict_matrix)
+            
             fig, ax = plt.subplots(figsize=(10, 10))
             
-            im = ax.imshow(conflict_matrix, cmap='RdYlGn_r', aspect='auto')
+            im = ax.imshow(density, cmap='RdYlGn_r', aspect='auto',
+                           interpolation='nearest', extent=(0, n, n, 0),
+                           vmin=0, vmax=max(float(density.max()), 1e-12))
             ax.set_xlabel('Vertex', fontsize=12)
             ax.set_ylabel('Vertex', fontsize=12)
             ax.set_title(f'Adjacency matrix of the graph (instance {instance_name})', fontsize=14, fontweight='bold')
             
-            plt.colorbar(im, ax=ax, label='Edge')
+            label = 'Edge' if density.shape[0] == n else 'Edge density'
+            plt.colorbar(im, ax=ax, label=label)
             
             filepath = instance_dir / "03_graph_adjacency_matrix.png"
             plt.savefig(filepath, dpi=300, bbox_inches='tight')
@@ -250,6 +269,21 @@ class PlotManagerV2:
             self.logger.error(f"Error en ploteo heatmap: {e}")
             return ""
     
+    @staticmethod
+    def _block_density(matrix: np.ndarray, max_bins: int) -> np.ndarray:
+        """Reducir una matriz densa n×n a la media por bloques (≤ max_bins)"""
+        n = matrix.shape[0]
+        if n <= max_bins:
+            return matrix
+        block = np.arange(n) * max_bins // n
+        starts = np.searchsorted(block, np.arange(max_bins))
+        sizes = np.diff(np.r_[starts, n])
+        sums = np.add.reduceat(np.add.reduceat(matrix, starts, axis=0), starts, axis=1)
+        # Pares posibles por bloque (sin la diagonal), igual que adjacency_density
+        pairs = np.outer(sizes, sizes).astype(np.float64)
+        np.fill_diagonal(pairs, sizes * (sizes - 1))
+        return np.divide(sums, pairs, out=np.zeros(pairs.shape), where=pairs > 0)
+    
     def plot_instance_time_vs_quality(self,
                                      instance_name: str,
                                      times: List[float],
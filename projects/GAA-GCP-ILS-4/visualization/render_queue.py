@@ -0,0 +1,270 @@
+"""
+visualization/render_queue.py
+Cola de renderizado diferido de gráficas
+
+Durante el experimento los gestores de gráficas (PlotManager, PlotManagerV2)
+no dibujan: cada llamada plot_* se registra como una especificación
+(gestor, método, datos). Al terminar, RenderQueue.render() las dibuja en un
+pool de procesos con el backend Agg, así el tiempo de pared del experimento
+no incluye matplotlib. Con un solo proceso se dibuja en el proceso actual
+sin tocar su backend.
+
+Modo incremental: cada especificación se identifica por un hash de sus
+datos de entrada. El manifiesto plots/.render_manifest.json guarda qué
+archivo produjo cada hash; si el hash ya está y el archivo existe, la
+gráfica no se vuelve a dibujar (p.ej. al reanudar una sesión).
+
+Uso:
+    >>> queue = RenderQueue(session_dir, workers=4)
+    >>> plots = queue.proxy(PlotManagerV2)
+    >>> plots.plot_instance_convergence(name, history)   # solo encola
+    >>> stats = queue.render()
+"""
+
+import json
+import hashlib
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Nombre del manifiesto incremental dentro de {session_dir}/plots/
+MANIFEST_FILENAME = ".render_manifest.json"
+
+
+@dataclass
+class PlotSpec:
+    """Llamada diferida a un método de un gestor de gráficas"""
+    manager: type                       # Clase del gestor (PlotManager, PlotManagerV2, ...)
+    session_dir: str                    # Argumento de construcción del gestor
+    method: str                         # Nombre del método plot_*
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def digest(self) -> str:
+        """Hash de la gráfica: gestor, método y datos de entrada"""
+        h = hashlib.sha1()
+        h.update(f"{self.manager.__module__}.{self.manager.__qualname__}.{self.method}".encode())
+        _update_hash(h, self.args)
+        _update_hash(h, sorted(self.kwargs.items()))
+        return h.hexdigest()
+
+
+def _update_hash(h: "hashlib._Hash", obj: Any) -> None:
+    """
+    Añade al hash una representación canónica de los datos de una gráfica.
+
+    Los grafos (objetos con `vertices` y `edges`) se identifican por su
+    estructura, no por sus cachés internas.
+    """
+    if isinstance(obj, np.ndarray):
+        h.update(f"nd{obj.dtype.str}{obj.shape}".encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for key in sorted(obj, key=repr):
+            _update_hash(h, key)
+            _update_hash(h, obj[key])
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[")
+        for item in obj:
+            _update_hash(h, item)
+        h.update(b"]")
+    elif hasattr(obj, 'vertices') and hasattr(obj, 'edges'):
+        h.update(f"graph{obj.vertices}:{len(obj.edges)}".encode())
+        h.update(np.asarray(obj.edges, dtype=np.int64).tobytes())
+    else:
+        h.update(repr(obj).encode())
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+# Gestores ya construidos en el worker: (clase, session_dir) -> instancia
+_WORKER_MANAGERS: Dict[Tuple[type, str], Any] = {}
+
+
+def _init_worker() -> None:
+    """Backend sin ventana: los workers del pool solo escriben archivos"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    plt.switch_backend('Agg')
+
+
+def _render_spec(spec: PlotSpec) -> Optional[str]:
+    """Dibuja una especificación; retorna la ruta generada (None si falla)"""
+    key = (spec.manager, spec.session_dir)
+    manager = _WORKER_MANAGERS.get(key)
+    if manager is None:
+        manager = spec.manager(session_dir=spec.session_dir)
+        _WORKER_MANAGERS[key] = manager
+    try:
+        path = getattr(manager, spec.method)(*spec.args, **spec.kwargs)
+    except Exception as e:
+        logger.error(f"Error renderizando {spec.method}: {e}")
+        return None
+    finally:
+        import matplotlib.pyplot as plt
+        plt.close('all')
+    return str(path) if path else None
+
+
+# ============================================================================
+# COLA
+# ============================================================================
+
+class DeferredPlotManager:
+    """
+    Sustituto de un gestor de gráficas que encola las llamadas plot_*.
+
+    El resto de atributos (create_summary_readme, directorios, ...) se
+    delegan en una instancia real del gestor, que se crea en el proceso
+    principal. Las llamadas encoladas retornan "" porque la ruta se conoce
+    al renderizar.
+    """
+
+    def __init__(self, queue: "RenderQueue", manager: type):
+        self._queue = queue
+        self._manager_class = manager
+        self._manager = manager(session_dir=str(queue.session_dir))
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('plot_') and callable(getattr(self._manager_class, name, None)):
+            def deferred(*args, **kwargs) -> str:
+                self._queue.submit(self._manager_class, name, *args, **kwargs)
+                return ""
+            return deferred
+        return getattr(self._manager, name)
+
+
+class RenderQueue:
+    """
+    Cola de especificaciones de gráficas con renderizado paralelo.
+
+    Atributos:
+        session_dir: Directorio de sesión (los gestores escriben en plots/)
+        workers: Procesos de renderizado (1 = en el proceso actual)
+        incremental: Saltar gráficas cuyo hash ya está en el manifiesto
+    """
+
+    def __init__(self, session_dir: str, workers: Optional[int] = None,
+                 incremental: bool = True):
+        self.session_dir = Path(session_dir)
+        self.workers = workers or multiprocessing.cpu_count()
+        self.incremental = incremental
+        self.specs: List[PlotSpec] = []
+
+        self.manifest_path = self.session_dir / "plots" / MANIFEST_FILENAME
+        self.manifest: Dict[str, str] = self._load_manifest()
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def _load_manifest(self) -> Dict[str, str]:
+        """Manifiesto {hash: ruta} de renderizados anteriores"""
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (ValueError, OSError):
+            logger.warning(f"Manifiesto ilegible, se ignora: {self.manifest_path}")
+            return {}
+
+    def _save_manifest(self) -> None:
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+
+    # ========================================================================
+    # ENCOLADO
+    # ========================================================================
+
+    def submit(self, manager: type, method: str, *args, **kwargs) -> PlotSpec:
+        """Encola la llamada manager(session_dir).method(*args, **kwargs)"""
+        spec = PlotSpec(manager=manager, session_dir=str(self.session_dir),
+                        method=method, args=args, kwargs=kwargs)
+        self.specs.append(spec)
+        return spec
+
+    def proxy(self, manager: type) -> DeferredPlotManager:
+        """Gestor con la interfaz de `manager` cuyas gráficas se encolan"""
+        return DeferredPlotManager(self, manager)
+
+    # ========================================================================
+    # RENDERIZADO
+    # ========================================================================
+
+    def _is_fresh(self, digest: str) -> bool:
+        """¿Ya se renderizó esta gráfica con los mismos datos?"""
+        path = self.manifest.get(digest)
+        return bool(path) and Path(path).exists()
+
+    def render(self, on_progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """
+        Dibuja las especificaciones pendientes y vacía la cola.
+
+        Args:
+            on_progress: Callback (hechas, total) tras cada gráfica
+
+        Returns:
+            Dict con 'rendered', 'skipped', 'failed' y 'paths'
+        """
+        specs, self.specs = self.specs, []
+        pending: Dict[str, PlotSpec] = {}
+        skipped = 0
+        for spec in specs:
+            digest = spec.digest
+            if digest in pending or (self.incremental and self._is_fresh(digest)):
+                skipped += 1
+            else:
+                pending[digest] = spec
+
+        digests = list(pending)
+        if self.workers <= 1 or len(digests) <= 1:
+            # En el proceso que llama: se respeta su backend de matplotlib
+            paths = []
+            for done, digest in enumerate(digests, 1):
+                paths.append(_render_spec(pending[digest]))
+                if on_progress:
+                    on_progress(done, len(digests))
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(digests)),
+                                     initializer=_init_worker) as executor:
+                futures = [executor.submit(_render_spec, pending[d]) for d in digests]
+                paths = []
+                for done, future in enumerate(futures, 1):
+                    try:
+                        paths.append(future.result())
+                    except Exception as e:
+                        logger.error(f"Error en worker de renderizado: {e}")
+                        paths.append(None)
+                    if on_progress:
+                        on_progress(done, len(digests))
+
+        for digest, path in zip(digests, paths):
+            if path:
+                self.manifest[digest] = path
+        self._save_manifest()
+
+        rendered = [path for path in paths if path]
+        stats = {
+            'rendered': len(rendered),
+            'skipped': skipped,
+            'failed': len(paths) - len(rendered),
+            'paths': rendered,
+        }
+        logger.info(f"Renderizado: {stats['rendered']} gráficas, "
+                    f"{stats['skipped']} sin cambios, {stats['failed']} fallidas")
+        return stats
@@ -6,5 +6,7 @@ Definición matemática del problema de la mochila
 from .problem import KnapsackProblem
 from .solution import KnapsackSolution
 from .evaluation import KnapsackEvaluator
+from .exact import ExactResult, OptimumCache, solve_exact, solve_dp, solve_branch_and_bound
 
-__all__ = ['KnapsackProblem', 'KnapsackSolution', 'KnapsackEvaluator']
+__all__ = ['KnapsackProblem', 'KnapsackSolution', 'KnapsackEvaluator',
+           'ExactResult', 'OptimumCache', 'solve_exact', 'solve_dp', 'solve_branch_and_bound']
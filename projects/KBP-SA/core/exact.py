@@ -0,0 +1,377 @@
+"""
+Exact Solvers - KBP-SA
+Óptimo exacto de referencia para el 0/1 Knapsack
+
+Dos métodos:
+- Programación dinámica sobre la capacidad: el vector dp[c] (mejor valor
+  con peso <= c) se actualiza por ítem con una sola expresión NumPy; las
+  decisiones se guardan como bits empaquetados para reconstruir la
+  selección. Memoria O(n·W/8), adecuada para W moderado.
+- Branch-and-bound con núcleo (core): ítems ordenados por ratio, cota LP
+  de Dantzig, y reducción de Dembo-Hammer que fija los ítems alejados del
+  ítem crítico; la búsqueda en profundidad solo recorre el núcleo libre.
+
+El óptimo probado se guarda por archivo de dataset (OptimumCache), de modo
+que cada instancia se resuelve una sola vez.
+
+Referencias:
+- Dantzig (1957): Discrete-variable extremum problems
+- Dembo & Hammer (1980): A reduction algorithm for knapsack problems
+- Pisinger (1997): A minimal algorithm for the 0-1 knapsack problem
+- Kellerer et al. (2004): Knapsack problems
+"""
+
+from typing import Optional, Dict, Any, Tuple
+from dataclasses import dataclass
+from bisect import bisect_right
+from pathlib import Path
+import hashlib
+import json
+import time
+import numpy as np
+
+from core.problem import KnapsackProblem
+
+
+# Máximo de celdas n·(W+1) para programación dinámica (bits: ~62 MB)
+DP_MAX_CELLS = 500_000_000
+
+# Máximo de nodos explorados por el branch-and-bound
+DEFAULT_NODE_LIMIT = 2_000_000
+
+# Hasta este tamaño n·(W+1) la DP es más barata que intentar branch-and-bound
+DP_DIRECT_CELLS = 10_000_000
+
+
+@dataclass
+class ExactResult:
+    """Resultado de un solver exacto"""
+    value: int                # Mejor valor encontrado
+    selection: np.ndarray     # Vector binario de la mejor solución
+    optimal: bool             # True si el valor es el óptimo probado
+    method: str               # 'dp' o 'branch_and_bound'
+    nodes: int = 0            # Nodos explorados (branch-and-bound)
+    core_size: int = 0        # Ítems libres tras la reducción
+    elapsed_time: float = 0.0
+
+
+# ============================================================================
+# PROGRAMACIÓN DINÁMICA
+# ============================================================================
+
+def solve_dp(problem: KnapsackProblem, max_cells: int = DP_MAX_CELLS) -> ExactResult:
+    """
+    Programación dinámica vectorizada sobre la capacidad
+
+    dp[c] = máx(dp[c], dp[c - w_i] + v_i) para todos los c >= w_i a la vez;
+    take[i, c] = 1 si el ítem i mejora dp[c].
+
+    Args:
+        problem: Instancia del problema
+        max_cells: Límite de n·(W+1)
+
+    Returns:
+        ExactResult con el óptimo probado
+    """
+    n, capacity = problem.n, int(problem.capacity)
+    if n * (capacity + 1) > max_cells:
+        raise ValueError(f"Instancia demasiado grande para DP: n·(W+1) = {n * (capacity + 1)} > {max_cells}")
+
+    start_time = time.time()
+    values = problem.values.astype(np.int64)
+    weights = problem.weights.astype(np.int64)
+
+    dp = np.zeros(capacity + 1, dtype=np.int64)
+    take = np.zeros((n, (capacity + 8) // 8), dtype=np.uint8)
+    row = np.zeros(capacity + 1, dtype=bool)
+
+    for i in range(n):
+        w = int(weights[i])
+        if w > capacity:
+            continue
+        candidate = dp[:capacity + 1 - w] + values[i]
+        improved = candidate > dp[w:]
+        row[:w] = False
+        row[w:] = improved
+        take[i] = np.packbits(row)
+        np.maximum(dp[w:], candidate, out=dp[w:])
+
+    # Reconstrucción hacia atrás desde la capacidad completa
+    selection = np.zeros(n, dtype=int)
+    c = capacity
+    for i in range(n - 1, -1, -1):
+        if (take[i, c >> 3] >> (7 - (c & 7))) & 1:
+            selection[i] = 1
+            c -= int(weights[i])
+
+    return ExactResult(
+        value=int(dp[capacity]),
+        selection=selection,
+        optimal=True,
+        method='dp',
+        elapsed_time=time.time() - start_time
+    )
+
+
+# ============================================================================
+# BRANCH-AND-BOUND CON NÚCLEO
+# ============================================================================
+
+def solve_branch_and_bound(problem: KnapsackProblem,
+                           node_limit: int = DEFAULT_NODE_LIMIT) -> ExactResult:
+    """
+    Branch-and-bound en profundidad sobre el núcleo reducido
+
+    1. Orden por ratio v/w decreciente e ítem crítico b (el primero que no cabe)
+    2. Incumbente voraz y cota de Dantzig U
+    3. Reducción: los ítems cuya fijación contraria no puede superar al
+       incumbente (cota U - |v_j - r_b·w_j|) quedan fijados
+    4. DFS sobre los ítems libres con la cota LP calculada por búsqueda
+       binaria en sumas prefijas
+
+    Args:
+        problem: Instancia del problema
+        node_limit: Máximo de nodos; si se alcanza, optimal=False
+
+    Returns:
+        ExactResult (óptimo probado salvo que se agote node_limit)
+    """
+    start_time = time.time()
+    n, capacity = problem.n, int(problem.capacity)
+    ratios = problem.values / problem.weights
+    order = np.argsort(-ratios, kind='stable')
+    values = problem.values.astype(np.int64)[order]
+    weights = problem.weights.astype(np.int64)[order]
+
+    cum_weights = np.cumsum(weights)
+    critical = int(np.searchsorted(cum_weights, capacity, side='right'))
+
+    if critical == n:
+        # Todos los ítems caben
+        selection = np.ones(n, dtype=int)
+        return ExactResult(int(values.sum()), selection, True, 'branch_and_bound',
+                           elapsed_time=time.time() - start_time)
+
+    # Incumbente voraz: prefijo hasta el crítico y relleno con el resto
+    greedy = np.zeros(n, dtype=bool)
+    greedy[:critical] = True
+    residual = capacity - int(cum_weights[critical - 1]) if critical > 0 else capacity
+    for j in range(critical + 1, n):
+        if weights[j] <= residual:
+            greedy[j] = True
+            residual -= int(weights[j])
+    lower = int(values[greedy].sum())
+
+    # Cota de Dantzig y reducción de Dembo-Hammer (r = ratio del crítico)
+    prefix_weight = int(cum_weights[critical - 1]) if critical > 0 else 0
+    prefix_value = int(values[:critical].sum())
+    v_b, w_b = int(values[critical]), int(weights[critical])
+    upper = prefix_value + (capacity - prefix_weight) * v_b // w_b
+
+    reduced = np.abs(values * w_b - weights * v_b)  # |v_j - r·w_j|·w_b
+    upper_scaled = prefix_value * w_b + (capacity - prefix_weight) * v_b
+    can_fix = upper_scaled - reduced < (lower + 1) * w_b
+    can_fix[critical] = False
+    fixed_in = can_fix & (np.arange(n) < critical)
+    free = ~can_fix
+
+    base_value = int(values[fixed_in].sum())
+    free_capacity = capacity - int(weights[fixed_in].sum())
+    core = np.flatnonzero(free)
+
+    best_value, core_taken, nodes, complete = _depth_first(
+        values[core].tolist(), weights[core].tolist(), free_capacity,
+        lower - base_value, node_limit
+    )
+
+    if core_taken is None:
+        sorted_selection = greedy
+        best_value = lower
+    else:
+        sorted_selection = fixed_in.copy()
+        sorted_selection[core[core_taken]] = True
+        best_value += base_value
+
+    selection = np.zeros(n, dtype=int)
+    selection[order[sorted_selection]] = 1
+
+    return ExactResult(
+        value=int(best_value),
+        selection=selection,
+        optimal=complete or best_value >= upper,
+        method='branch_and_bound',
+        nodes=nodes,
+        core_size=len(core),
+        elapsed_time=time.time() - start_time
+    )
+
+
+def _depth_first(values, weights, capacity: int, lower: int,
+                 node_limit: int) -> Tuple[int, Optional[list], int, bool]:
+    """
+    DFS (incluir antes que excluir) con cota LP de Dantzig
+
+    Las listas vienen ordenadas por ratio decreciente, así la cota desde el
+    ítem k es voraz: ítems completos hasta agotar la capacidad más la
+    fracción del siguiente.
+
+    Returns:
+        (mejor valor, índices tomados o None si no se supera `lower`,
+         nodos explorados, True si la búsqueda terminó)
+    """
+    m = len(values)
+    cum_w = [0] * (m + 1)
+    cum_v = [0] * (m + 1)
+    for k in range(m):
+        cum_w[k + 1] = cum_w[k] + weights[k]
+        cum_v[k + 1] = cum_v[k] + values[k]
+
+    best, best_taken = lower, None
+    nodes = 0
+    # Pila de nodos: (siguiente ítem, valor, capacidad libre, lista enlazada de tomados)
+    stack = [(0, 0, capacity, None)]
+
+    while stack:
+        nodes += 1
+        if nodes > node_limit:
+            return best, _unlink(best_taken), nodes, False
+
+        k, value, room, taken = stack.pop()
+        if value > best:
+            best, best_taken = value, taken
+        if k == m:
+            continue
+
+        # Cota LP: ítems k..s-1 completos y fracción del ítem s
+        target = cum_w[k] + room
+        s = bisect_right(cum_w, target, k) - 1
+        bound = value + cum_v[s] - cum_v[k]
+        if s < m:
+            bound += (target - cum_w[s]) * values[s] // weights[s]
+        if bound <= best:
+            continue
+
+        stack.append((k + 1, value, room, taken))
+        if weights[k] <= room:
+            stack.append((k + 1, value + values[k], room - weights[k], (k, taken)))
+
+    return best, _unlink(best_taken), nodes, True
+
+
+def _unlink(taken) -> Optional[list]:
+    """Convierte la lista enlazada (índice, resto) en lista de índices"""
+    if taken is None:
+        return None
+    indices = []
+    while taken is not None:
+        indices.append(taken[0])
+        taken = taken[1]
+    return indices
+
+
+# ============================================================================
+# SELECCIÓN DE MÉTODO Y CACHÉ
+# ============================================================================
+
+def solve_exact(problem: KnapsackProblem,
+                max_dp_cells: int = DP_MAX_CELLS,
+                node_limit: int = DEFAULT_NODE_LIMIT) -> ExactResult:
+    """
+    Resuelve la instancia de forma exacta
+
+    Usa programación dinámica directamente si n·(W+1) <= DP_DIRECT_CELLS;
+    en otro caso branch-and-bound, y si éste agota node_limit sin probar
+    el óptimo, programación dinámica siempre que n·(W+1) <= max_dp_cells.
+
+    Args:
+        problem: Instancia del problema
+        max_dp_cells: Límite de celdas para DP
+        node_limit: Límite de nodos del branch-and-bound
+
+    Returns:
+        ExactResult (optimal=False solo si ningún método pudo probarlo)
+    """
+    cells = problem.n * (int(problem.capacity) + 1)
+    if cells <= min(DP_DIRECT_CELLS, max_dp_cells):
+        return solve_dp(problem, max_dp_cells)
+    result = solve_branch_and_bound(problem, node_limit)
+    if not result.optimal and cells <= max_dp_cells:
+        return solve_dp(problem, max_dp_cells)
+    return result
+
+
+class OptimumCache:
+    """
+    Caché de óptimos probados por archivo de dataset
+
+    Archivo JSON {nombre de archivo: {value, digest, method}} junto a los
+    datasets. La entrada solo se usa si el SHA-1 del contenido coincide,
+    así una instancia modificada se vuelve a resolver.
+    """
+
+    FILENAME = ".optimum_cache.json"
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        """
+        Args:
+            cache_file: Ruta del JSON (default: FILENAME junto a cada dataset)
+        """
+        self.cache_file = Path(cache_file) if cache_file is not None else None
+
+    def get(self, file_path: Path) -> Optional[int]:
+        """Óptimo en caché del archivo, o None"""
+        file_path = Path(file_path)
+        entry = self._read(file_path).get(file_path.name)
+        if entry is None or entry.get('digest') != self._digest(file_path):
+            return None
+        return int(entry['value'])
+
+    def put(self, file_path: Path, result: ExactResult) -> None:
+        """Guarda el óptimo probado del archivo"""
+        if not result.optimal:
+            raise ValueError("Solo se guardan óptimos probados")
+        file_path = Path(file_path)
+        entries = self._read(file_path)
+        entries[file_path.name] = {
+            'value': int(result.value),
+            'digest': self._digest(file_path),
+            'method': result.method
+        }
+        path = self._path(file_path)
+        with open(path, 'w') as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+
+    def optimum(self, file_path: Path, problem: KnapsackProblem, **solver_options) -> Optional[int]:
+        """
+        Óptimo probado de la instancia: desde la caché o resolviéndola
+
+        Args:
+            file_path: Archivo del dataset
+            problem: Instancia cargada desde file_path
+            **solver_options: Opciones de solve_exact
+
+        Returns:
+            Valor óptimo, o None si el solver no pudo probarlo
+        """
+        cached = self.get(file_path)
+        if cached is not None:
+            return cached
+        result = solve_exact(problem, **solver_options)
+        if not result.optimal:
+            return None
+        self.put(file_path, result)
+        return result.value
+
+    def _path(self, file_path: Path) -> Path:
+        return self.cache_file if self.cache_file is not None else file_path.parent / self.FILENAME
+
+    def _read(self, file_path: Path) -> Dict[str, Any]:
+        path = self._path(file_path)
+        if not path.exists():
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _digest(file_path: Path) -> str:
+        return hashlib.sha1(Path(file_path).read_bytes()).hexdigest()
@@ -5,7 +5,7 @@ Fase 1 GAA: Modelado Matemático
 Referencia: Pisinger (2005) - "Where are the hard knapsack problems?"
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Callable, Optional
 from dataclasses import dataclass
 import numpy as np
 
@@ -37,6 +37,7 @@ class KnapsackProblem:
     weights: np.ndarray       # Vector de pesos [w_1, ..., w_n]
     optimal_value: int = None # Valor óptimo conocido (si existe)
     name: str = "KBP"         # Nombre de la instancia
+    proven_optimum: Optional[int] = None  # Óptimo probado por core.exact (None = sin probar)
     
     def __post_init__(self):
         """Validación y conversión de tipos"""
@@ -89,21 +90,103 @@ class KnapsackProblem:
     
     def get_ratio(self) -> np.ndarray:
         """
-        Calcula ratio valor/peso para cada ítem
+        Calcula ratio valor/peso para cada ítem (memorizado, solo lectura)
         
         Returns:
             Array de ratios [v_1/w_1, ..., v_n/w_n]
         """
-        return self.values / self.weights
+        return self._derived()['ratio']
     
     def get_efficiency_order(self) -> np.ndarray:
         """
-        Obtiene índices ordenados por ratio v/w decreciente
+        Obtiene índices ordenados por ratio v/w decreciente (memorizado, solo lectura)
         
         Returns:
             Array de índices ordenados
         """
-        return np.argsort(self.get_ratio())[::-1]
+        return self._cached('efficiency_order', lambda: np.argsort(self.get_ratio())[::-1])
+    
+    def get_value_order(self) -> np.ndarray:
+        """Índices por valor decreciente (memorizado, solo lectura)"""
+        return self._cached('value_order', lambda: np.argsort(self.values)[::-1])
+    
+    def get_weight_order(self) -> np.ndarray:
+        """Índices por peso creciente (memorizado, solo lectura)"""
+        return self._cached('weight_order', lambda: np.argsort(self.weights))
+    
+    def get_removal_order(self) -> np.ndarray:
+        """
+        Índices por ratio v/w creciente, empates por índice (memorizado)
+        
+        Recorrerlo equivale a extraer repetidamente el argmin del ratio
+        entre los ítems restantes.
+        """
+        return self._cached('removal_order', lambda: np.argsort(self.get_ratio(), kind='stable'))
+    
+    def get_prefix_sums(self, order: str = 'ratio') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pesos y valores acumulados a lo largo de un orden (memorizados)
+        
+        Args:
+            order: 'ratio' (get_efficiency_order), 'value' o 'weight'
+        
+        Returns:
+            (pesos acumulados, valores acumulados); el elemento k suma los
+            k+1 primeros ítems del orden
+        """
+        orders = {
+            'ratio': self.get_efficiency_order,
+            'value': self.get_value_order,
+            'weight': self.get_weight_order
+        }
+        if order not in orders:
+            raise ValueError(f"Orden desconocido: {order}")
+        indices = orders[order]()
+        cum_weights = self._cached(f'{order}_cum_weights',
+                                   lambda: np.cumsum(self.weights[indices], dtype=np.int64))
+        cum_values = self._cached(f'{order}_cum_values',
+                                  lambda: np.cumsum(self.values[indices], dtype=np.int64))
+        return cum_weights, cum_values
+    
+    def attach_derived(self, ratio: np.ndarray, efficiency_order: np.ndarray) -> None:
+        """
+        Registra arrays derivados ya calculados (p.ej. desde la caché del loader)
+        
+        Args:
+            ratio: values / weights
+            efficiency_order: argsort(ratio)[::-1]
+        """
+        self.__dict__['_derived_cache'] = {
+            'values': self.values,
+            'weights': self.weights,
+            'ratio': self._readonly(ratio),
+            'efficiency_order': self._readonly(efficiency_order)
+        }
+    
+    def _derived(self) -> Dict[str, Any]:
+        """Arrays derivados, recalculados si values/weights fueron reemplazados"""
+        cache = self.__dict__.get('_derived_cache')
+        if cache is None or cache['values'] is not self.values or cache['weights'] is not self.weights:
+            cache = {
+                'values': self.values,
+                'weights': self.weights,
+                'ratio': self._readonly(self.values / self.weights)
+            }
+            self.__dict__['_derived_cache'] = cache
+        return cache
+    
+    def _cached(self, key: str, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """Array derivado `key`, calculado con compute() la primera vez"""
+        derived = self._derived()
+        if key not in derived:
+            derived[key] = self._readonly(compute())
+        return derived[key]
+    
+    @staticmethod
+    def _readonly(array: np.ndarray) -> np.ndarray:
+        array = np.asarray(array)
+        array.flags.writeable = False
+        return array
     
     def total_value(self) -> int:
         """Suma total de todos los valores"""
@@ -6,7 +6,7 @@ Representación: Vector binario x = [x_1, x_2, ..., x_n]
 donde x_i ∈ {0, 1} indica si el ítem i está en la mochila
 """
 
-from typing import List, Optional, Set
+from typing import List, Optional, Set, Tuple
 import numpy as np
 from copy import deepcopy
 
@@ -140,17 +140,60 @@ class KnapsackSolution:
         """
         Cambia el estado de un ítem (0→1 o 1→0)
         
+        Si la solución está evaluada, valor y peso se actualizan en O(1)
+        en lugar de invalidarse.
+        
         Args:
             item_idx: Índice del ítem a cambiar
         """
         assert 0 <= item_idx < self.n, f"Índice {item_idx} fuera de rango [0, {self.n})"
         
-        self.selection[item_idx] = 1 - self.selection[item_idx]
+        added = self.selection[item_idx] == 0
+        self.selection[item_idx] = 1 if added else 0
         
-        # Invalidar caché
-        self._value = None
-        self._weight = None
-        self._is_feasible = None
+        if self._value is None or self._weight is None or self.problem is None:
+            # Invalidar caché
+            self._value = None
+            self._weight = None
+            self._is_feasible = None
+            return
+        
+        sign = 1 if added else -1
+        self._value += sign * int(self.problem.values[item_idx])
+        self._weight += sign * int(self.problem.weights[item_idx])
+        self._is_feasible = self._weight <= self.problem.capacity
+    
+    def delta_flip(self, item_idx: int) -> Tuple[int, int]:
+        """
+        Cambio de (valor, peso) si se aplicara flip(item_idx), sin modificar
+        la solución. O(1).
+        
+        Args:
+            item_idx: Índice del ítem
+        
+        Returns:
+            (Δvalor, Δpeso)
+        """
+        if self.problem is None:
+            raise ValueError("delta_flip requiere una solución asociada a un problema")
+        sign = -1 if self.selection[item_idx] else 1
+        return (sign * int(self.problem.values[item_idx]),
+                sign * int(self.problem.weights[item_idx]))
+    
+    def delta_swap(self, item_i: int, item_j: int) -> Tuple[int, int]:
+        """
+        Cambio de (valor, peso) si se aplicara flip a los ítems i y j
+        (p.ej. sacar uno seleccionado y meter uno no seleccionado), sin
+        modificar la solución. O(1).
+        
+        Returns:
+            (Δvalor, Δpeso)
+        """
+        if item_i == item_j:
+            return 0, 0
+        value_i, weight_i = self.delta_flip(item_i)
+        value_j, weight_j = self.delta_flip(item_j)
+        return value_i + value_j, weight_i + weight_j
     
     def add_item(self, item_idx: int) -> None:
         """Agrega un ítem a la mochila"""
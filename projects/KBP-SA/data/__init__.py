@@ -3,7 +3,7 @@ Módulo Data - KBP-SA
 Gestión de datasets y carga de instancias
 """
 
-from .loader import DatasetLoader
+from .loader import DatasetLoader, InstanceCatalog
 from .validator import DatasetValidator
 
-__all__ = ['DatasetLoader', 'DatasetValidator']
+__all__ = ['DatasetLoader', 'InstanceCatalog', 'DatasetValidator']
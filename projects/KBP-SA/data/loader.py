@@ -4,11 +4,15 @@ Carga de instancias del problema
 """
 
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
+from collections.abc import Mapping
+import hashlib
+import os
 import numpy as np
 import logging
 
 from core.problem import KnapsackProblem
+from core.exact import OptimumCache
 
 logger = logging.getLogger(__name__)
 
@@ -24,67 +28,180 @@ class DatasetLoader:
     ...
     """
     
-    def __init__(self, base_dir: Path):
+    # Versión del formato de caché (invalida los .npz al cambiar el parser)
+    CACHE_VERSION = 1
+    CACHE_DIR = ".npz_cache"
+    # Archivos menores se parsean directamente (más rápido que abrir un .npz)
+    CACHE_MIN_BYTES = 16 * 1024
+    
+    def __init__(self, base_dir: Path, use_cache: bool = True):
         """
         Inicializa loader
         
         Args:
             base_dir: Directorio base de datasets
+            use_cache: Guardar/leer instancias parseadas en .npz (clave: hash
+                del contenido), para archivos de al menos CACHE_MIN_BYTES
         """
         self.base_dir = Path(base_dir)
+        self.use_cache = use_cache
     
-    def load_instance(self, file_path: Path) -> KnapsackProblem:
+    def load_instance(self, file_path: Path, exact_optimum: bool = False) -> KnapsackProblem:
         """
         Carga una instancia desde archivo
         
         Args:
             file_path: Ruta al archivo
+            exact_optimum: Si True, intentar probar el óptimo con core.exact
+                (en caché por archivo, ver OptimumCache); si se prueba, queda
+                en proven_optimum y reemplaza a optimal_value
         
         Returns:
             Instancia de KnapsackProblem
         """
-        with open(file_path, 'r') as f:
-            lines = [line.strip() for line in f if line.strip()]
+        file_path = Path(file_path)
+        use_cache = self.use_cache and file_path.stat().st_size >= self.CACHE_MIN_BYTES
+        problem = self._load_cached(file_path) if use_cache else None
+        if problem is None:
+            problem = self._parse(file_path.read_bytes(), file_path.stem)
+            if use_cache:
+                self._store_cached(file_path, problem)
+        optimal_value = problem.optimal_value
         
-        # Detectar formato
-        first_parts = lines[0].split()
+        if exact_optimum:
+            proven = OptimumCache().optimum(Path(file_path), problem)
+            if proven is not None:
+                if optimal_value is not None and proven != optimal_value:
+                    logger.warning(f"{file_path.name}: óptimo del archivo {optimal_value} "
+                                   f"!= óptimo probado {proven}")
+                problem.optimal_value = proven
+                problem.proven_optimum = proven
+            else:
+                logger.warning(f"{file_path.name}: no se pudo probar el óptimo; "
+                               f"se mantiene el del archivo ({optimal_value}) "
+                               f"y no se usará como objetivo de parada")
+        
+        return problem
+    
+    @staticmethod
+    def _parse(content: bytes, name: str) -> KnapsackProblem:
+        """
+        Parsea el texto de una instancia con NumPy (sin bucle por línea)
         
-        if len(first_parts) == 1:
+        La primera línea tiene 1 token (optimal_value) o 2 (n W); luego n
+        pares "v w". Los tokens sobrantes (p.ej. la solución en knapPI) se
+        ignoran. Los valores se truncan a entero como int(float(x)).
+        """
+        text = content.decode('utf-8')
+        first_line = next(line for line in text.splitlines() if line.strip())
+        tokens = np.array(text.split(), dtype=np.float64)
+        
+        # Detectar formato
+        if len(first_line.split()) == 1:
             # Formato con optimal_value
-            optimal_value = int(float(first_parts[0]))
-            n, capacity = map(int, lines[1].split())
-            start_idx = 2
+            optimal_value = int(tokens[0])
+            start_idx = 1
         else:
             # Formato sin optimal_value
             optimal_value = None
-            n, capacity = map(int, lines[0].split())
-            start_idx = 1
-        
-        # Leer ítems
-        values = []
-        weights = []
+            start_idx = 0
+        n, capacity = int(tokens[start_idx]), int(tokens[start_idx + 1])
         
-        for i in range(start_idx, start_idx + n):
-            v, w = map(float, lines[i].split())
-            values.append(int(v))
-            weights.append(int(w))
+        # Leer ítems: n pares (v, w)
+        items = tokens[start_idx + 2:start_idx + 2 + 2 * n]
+        if len(items) < 2 * n:
+            raise ValueError(f"Se esperaban {n} ítems, encontrados {len(items) // 2}")
+        items = items.reshape(n, 2).astype(np.int64)
         
         return KnapsackProblem(
             n=n,
             capacity=capacity,
-            values=np.array(values),
-            weights=np.array(weights),
+            values=items[:, 0].copy(),
+            weights=items[:, 1].copy(),
             optimal_value=optimal_value,
-            name=file_path.stem
+            name=name
         )
     
-    def load_folder(self, folder_name: str, strict: bool = False) -> List[KnapsackProblem]:
+    # ========================================================================
+    # CACHÉ .npz
+    # ========================================================================
+    
+    def _cache_path(self, file_path: Path) -> Path:
+        """Archivo .npz de la instancia, con el hash del contenido en el nombre"""
+        digest = hashlib.sha1(file_path.read_bytes()).hexdigest()[:16]
+        return file_path.parent / self.CACHE_DIR / f"{file_path.stem}.v{self.CACHE_VERSION}.{digest}.npz"
+    
+    def _load_cached(self, file_path: Path) -> Optional[KnapsackProblem]:
+        """Instancia desde la caché, o None si no existe o no es legible"""
+        cache_path = self._cache_path(file_path)
+        if not cache_path.exists():
+            return None
+        try:
+            with np.load(cache_path) as data:
+                optimal_value = int(data['optimal_value'])
+                problem = KnapsackProblem(
+                    n=int(data['n']),
+                    capacity=int(data['capacity']),
+                    values=data['values'],
+                    weights=data['weights'],
+                    optimal_value=optimal_value if optimal_value >= 0 else None,
+                    name=file_path.stem
+                )
+                problem.attach_derived(data['ratio'], data['efficiency_order'])
+            return problem
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Caché inválida para {file_path.name}: {e}")
+            return None
+    
+    def _store_cached(self, file_path: Path, problem: KnapsackProblem) -> None:
+        """Guarda la instancia y sus arrays derivados (ratio, orden por ratio)"""
+        cache_path = self._cache_path(file_path)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Eliminar entradas antiguas de la misma instancia
+            for stale in cache_path.parent.glob(f"{file_path.stem}.v*.npz"):
+                stale.unlink()
+            tmp_path = cache_path.with_suffix('.tmp.npz')
+            np.savez(
+                tmp_path,
+                n=problem.n,
+                capacity=problem.capacity,
+                values=problem.values,
+                weights=problem.weights,
+                optimal_value=-1 if problem.optimal_value is None else problem.optimal_value,
+                ratio=problem.get_ratio(),
+                efficiency_order=problem.get_efficiency_order()
+            )
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar caché de {file_path.name}: {e}")
+    
+    # ========================================================================
+    # CARPETAS
+    # ========================================================================
+    
+    def catalog(self, folder_name: str, exact_optimum: bool = False) -> 'InstanceCatalog':
+        """
+        Catálogo perezoso de una carpeta: lista los archivos sin parsearlos
+        
+        Args:
+            folder_name: Nombre de la carpeta
+            exact_optimum: Ver load_instance
+        
+        Returns:
+            InstanceCatalog {nombre: KnapsackProblem} que carga al acceder
+        """
+        return InstanceCatalog(self, self.base_dir / folder_name, exact_optimum)
+    
+    def load_folder(self, folder_name: str, strict: bool = False,
+                    exact_optimum: bool = False) -> List[KnapsackProblem]:
         """
         Carga todas las instancias de una carpeta
         
         Args:
             folder_name: Nombre de la carpeta (low_dimensional, large_scale, etc.)
             strict: Si True, lanza excepción en cualquier error. Si False, continúa.
+            exact_optimum: Si True, usa el óptimo probado (ver load_instance)
         
         Returns:
             Lista de instancias
@@ -100,7 +217,7 @@ class DatasetLoader:
         
         for file_path in sorted(folder_path.glob('*.txt')):
             try:
-                instance = self.load_instance(file_path)
+                instance = self.load_instance(file_path, exact_optimum=exact_optimum)
                 instances.append(instance)
                 logger.debug(f"Cargada instancia: {file_path.name}")
             except Exception as e:
@@ -119,3 +236,61 @@ class DatasetLoader:
     def list_available_folders(self) -> List[str]:
         """Lista carpetas disponibles"""
         return [d.name for d in self.base_dir.iterdir() if d.is_dir()]
+
+
+class InstanceCatalog(Mapping):
+    """
+    Instancias de una carpeta cargadas bajo demanda
+    
+    Las claves son los nombres (stem) de los .txt; cada instancia se parsea
+    (o se lee de la caché .npz) la primera vez que se accede a ella.
+    
+    Ejemplo:
+        >>> catalog = loader.catalog("large_scale")
+        >>> problem = catalog["knapPI_1_100_1000_1_large_scale"]
+    """
+    
+    def __init__(self, loader: DatasetLoader, folder_path: Path, exact_optimum: bool = False):
+        self.loader = loader
+        self.folder_path = Path(folder_path)
+        self.exact_optimum = exact_optimum
+        if self.folder_path.exists():
+            self._paths = {path.stem: path for path in sorted(self.folder_path.glob('*.txt'))}
+        else:
+            logger.warning(f"Carpeta no existe: {self.folder_path}")
+            self._paths = {}
+        self._loaded: Dict[str, KnapsackProblem] = {}
+    
+    def __getitem__(self, name: str) -> KnapsackProblem:
+        if name not in self._loaded:
+            self._loaded[name] = self.loader.load_instance(self._paths[name], exact_optimum=self.exact_optimum)
+        return self._loaded[name]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+    
+    def __len__(self) -> int:
+        return len(self._paths)
+    
+    def select(self, names: List[str], strict: bool = False) -> Dict[str, KnapsackProblem]:
+        """
+        Carga solo las instancias indicadas que existan (en el orden de la carpeta)
+        
+        Args:
+            names: Nombres de instancias
+            strict: Si True, lanza excepción en cualquier error. Si False, la
+                instancia con error se registra y se omite del resultado.
+        """
+        wanted = set(names)
+        selected = {}
+        for name in self._paths:
+            if name not in wanted:
+                continue
+            try:
+                selected[name] = self[name]
+            except Exception as e:
+                logger.error(f"Error cargando {self._paths[name].name}: {e}")
+                print(f"Error cargando {self._paths[name].name}: {e}")
+                if strict:
+                    raise
+        return selected
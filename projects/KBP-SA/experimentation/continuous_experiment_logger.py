@@ -1,84 +1,218 @@
 """
 Continuous Experiment Logger - 3 Day Protocol
 Sistema completo para logging exhaustivo según protocolo experimental
+
+Cada corrida se añade como una línea JSON (JSON Lines) y una fila CSV; los
+archivos se sincronizan a disco (fsync) por lotes. Las estadísticas se
+mantienen como agregados en memoria (Welford, y mediana P²) por estado y
+por (algoritmo, instancia), y se guardan periódicamente en un snapshot.
+Tras una caída, el estado y el CSV se reconstruyen leyendo el JSONL en
+streaming.
 """
 
 import json
 import csv
-import time
+import os
+import hashlib
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Iterator, Tuple
+import statistics
 import uuid
 
 
+@dataclass
+class RunningStats:
+    """Media, varianza, mínimo y máximo incrementales (Welford)"""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = float('inf')
+    max: float = float('-inf')
+
+    def add(self, x: float):
+        """Agrega una observación en O(1)"""
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    @property
+    def variance(self) -> float:
+        """Varianza poblacional"""
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return self.variance ** 0.5
+
+    def to_dict(self) -> Dict:
+        return {**asdict(self), 'variance': self.variance, 'std': self.std}
+
+
+@dataclass
+class StreamingMedian:
+    """
+    Mediana aproximada en memoria O(1) (algoritmo P², Jain & Chlamtac 1985)
+
+    Mantiene 5 marcadores cuyas alturas se ajustan con interpolación
+    parabólica; el marcador central estima la mediana. Exacta mientras
+    haya como mucho 5 observaciones.
+    """
+    heights: List[float] = field(default_factory=list)
+    positions: List[float] = field(default_factory=lambda: [1.0, 2.0, 3.0, 4.0, 5.0])
+    desired: List[float] = field(default_factory=lambda: [1.0, 2.0, 3.0, 4.0, 5.0])
+
+    # Incremento de las posiciones deseadas por observación (cuantil 0.5)
+    INCREMENTS = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+    def add(self, x: float):
+        """Agrega una observación en O(1)"""
+        q = self.heights
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        n, desired = self.positions, self.desired
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            desired[i] += self.INCREMENTS[i]
+
+        # Ajustar los marcadores interiores hacia su posición deseada
+        for i in (1, 2, 3):
+            d = desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = candidate
+                n[i] += d
+
+    @property
+    def value(self) -> Optional[float]:
+        """Mediana estimada (None sin observaciones)"""
+        if not self.heights:
+            return None
+        if self.positions[4] <= 5:
+            return float(statistics.median(self.heights))
+        return self.heights[2]
+
+
 class ContinuousExperimentLogger:
     """
     Logger para experimentación continua de 3 días
     Captura TODAS las métricas del protocolo experimental
+
+    Coste por corrida O(1): append a JSONL/CSV y actualización de agregados.
     """
 
-    def __init__(self, output_dir: str, experiment_name: str = "3day_protocol"):
+    CSV_HEADERS = [
+        'run_id',
+        'timestamp',
+        'algorithm_id',
+        'execution_status',
+        'time_generation',
+        'time_initialization',
+        'time_search',
+        'time_evaluation',
+        'time_postprocessing',
+        'time_total',
+        'objective_value',
+        'optimal_value',
+        'absolute_error',
+        'relative_error',
+        'gap_percent',
+        'hit',
+        # Features del algoritmo
+        'constructor_type',
+        'num_operators',
+        'operator_types',
+        'has_loop',
+        'loop_budget',
+        'acceptance_criterion',
+        'num_evaluations',
+        'tree_depth',
+        'complexity_score'
+    ]
+
+    # Métricas agregadas por (algoritmo, instancia)
+    GROUP_METRICS = ('time_total', 'objective_value', 'gap_percent')
+
+    def __init__(self, output_dir: str, experiment_name: str = "3day_protocol",
+                 experiment_id: Optional[str] = None, fsync_every: int = 10,
+                 snapshot_every: int = 50):
         """
         Inicializa el logger
 
         Args:
             output_dir: Directorio de salida
             experiment_name: Nombre del experimento
+            experiment_id: Id de un experimento previo a reanudar; su estado
+                se reconstruye desde el JSONL
+            fsync_every: Corridas entre sincronizaciones a disco
+            snapshot_every: Corridas entre snapshots de estadísticas
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
         self.experiment_name = experiment_name
-        self.experiment_id = f"{experiment_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.experiment_id = experiment_id or f"{experiment_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
         # Archivos de salida
+        self.jsonl_file = self.output_dir / f"{self.experiment_id}.jsonl"
         self.json_file = self.output_dir / f"{self.experiment_id}.json"
         self.csv_file = self.output_dir / f"{self.experiment_id}.csv"
+        self.snapshot_file = self.output_dir / f"{self.experiment_id}_stats.json"
         self.features_file = self.output_dir / f"{self.experiment_id}_features.json"
 
-        # Datos acumulados
-        self.runs_data = []
-        self.features_data = []
+        self.fsync_every = max(1, fsync_every)
+        self.snapshot_every = max(1, snapshot_every)
+
+        # Reanudar (reconstruir agregados) o empezar de cero
+        self._reset_aggregates()
+        if experiment_id is not None and self.jsonl_file.exists():
+            self.recover()
+        else:
+            self._init_csv()
+            self.jsonl_file.touch()
 
-        # Inicializar CSV
-        self._init_csv()
+        self._jsonl = open(self.jsonl_file, 'a', encoding='utf-8')
+        self._csv = open(self.csv_file, 'a', newline='', encoding='utf-8')
+        self._csv_writer = csv.DictWriter(self._csv, fieldnames=self.CSV_HEADERS)
+        self._unsynced = 0
 
     def _init_csv(self):
         """Inicializa el archivo CSV con headers"""
-        headers = [
-            'run_id',
-            'timestamp',
-            'algorithm_id',
-            'execution_status',
-            'time_generation',
-            'time_initialization',
-            'time_search',
-            'time_evaluation',
-            'time_postprocessing',
-            'time_total',
-            'objective_value',
-            'optimal_value',
-            'absolute_error',
-            'relative_error',
-            'gap_percent',
-            'hit',
-            # Features del algoritmo
-            'constructor_type',
-            'num_operators',
-            'operator_types',
-            'has_loop',
-            'loop_budget',
-            'acceptance_criterion',
-            'num_evaluations',
-            'tree_depth',
-            'complexity_score'
-        ]
-
         with open(self.csv_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
+            writer = csv.DictWriter(f, fieldnames=self.CSV_HEADERS)
             writer.writeheader()
 
+    def _reset_aggregates(self):
+        """Agregados vacíos"""
+        self.total_runs = 0
+        self.status_counts: Dict[str, int] = {'success': 0, 'timeout': 0, 'error': 0}
+        self.hit_runs = 0
+        self.success_times = RunningStats()
+        self.success_gaps = RunningStats()
+        self.success_time_median = StreamingMedian()
+        self.group_stats: Dict[Tuple[str, Optional[str]], Dict[str, RunningStats]] = {}
+
     def log_run(
         self,
         algorithm_pseudocode: str,
@@ -86,7 +220,8 @@ class ContinuousExperimentLogger:
         execution_status: str,
         time_breakdown: Dict[str, float],
         objective_value: Optional[float] = None,
-        optimal_value: Optional[float] = None
+        optimal_value: Optional[float] = None,
+        instance_name: Optional[str] = None
     ) -> str:
         """
         Registra una corrida completa
@@ -98,13 +233,16 @@ class ContinuousExperimentLogger:
             time_breakdown: Dict con tiempos de cada etapa
             objective_value: Valor objetivo obtenido
             optimal_value: Valor óptimo conocido
+            instance_name: Instancia evaluada (agrupa las estadísticas)
 
         Returns:
             run_id generado
         """
         run_id = str(uuid.uuid4())
         timestamp = datetime.now().isoformat()
-        algorithm_id = f"algo_{hash(algorithm_pseudocode) % 1000000}"
+        # Hash estable entre procesos (hash() de str cambia con cada intérprete)
+        digest = hashlib.md5(algorithm_pseudocode.encode('utf-8')).hexdigest()
+        algorithm_id = f"algo_{int(digest, 16) % 1000000}"
 
         # Calcular métricas de calidad
         absolute_error = None
@@ -137,97 +275,230 @@ class ContinuousExperimentLogger:
             'relative_error': relative_error,
             'gap_percent': gap_percent,
             'hit': hit,
+            'instance_name': instance_name,
             'features': algorithm_features
         }
 
-        # Guardar en memoria
-        self.runs_data.append(run_record)
+        # Escribir a JSONL (append, una línea por corrida)
+        self._jsonl.write(json.dumps(run_record, default=str) + '\n')
 
         # Escribir a CSV (append)
-        csv_record = {
-            'run_id': run_id,
-            'timestamp': timestamp,
-            'algorithm_id': algorithm_id,
-            'execution_status': execution_status,
-            'time_generation': time_breakdown.get('generation', 0.0),
-            'time_initialization': time_breakdown.get('initialization', 0.0),
-            'time_search': time_breakdown.get('search', 0.0),
-            'time_evaluation': time_breakdown.get('evaluation', 0.0),
-            'time_postprocessing': time_breakdown.get('postprocessing', 0.0),
-            'time_total': time_breakdown.get('total', 0.0),
-            'objective_value': objective_value or '',
-            'optimal_value': optimal_value or '',
-            'absolute_error': absolute_error or '',
-            'relative_error': relative_error or '',
-            'gap_percent': gap_percent or '',
-            'hit': hit,
+        self._csv_writer.writerow(self._csv_row(run_record))
+
+        self._update_aggregates(run_record)
+
+        # Sincronización y snapshot por lotes
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+        if self.total_runs % self.snapshot_every == 0:
+            self.write_snapshot()
+
+        return run_id
+
+    @staticmethod
+    def _csv_row(record: Dict) -> Dict:
+        """Fila CSV de un registro de corrida"""
+        features = record.get('features') or {}
+        return {
+            'run_id': record['run_id'],
+            'timestamp': record['timestamp'],
+            'algorithm_id': record['algorithm_id'],
+            'execution_status': record['execution_status'],
+            'time_generation': record['time_generation'],
+            'time_initialization': record['time_initialization'],
+            'time_search': record['time_search'],
+            'time_evaluation': record['time_evaluation'],
+            'time_postprocessing': record['time_postprocessing'],
+            'time_total': record['time_total'],
+            'objective_value': record['objective_value'] or '',
+            'optimal_value': record['optimal_value'] or '',
+            'absolute_error': record['absolute_error'] or '',
+            'relative_error': record['relative_error'] or '',
+            'gap_percent': record['gap_percent'] or '',
+            'hit': record['hit'],
             # Features
-            'constructor_type': algorithm_features.get('constructor', ''),
-            'num_operators': algorithm_features.get('num_operators', 0),
-            'operator_types': ','.join(algorithm_features.get('operators', [])),
-            'has_loop': algorithm_features.get('has_loop', False),
-            'loop_budget': algorithm_features.get('loop_budget', ''),
-            'acceptance_criterion': algorithm_features.get('acceptance_criteria', ''),
-            'num_evaluations': algorithm_features.get('num_evaluations', ''),
-            'tree_depth': algorithm_features.get('tree_depth', ''),
-            'complexity_score': algorithm_features.get('complexity_score', '')
+            'constructor_type': features.get('constructor', ''),
+            'num_operators': features.get('num_operators', 0),
+            'operator_types': ','.join(features.get('operators', [])),
+            'has_loop': features.get('has_loop', False),
+            'loop_budget': features.get('loop_budget', ''),
+            'acceptance_criterion': features.get('acceptance_criteria', ''),
+            'num_evaluations': features.get('num_evaluations', ''),
+            'tree_depth': features.get('tree_depth', ''),
+            'complexity_score': features.get('complexity_score', '')
         }
 
-        with open(self.csv_file, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=csv_record.keys())
-            writer.writerow(csv_record)
+    def _update_aggregates(self, record: Dict):
+        """Actualiza los agregados con una corrida en O(1)"""
+        self.total_runs += 1
+        status = record['execution_status']
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if status != 'success':
+            return
+
+        if record['hit']:
+            self.hit_runs += 1
+        self.success_times.add(record['time_total'])
+        self.success_time_median.add(record['time_total'])
+        if record['gap_percent'] is not None:
+            self.success_gaps.add(record['gap_percent'])
+
+        key = (record['algorithm_id'], record.get('instance_name'))
+        group = self.group_stats.get(key)
+        if group is None:
+            group = self.group_stats[key] = {metric: RunningStats() for metric in self.GROUP_METRICS}
+        for metric, stats in group.items():
+            if record[metric] is not None:
+                stats.add(record[metric])
+
+    # ========================================================================
+    # PERSISTENCIA
+    # ========================================================================
+
+    def sync(self):
+        """Vuelca JSONL y CSV a disco (flush + fsync)"""
+        for handle in (self._jsonl, self._csv):
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._unsynced = 0
+
+    def write_snapshot(self):
+        """Guarda las estadísticas agregadas actuales (reemplazo atómico)"""
+        snapshot = {
+            'experiment_id': self.experiment_id,
+            'timestamp': datetime.now().isoformat(),
+            'statistics': self.get_statistics(),
+            'groups': self.get_group_statistics()
+        }
+        tmp_file = self.snapshot_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(tmp_file, self.snapshot_file)
+
+    def iter_runs(self) -> Iterator[Dict]:
+        """Recorre las corridas registradas leyendo el JSONL en streaming"""
+        with open(self.jsonl_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Línea truncada por una caída
+                    continue
+
+    def recover(self):
+        """
+        Reconstruye los agregados y el CSV desde el JSONL
 
-        # Escribir JSON (sobrescribir todo)
+        El CSV se reescribe con una fila por registro recuperado, de modo que
+        ambos archivos coinciden aunque la caída los dejara desalineados.
+        """
+        self._truncate_partial_line()
+        self._reset_aggregates()
+        tmp_file = self.csv_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=self.CSV_HEADERS)
+            writer.writeheader()
+            for record in self.iter_runs():
+                self._update_aggregates(record)
+                writer.writerow(self._csv_row(record))
+        os.replace(tmp_file, self.csv_file)
+
+    def _truncate_partial_line(self):
+        """Descarta una última línea incompleta (escritura interrumpida)"""
+        with open(self.jsonl_file, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+            # Buscar el último salto de línea hacia atrás por bloques
+            position = size
+            while position > 0:
+                step = min(4096, position)
+                position -= step
+                f.seek(position)
+                block = f.read(step)
+                newline = block.rfind(b'\n')
+                if newline >= 0:
+                    f.truncate(position + newline + 1)
+                    return
+            f.truncate(0)
+
+    def export_json(self):
+        """Escribe el JSON completo {experiment_id, experiment_name, runs}"""
+        self.sync()
         with open(self.json_file, 'w', encoding='utf-8') as f:
             json.dump({
                 'experiment_id': self.experiment_id,
                 'experiment_name': self.experiment_name,
-                'runs': self.runs_data
+                'runs': list(self.iter_runs())
             }, f, indent=2)
 
-        return run_id
+    def close(self):
+        """Sincroniza, guarda snapshot y exporta el JSON completo"""
+        if self._jsonl.closed:
+            return
+        self.write_snapshot()
+        self.export_json()
+        self._jsonl.close()
+        self._csv.close()
+
+    # ========================================================================
+    # ESTADÍSTICAS
+    # ========================================================================
 
     def get_statistics(self) -> Dict:
-        """Retorna estadísticas acumuladas"""
-        if not self.runs_data:
+        """Retorna estadísticas acumuladas (desde los agregados en memoria)"""
+        if self.total_runs == 0:
             return {'total_runs': 0}
 
-        successful = [r for r in self.runs_data if r['execution_status'] == 'success']
-        timeouts = [r for r in self.runs_data if r['execution_status'] == 'timeout']
-        errors = [r for r in self.runs_data if r['execution_status'] == 'error']
-
-        hits = [r for r in successful if r['hit']]
+        successful = self.status_counts.get('success', 0)
 
         stats = {
-            'total_runs': len(self.runs_data),
-            'successful_runs': len(successful),
-            'timeout_runs': len(timeouts),
-            'error_runs': len(errors),
-            'hit_runs': len(hits),
-            'hit_rate': len(hits) / len(successful) * 100 if successful else 0,
+            'total_runs': self.total_runs,
+            'successful_runs': successful,
+            'timeout_runs': self.status_counts.get('timeout', 0),
+            'error_runs': self.status_counts.get('error', 0),
+            'hit_runs': self.hit_runs,
+            'hit_rate': self.hit_runs / successful * 100 if successful else 0,
         }
 
         if successful:
-            times = [r['time_total'] for r in successful]
-            import numpy as np
+            times = self.success_times
             stats.update({
-                'avg_time': np.mean(times),
-                'min_time': np.min(times),
-                'max_time': np.max(times),
-                'median_time': np.median(times),
-                'std_time': np.std(times)
+                'avg_time': times.mean,
+                'min_time': times.min,
+                'max_time': times.max,
+                'median_time': self.success_time_median.value,  # Estimación P²
+                'std_time': times.std
             })
 
-            gaps = [r['gap_percent'] for r in successful if r['gap_percent'] is not None]
-            if gaps:
+            gaps = self.success_gaps
+            if gaps.count:
                 stats.update({
-                    'avg_gap': np.mean(gaps),
-                    'min_gap': np.min(gaps),
-                    'max_gap': np.max(gaps)
+                    'avg_gap': gaps.mean,
+                    'min_gap': gaps.min,
+                    'max_gap': gaps.max
                 })
 
         return stats
 
+    def get_group_statistics(self) -> List[Dict]:
+        """Agregados por (algoritmo, instancia): count, mean, variance, min, max"""
+        return [
+            {
+                'algorithm_id': algorithm_id,
+                'instance_name': instance_name,
+                **{metric: stats.to_dict() for metric, stats in group.items()}
+            }
+            for (algorithm_id, instance_name), group in self.group_stats.items()
+        ]
+
     def print_progress(self):
         """Imprime progreso actual"""
         stats = self.get_statistics()
@@ -3,15 +3,31 @@ Experiment Runner - KBP-SA
 Ejecución de experimentos en batch
 Fase 5 GAA: Experimentación controlada
 
+Las tareas (instancia, algoritmo, seed) se reparten en un pool de procesos
+(config.workers); cada worker recibe los arrays de las instancias una sola
+vez por memoria compartida. Cada tarea tiene un límite de tiempo
+(max_time_seconds, con SIGALRM donde está disponible), cada resultado se
+añade a un JSONL al completarse y, con config.resume, una nueva ejecución
+omite las claves ya registradas con éxito y reintenta las fallidas.
+
 Referencias:
 - Barr et al. (1995): Designing and reporting on computational experiments
 - Hooker (1995): Testing heuristics: We have it all wrong
 - Eiben & Jelasity (2002): A critical note on experimental research methodology
 """
 
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from functools import partial
+import importlib
 import json
+import inspect
+import pickle
+import signal
+import threading
 import time
 import numpy as np
 from dataclasses import dataclass, asdict
@@ -36,6 +52,9 @@ class ExperimentConfig:
     max_time_seconds: float = 300.0  # Timeout por ejecución
     output_dir: str = "output/experiments"
     save_solutions: bool = False  # Guardar soluciones encontradas
+    workers: int = 1  # Procesos en paralelo (1 = secuencial)
+    resume: bool = False  # Omitir tareas ya exitosas en el JSONL de resultados (reintenta fallidas)
+    stop_at_optimum: bool = False  # Cargar óptimos probados (core.exact) y detener al alcanzarlos
     
     def __post_init__(self):
         if self.seeds is None:
@@ -73,6 +92,77 @@ class ExperimentResult:
     timestamp: str
     success: bool
     error_message: Optional[str] = None
+    
+    @property
+    def key(self) -> Tuple[str, str, int]:
+        """Clave de la tarea: (instancia, algoritmo, seed)"""
+        return (self.instance_name, self.algorithm_name, self.seed)
+
+
+@contextmanager
+def _time_limit(seconds: Optional[float]):
+    """
+    Interrumpe el bloque con TimeoutError tras `seconds` (SIGALRM)
+    
+    Solo en el hilo principal de plataformas con setitimer; en otro caso no
+    interrumpe y run_single verifica el tiempo al terminar.
+    """
+    if (not seconds or seconds <= 0 or not hasattr(signal, 'setitimer')
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+    
+    def _raise_timeout(signum, frame):
+        raise TimeoutError(f"Excedido timeout de {seconds}s")
+    
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _accepts_target_value(executor: Callable) -> bool:
+    """¿La función 'executor' acepta el argumento target_value?"""
+    try:
+        return 'target_value' in inspect.signature(executor).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _build_algorithm(algorithm: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Algoritmo listo para ejecutar
+    
+    'executor' puede ser una función o su ruta 'modulo:funcion' (descriptor
+    serializable, se importa en el proceso que la ejecuta); 'executor_kwargs'
+    se fijan como argumentos con nombre.
+    """
+    executor = algorithm.get('executor')
+    kwargs = algorithm.get('executor_kwargs')
+    if executor is None or (not isinstance(executor, str) and not kwargs):
+        return algorithm
+    if isinstance(executor, str):
+        module_name, _, function_name = executor.partition(':')
+        executor = getattr(importlib.import_module(module_name), function_name)
+    if kwargs:
+        executor = partial(executor, **kwargs)
+    return {**algorithm, 'executor': executor}
+
+
+def _check_picklable(algorithms: List[Dict[str, Any]]) -> None:
+    """Verifica que los algoritmos se pueden enviar a los workers del pool"""
+    for algorithm in algorithms:
+        try:
+            pickle.dumps(algorithm)
+        except Exception as e:
+            raise ValueError(
+                f"El algoritmo '{algorithm.get('name')}' no se puede enviar a los workers "
+                f"({type(e).__name__}: {e}). Use una función de módulo o su ruta "
+                f"'modulo:funcion' en 'executor' (con 'executor_kwargs'), o workers=1"
+            ) from e
 
 
 class ExperimentRunner:
@@ -96,11 +186,14 @@ class ExperimentRunner:
         self.results: List[ExperimentResult] = []
         self.output_path = Path(config.output_dir)
         self.output_path.mkdir(parents=True, exist_ok=True)
+        # Resultados en streaming, uno por línea al completarse cada tarea
+        self.results_file = self.output_path / f"{config.name}_results.jsonl"
         
         # Cargar datasets - usar directorio por defecto
         datasets_dir = Path(__file__).parent.parent / "datasets"
         self.loader = DatasetLoader(datasets_dir)
         self.problems: Dict[str, KnapsackProblem] = {}
+        self.algorithms = [_build_algorithm(a) for a in config.algorithms]
         
     def load_instances(self, folder: str = "low_dimensional") -> None:
         """
@@ -109,19 +202,17 @@ class ExperimentRunner:
         Args:
             folder: Nombre de la carpeta de datasets
         """
-        all_instances = self.loader.load_folder(folder)
-        
-        # Filtrar solo las instancias especificadas en config
-        for instance in all_instances:
-            if instance.name in self.config.instances:
-                self.problems[instance.name] = instance
+        # Catálogo perezoso: solo se parsean las instancias del config; las
+        # que fallan al cargarse se omiten y se informan como faltantes
+        catalog = self.loader.catalog(folder, exact_optimum=self.config.stop_at_optimum)
+        self.problems.update(catalog.select(self.config.instances))
         
         loaded = len(self.problems)
         expected = len(self.config.instances)
         
         if loaded < expected:
             missing = set(self.config.instances) - set(self.problems.keys())
-            print(f"⚠️  Advertencia: {len(missing)} instancias no encontradas: {missing}")
+            print(f"⚠️  Advertencia: {len(missing)} instancias no encontradas o con error de carga: {missing}")
     
     def run_single(
         self,
@@ -135,7 +226,8 @@ class ExperimentRunner:
         
         Args:
             problem: Instancia del problema
-            algorithm: Diccionario con 'name' y 'ast' (o función 'executor')
+            algorithm: Diccionario con 'name' y 'ast' (o 'executor': función
+                o ruta 'modulo:funcion', con 'executor_kwargs' opcionales)
             seed: Semilla aleatoria
             repetition: Número de repetición (para tracking)
             
@@ -145,33 +237,13 @@ class ExperimentRunner:
         start_time = time.time()
         
         try:
-            # Ejecutar algoritmo
-            if 'ast' in algorithm:
-                # Algoritmo GAA (AST)
-                ast_node = algorithm['ast']
-                interpreter = ASTInterpreter(problem, seed=seed)
-                best_solution = interpreter.execute(ast_node)
-                report = interpreter.get_execution_report()
-                
-                iterations = report.get('iterations', 0)
-                evaluations = report.get('evaluations', 0)
-                initial_value = report.get('initial_value', 0)
-                
-            elif 'executor' in algorithm:
-                # Función custom
-                executor_func = algorithm['executor']
-                result = executor_func(problem, seed)
-                
-                best_solution = result['solution']
-                iterations = result.get('iterations', 0)
-                evaluations = result.get('evaluations', 0)
-                initial_value = result.get('initial_value', 0)
-            else:
-                raise ValueError("Algoritmo debe tener 'ast' o 'executor'")
+            with _time_limit(self.config.max_time_seconds):
+                best_solution, iterations, evaluations, initial_value = \
+                    self._execute(problem, algorithm, seed)
             
             elapsed_time = time.time() - start_time
             
-            # Verificar timeout
+            # Verificar timeout (plataformas sin SIGALRM)
             if elapsed_time > self.config.max_time_seconds:
                 raise TimeoutError(f"Excedido timeout de {self.config.max_time_seconds}s")
             
@@ -224,54 +296,104 @@ class ExperimentRunner:
                 error_message=str(e)
             )
     
+    def _execute(self, problem: KnapsackProblem, algorithm: Dict[str, Any],
+                 seed: int) -> Tuple[KnapsackSolution, int, int, int]:
+        """
+        Ejecuta el algoritmo
+        
+        Con config.stop_at_optimum, los algoritmos se detienen al alcanzar
+        problem.proven_optimum (el óptimo probado al cargar; sin él no hay
+        parada temprana): los AST vía ASTInterpreter(target_value=...) y
+        las funciones 'executor' que aceptan el argumento `target_value`,
+        que deben pasarlo a SimulatedAnnealing.set_target_value.
+        
+        Returns:
+            (mejor solución, iteraciones, evaluaciones, valor inicial)
+        """
+        target_value = problem.proven_optimum if self.config.stop_at_optimum else None
+        
+        if 'ast' in algorithm:
+            # Algoritmo GAA (AST)
+            interpreter = ASTInterpreter(problem, seed=seed, target_value=target_value)
+            best_solution = interpreter.execute(algorithm['ast'])
+            report = interpreter.get_execution_report()
+            return (best_solution, report.get('iterations', 0),
+                    report.get('evaluations', 0), report.get('initial_value', 0))
+        
+        if 'executor' in algorithm:
+            # Función custom
+            executor = algorithm['executor']
+            if _accepts_target_value(executor):
+                result = executor(problem, seed, target_value=target_value)
+            else:
+                result = executor(problem, seed)
+            return (result['solution'], result.get('iterations', 0),
+                    result.get('evaluations', 0), result.get('initial_value', 0))
+        
+        raise ValueError("Algoritmo debe tener 'ast' o 'executor'")
+    
     def run_all(self, verbose: bool = True) -> List[ExperimentResult]:
         """
         Ejecuta todos los experimentos configurados
         
+        Con config.workers > 1 las tareas se ejecutan en un pool de procesos.
+        Cada resultado se añade a results_file al completarse; con
+        config.resume se omiten las tareas ya registradas con éxito en ese
+        archivo (las fallidas se reintentan).
+        
         Args:
             verbose: Mostrar progreso
             
         Returns:
-            Lista de todos los resultados
+            Lista de todos los resultados (en orden instancia × algoritmo × repetición)
         """
-        total_experiments = (
-            len(self.problems) * 
-            len(self.config.algorithms) * 
-            self.config.repetitions
-        )
+        tasks = self._tasks()
+        total_experiments = len(tasks)
+        
+        # Resultados previos (reanudación) o archivo nuevo
+        completed = self._load_completed() if self.config.resume else {}
+        if not self.config.resume:
+            self.results_file.write_text('', encoding='utf-8')
+        pending = [task for task in tasks if task[0] not in completed]
         
         if verbose:
             print(f"🧪 Iniciando experimentos:")
             print(f"   • Instancias: {len(self.problems)}")
             print(f"   • Algoritmos: {len(self.config.algorithms)}")
             print(f"   • Repeticiones: {self.config.repetitions}")
-            print(f"   • Total ejecuciones: {total_experiments}\n")
+            print(f"   • Total ejecuciones: {total_experiments}")
+            if completed:
+                print(f"   • Ya completadas (resume): {total_experiments - len(pending)}")
+            print(f"   • Workers: {self.config.workers}\n")
         
-        experiment_count = 0
         start_time = time.time()
+        finished = dict(completed)
         
-        for instance_name, problem in self.problems.items():
-            for algorithm in self.config.algorithms:
-                for rep in range(self.config.repetitions):
-                    seed = self.config.seeds[rep]
-                    
-                    if verbose:
-                        experiment_count += 1
-                        print(f"[{experiment_count}/{total_experiments}] "
-                              f"{instance_name} × {algorithm['name']} (rep {rep+1})", 
-                              end=" ... ")
-                    
-                    result = self.run_single(problem, algorithm, seed, rep)
-                    self.results.append(result)
-                    
-                    if verbose:
-                        if result.success:
-                            gap_str = f"{result.gap_to_optimal:.2f}%" if result.gap_to_optimal else "N/A"
-                            print(f"✅ valor={result.best_value}, gap={gap_str}, "
-                                  f"tiempo={result.total_time:.3f}s")
-                        else:
-                            print(f"❌ Error: {result.error_message}")
+        with open(self.results_file, 'a', encoding='utf-8') as stream:
+            def record(result: ExperimentResult):
+                finished[result.key] = result
+                stream.write(json.dumps(asdict(result), ensure_ascii=False) + '\n')
+                stream.flush()
+                if verbose:
+                    print(f"[{len(finished)}/{total_experiments}] "
+                          f"{result.instance_name} × {result.algorithm_name} (rep {result.repetition+1}) ... ",
+                          end="")
+                    if result.success:
+                        gap_str = f"{result.gap_to_optimal:.2f}%" if result.gap_to_optimal else "N/A"
+                        print(f"✅ valor={result.best_value}, gap={gap_str}, "
+                              f"tiempo={result.total_time:.3f}s")
+                    else:
+                        print(f"❌ Error: {result.error_message}")
+            
+            if self.config.workers > 1 and len(pending) > 1:
+                self._run_parallel(pending, record)
+            else:
+                for _, instance_name, alg_index, seed, rep in pending:
+                    record(self.run_single(self.problems[instance_name],
+                                           self.algorithms[alg_index], seed, rep))
         
+        # Orden determinista, independiente del orden de finalización
+        self.results = [finished[task[0]] for task in tasks if task[0] in finished]
         total_time = time.time() - start_time
         
         if verbose:
@@ -279,10 +401,73 @@ class ExperimentRunner:
             print(f"\n✅ Experimentos completados:")
             print(f"   • Exitosos: {successful}/{total_experiments}")
             print(f"   • Tiempo total: {total_time:.1f}s")
-            print(f"   • Tiempo promedio: {total_time/total_experiments:.3f}s por ejecución")
+            if pending:
+                print(f"   • Tiempo promedio: {total_time/len(pending):.3f}s por ejecución")
         
         return self.results
     
+    def _tasks(self) -> List[Tuple[Tuple[str, str, int], str, int, int, int]]:
+        """Tareas (clave, instancia, índice de algoritmo, seed, repetición)"""
+        tasks = []
+        for instance_name in self.problems:
+            for alg_index, algorithm in enumerate(self.config.algorithms):
+                for rep in range(self.config.repetitions):
+                    seed = self.config.seeds[rep]
+                    tasks.append(((instance_name, algorithm['name'], seed),
+                                  instance_name, alg_index, seed, rep))
+        return tasks
+    
+    def _load_completed(self) -> Dict[Tuple[str, str, int], ExperimentResult]:
+        """
+        Resultados exitosos ya registrados en results_file
+        
+        Los fallidos (timeout, error) y las líneas truncadas no cuentan como
+        completados: la tarea se vuelve a ejecutar y su línea se descarta.
+        """
+        completed = {}
+        if not self.results_file.exists():
+            return completed
+        with open(self.results_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    result = ExperimentResult(**json.loads(line))
+                except (json.JSONDecodeError, TypeError):
+                    continue
+                if result.success:
+                    completed[result.key] = result
+        # Reescribir solo los exitosos antes de añadir nuevas líneas
+        with open(self.results_file, 'w', encoding='utf-8') as f:
+            for result in completed.values():
+                f.write(json.dumps(asdict(result), ensure_ascii=False) + '\n')
+        return completed
+    
+    def _run_parallel(self, pending: List[Tuple], record: Callable[[ExperimentResult], None]) -> None:
+        """
+        Ejecuta las tareas en un pool de procesos
+        
+        Los arrays de las instancias se copian una vez a memoria compartida;
+        cada worker las reconstruye en su inicializador y solo recibe
+        (instancia, índice de algoritmo, seed, repetición) por tarea.
+        
+        Los algoritmos viajan serializados en la configuración y se
+        construyen en cada worker (_build_algorithm): una lambda o closure
+        como 'executor' se rechaza antes de arrancar el pool.
+        """
+        _check_picklable(self.config.algorithms)
+        blocks, descriptors = _share_problems(self.problems)
+        try:
+            with ProcessPoolExecutor(max_workers=self.config.workers,
+                                     initializer=_init_worker,
+                                     initargs=(self.config, descriptors)) as executor:
+                futures = [executor.submit(_run_task, instance_name, alg_index, seed, rep)
+                           for _, instance_name, alg_index, seed, rep in pending]
+                for future in as_completed(futures):
+                    record(future.result())
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+    
     def save_results(self, filename: Optional[str] = None) -> Path:
         """
         Guarda resultados en JSON
@@ -369,3 +554,62 @@ class ExperimentRunner:
         except ImportError:
             print("⚠️  pandas no disponible. Instalar con: pip install pandas")
             return None
+
+
+# ============================================================================
+# WORKERS (memoria compartida)
+# ============================================================================
+
+# Estado de cada proceso worker: runner con las instancias reconstruidas
+_WORKER_RUNNER: Optional[ExperimentRunner] = None
+_WORKER_BLOCKS: List[shared_memory.SharedMemory] = []
+
+
+def _share_problems(problems: Dict[str, KnapsackProblem]) -> Tuple[List[shared_memory.SharedMemory], Dict[str, Dict[str, Any]]]:
+    """Copia valores y pesos de cada instancia a un bloque de memoria compartida"""
+    blocks, descriptors = [], {}
+    for name, problem in problems.items():
+        data = np.concatenate([problem.values, problem.weights]).astype(np.int64)
+        block = shared_memory.SharedMemory(create=True, size=data.nbytes)
+        np.ndarray(data.shape, dtype=np.int64, buffer=block.buf)[:] = data
+        blocks.append(block)
+        descriptors[name] = {
+            'block': block.name,
+            'n': problem.n,
+            'capacity': problem.capacity,
+            'optimal_value': problem.optimal_value,
+            'proven_optimum': problem.proven_optimum
+        }
+    return blocks, descriptors
+
+
+def _init_worker(config: ExperimentConfig, descriptors: Dict[str, Dict[str, Any]]) -> None:
+    """Inicializador del worker: instancias como vistas de la memoria compartida"""
+    global _WORKER_RUNNER
+    runner = ExperimentRunner.__new__(ExperimentRunner)
+    runner.config = config
+    runner.algorithms = [_build_algorithm(a) for a in config.algorithms]
+    runner.problems = {}
+    for name, info in descriptors.items():
+        block = shared_memory.SharedMemory(name=info['block'])
+        _WORKER_BLOCKS.append(block)
+        n = info['n']
+        data = np.ndarray((2 * n,), dtype=np.int64, buffer=block.buf)
+        data.flags.writeable = False
+        runner.problems[name] = KnapsackProblem(
+            n=n,
+            capacity=info['capacity'],
+            values=data[:n],
+            weights=data[n:],
+            optimal_value=info['optimal_value'],
+            name=name,
+            proven_optimum=info['proven_optimum']
+        )
+    _WORKER_RUNNER = runner
+
+
+def _run_task(instance_name: str, alg_index: int, seed: int, repetition: int) -> ExperimentResult:
+    """Ejecuta una tarea en el worker"""
+    runner = _WORKER_RUNNER
+    return runner.run_single(runner.problems[instance_name],
+                             runner.algorithms[alg_index], seed, repetition)
@@ -3,6 +3,11 @@ Time Tracker - KBP-SA
 Sistema de seguimiento de tiempo de ejecución en tiempo real
 Genera archivo time_tracking.md con métricas de rendimiento
 
+Los eventos (inicio, fin, actualización) se acumulan en memoria y se
+añaden a un archivo JSONL (time_tracking.events.jsonl) como mucho una vez
+por `flush_interval` segundos; el reporte Markdown, que recorre todo el
+árbol de procesos, se genera bajo demanda (write_report) y en finalize().
+
 Fase 5 GAA: Experimentación controlada - Monitoreo de rendimiento
 """
 
@@ -12,6 +17,8 @@ from datetime import datetime
 import time
 from dataclasses import dataclass, field
 from contextlib import contextmanager
+import json
+import weakref
 
 
 @dataclass
@@ -36,29 +43,43 @@ class ProcessInfo:
         self.details[key] = value
 
 
+def _append_events(events_path: Path, pending: List[str]):
+    """Añade las líneas pendientes al JSONL de eventos y vacía el buffer"""
+    if pending:
+        with open(events_path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(pending) + '\n')
+        pending.clear()
+
+
 class TimeTracker:
     """
     Sistema de seguimiento de tiempo en tiempo real
 
-    Registra todos los procesos y genera un archivo Markdown
-    que se actualiza continuamente mientras el código se ejecuta.
+    Registra todos los procesos en un log de eventos append-only y genera
+    un archivo Markdown con el árbol completo.
 
     Features:
     - Seguimiento jerárquico de procesos
-    - Actualización en tiempo real del archivo .md
+    - Eventos en JSONL con escritura agrupada (flush_interval)
+    - Reporte .md bajo demanda, periódico (report_interval) y al finalizar
     - Métricas acumuladas de tiempo
     - Registro de detalles por proceso
     """
 
-    def __init__(self, output_file: str = "time_tracking.md", output_dir: str = "output", verbose: bool = True):
+    def __init__(self, output_file: str = "time_tracking.md", output_dir: str = "output", verbose: bool = True,
+                 flush_interval: float = 1.0, report_interval: Optional[float] = None):
         """
         Args:
             output_file: Nombre del archivo de seguimiento
             output_dir: Directorio de salida
             verbose: Si True, imprime mensajes en consola con timestamps
+            flush_interval: Segundos mínimos entre escrituras del log de eventos
+            report_interval: Si se indica, regenera también el .md como mucho
+                cada report_interval segundos (None: solo bajo demanda y al finalizar)
         """
         self.output_path = Path(output_dir) / output_file
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.events_path = self.output_path.with_suffix('.events.jsonl')
 
         self.start_time = time.time()
         self.processes: List[ProcessInfo] = []
@@ -66,7 +87,21 @@ class TimeTracker:
         self.process_stack: List[ProcessInfo] = []  # Para procesos anidados
         self.verbose = verbose
 
+        # Contadores incrementales (resumen sin recorrer el árbol)
+        self.total_processes = 0
+        self.completed_processes = 0
+
+        # Log de eventos pendiente de escribir y control de escritura
+        self.flush_interval = flush_interval
+        self.report_interval = report_interval
+        self._pending_events: List[str] = []
+        self._last_flush = self.start_time
+        self._last_report = self.start_time
+
         self._initialize_file()
+        # Vuelca los eventos pendientes si el tracker se libera o el intérprete
+        # termina sin finalize(); solo retiene el buffer, no el tracker
+        self._exit_flush = weakref.finalize(self, _append_events, self.events_path, self._pending_events)
 
         if self.verbose:
             start_timestamp = datetime.fromtimestamp(self.start_time).strftime("%H:%M:%S")
@@ -75,10 +110,11 @@ class TimeTracker:
             print(f"{'='*80}\n", flush=True)
 
     def _initialize_file(self):
-        """Inicializa el archivo de seguimiento"""
+        """Inicializa el archivo de seguimiento y el log de eventos"""
         content = self._generate_header()
         with open(self.output_path, 'w', encoding='utf-8') as f:
             f.write(content)
+        open(self.events_path, 'w', encoding='utf-8').close()
 
     def _generate_header(self) -> str:
         """Genera el encabezado del archivo"""
@@ -129,6 +165,7 @@ class TimeTracker:
             self.processes.append(process)
 
         self.current_process = process
+        self.total_processes += 1
 
         # Imprimir mensaje de inicio si verbose está activado
         if self.verbose:
@@ -139,7 +176,7 @@ class TimeTracker:
                 for key, value in details.items():
                     print(f"{indent}   └─ {key}: {value}", flush=True)
 
-        self._update_file()
+        self._record('start', process, depth=len(self.process_stack), details=process.details)
 
         return process
 
@@ -153,6 +190,8 @@ class TimeTracker:
         """
         if self.current_process:
             self.current_process.finish(status)
+            if status == "Completado":
+                self.completed_processes += 1
 
             # Agregar detalles adicionales
             for key, value in details.items():
@@ -173,14 +212,15 @@ class TimeTracker:
                         print(f"{indent}   └─ {key}: {value}", flush=True)
                 print(flush=True)  # Línea en blanco para separar
 
+            self._record('finish', self.current_process, depth=len(self.process_stack),
+                         status=status, duration=self.current_process.duration, details=details)
+
             # Volver al proceso padre si existe
             if self.process_stack:
                 self.current_process = self.process_stack.pop()
             else:
                 self.current_process = None
 
-            self._update_file()
-
     def update_current(self, **details):
         """
         Actualiza detalles del proceso actual sin finalizarlo
@@ -191,7 +231,7 @@ class TimeTracker:
         if self.current_process:
             for key, value in details.items():
                 self.current_process.add_detail(key, value)
-            self._update_file()
+            self._record('update', self.current_process, depth=len(self.process_stack), details=details)
 
     @contextmanager
     def track(self, name: str, **details):
@@ -215,11 +255,36 @@ class TimeTracker:
             self.finish_process("Error", error=str(e))
             raise
 
-    def _update_file(self):
-        """Actualiza el archivo con el estado actual"""
+    # ========================================================================
+    # LOG DE EVENTOS Y ESCRITURA
+    # ========================================================================
+
+    def _record(self, event: str, process: ProcessInfo, **fields):
+        """
+        Registra un evento en memoria; escribe a disco solo si pasó
+        flush_interval desde la última escritura
+        """
+        now = time.time()
+        entry = {'t': round(now - self.start_time, 6), 'event': event, 'name': process.name}
+        entry.update({key: value for key, value in fields.items() if value is not None})
+        self._pending_events.append(json.dumps(entry, ensure_ascii=False, default=str))
+
+        if now - self._last_flush >= self.flush_interval:
+            self.flush()
+            if self.report_interval is not None and now - self._last_report >= self.report_interval:
+                self.write_report()
+
+    def flush(self):
+        """Añade los eventos pendientes al archivo JSONL"""
+        _append_events(self.events_path, self._pending_events)
+        self._last_flush = time.time()
+
+    def write_report(self):
+        """Genera el reporte Markdown con el estado actual (recorre todo el árbol)"""
         content = self._generate_content()
         with open(self.output_path, 'w', encoding='utf-8') as f:
             f.write(content)
+        self._last_report = time.time()
 
     def _generate_content(self) -> str:
         """Genera el contenido completo del archivo"""
@@ -227,8 +292,8 @@ class TimeTracker:
         elapsed = time.time() - self.start_time
 
         # Contar procesos
-        total_processes = self._count_processes(self.processes)
-        completed = self._count_completed(self.processes)
+        total_processes = self.total_processes
+        completed = self.completed_processes
         active = 1 if self.current_process else 0
 
         content = f"""# Time Tracking Report
@@ -338,26 +403,14 @@ class TimeTracker:
             minutes = int((seconds % 3600) // 60)
             return f"{hours}h {minutes}m"
 
-    def _count_processes(self, processes: List[ProcessInfo]) -> int:
-        """Cuenta total de procesos incluyendo subprocesos"""
-        count = len(processes)
-        for p in processes:
-            count += self._count_processes(p.sub_processes)
-        return count
-
-    def _count_completed(self, processes: List[ProcessInfo]) -> int:
-        """Cuenta procesos completados"""
-        count = sum(1 for p in processes if p.status == "Completado")
-        for p in processes:
-            count += self._count_completed(p.sub_processes)
-        return count
-
     def finalize(self):
         """Finaliza el tracking y genera reporte final"""
         if self.current_process:
             self.finish_process("Completado")
 
-        self._update_file()
+        self.flush()
+        self.write_report()
+        self._exit_flush.detach()
 
         total_time = time.time() - self.start_time
         end_timestamp = datetime.now().strftime("%H:%M:%S")
@@ -369,11 +422,17 @@ class TimeTracker:
             print(f"📊 Resumen:", flush=True)
             print(f"   • Archivo: {self.output_path}", flush=True)
             print(f"   • Tiempo total: {self._format_duration(total_time)}", flush=True)
-            print(f"   • Procesos totales: {self._count_processes(self.processes)}", flush=True)
-            print(f"   • Procesos completados: {self._count_completed(self.processes)}", flush=True)
+            print(f"   • Procesos totales: {self.total_processes}", flush=True)
+            print(f"   • Procesos completados: {self.completed_processes}", flush=True)
             print(f"{'='*80}\n", flush=True)
         else:
             print(f"\n📊 Time tracking finalizado:", flush=True)
             print(f"   • Archivo: {self.output_path}", flush=True)
             print(f"   • Tiempo total: {self._format_duration(total_time)}", flush=True)
-            print(f"   • Procesos: {self._count_processes(self.processes)}", flush=True)
+            print(f"   • Procesos: {self.total_processes}", flush=True)
+
+    def __enter__(self) -> 'TimeTracker':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finalize()
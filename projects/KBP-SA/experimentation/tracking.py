@@ -16,6 +16,8 @@ import time
 from datetime import datetime
 import numpy as np
 
+from metaheuristic.recording import acceptance_windows
+
 
 class TrackingConfig:
     """Configuración del sistema de tracking"""
@@ -149,6 +151,15 @@ class ExecutionTracker:
             }
         }
     
+    def samples(self, iteration: int) -> bool:
+        """
+        ¿Se registrará esta iteración? (sampling_rate)
+        
+        Permite al algoritmo decidir antes de construir el diccionario
+        de la iteración.
+        """
+        return iteration % self.config.sampling_rate == 0
+    
     def track_iteration(self, iteration: int, data: Dict[str, Any]):
         """
         Registra una iteración
@@ -168,7 +179,7 @@ class ExecutionTracker:
                 - gap_to_optimal: float (opcional)
         """
         # Muestreo según configuración
-        if iteration % self.config.sampling_rate != 0:
+        if not self.samples(iteration):
             return
         
         elapsed = time.time() - self.start_time if self.start_time else 0.0
@@ -286,29 +297,19 @@ class ExecutionTracker:
         if self.config.save_convergence:
             self.convergence_data['improvement_markers'].append(iteration)
     
-    def calculate_acceptance_windows(self, acceptance_history: List[int]):
+    def calculate_acceptance_windows(self, acceptance_history):
         """
-        Calcula ventanas móviles de aceptación
+        Calcula ventanas móviles de aceptación (sumas acumuladas, O(n))
         
         Args:
-            acceptance_history: Lista de aceptaciones (1/0)
+            acceptance_history: Aceptaciones por iteración (1/0), lista o array
         """
         if not self.config.save_convergence:
             return
         
-        windows = [50, 100, 200]
-        for window_size in windows:
-            window_rates = []
-            for i in range(len(acceptance_history)):
-                start = max(0, i - window_size + 1)
-                window = acceptance_history[start:i+1]
-                if window:
-                    rate = sum(window) / len(window)
-                    window_rates.append(rate)
-                else:
-                    window_rates.append(0.0)
-            
-            self.convergence_data['acceptance_windows'][f'window_{window_size}'] = window_rates
+        windows = acceptance_windows(np.asarray(acceptance_history), (50, 100, 200))
+        for window_size, window_rates in windows.items():
+            self.convergence_data['acceptance_windows'][f'window_{window_size}'] = window_rates.tolist()
     
     def finalize_tracking(self, final_stats: Dict[str, Any]):
         """
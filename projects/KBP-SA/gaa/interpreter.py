@@ -29,12 +29,15 @@ class ExecutionContext:
     - Mejor solución encontrada
     - Estadísticas de ejecución
     - Presupuesto consumido
+    - Valor objetivo opcional (parada temprana)
     """
     
     def __init__(self, 
                  problem: KnapsackProblem,
-                 rng: Optional[np.random.Generator] = None):
+                 rng: Optional[np.random.Generator] = None,
+                 target_value: Optional[int] = None):
         self.problem = problem
+        self.target_value = target_value
         self.evaluator = KnapsackEvaluator(problem)
         self.rng = rng if rng else np.random.default_rng()
         
@@ -69,6 +72,10 @@ class ExecutionContext:
         else:
             self.iterations_without_improvement += 1
     
+    def reached_target(self) -> bool:
+        """True si la mejor solución alcanzó el valor objetivo"""
+        return self.target_value is not None and self.best_value >= self.target_value
+    
     def check_stagnation(self, threshold: int = 10) -> bool:
         """Verifica si hay estancamiento"""
         return self.iterations_without_improvement >= threshold
@@ -90,6 +97,7 @@ class ExecutionContext:
             'evaluations': self.evaluations,
             'elapsed_time': self.get_elapsed_time(),
             'best_value': self.best_value,
+            'reached_target': self.reached_target(),
             'improvement_iterations': len(self.improvement_iterations),
             'final_gap': self.evaluator.gap_to_optimal(self.best_solution) 
                         if self.best_solution else None
@@ -104,16 +112,20 @@ class ASTInterpreter:
     sobre instancias del problema
     """
     
-    def __init__(self, problem: KnapsackProblem, seed: Optional[int] = None):
+    def __init__(self, problem: KnapsackProblem, seed: Optional[int] = None,
+                 target_value: Optional[int] = None):
         """
         Inicializa intérprete
         
         Args:
             problem: Instancia del problema
             seed: Semilla aleatoria
+            target_value: Valor que detiene los bucles al alcanzarse (p.ej.
+                el óptimo probado de core.exact)
         """
         self.problem = problem
         self.rng = np.random.default_rng(seed)
+        self.target_value = target_value
         self.context = None
         self.sa_instance = None  # Referencia al SA si se usa
         
@@ -153,7 +165,7 @@ class ASTInterpreter:
             Mejor solución encontrada
         """
         # Inicializar contexto
-        self.context = ExecutionContext(self.problem, self.rng)
+        self.context = ExecutionContext(self.problem, self.rng, self.target_value)
         self.context.start_timer()
         
         # Ejecutar AST
@@ -206,6 +218,8 @@ class ASTInterpreter:
             if result is not None:
                 solution = result
                 self.context.update_solution(solution)
+            if self.context.reached_target():
+                break
         return solution
     
     def _execute_if(self, node) -> KnapsackSolution:
@@ -224,12 +238,14 @@ class ASTInterpreter:
         if node.budget_type == 'IterBudget':
             max_iter = int(node.budget_value)
             for _ in range(max_iter):
+                if self.context.reached_target():
+                    break
                 self.context.iterations += 1
                 self._execute_node(node.body)
         
         elif node.budget_type == 'TimeBudget':
             max_time = float(node.budget_value)
-            while self.context.get_elapsed_time() < max_time:
+            while self.context.get_elapsed_time() < max_time and not self.context.reached_target():
                 self.context.iterations += 1
                 self._execute_node(node.body)
         
@@ -238,6 +254,8 @@ class ASTInterpreter:
     def _execute_for(self, node) -> KnapsackSolution:
         """Ejecuta bucle for"""
         for _ in range(node.iterations):
+            if self.context.reached_target():
+                break
             self.context.iterations += 1
             self._execute_node(node.body)
         
@@ -309,6 +327,9 @@ class ASTInterpreter:
                 if solution.value > best_value:
                     best_value = solution.value
                     best_solution = solution.copy()
+            
+            if self.context.reached_target():
+                break
         
         return best_solution
     
@@ -321,6 +342,8 @@ class ASTInterpreter:
         iterations_without_improvement = 0
         
         while iterations_without_improvement < node.stop_value:
+            if self.context.reached_target():
+                break
             new_solution = self._execute_node(node.body)
             
             if new_solution and new_solution.value > solution.value:
@@ -5,6 +5,7 @@ Fase 4: Optimización de parámetros de algoritmos
 """
 
 from .sa_core import SimulatedAnnealing
+from .population import PopulationAnnealer
 from .cooling_schedules import (
     GeometricCooling,
     LinearCooling,
@@ -12,13 +13,17 @@ from .cooling_schedules import (
     AdaptiveCooling
 )
 from .acceptance import MetropolisCriterion, AcceptanceCriterion
+from .recording import SeriesBuffer, acceptance_windows
 
 __all__ = [
     'SimulatedAnnealing',
+    'PopulationAnnealer',
     'GeometricCooling',
     'LinearCooling',
     'ExponentialCooling',
     'AdaptiveCooling',
     'MetropolisCriterion',
-    'AcceptanceCriterion'
+    'AcceptanceCriterion',
+    'SeriesBuffer',
+    'acceptance_windows'
 ]
@@ -9,7 +9,7 @@ Referencias:
 
 from abc import ABC, abstractmethod
 import numpy as np
-from typing import Optional
+from typing import Optional, Tuple
 
 
 class AcceptanceCriterion(ABC):
@@ -50,6 +50,23 @@ class AcceptanceCriterion(ABC):
         if temperature <= 0:
             return 0.0
         return np.exp(-delta_E / temperature)
+    
+    def decide(self,
+               delta_E: float,
+               temperature: float,
+               rng: np.random.Generator) -> Tuple[bool, float]:
+        """
+        Decisión y probabilidad de aceptación en una sola llamada
+        
+        Por defecto combina accept() y acceptance_probability(); los
+        criterios probabilísticos lo sobrescriben para calcular la
+        probabilidad una sola vez.
+        
+        Returns:
+            (aceptado, probabilidad)
+        """
+        probability = self.acceptance_probability(delta_E, temperature)
+        return self.accept(delta_E, temperature, rng), probability
 
 
 class MetropolisCriterion(AcceptanceCriterion):
@@ -91,6 +108,18 @@ class MetropolisCriterion(AcceptanceCriterion):
         
         probability = np.exp(-delta_E / temperature)
         return rng.random() < probability
+    
+    def decide(self,
+               delta_E: float,
+               temperature: float,
+               rng: np.random.Generator) -> Tuple[bool, float]:
+        """Metropolis con una sola evaluación de exp (misma secuencia de rng que accept)"""
+        if delta_E <= 0:
+            return True, 1.0
+        if temperature <= 0:
+            return False, 0.0
+        probability = np.exp(-delta_E / temperature)
+        return rng.random() < probability, probability
 
 
 class ThresholdAcceptance(AcceptanceCriterion):
@@ -0,0 +1,349 @@
+"""
+Population Annealing - KBP-SA
+R cadenas de Simulated Annealing avanzando juntas
+
+Modos:
+- 'independent': reinicios independientes con el mismo enfriamiento
+  geométrico que SimulatedAnnealing; a diferencia de su vecindario 'flip',
+  que acepta flips infactibles por Metropolis, aquí se rechazan
+- 'tempering': parallel tempering; cada cadena a una temperatura fija de
+  una escalera geométrica entre T_min y T0, con intercambio de réplicas
+  entre niveles adyacentes cada `exchange_interval` pasos
+
+El estado es una matriz de selección R×n con valor y peso por cadena. Cada
+paso propone un flip por cadena, evalúa los deltas de las R cadenas en
+bloque y aplica Metropolis vectorizado. Los flips que exceden la capacidad
+se rechazan: las cadenas solo visitan soluciones factibles.
+
+Referencias:
+- Kirkpatrick et al. (1983): Optimization by Simulated Annealing
+- Swendsen & Wang (1986): Replica Monte Carlo simulation of spin glasses
+- Earl & Deem (2005): Parallel tempering: Theory, applications, and new perspectives
+"""
+
+from typing import Optional, Dict, Any, List
+from concurrent.futures import ProcessPoolExecutor
+import time
+import numpy as np
+
+from core.problem import KnapsackProblem
+from core.solution import KnapsackSolution
+
+
+class PopulationAnnealer:
+    """
+    Simulated Annealing poblacional para Knapsack Problem
+
+    Parámetros:
+    -----------
+    n_chains: Número de cadenas R
+    mode: 'independent' o 'tempering'
+    T0, alpha, iterations_per_temp, T_min: Como en SimulatedAnnealing; en
+        'tempering' definen la escalera de temperaturas y el número de pasos
+    exchange_interval: Pasos entre rondas de intercambio (tempering)
+    max_iterations: Pasos por cadena (default: los del enfriamiento completo)
+    time_limit: Tiempo máximo en segundos (opcional)
+    target_value: Valor que detiene la ejecución al alcanzarse (p.ej. el
+        óptimo probado de core.exact)
+    workers: Procesos entre los que repartir las cadenas (1 = sin procesos)
+
+    Ejemplo:
+        >>> annealer = PopulationAnnealer(problem, n_chains=16, mode='tempering', seed=42)
+        >>> best = annealer.optimize()
+        >>> annealer.get_statistics()['proposals_per_second']
+    """
+
+    INDEPENDENT = "independent"
+    TEMPERING = "tempering"
+
+    def __init__(self,
+                 problem: KnapsackProblem,
+                 n_chains: int = 8,
+                 mode: str = "independent",
+                 T0: float = 100.0,
+                 alpha: float = 0.95,
+                 iterations_per_temp: int = 100,
+                 T_min: float = 0.01,
+                 exchange_interval: int = 10,
+                 max_iterations: Optional[int] = None,
+                 time_limit: Optional[float] = None,
+                 target_value: Optional[int] = None,
+                 workers: int = 1,
+                 seed: Optional[int] = None):
+        """
+        Inicializa el annealer poblacional
+
+        Args:
+            problem: Instancia del problema
+            n_chains: Número de cadenas
+            mode: 'independent' (reinicios) o 'tempering' (intercambio de réplicas)
+            T0: Temperatura inicial / máxima de la escalera
+            alpha: Factor de enfriamiento geométrico
+            iterations_per_temp: Pasos por nivel de temperatura
+            T_min: Temperatura mínima
+            exchange_interval: Pasos entre intentos de intercambio
+            max_iterations: Pasos por cadena
+            time_limit: Tiempo máximo (segundos)
+            target_value: Parada temprana al alcanzar este valor
+            workers: Procesos para repartir las cadenas
+            seed: Semilla aleatoria
+        """
+        if mode not in (self.INDEPENDENT, self.TEMPERING):
+            raise ValueError(f"Modo desconocido: {mode}")
+        if n_chains < 1:
+            raise ValueError("Se requiere al menos una cadena")
+
+        self.problem = problem
+        self.n_chains = n_chains
+        self.mode = mode
+        self.T0 = T0
+        self.alpha = alpha
+        self.iterations_per_temp = iterations_per_temp
+        self.T_min = T_min
+        self.exchange_interval = exchange_interval
+        self.time_limit = time_limit
+        self.target_value = target_value
+        self.workers = max(1, workers)
+        self.seed = seed
+
+        if max_iterations is None:
+            levels = int(np.ceil(np.log(T_min / T0) / np.log(alpha))) if 0 < alpha < 1 else 1
+            max_iterations = max(1, levels) * iterations_per_temp
+        self.max_iterations = max_iterations
+
+        self.reset_statistics()
+
+    def reset_statistics(self):
+        """Reinicia estadísticas de ejecución"""
+        self.proposals = 0
+        self.accepted_moves = 0
+        self.exchange_attempts = 0
+        self.exchanges = 0
+        self.total_iterations = 0
+        self.elapsed_time = 0.0
+        self.chain_best_values: List[int] = []
+        self.best_value = 0
+        self.reached_target = False
+
+    def ladder(self, n_chains: Optional[int] = None) -> np.ndarray:
+        """Escalera geométrica de temperaturas de T0 a T_min"""
+        n_chains = self.n_chains if n_chains is None else n_chains
+        if n_chains == 1:
+            return np.array([self.T0])
+        return self.T0 * (self.T_min / self.T0) ** (np.arange(n_chains) / (n_chains - 1))
+
+    # ========================================================================
+    # EJECUCIÓN
+    # ========================================================================
+
+    def optimize(self, initial_solution: Optional[KnapsackSolution] = None) -> KnapsackSolution:
+        """
+        Ejecuta las R cadenas
+
+        Args:
+            initial_solution: Solución inicial de todas las cadenas (debe ser
+                factible; default: mochila vacía)
+
+        Returns:
+            Mejor solución factible encontrada por cualquier cadena
+        """
+        problem = self.problem
+        if initial_solution is None:
+            start = np.zeros(problem.n, dtype=np.int8)
+        else:
+            start = np.asarray(initial_solution.selection, dtype=np.int8)
+            if int(start @ problem.weights) > problem.capacity:
+                raise ValueError("La solución inicial debe ser factible")
+
+        self.reset_statistics()
+        start_time = time.time()
+
+        if self.workers > 1 and self.n_chains > 1:
+            shards = self._run_sharded(start)
+        else:
+            shards = [_anneal(self._config(self.n_chains, self.seed), problem, start)]
+
+        # Combinar resultados de los shards
+        best_selection, best_value = start, int(start @ problem.values)
+        for shard in shards:
+            self.proposals += shard['proposals']
+            self.accepted_moves += shard['accepted']
+            self.exchange_attempts += shard['exchange_attempts']
+            self.exchanges += shard['exchanges']
+            self.total_iterations = max(self.total_iterations, shard['iterations'])
+            self.chain_best_values.extend(shard['chain_best_values'])
+            if shard['best_value'] > best_value:
+                best_value, best_selection = shard['best_value'], shard['best_selection']
+
+        self.elapsed_time = time.time() - start_time
+        self.best_value = best_value
+        self.reached_target = self.target_value is not None and best_value >= self.target_value
+
+        best = KnapsackSolution(problem.n, best_selection.astype(int), problem)
+        best.evaluate(problem)
+        return best
+
+    def _config(self, n_chains: int, seed) -> Dict[str, Any]:
+        """Parámetros de una ejecución (serializables para los workers)"""
+        return {
+            'n_chains': n_chains,
+            'mode': self.mode,
+            'T0': self.T0,
+            'alpha': self.alpha,
+            'iterations_per_temp': self.iterations_per_temp,
+            'ladder': self.ladder(n_chains),
+            'exchange_interval': self.exchange_interval,
+            'max_iterations': self.max_iterations,
+            'time_limit': self.time_limit,
+            'target_value': self.target_value,
+            'seed': seed,
+        }
+
+    def _run_sharded(self, start: np.ndarray) -> List[Dict[str, Any]]:
+        """Reparte las cadenas entre procesos (cada shard con su escalera)"""
+        workers = min(self.workers, self.n_chains)
+        sizes = [len(part) for part in np.array_split(np.arange(self.n_chains), workers)]
+        seeds = np.random.SeedSequence(self.seed).spawn(workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_anneal, self._config(size, seed), self.problem, start)
+                       for size, seed in zip(sizes, seeds)]
+            return [future.result() for future in futures]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Obtiene estadísticas de ejecución
+
+        Returns:
+            Diccionario con métricas
+        """
+        return {
+            'mode': self.mode,
+            'n_chains': self.n_chains,
+            'total_iterations': self.total_iterations,
+            'proposals': self.proposals,
+            'elapsed_time': self.elapsed_time,
+            'proposals_per_second': self.proposals / self.elapsed_time if self.elapsed_time > 0 else 0.0,
+            'best_value': self.best_value,
+            'chain_best_values': self.chain_best_values,
+            'accepted_moves': self.accepted_moves,
+            'acceptance_rate': (self.accepted_moves / self.proposals * 100 if self.proposals else 0),
+            'exchange_attempts': self.exchange_attempts,
+            'exchange_rate': (self.exchanges / self.exchange_attempts * 100
+                              if self.exchange_attempts else 0),
+            'workers': self.workers,
+            'reached_target': self.reached_target
+        }
+
+    def __repr__(self) -> str:
+        return (f"PopulationAnnealer(chains={self.n_chains}, mode={self.mode}, "
+                f"T0={self.T0}, T_min={self.T_min})")
+
+
+def _anneal(config: Dict[str, Any], problem: KnapsackProblem,
+            start: np.ndarray) -> Dict[str, Any]:
+    """
+    Bucle vectorizado de R cadenas (ejecutable en un worker)
+
+    Cada paso: un ítem aleatorio por cadena, Δvalor/Δpeso por indexado,
+    rechazo de los flips infactibles y Metropolis con la temperatura de
+    cada cadena.
+    """
+    rng = np.random.default_rng(config['seed'])
+    R, n = config['n_chains'], problem.n
+    values = problem.values.astype(np.int64)
+    weights = problem.weights.astype(np.int64)
+    capacity = problem.capacity
+    tempering = config['mode'] == PopulationAnnealer.TEMPERING
+
+    selection = np.tile(start.astype(np.int8), (R, 1))
+    chain_values = np.full(R, int(start @ values), dtype=np.int64)
+    chain_weights = np.full(R, int(start @ weights), dtype=np.int64)
+    best_values = chain_values.copy()
+    best_selection = selection.copy()
+
+    # Temperatura de cada cadena (tempering: escalera; se intercambian temperaturas)
+    temperatures = config['ladder'].copy() if tempering else np.full(R, config['T0'])
+    rows = np.arange(R)
+
+    stats = {'proposals': 0, 'accepted': 0, 'exchange_attempts': 0, 'exchanges': 0}
+    deadline = time.time() + config['time_limit'] if config['time_limit'] else None
+    target = config['target_value']
+    iteration = 0
+
+    while iteration < config['max_iterations']:
+        # Propuesta: un flip por cadena
+        items = rng.integers(0, n, size=R)
+        sign = 1 - 2 * selection[rows, items].astype(np.int64)
+        delta_values = sign * values[items]
+        delta_weights = sign * weights[items]
+
+        # Metropolis vectorizado (ΔE = -Δvalor), solo flips factibles
+        feasible = chain_weights + delta_weights <= capacity
+        with np.errstate(over='ignore'):
+            probability = np.exp(np.minimum(delta_values, 0) / temperatures)
+        accept = feasible & ((delta_values >= 0) | (rng.random(R) < probability))
+
+        if accept.any():
+            chains = rows[accept]
+            selection[chains, items[accept]] ^= 1
+            chain_values[accept] += delta_values[accept]
+            chain_weights[accept] += delta_weights[accept]
+            stats['accepted'] += len(chains)
+
+            improved = chain_values > best_values
+            if improved.any():
+                best_values[improved] = chain_values[improved]
+                best_selection[improved] = selection[improved]
+                if target is not None and best_values.max() >= target:
+                    stats['proposals'] += R
+                    iteration += 1
+                    break
+
+        stats['proposals'] += R
+        iteration += 1
+
+        if tempering:
+            if R > 1 and iteration % config['exchange_interval'] == 0:
+                _exchange(temperatures, chain_values, rng, iteration // config['exchange_interval'], stats)
+        elif iteration % config['iterations_per_temp'] == 0:
+            temperatures *= config['alpha']
+
+        if deadline is not None and iteration % 256 == 0 and time.time() >= deadline:
+            break
+
+    best_chain = int(np.argmax(best_values))
+    return {
+        'iterations': iteration,
+        'best_value': int(best_values[best_chain]),
+        'best_selection': best_selection[best_chain].copy(),
+        'chain_best_values': best_values.tolist(),
+        **stats
+    }
+
+
+def _exchange(temperatures: np.ndarray, chain_values: np.ndarray,
+              rng: np.random.Generator, round_index: int, stats: Dict[str, int]) -> None:
+    """
+    Intercambio de réplicas entre niveles adyacentes de la escalera
+
+    Se alternan los pares (0,1),(2,3),... y (1,2),(3,4),... Con E = -valor,
+    el par (i, j) intercambia temperaturas con probabilidad
+    min(1, exp((1/T_i - 1/T_j)(E_i - E_j))).
+    """
+    order = np.argsort(-temperatures)           # Cadenas de mayor a menor temperatura
+    first = order[round_index % 2:-1:2]
+    second = order[round_index % 2 + 1::2]
+    pairs = min(len(first), len(second))
+    if pairs == 0:
+        return
+    first, second = first[:pairs], second[:pairs]
+
+    beta_first, beta_second = 1.0 / temperatures[first], 1.0 / temperatures[second]
+    energy_first, energy_second = -chain_values[first], -chain_values[second]
+    log_ratio = (beta_first - beta_second) * (energy_first - energy_second)
+    swap = rng.random(pairs) < np.exp(np.minimum(log_ratio, 0.0))
+
+    stats['exchange_attempts'] += pairs
+    stats['exchanges'] += int(swap.sum())
+    a, b = first[swap], second[swap]
+    temperatures[a], temperatures[b] = temperatures[b], temperatures[a].copy()
@@ -0,0 +1,88 @@
+"""
+Recording - KBP-SA
+Registro compacto de convergencia para Simulated Annealing
+
+Las series por iteración (aceptaciones) y por nivel de temperatura
+(temperaturas, valores) se guardan en arrays NumPy preasignados con un
+contador de elementos, en lugar de listas de objetos Python. Las
+estadísticas derivadas (ventanas de aceptación) se calculan en bloque con
+sumas acumuladas.
+"""
+
+from typing import Dict, Iterable, List
+import numpy as np
+
+
+class SeriesBuffer:
+    """
+    Serie numérica en un array preasignado
+
+    append() escribe en la siguiente posición libre; si el array se llena,
+    su capacidad se duplica (coste amortizado O(1)). view() devuelve la
+    parte ocupada sin copiar.
+    """
+
+    __slots__ = ('_data', '_size')
+
+    def __init__(self, dtype=np.float64, capacity: int = 1024):
+        """
+        Args:
+            dtype: Tipo NumPy de los elementos
+            capacity: Capacidad inicial (p.ej. iteraciones esperadas)
+        """
+        self._data = np.empty(max(1, int(capacity)), dtype=dtype)
+        self._size = 0
+
+    def append(self, value) -> None:
+        """Añade un elemento al final"""
+        if self._size == len(self._data):
+            grown = np.empty(2 * len(self._data), dtype=self._data.dtype)
+            grown[:self._size] = self._data
+            self._data = grown
+        self._data[self._size] = value
+        self._size += 1
+
+    def view(self) -> np.ndarray:
+        """Elementos registrados (vista, sin copia)"""
+        return self._data[:self._size]
+
+    def tolist(self) -> List:
+        return self._data[:self._size].tolist()
+
+    def clear(self) -> None:
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index):
+        return self.view()[index]
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __repr__(self) -> str:
+        return f"SeriesBuffer(size={self._size}, dtype={self._data.dtype})"
+
+
+def acceptance_windows(accepted: np.ndarray,
+                       window_sizes: Iterable[int] = (50, 100, 200)) -> Dict[int, np.ndarray]:
+    """
+    Tasa de aceptación móvil por iteración: para la iteración i, la media
+    de accepted[max(0, i-w+1) .. i].
+
+    Args:
+        accepted: Aceptaciones por iteración (0/1)
+        window_sizes: Tamaños de ventana
+
+    Returns:
+        {tamaño: array de tasas, una por iteración}
+    """
+    accepted = np.asarray(accepted, dtype=np.int64)
+    counts = np.concatenate(([0], np.cumsum(accepted)))
+    index = np.arange(1, len(accepted) + 1)
+    windows = {}
+    for size in window_sizes:
+        start = np.maximum(0, index - size)
+        windows[size] = (counts[index] - counts[start]) / (index - start)
+    return windows
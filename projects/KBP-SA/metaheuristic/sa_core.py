@@ -8,7 +8,7 @@ Referencias:
 - Metropolis et al. (1953): Equation of State Calculations
 """
 
-from typing import Optional, Callable, Dict, Any, List
+from typing import Optional, Callable, Dict, Any, List, Union
 import numpy as np
 import time
 from pathlib import Path
@@ -18,6 +18,7 @@ from core.solution import KnapsackSolution
 from core.evaluation import KnapsackEvaluator
 from metaheuristic.cooling_schedules import CoolingSchedule, GeometricCooling
 from metaheuristic.acceptance import AcceptanceCriterion, MetropolisCriterion
+from metaheuristic.recording import SeriesBuffer
 
 
 class SimulatedAnnealing:
@@ -41,6 +42,9 @@ class SimulatedAnnealing:
     Metropolis: P(accept) = exp(-ΔE / T) si ΔE > 0
     """
     
+    # Vecindario integrado: flip de un ítem aleatorio con delta O(1)
+    FLIP_NEIGHBORHOOD = 'flip'
+    
     def __init__(self,
                  problem: KnapsackProblem,
                  T0: float = 100.0,
@@ -98,6 +102,7 @@ class SimulatedAnnealing:
         self.tracker = None
         self.enable_tracking = False
         self.optimal_value = None  # Para calcular gap
+        self.target_value = None   # Parada temprana al alcanzar este valor
     
     def set_tracking(self, tracker, optimal_value: Optional[int] = None):
         """
@@ -111,13 +116,27 @@ class SimulatedAnnealing:
         self.enable_tracking = True
         self.optimal_value = optimal_value
     
-    def set_neighborhood(self, neighborhood_fn: Callable):
+    def set_target_value(self, target_value: Optional[int]):
+        """
+        Detiene la búsqueda en cuanto la mejor solución alcanza target_value
+        
+        Args:
+            target_value: Valor objetivo, normalmente el óptimo probado
+                (core.exact); None desactiva la parada temprana
+        """
+        self.target_value = target_value
+    
+    def set_neighborhood(self, neighborhood_fn: Union[Callable, str]):
         """
         Establece función de vecindario
         
         Args:
-            neighborhood_fn: Función que recibe (solution, rng) y retorna vecino
+            neighborhood_fn: Función que recibe (solution, rng) y retorna vecino,
+                o 'flip': flip de un ítem aleatorio evaluado con delta O(1)
+                sobre la solución actual (sin copiar ni re-evaluar)
         """
+        if isinstance(neighborhood_fn, str) and neighborhood_fn != self.FLIP_NEIGHBORHOOD:
+            raise ValueError(f"Vecindario desconocido: {neighborhood_fn}")
         self.neighborhood_function = neighborhood_fn
     
     def optimize(self, 
@@ -145,42 +164,53 @@ class SimulatedAnnealing:
         
         best = current.copy()
         best_value = current.value
+        target = self.target_value
+        self.reached_target = target is not None and current.is_feasible and best_value >= target
         
         T = self.T0
         iteration = 0
-        prev_temp = T
+        flip_moves = self.neighborhood_function == self.FLIP_NEIGHBORHOOD
+        
+        # Tracking: qué se registra se decide antes de construir datos
+        tracker = self.tracker if self.enable_tracking else None
+        log_acceptance = tracker is not None and tracker.config.save_acceptance_log
+        accepted_history = self.acceptance_history
         
         # Bucle principal SA
-        while T > self.T_min and self.evaluator.num_evaluations < self.max_evaluations:
+        while (T > self.T_min and self.evaluator.num_evaluations < self.max_evaluations
+               and not self.reached_target):
             
             for _ in range(self.iterations_per_temp):
                 # Generar vecino
-                neighbor = self.neighborhood_function(current, self.rng)
-                neighbor.evaluate(self.problem)
+                if flip_moves:
+                    # Movimiento evaluado sin construir el vecino: O(1)
+                    item = int(self.rng.integers(0, self.problem.n))
+                    delta_value, _ = current.delta_flip(item)
+                else:
+                    neighbor = self.neighborhood_function(current, self.rng)
+                    neighbor.evaluate(self.problem)
+                    delta_value = neighbor.value - current.value
                 
                 # Calcular diferencia de energía (minimización: -fitness)
-                delta_E = -(neighbor.value - current.value)
+                delta_E = -delta_value
                 
-                # Calcular probabilidad de aceptación
-                acceptance_prob = self.acceptance_criterion.acceptance_probability(
-                    delta_E=delta_E,
-                    temperature=T
-                )
-                
-                # Decidir aceptación
-                accept = self.acceptance_criterion.accept(
+                # Decidir aceptación (probabilidad calculada una sola vez)
+                accept, acceptance_prob = self.acceptance_criterion.decide(
                     delta_E=delta_E,
                     temperature=T,
                     rng=self.rng
                 )
                 
                 # Registrar decisión de aceptación
-                self.acceptance_history.append(1 if accept else 0)
+                accepted_history.append(accept)
                 
                 # Tracking de iteración
                 is_improvement = False
                 if accept:
-                    current = neighbor
+                    if flip_moves:
+                        current.flip(item)
+                    else:
+                        current = neighbor
                     self.accepted_moves += 1
                     
                     # Actualizar mejor solución
@@ -190,19 +220,24 @@ class SimulatedAnnealing:
                         self.improvement_iterations.append(iteration)
                         is_improvement = True
                         
-                        if self.enable_tracking and self.tracker:
-                            self.tracker.track_improvement(iteration)
+                        if tracker is not None:
+                            tracker.track_improvement(iteration)
+                        
+                        if target is not None and best_value >= target:
+                            self.reached_target = True
                         
                         if verbose:
                             print(f"Iter {iteration}, T={T:.2f}: Nueva mejor solución = {best_value}")
                 
-                # Tracking detallado
-                if self.enable_tracking and self.tracker:
+                # Tracking detallado: solo las iteraciones muestreadas
+                # (sampling_rate), decidido antes de construir los datos
+                sampled = tracker is not None and tracker.samples(iteration)
+                if sampled:
                     gap = None
                     if self.optimal_value is not None and best_value > 0:
                         gap = ((self.optimal_value - best_value) / self.optimal_value) * 100
                     
-                    self.tracker.track_iteration(iteration, {
+                    tracker.track_iteration(iteration, {
                         'temperature': T,
                         'current_value': current.value,
                         'best_value': best_value,
@@ -215,8 +250,9 @@ class SimulatedAnnealing:
                         'gap_to_optimal': gap,
                         'is_improvement': is_improvement
                     })
-                    
-                    self.tracker.track_acceptance(
+                
+                if sampled and log_acceptance:
+                    tracker.track_acceptance(
                         iteration=iteration,
                         temperature=T,
                         delta_E=delta_E,
@@ -227,17 +263,17 @@ class SimulatedAnnealing:
                 
                 iteration += 1
                 
-                # Verificar presupuesto
-                if self.evaluator.num_evaluations >= self.max_evaluations:
+                # Verificar presupuesto y objetivo
+                if self.evaluator.num_evaluations >= self.max_evaluations or self.reached_target:
                     break
             
             # Enfriar temperatura
             new_T = self.cooling_schedule.cool(T, iteration)
             
             # Tracking de cambio de temperatura
-            if self.enable_tracking and self.tracker:
+            if tracker is not None:
                 temp_level = len(self.temperature_history)
-                self.tracker.track_temperature_change(temp_level, T, new_T)
+                tracker.track_temperature_change(temp_level, T, new_T)
             
             T = new_T
             self.temperature_history.append(T)
@@ -251,9 +287,9 @@ class SimulatedAnnealing:
         self.total_iterations = iteration
         
         # Finalizar tracking
-        if self.enable_tracking and self.tracker:
-            self.tracker.calculate_acceptance_windows(self.acceptance_history)
-            self.tracker.finalize_tracking(self.get_statistics())
+        if tracker is not None:
+            tracker.calculate_acceptance_windows(self.acceptance_history.view())
+            tracker.finalize_tracking(self.get_statistics())
         
         return best
     
@@ -262,13 +298,24 @@ class SimulatedAnnealing:
         self.evaluator.reset_statistics()
         self.accepted_moves = 0
         self.improvement_iterations = []
-        self.temperature_history = [self.T0]
-        self.value_history = []
-        self.acceptance_history = []  # Historial de aceptaciones por iteración
+        # Series en arrays preasignados (ver metaheuristic/recording.py)
+        levels = self._expected_levels()
+        self.temperature_history = SeriesBuffer(np.float64, capacity=levels + 1)
+        self.temperature_history.append(self.T0)
+        self.value_history = SeriesBuffer(np.int64, capacity=levels)
+        # Aceptaciones por iteración (0/1)
+        self.acceptance_history = SeriesBuffer(np.uint8, capacity=levels * self.iterations_per_temp)
         self.start_time = None
         self.elapsed_time = 0.0
         self.final_temperature = self.T0
         self.total_iterations = 0
+        self.reached_target = False
+    
+    def _expected_levels(self) -> int:
+        """Niveles de temperatura esperados con enfriamiento geométrico (capacidad inicial)"""
+        if 0 < self.alpha < 1 and 0 < self.T_min < self.T0:
+            return int(np.ceil(np.log(self.T_min / self.T0) / np.log(self.alpha))) + 1
+        return 64
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -291,7 +338,8 @@ class SimulatedAnnealing:
             'final_temperature': self.final_temperature,
             'T0': self.T0,
             'T_min': self.T_min,
-            'alpha': self.alpha
+            'alpha': self.alpha,
+            'reached_target': self.reached_target
         }
     
     def get_convergence_data(self) -> Dict[str, List]:
@@ -302,10 +350,10 @@ class SimulatedAnnealing:
             Diccionario con historiales
         """
         return {
-            'temperatures': self.temperature_history,
-            'values': self.value_history,
+            'temperatures': self.temperature_history.tolist(),
+            'values': self.value_history.tolist(),
             'improvement_iterations': self.improvement_iterations,
-            'acceptance_history': self.acceptance_history
+            'acceptance_history': self.acceptance_history.tolist()
         }
     
     def __repr__(self) -> str:
@@ -15,6 +15,50 @@ from core.problem import KnapsackProblem
 from core.solution import KnapsackSolution
 
 
+def _greedy_fill(problem: KnapsackProblem, order: np.ndarray,
+                 cum_weights: Optional[np.ndarray] = None) -> KnapsackSolution:
+    """
+    Inserta ítems en el orden dado mientras quepan (primer ajuste)
+    
+    El prefijo que cabe entero se obtiene con searchsorted sobre los pesos
+    acumulados; tras el primer ítem que no cabe se buscan, con operaciones
+    vectoriales, los siguientes que aún entran en la capacidad residual.
+    Equivale a recorrer `order` añadiendo cada ítem si cabe.
+    
+    Args:
+        problem: Instancia del problema
+        order: Permutación de índices de ítems
+        cum_weights: np.cumsum(weights[order]) si ya está calculado
+    
+    Returns:
+        Solución factible evaluada
+    """
+    sorted_weights = problem.weights[order]
+    if cum_weights is None:
+        cum_weights = np.cumsum(sorted_weights, dtype=np.int64)
+    
+    # Prefijo completo: ítems hasta el primero que excede la capacidad
+    break_idx = int(np.searchsorted(cum_weights, problem.capacity, side='right'))
+    taken = [order[:break_idx]]
+    residual = problem.capacity - (int(cum_weights[break_idx - 1]) if break_idx > 0 else 0)
+    
+    # Resto: siguiente ítem que cabe en la capacidad residual
+    k = break_idx + 1
+    while k < len(order):
+        fits = np.flatnonzero(sorted_weights[k:] <= residual)
+        if len(fits) == 0:
+            break
+        k += int(fits[0])
+        taken.append(order[k:k + 1])
+        residual -= int(sorted_weights[k])
+        k += 1
+    
+    solution = KnapsackSolution.empty(problem.n, problem)
+    solution.selection[np.concatenate(taken)] = 1
+    solution.evaluate(problem)
+    return solution
+
+
 class GreedyByValue:
     """
     Construcción voraz por valor decreciente [Dantzig1957]
@@ -23,7 +67,7 @@ class GreedyByValue:
     1. Ordenar ítems por valor decreciente
     2. Insertar ítems mientras quede capacidad
     
-    Complejidad: O(n log n)
+    Complejidad: O(n log n) la primera vez (orden memorizado), luego O(n)
     """
     
     def __init__(self, problem: KnapsackProblem):
@@ -36,23 +80,9 @@ class GreedyByValue:
         Returns:
             Solución factible construida
         """
-        solution = KnapsackSolution.empty(self.problem.n, self.problem)
-        
-        # Ordenar ítems por valor decreciente
-        sorted_indices = np.argsort(self.problem.values)[::-1]
-        
-        current_weight = 0
-        
-        for idx in sorted_indices:
-            weight = self.problem.weights[idx]
-            
-            # Agregar ítem si cabe
-            if current_weight + weight <= self.problem.capacity:
-                solution.add_item(int(idx))
-                current_weight += weight
-        
-        solution.evaluate(self.problem)
-        return solution
+        # Índices por valor decreciente y pesos acumulados (memorizados)
+        cum_weights, _ = self.problem.get_prefix_sums('value')
+        return _greedy_fill(self.problem, self.problem.get_value_order(), cum_weights)
     
     def __call__(self, rng: Optional[np.random.Generator] = None) -> KnapsackSolution:
         return self.construct(rng)
@@ -66,7 +96,7 @@ class GreedyByWeight:
     1. Ordenar ítems por peso creciente
     2. Insertar ítems ligeros primero
     
-    Complejidad: O(n log n)
+    Complejidad: O(n log n) la primera vez (orden memorizado), luego O(n)
     """
     
     def __init__(self, problem: KnapsackProblem):
@@ -74,22 +104,9 @@ class GreedyByWeight:
     
     def construct(self, rng: Optional[np.random.Generator] = None) -> KnapsackSolution:
         """Construye solución greedy por peso"""
-        solution = KnapsackSolution.empty(self.problem.n, self.problem)
-        
-        # Ordenar ítems por peso creciente
-        sorted_indices = np.argsort(self.problem.weights)
-        
-        current_weight = 0
-        
-        for idx in sorted_indices:
-            weight = self.problem.weights[idx]
-            
-            if current_weight + weight <= self.problem.capacity:
-                solution.add_item(int(idx))
-                current_weight += weight
-        
-        solution.evaluate(self.problem)
-        return solution
+        # Índices por peso creciente y pesos acumulados (memorizados)
+        cum_weights, _ = self.problem.get_prefix_sums('weight')
+        return _greedy_fill(self.problem, self.problem.get_weight_order(), cum_weights)
     
     def __call__(self, rng: Optional[np.random.Generator] = None) -> KnapsackSolution:
         return self.construct(rng)
@@ -106,7 +123,7 @@ class GreedyByRatio:
     
     Nota: Esta es la heurística clásica para KBP con mejor garantía teórica
     
-    Complejidad: O(n log n)
+    Complejidad: O(n log n) la primera vez (orden memorizado), luego O(n)
     """
     
     def __init__(self, problem: KnapsackProblem):
@@ -114,23 +131,9 @@ class GreedyByRatio:
     
     def construct(self, rng: Optional[np.random.Generator] = None) -> KnapsackSolution:
         """Construye solución greedy por ratio v/w"""
-        solution = KnapsackSolution.empty(self.problem.n, self.problem)
-        
-        # Calcular ratios y ordenar decreciente
-        ratios = self.problem.get_ratio()
-        sorted_indices = np.argsort(ratios)[::-1]
-        
-        current_weight = 0
-        
-        for idx in sorted_indices:
-            weight = self.problem.weights[idx]
-            
-            if current_weight + weight <= self.problem.capacity:
-                solution.add_item(int(idx))
-                current_weight += weight
-        
-        solution.evaluate(self.problem)
-        return solution
+        # Índices por ratio decreciente y pesos acumulados (memorizados)
+        cum_weights, _ = self.problem.get_prefix_sums('ratio')
+        return _greedy_fill(self.problem, self.problem.get_efficiency_order(), cum_weights)
     
     def __call__(self, rng: Optional[np.random.Generator] = None) -> KnapsackSolution:
         return self.construct(rng)
@@ -164,22 +167,8 @@ class RandomConstruct:
         if rng is None:
             rng = np.random.default_rng()
         
-        solution = KnapsackSolution.empty(self.problem.n, self.problem)
-        
         # Permutación aleatoria de índices
-        shuffled_indices = rng.permutation(self.problem.n)
-        
-        current_weight = 0
-        
-        for idx in shuffled_indices:
-            weight = self.problem.weights[idx]
-            
-            if current_weight + weight <= self.problem.capacity:
-                solution.add_item(int(idx))
-                current_weight += weight
-        
-        solution.evaluate(self.problem)
-        return solution
+        return _greedy_fill(self.problem, rng.permutation(self.problem.n))
     
     def __call__(self, rng: Optional[np.random.Generator] = None) -> KnapsackSolution:
         return self.construct(rng)
@@ -16,6 +16,18 @@ from core.solution import KnapsackSolution
 from core.evaluation import KnapsackEvaluator
 
 
+# Ganancia de los movimientos infactibles (nunca elegidos por argmax)
+_NO_MOVE = np.iinfo(np.int64).min
+
+
+def _evaluated_copy(solution: KnapsackSolution, problem: KnapsackProblem) -> KnapsackSolution:
+    """Copia asociada a `problem` y evaluada: base para los deltas O(1)"""
+    copy = solution.copy()
+    if copy.problem is not problem or copy._value is None:
+        copy.evaluate(problem)
+    return copy
+
+
 class FlipBestItem:
     """
     Mejora local: cambia el ítem que más mejore [Martello1999]
@@ -25,7 +37,7 @@ class FlipBestItem:
     2. Seleccionar el flip que más mejore
     3. Aplicar si mejora y mantiene factibilidad
     
-    Complejidad: O(n) por iteración
+    Complejidad: O(n) por iteración, como una expresión NumPy
     """
     
     def __init__(self, problem: KnapsackProblem):
@@ -40,25 +52,22 @@ class FlipBestItem:
         Returns:
             (solución mejorada, True si hubo mejora)
         """
-        best_solution = solution.copy()
-        best_value = solution.value
-        improved = False
-        best_idx = -1
-        
-        for idx in range(self.problem.n):
-            # Probar flip
-            test_solution = solution.copy()
-            test_solution.flip(idx)
-            test_solution.evaluate(self.problem)
-            
-            # Verificar si mejora y es factible
-            if test_solution.is_feasible and test_solution.value > best_value:
-                best_value = test_solution.value
-                best_solution = test_solution
-                best_idx = idx
-                improved = True
+        best_solution = _evaluated_copy(solution, self.problem)
+        
+        # Deltas de todos los flips a la vez: +v/+w al añadir, -v/-w al quitar
+        sign = 1 - 2 * best_solution.selection.astype(np.int64)
+        delta_values = sign * self.problem.values
+        delta_weights = sign * self.problem.weights
         
-        return best_solution, improved
+        # Mejor flip factible (argmax: el primero en caso de empate)
+        feasible = best_solution.weight + delta_weights <= self.problem.capacity
+        gains = np.where(feasible, delta_values, _NO_MOVE)
+        best_idx = int(np.argmax(gains))
+        
+        if gains[best_idx] <= 0:
+            return best_solution, False
+        best_solution.flip(best_idx)
+        return best_solution, True
     
     def __call__(self, solution: KnapsackSolution, 
                  rng: Optional[np.random.Generator] = None) -> KnapsackSolution:
@@ -98,24 +107,22 @@ class FlipWorstItem:
         worst_item = selected[worst_idx_in_selected]
         
         # Remover peor ítem
+        original = _evaluated_copy(solution, self.problem)
+        new_solution = original.copy()
         new_solution.remove_item(int(worst_item))
-        new_solution.evaluate(self.problem)
         
         # Intentar agregar ítems no seleccionados por ratio decreciente
         unselected = new_solution.get_unselected_items()
         unselected_ratios = ratios[unselected]
         sorted_unselected = unselected[np.argsort(unselected_ratios)[::-1]]
         
+        capacity = self.problem.capacity
         for idx in sorted_unselected:
-            test_solution = new_solution.copy()
-            test_solution.add_item(int(idx))
-            test_solution.evaluate(self.problem)
-            
-            if test_solution.is_feasible:
-                new_solution = test_solution
+            _, delta_weight = new_solution.delta_flip(int(idx))
+            if new_solution.weight + delta_weight <= capacity:
+                new_solution.add_item(int(idx))
         
-        new_solution.evaluate(self.problem)
-        improved = new_solution.value > solution.value
+        improved = new_solution.value > original.value
         
         return new_solution, improved
     
@@ -134,36 +141,53 @@ class OneExchange:
     2. Evaluar intercambio
     3. Aplicar el mejor intercambio que mejore
     
-    Complejidad: O(n²)
+    Complejidad: O(n²) deltas O(1), evaluados como matriz NumPy por bloques
     """
     
+    # Máximo de elementos de la matriz de deltas por bloque
+    CHUNK_ELEMENTS = 1 << 20
+    
     def __init__(self, problem: KnapsackProblem):
         self.problem = problem
     
     def improve(self, solution: KnapsackSolution,
                 rng: Optional[np.random.Generator] = None) -> Tuple[KnapsackSolution, bool]:
         """Aplica mejor intercambio 1-1"""
-        best_solution = solution.copy()
-        best_value = solution.value
-        improved = False
+        best_solution = _evaluated_copy(solution, self.problem)
+        value, weight = best_solution.value, best_solution.weight
+        best_value = value
+        best_move = None
         
         selected = solution.get_selected_items()
         unselected = solution.get_unselected_items()
+        if len(selected) == 0 or len(unselected) == 0:
+            return best_solution, False
+        
+        # Matriz Δvalor/Δpeso (dentro × fuera) por bloques de filas, con
+        # máscara de capacidad residual; solo se materializa el argmax
+        values = self.problem.values.astype(np.int64)
+        weights = self.problem.weights.astype(np.int64)
+        out_values, out_weights = values[unselected], weights[unselected]
+        room = self.problem.capacity - weight
+        rows = max(1, self.CHUNK_ELEMENTS // len(unselected))
         
-        # Probar todos los intercambios
-        for in_idx in selected:
-            for out_idx in unselected:
-                test_solution = solution.copy()
-                test_solution.remove_item(int(in_idx))
-                test_solution.add_item(int(out_idx))
-                test_solution.evaluate(self.problem)
-                
-                if test_solution.is_feasible and test_solution.value > best_value:
-                    best_value = test_solution.value
-                    best_solution = test_solution
-                    improved = True
-        
-        return best_solution, improved
+        for start in range(0, len(selected), rows):
+            block = selected[start:start + rows]
+            gains = out_values[None, :] - values[block][:, None]
+            feasible = out_weights[None, :] - weights[block][:, None] <= room
+            gains = np.where(feasible, gains, _NO_MOVE)
+            # argmax sobre el bloque aplanado: orden (dentro, fuera) del bucle
+            pos = int(np.argmax(gains))
+            gain = int(gains.flat[pos])
+            if gain > best_value - value:
+                best_value = value + gain
+                row, col = divmod(pos, len(unselected))
+                best_move = (int(block[row]), int(unselected[col]))
+        
+        if best_move is not None:
+            best_solution.remove_item(best_move[0])
+            best_solution.add_item(best_move[1])
+        return best_solution, best_move is not None
     
     def __call__(self, solution: KnapsackSolution,
                  rng: Optional[np.random.Generator] = None) -> KnapsackSolution:
@@ -193,9 +217,11 @@ class TwoExchange:
         if rng is None:
             rng = np.random.default_rng()
         
-        best_solution = solution.copy()
-        best_value = solution.value
-        improved = False
+        best_solution = _evaluated_copy(solution, self.problem)
+        value, weight = best_solution.value, best_solution.weight
+        capacity = self.problem.capacity
+        best_value = value
+        best_move = None
         
         selected = solution.get_selected_items()
         unselected = solution.get_unselected_items()
@@ -212,26 +238,26 @@ class TwoExchange:
             in_pair = rng.choice(selected, size=min(2, len(selected)), replace=False)
             out_pair = rng.choice(unselected, size=min(2, len(unselected)), replace=False)
             
-            test_solution = solution.copy()
-            
-            # Intercambiar
-            for idx in in_pair:
-                test_solution.remove_item(int(idx))
-            for idx in out_pair:
-                test_solution.add_item(int(idx))
-            
-            test_solution.evaluate(self.problem)
+            # Delta del intercambio 2-2 (cuatro flips de ítems distintos)
+            delta_value, delta_weight = best_solution.delta_swap(int(in_pair[0]), int(out_pair[0]))
+            second_value, second_weight = best_solution.delta_swap(int(in_pair[1]), int(out_pair[1]))
+            delta_value += second_value
+            delta_weight += second_weight
             
-            if test_solution.is_feasible and test_solution.value > best_value:
-                best_value = test_solution.value
-                best_solution = test_solution
-                improved = True
+            if weight + delta_weight <= capacity and value + delta_value > best_value:
+                best_value = value + delta_value
+                best_move = (in_pair, out_pair)
             
             iterations += 1
             if iterations >= self.max_iterations:
                 break
         
-        return best_solution, improved
+        if best_move is not None:
+            for idx in best_move[0]:
+                best_solution.remove_item(int(idx))
+            for idx in best_move[1]:
+                best_solution.add_item(int(idx))
+        return best_solution, best_move is not None
     
     def __call__(self, solution: KnapsackSolution,
                  rng: Optional[np.random.Generator] = None) -> KnapsackSolution:
@@ -26,7 +26,7 @@ class RepairByRemoval:
     - Garantiza factibilidad
     - Preserva ítems eficientes
     
-    Complejidad: O(n log n) peor caso
+    Complejidad: O(n) (orden por ratio memorizado en el problema)
     """
     
     def __init__(self, problem: KnapsackProblem):
@@ -48,23 +48,21 @@ class RepairByRemoval:
             return solution.copy()
         
         repaired = solution.copy()
-        ratios = self.problem.get_ratio()
+        repaired.evaluate(self.problem)
+        excess = repaired.weight - self.problem.capacity
+        if excess <= 0:
+            return repaired
         
-        # Remover ítems hasta ser factible
-        while not repaired.is_feasible:
-            selected = repaired.get_selected_items()
-            
-            if len(selected) == 0:
-                break
-            
-            # Encontrar ítem con peor ratio entre los seleccionados
-            selected_ratios = ratios[selected]
-            worst_idx_in_selected = np.argmin(selected_ratios)
-            worst_item = selected[worst_idx_in_selected]
-            
-            # Remover
-            repaired.remove_item(int(worst_item))
-            repaired.evaluate(self.problem)
+        # Seleccionados por ratio creciente (orden memorizado en el problema):
+        # equivale a remover repetidamente el de peor ratio
+        order = self.problem.get_removal_order()
+        selected = order[repaired.selection[order] == 1]
+        
+        # Menor prefijo cuyo peso cubre el exceso
+        cum_weights = np.cumsum(self.problem.weights[selected], dtype=np.int64)
+        num_removed = int(np.searchsorted(cum_weights, excess, side='left')) + 1
+        repaired.selection[selected[:num_removed]] = 0
+        repaired.evaluate(self.problem)
         
         return repaired
     
@@ -87,7 +85,7 @@ class RepairByGreedy:
     - Maximiza utilización de capacidad
     - Usa heurística greedy probada
     
-    Complejidad: O(n log n)
+    Complejidad: O(n) (orden por ratio memorizado en el problema)
     """
     
     def __init__(self, problem: KnapsackProblem):
@@ -110,26 +108,22 @@ class RepairByGreedy:
         repaired = self.repair_removal.repair(solution, rng)
         
         # Paso 2: Completar con greedy
-        ratios = self.problem.get_ratio()
-        unselected = repaired.get_unselected_items()
+        unselected_mask = repaired.selection == 0
         
-        if len(unselected) == 0:
+        if not np.any(unselected_mask):
             return repaired
         
-        # Ordenar ítems no seleccionados por ratio decreciente
-        sorted_unselected = unselected[np.argsort(ratios[unselected])[::-1]]
+        # No seleccionados por ratio decreciente (orden memorizado en el problema)
+        order = self.problem.get_efficiency_order()
+        sorted_unselected = order[unselected_mask[order]]
         
-        # Intentar agregar ítems
-        for idx in sorted_unselected:
-            test_solution = repaired.copy()
-            test_solution.add_item(int(idx))
-            test_solution.evaluate(self.problem)
-            
-            if test_solution.is_feasible:
-                repaired = test_solution
-            else:
-                # Si uno no cabe, los siguientes tampoco (están ordenados por ratio)
-                break
+        # Agregar el mayor prefijo que cabe: si uno no cabe, se detiene
+        # como el recorrido ítem a ítem
+        repaired.evaluate(self.problem)
+        residual = self.problem.capacity - repaired.weight
+        cum_weights = np.cumsum(self.problem.weights[sorted_unselected], dtype=np.int64)
+        num_added = int(np.searchsorted(cum_weights, residual, side='right'))
+        repaired.selection[sorted_unselected[:num_added]] = 1
         
         repaired.evaluate(self.problem)
         return repaired
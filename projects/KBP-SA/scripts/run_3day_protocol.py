@@ -249,10 +249,13 @@ class ThreeDayProtocolRunner:
             print()
 
             self.logger.print_progress()
+            self.logger.close()
 
             print(f"\n📁 Archivos generados:")
             print(f"   • CSV: {self.logger.csv_file}")
+            print(f"   • JSONL: {self.logger.jsonl_file}")
             print(f"   • JSON: {self.logger.json_file}")
+            print(f"   • Estadísticas: {self.logger.snapshot_file}")
             print()
 
 
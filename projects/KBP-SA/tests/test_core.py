@@ -7,6 +7,7 @@ import pytest
 import numpy as np
 from pathlib import Path
 import sys
+import json
 
 # Agregar proyecto al path
 project_root = Path(__file__).parent.parent
@@ -15,6 +16,7 @@ sys.path.insert(0, str(project_root))
 from core.problem import KnapsackProblem
 from core.solution import KnapsackSolution
 from core.evaluation import KnapsackEvaluator
+from core.exact import solve_dp, solve_branch_and_bound, solve_exact
 from data.loader import DatasetLoader
 
 
@@ -86,6 +88,33 @@ class TestKnapsackProblem:
                 weights=np.array([4, 3, 2])  # 3 pesos
             )
 
+    def test_problem_orders_and_greedy_fill(self):
+        """Test órdenes memorizados, sumas prefijas y operadores que los usan"""
+        from operators.constructive import GreedyByValue, GreedyByWeight, GreedyByRatio
+        from operators.repair import RepairByRemoval
+        problem = KnapsackProblem(
+            n=5,
+            capacity=10,
+            values=np.array([11, 4, 6, 9, 3]),
+            weights=np.array([5, 4, 3, 6, 1])
+        )
+        assert list(problem.get_value_order()) == [0, 3, 2, 1, 4]
+        assert list(problem.get_weight_order()) == [4, 2, 1, 0, 3]
+        assert list(problem.get_removal_order()) == [1, 3, 2, 0, 4]
+        assert problem.get_value_order() is problem.get_value_order()
+        cum_weights, cum_values = problem.get_prefix_sums('value')
+        assert list(cum_weights) == [5, 11, 14, 18, 19]
+        assert list(cum_values) == [11, 20, 26, 30, 33]
+
+        # Primer ajuste tras el ítem que no cabe: {0, 2, 4} por valor
+        assert list(GreedyByValue(problem)().get_selected_items()) == [0, 2, 4]
+        assert list(GreedyByWeight(problem)().get_selected_items()) == [1, 2, 4]
+        assert list(GreedyByRatio(problem)().get_selected_items()) == [0, 2, 4]
+
+        repaired = RepairByRemoval(problem)(KnapsackSolution.full(5, problem))
+        assert list(repaired.get_selected_items()) == [0, 2, 4]
+        assert repaired.weight == 9
+
 
 class TestKnapsackSolution:
     """Tests para KnapsackSolution"""
@@ -133,7 +162,25 @@ class TestKnapsackSolution:
         assert sol.selection[0] == 1
         sol.flip(0)
         assert sol.selection[0] == 0
-    
+
+    def test_solution_incremental_flip(self, simple_problem):
+        """Test valor y peso incrementales tras flip y deltas sin copiar"""
+        sol = KnapsackSolution.empty(3, simple_problem)
+        sol.evaluate(simple_problem)
+        assert sol.delta_flip(0) == (5, 4)
+        assert sol.delta_swap(0, 1) == (8, 7)
+        sol.add_item(0)
+        sol.add_item(1)
+        sol.remove_item(0)
+        sol.flip(2)
+        assert (sol.value, sol.weight) == (5, 5)
+        assert sol.delta_flip(1) == (-3, -3)
+        assert sol.delta_swap(1, 0) == (2, 1)
+
+        fresh = KnapsackSolution(3, sol.selection, simple_problem)
+        assert (fresh.value, fresh.weight) == (sol.value, sol.weight)
+        assert sol.is_feasible
+
     def test_solution_copy(self, simple_problem):
         """Test copia de solución"""
         sol1 = KnapsackSolution.empty(3, simple_problem)
@@ -197,6 +244,288 @@ class TestKnapsackEvaluator:
         assert gap is None
 
 
+class TestImprovementOperators:
+    """Tests de los operadores de mejora vectorizados frente a los bucles originales"""
+    
+    @staticmethod
+    def _instances(count, seed=0):
+        """Instancias aleatorias con valores pequeños (muchos empates) y una solución factible"""
+        rng = np.random.default_rng(seed)
+        for _ in range(count):
+            n = int(rng.integers(2, 40))
+            values = rng.integers(1, 10, size=n)
+            weights = rng.integers(1, 10, size=n)
+            capacity = int(rng.integers(5, max(6, weights.sum())))
+            problem = KnapsackProblem(n=n, capacity=capacity, values=values, weights=weights)
+            selection = rng.integers(0, 2, size=n)
+            for idx in rng.permutation(n):
+                if (weights * selection).sum() <= capacity:
+                    break
+                selection[idx] = 0
+            solution = KnapsackSolution(n, selection, problem)
+            solution.evaluate(problem)
+            yield problem, solution
+    
+    @staticmethod
+    def _reference_flip(problem, solution):
+        """Bucle original de FlipBestItem: primer flip factible de mayor valor"""
+        value, weight = solution.value, solution.weight
+        best_value, best_idx = value, -1
+        for idx in range(problem.n):
+            sign = 1 - 2 * int(solution.selection[idx])
+            if (weight + sign * int(problem.weights[idx]) <= problem.capacity
+                    and value + sign * int(problem.values[idx]) > best_value):
+                best_value, best_idx = value + sign * int(problem.values[idx]), idx
+        result = solution.copy()
+        if best_idx >= 0:
+            result.flip(best_idx)
+        return result
+    
+    @staticmethod
+    def _reference_exchange(problem, solution):
+        """Bucle original de OneExchange: primer intercambio (dentro, fuera) de mayor valor"""
+        value, weight = solution.value, solution.weight
+        best_value, best_move = value, None
+        for i in solution.get_selected_items():
+            for j in solution.get_unselected_items():
+                new_weight = weight - int(problem.weights[i]) + int(problem.weights[j])
+                new_value = value - int(problem.values[i]) + int(problem.values[j])
+                if new_weight <= problem.capacity and new_value > best_value:
+                    best_value, best_move = new_value, (i, j)
+        result = solution.copy()
+        if best_move is not None:
+            result.remove_item(best_move[0])
+            result.add_item(best_move[1])
+        return result
+    
+    def test_flip_best_item_matches_loop(self):
+        """Test que FlipBestItem elige el mismo flip que el bucle original"""
+        from operators.improvement import FlipBestItem
+        for problem, solution in self._instances(100):
+            improved, _ = FlipBestItem(problem).improve(solution)
+            expected = self._reference_flip(problem, solution)
+            assert np.array_equal(improved.selection, expected.selection)
+    
+    @pytest.mark.parametrize("chunk_elements", [None, 3])
+    def test_one_exchange_matches_loop(self, monkeypatch, chunk_elements):
+        """Test que OneExchange (también por bloques pequeños) coincide con el bucle original"""
+        from operators.improvement import OneExchange
+        if chunk_elements is not None:
+            monkeypatch.setattr(OneExchange, 'CHUNK_ELEMENTS', chunk_elements)
+        for problem, solution in self._instances(100, seed=1):
+            improved, _ = OneExchange(problem).improve(solution)
+            expected = self._reference_exchange(problem, solution)
+            assert np.array_equal(improved.selection, expected.selection)
+
+
+class TestExactSolvers:
+    """Tests para los solvers exactos de referencia"""
+    
+    def test_exact_solvers_match_brute_force(self):
+        """Test DP y branch-and-bound contra enumeración completa"""
+        import itertools
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            n = int(rng.integers(1, 11))
+            values = rng.integers(0, 30, n)
+            weights = rng.integers(1, 20, n)
+            problem = KnapsackProblem(n=n, capacity=int(rng.integers(1, 60)),
+                                      values=values, weights=weights)
+            best = max(int(values @ x) for x in itertools.product([0, 1], repeat=n)
+                       if weights @ np.array(x) <= problem.capacity)
+            
+            for result in (solve_dp(problem), solve_branch_and_bound(problem), solve_exact(problem)):
+                assert result.optimal
+                assert result.value == best
+                assert int(values @ result.selection) == best
+                assert int(weights @ result.selection) <= problem.capacity
+
+    def test_solve_exact_falls_back_to_dp(self):
+        """Test que solve_exact usa DP si branch-and-bound agota sus nodos"""
+        rng = np.random.default_rng(1)
+        weights = rng.integers(100_000, 200_000, 20)
+        problem = KnapsackProblem(n=20, capacity=int(weights.sum() // 2),
+                                  values=weights + rng.integers(0, 1000, 20), weights=weights)
+        assert not solve_branch_and_bound(problem, node_limit=1).optimal
+
+        result = solve_exact(problem, node_limit=1)
+        assert result.optimal and result.method == 'dp'
+        assert result.value == solve_dp(problem).value
+
+    def test_sa_stops_at_target_value(self):
+        """Test parada temprana de SA al alcanzar el óptimo probado"""
+        from metaheuristic.sa_core import SimulatedAnnealing
+        problem = KnapsackProblem(
+            n=8,
+            capacity=25,
+            values=np.array([10, 13, 7, 8, 9, 6, 12, 5]),
+            weights=np.array([6, 8, 5, 4, 7, 3, 9, 2])
+        )
+        optimum = solve_exact(problem).value
+
+        def run(target_value):
+            sa = SimulatedAnnealing(problem, T0=20, alpha=0.95, iterations_per_temp=20,
+                                    T_min=0.01, max_evaluations=100_000, seed=0)
+            sa.set_neighborhood('flip')
+            sa.set_target_value(target_value)
+            best = sa.optimize(KnapsackSolution.empty(problem.n, problem))
+            return best, sa.get_statistics()
+
+        full_best, full_stats = run(None)
+        best, stats = run(optimum)
+        assert stats['reached_target'] and not full_stats['reached_target']
+        assert best.value == full_best.value == optimum
+        assert best.is_feasible
+        assert stats['total_iterations'] < full_stats['total_iterations']
+
+
+
+class TestPopulationAnnealer:
+    """Tests para PopulationAnnealer"""
+
+    @pytest.fixture
+    def problem(self):
+        """Fixture con instancia aleatoria"""
+        rng = np.random.default_rng(7)
+        return KnapsackProblem(n=40, capacity=300, values=rng.integers(1, 100, 40),
+                               weights=rng.integers(1, 50, 40))
+
+    @pytest.mark.parametrize("mode", ["independent", "tempering"])
+    def test_feasible_and_deterministic(self, problem, mode):
+        """Test mejor solución factible y reproducible con la misma semilla"""
+        from metaheuristic.population import PopulationAnnealer
+
+        def run():
+            annealer = PopulationAnnealer(problem, n_chains=6, mode=mode, T0=50.0,
+                                          iterations_per_temp=20, seed=3)
+            return annealer.optimize(), annealer.get_statistics()
+
+        best, stats = run()
+        again, stats_again = run()
+        assert best.is_feasible and best.weight <= problem.capacity
+        assert best.value == stats['best_value'] == max(stats['chain_best_values'])
+        assert np.array_equal(best.selection, again.selection)
+        assert stats['chain_best_values'] == stats_again['chain_best_values']
+
+    def test_sharded_chains(self, problem):
+        """Test que repartir las cadenas en procesos conserva cadenas y propuestas"""
+        from metaheuristic.population import PopulationAnnealer
+
+        def run():
+            annealer = PopulationAnnealer(problem, n_chains=5, mode='tempering', T0=50.0,
+                                          max_iterations=300, workers=2, seed=11)
+            return annealer.optimize(), annealer.get_statistics()
+
+        best, stats = run()
+        again, _ = run()
+        assert best.is_feasible
+        assert len(stats['chain_best_values']) == 5
+        assert stats['proposals'] == 5 * 300
+        assert best.value == max(stats['chain_best_values'])
+        assert np.array_equal(best.selection, again.selection)
+
+
+class TestSARecording:
+    """Tests para el registro de SimulatedAnnealing (decide, SeriesBuffer, muestreo)"""
+
+    @staticmethod
+    def _reference_windows(history, window_size):
+        """Ventanas móviles de aceptación con el bucle original"""
+        rates = []
+        for i in range(len(history)):
+            window = history[max(0, i - window_size + 1):i + 1]
+            rates.append(sum(window) / len(window))
+        return rates
+
+    @pytest.mark.parametrize("name, args", [
+        ("MetropolisCriterion", ()),
+        ("ThresholdAcceptance", (5.0,)),
+        ("OnlyImproving", ()),
+        ("AlwaysAccept", ()),
+    ])
+    def test_decide_matches_accept(self, name, args):
+        """Test decide() toma las mismas decisiones y consume el mismo rng que accept()"""
+        from metaheuristic import acceptance
+
+        criterion = getattr(acceptance, name)(*args)
+        cases = np.random.default_rng(0)
+        rng_accept = np.random.default_rng(42)
+        rng_decide = np.random.default_rng(42)
+
+        for _ in range(2000):
+            delta_E = float(cases.integers(-20, 40))
+            temperature = float(cases.choice([0.0, 0.5, 5.0, 50.0]))
+            expected = criterion.accept(delta_E, temperature, rng_accept)
+            accepted, probability = criterion.decide(delta_E, temperature, rng_decide)
+            assert accepted == expected
+            assert probability == pytest.approx(
+                criterion.acceptance_probability(delta_E, temperature))
+            assert rng_accept.bit_generator.state == rng_decide.bit_generator.state
+
+    @pytest.mark.parametrize("dtype", [np.float64, np.int64, np.uint8])
+    def test_series_buffer_grows(self, dtype):
+        """Test SeriesBuffer conserva todas las muestras al superar su capacidad"""
+        from metaheuristic.recording import SeriesBuffer
+
+        values = [i % 200 for i in range(1000)]
+        buffer = SeriesBuffer(dtype, capacity=1)
+        for value in values:
+            buffer.append(value)
+
+        assert len(buffer) == len(values)
+        assert buffer.tolist() == values
+        assert list(buffer) == values
+        assert buffer[0] == values[0] and buffer[-1] == values[-1]
+        assert buffer.view().dtype == dtype
+
+    def test_sampled_tracking_matches_full_log(self):
+        """Test muestreo y ventanas de aceptación coinciden con las listas por iteración"""
+        from metaheuristic.sa_core import SimulatedAnnealing
+        from metaheuristic.acceptance import AcceptanceCriterion, MetropolisCriterion
+        from experimentation.tracking import ExecutionTracker, TrackingConfig
+
+        class PerIterationMetropolis(MetropolisCriterion):
+            """Camino original: probabilidad y decisión por separado"""
+            decide = AcceptanceCriterion.decide
+
+        rng = np.random.default_rng(5)
+        problem = KnapsackProblem(n=30, capacity=200, values=rng.integers(1, 100, 30),
+                                  weights=rng.integers(1, 40, 30))
+
+        def run(criterion, sampling_rate):
+            sa = SimulatedAnnealing(problem, T0=50.0, alpha=0.9, iterations_per_temp=20,
+                                    T_min=1.0, acceptance_criterion=criterion, seed=9)
+            sa.set_neighborhood('flip')
+            tracker = ExecutionTracker(TrackingConfig(level=TrackingConfig.FULL,
+                                                      sampling_rate=sampling_rate))
+            tracker.start_tracking({'n': problem.n}, {'name': 'SA'}, seed=9)
+            sa.set_tracking(tracker)
+            sa.optimize(KnapsackSolution.empty(problem.n, problem))
+            return sa, tracker
+
+        def strip(log):
+            return [{k: v for k, v in entry.items() if k != 'elapsed_time'} for entry in log]
+
+        full_sa, full = run(PerIterationMetropolis(), 1)
+        sa, sampled = run(MetropolisCriterion(), 3)
+
+        # Misma trayectoria; sólo se registran las iteraciones muestreadas
+        history = [1 if entry['accepted'] else 0 for entry in full.iteration_log]
+        assert len(history) == sa.total_iterations > 200
+        assert sa.get_convergence_data() == full_sa.get_convergence_data()
+        assert sa.get_convergence_data()['acceptance_history'] == history
+        assert [sampled.samples(i) for i in range(7)] == [i % 3 == 0 for i in range(7)]
+        assert strip(sampled.iteration_log) == strip(full.iteration_log[::3])
+        assert sampled.acceptance_log == full.acceptance_log[::3]
+
+        # Ventanas sobre la historia completa, como el bucle original
+        for window_size in (50, 100, 200):
+            key = f'window_{window_size}'
+            expected = self._reference_windows(history, window_size)
+            assert sampled.convergence_data['acceptance_windows'][key] == pytest.approx(expected)
+            assert full.convergence_data['acceptance_windows'][key] == pytest.approx(expected)
+
+
 class TestDatasetLoader:
     """Tests para DatasetLoader"""
     
@@ -230,6 +559,42 @@ class TestDatasetLoader:
         instances = loader.load_folder("nonexistent_folder")
         assert len(instances) == 0
     
+    def test_load_instance_npz_cache(self, tmp_path):
+        """Test caché .npz y catálogo perezoso con la misma instancia que el parseo"""
+        rng = np.random.default_rng(0)
+        n = 3000
+        values, weights = rng.integers(1, 1000, n), rng.integers(1, 1000, n)
+        folder = tmp_path / "large"
+        folder.mkdir()
+        lines = ["12345", f"{n} 50000"] + [f"{v} {w}" for v, w in zip(values, weights)]
+        (folder / "big.txt").write_text("\n".join(lines) + "\n0 1 0\n")
+        (folder / "other.txt").write_text("3 10\n5 4\n3 3\n2 2\n")
+
+        loader = DatasetLoader(tmp_path)
+        parsed = loader.load_instance(folder / "big.txt")
+        cached = loader.load_instance(folder / "big.txt")
+        assert len(list((folder / DatasetLoader.CACHE_DIR).glob("big.*.npz"))) == 1
+
+        for problem in (parsed, cached):
+            assert (problem.n, problem.capacity, problem.optimal_value) == (n, 50000, 12345)
+            assert np.array_equal(problem.values, values)
+            assert np.array_equal(problem.weights, weights)
+        assert np.array_equal(cached.get_efficiency_order(),
+                              np.argsort(values / weights)[::-1])
+
+        catalog = loader.catalog("large")
+        assert sorted(catalog) == ["big", "other"]
+        selected = catalog.select(["other"])
+        assert selected["other"].optimal_value is None
+        assert list(catalog._loaded) == ["other"]
+
+        # Un archivo inválido se omite (como en load_folder) salvo en modo strict
+        (folder / "broken.txt").write_text("3 10\n5 4\n")
+        catalog = loader.catalog("large")
+        assert list(catalog.select(["broken", "other"])) == ["other"]
+        with pytest.raises(ValueError):
+            catalog.select(["broken"], strict=True)
+
     def test_load_folder_strict_mode(self, datasets_dir):
         """Test modo strict con instancia inválida"""
         loader = DatasetLoader(datasets_dir)
@@ -242,5 +607,252 @@ class TestDatasetLoader:
         # (pero no podemos garantizar que haya errores en todas las ejecuciones)
 
 
+def _greedy_executor(problem, seed, iterations=0):
+    """Executor de módulo (serializable) para los tests del pool de procesos"""
+    from operators.constructive import GreedyByRatio
+    return {'solution': GreedyByRatio(problem)(), 'iterations': iterations}
+
+
+class TestExperimentRunner:
+    """Tests para ExperimentRunner"""
+
+    def test_resume_retries_failed_tasks(self, tmp_path):
+        """Test que resume omite los exitosos y reintenta los fallidos"""
+        from experimentation.runner import ExperimentConfig, ExperimentRunner
+        from operators.constructive import GreedyByRatio
+        calls = []
+        failing = {True}
+
+        def executor(problem, seed):
+            calls.append(seed)
+            if failing and seed == config.seeds[0]:
+                raise RuntimeError("fallo transitorio")
+            return {'solution': GreedyByRatio(problem)()}
+
+        config = ExperimentConfig(name="resume", instances=["f3_l-d_kp_4_20_low-dimensional"],
+                                  algorithms=[{'name': 'greedy', 'executor': executor}],
+                                  repetitions=3, output_dir=str(tmp_path))
+        runner = ExperimentRunner(config)
+        runner.load_instances()
+        results = runner.run_all(verbose=False)
+        assert [r.success for r in results] == [False, True, True]
+
+        failing.clear()
+        calls.clear()
+        config.resume = True
+        runner = ExperimentRunner(config)
+        runner.load_instances()
+        results = runner.run_all(verbose=False)
+        assert calls == [config.seeds[0]]
+        assert all(r.success for r in results)
+        lines = (tmp_path / "resume_results.jsonl").read_text().splitlines()
+        assert len(lines) == 3
+
+    def test_stop_target_is_proven_optimum_only(self, tmp_path, monkeypatch):
+        """Test que solo un óptimo probado se usa como objetivo de parada"""
+        import data.loader
+        from experimentation.runner import ExperimentConfig, ExperimentRunner
+        from operators.constructive import GreedyByRatio
+        targets = []
+
+        def executor(problem, seed, target_value=None):
+            targets.append(target_value)
+            return {'solution': GreedyByRatio(problem)()}
+
+        config = ExperimentConfig(name="target", instances=["f3_l-d_kp_4_20_low-dimensional"],
+                                  algorithms=[{'name': 'greedy', 'executor': executor}],
+                                  repetitions=1, output_dir=str(tmp_path), stop_at_optimum=True)
+        runner = ExperimentRunner(config)
+        runner.load_instances()
+        runner.run_all(verbose=False)
+        problem = next(iter(runner.problems.values()))
+        assert problem.proven_optimum is not None
+        assert targets == [problem.proven_optimum]
+
+        # Sin prueba: el valor del archivo se conserva pero no es objetivo
+        monkeypatch.setattr(data.loader.OptimumCache, 'optimum', lambda self, path, problem: None)
+        targets.clear()
+        runner = ExperimentRunner(config)
+        runner.load_instances()
+        runner.run_all(verbose=False)
+        problem = next(iter(runner.problems.values()))
+        assert problem.proven_optimum is None
+        assert problem.optimal_value is not None
+        assert targets == [None]
+
+    def test_parallel_rejects_unpicklable_executor(self, tmp_path):
+        """Test que una closure como executor falla antes de arrancar el pool"""
+        from experimentation.runner import ExperimentConfig, ExperimentRunner
+
+        config = ExperimentConfig(name="closure", instances=["f3_l-d_kp_4_20_low-dimensional"],
+                                  algorithms=[{'name': 'greedy',
+                                               'executor': lambda problem, seed: None}],
+                                  repetitions=2, output_dir=str(tmp_path), workers=2)
+        runner = ExperimentRunner(config)
+        runner.load_instances()
+        with pytest.raises(ValueError, match="'greedy'.*modulo:funcion"):
+            runner.run_all(verbose=False)
+
+    def test_parallel_builds_algorithms_in_workers(self, tmp_path):
+        """Test que un descriptor 'modulo:funcion' con kwargs se construye en cada worker"""
+        from experimentation.runner import ExperimentConfig, ExperimentRunner
+
+        def run(workers):
+            config = ExperimentConfig(
+                name=f"workers{workers}", instances=["f3_l-d_kp_4_20_low-dimensional"],
+                algorithms=[{'name': 'greedy', 'executor': f'{__name__}:_greedy_executor',
+                             'executor_kwargs': {'iterations': 7}}],
+                repetitions=3, output_dir=str(tmp_path), workers=workers)
+            runner = ExperimentRunner(config)
+            runner.load_instances()
+            return runner.run_all(verbose=False)
+
+        parallel, sequential = run(2), run(1)
+        assert all(r.success and r.iterations == 7 for r in parallel)
+        assert [(r.seed, r.best_value) for r in parallel] == \
+               [(r.seed, r.best_value) for r in sequential]
+
+
+
+class TestContinuousExperimentLogger:
+    """Tests para ContinuousExperimentLogger"""
+
+    def test_recover_rebuilds_csv_and_median(self, tmp_path):
+        """Test que recover alinea CSV y JSONL tras una caída y la mediana P²"""
+        import csv
+        from experimentation.continuous_experiment_logger import (
+            ContinuousExperimentLogger, StreamingMedian)
+        median = StreamingMedian()
+        values = np.random.default_rng(0).exponential(5.0, 5000)
+        for x in values:
+            median.add(float(x))
+        assert abs(median.value - np.median(values)) < 0.05 * np.median(values)
+
+        logger = ContinuousExperimentLogger(str(tmp_path), fsync_every=1)
+        for i in range(5):
+            logger.log_run(f"algo {i}", {'operators': ['flip']}, 'success', {'total': float(i)},
+                           objective_value=10, optimal_value=11)
+        logger.sync()
+        # Caída: línea JSONL truncada y fila CSV de más
+        with open(logger.jsonl_file, 'a') as f:
+            f.write('{"run_id": "trunc')
+        with open(logger.csv_file, 'a') as f:
+            f.write('partial,row\n')
+        logger._jsonl.close()
+        logger._csv.close()
+
+        resumed = ContinuousExperimentLogger(str(tmp_path), experiment_id=logger.experiment_id)
+        with open(resumed.csv_file, newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert [row['run_id'] for row in rows] == [run['run_id'] for run in resumed.iter_runs()]
+        stats = resumed.get_statistics()
+        assert stats['total_runs'] == 5 and stats['median_time'] == 2.0
+        resumed.close()
+
+
+class TestTimeTracker:
+    """Tests para TimeTracker (log de eventos con escritura agrupada)"""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Reloj manual para time.time() dentro de time_tracker"""
+        import types
+        import experimentation.time_tracker as time_tracker
+        now = [1000.0]
+        monkeypatch.setattr(time_tracker, 'time', types.SimpleNamespace(time=lambda: now[0]))
+        return now
+
+    @staticmethod
+    def _events(tracker):
+        text = tracker.events_path.read_text(encoding='utf-8')
+        return [json.loads(line) for line in text.splitlines()]
+
+    def test_events_flushed_after_interval(self, tmp_path, clock):
+        """Test que los eventos se escriben solo al pasar flush_interval"""
+        from experimentation.time_tracker import TimeTracker
+        tracker = TimeTracker(output_dir=str(tmp_path), verbose=False, flush_interval=1.0)
+
+        clock[0] += 0.5
+        tracker.start_process("carga", details={'dataset': 'low'})
+        tracker.update_current(items=10)
+        assert self._events(tracker) == []
+
+        clock[0] += 0.5
+        tracker.finish_process("Completado")
+        events = self._events(tracker)
+        assert [e['event'] for e in events] == ['start', 'update', 'finish']
+        assert events[0]['t'] == 0.5 and events[0]['details'] == {'dataset': 'low'}
+        assert events[2]['duration'] == 0.5
+
+        clock[0] += 0.2
+        tracker.start_process("otro")
+        assert len(self._events(tracker)) == 3
+        tracker.finalize()
+
+    def test_finalize_writes_once(self, tmp_path, clock, monkeypatch, capsys):
+        """Test que finalize (y __exit__) escribe log y reporte una sola vez"""
+        import gc
+        from experimentation.time_tracker import TimeTracker
+        reports = []
+        original = TimeTracker.write_report
+        monkeypatch.setattr(TimeTracker, 'write_report',
+                            lambda self: (reports.append(1), original(self)))
+
+        with TimeTracker(output_dir=str(tmp_path), verbose=False, flush_interval=60.0) as tracker:
+            with tracker.track("fase"):
+                pass
+            tracker.start_process("abierto")  # lo cierra finalize()
+        assert len(reports) == 1
+        events = self._events(tracker)
+        assert [e['event'] for e in events] == ['start', 'finish', 'start', 'finish']
+        report = tracker.output_path.read_text(encoding='utf-8')
+        assert "| Procesos completados | 2 |" in report
+
+        # El volcado de salida quedó desactivado: no duplica eventos
+        assert not tracker._exit_flush.alive
+        events_path = tracker.events_path
+        del tracker
+        gc.collect()
+        assert len(events_path.read_text(encoding='utf-8').splitlines()) == 4
+
+    def test_pending_events_flushed_on_release(self, tmp_path, clock):
+        """Test que los eventos pendientes se escriben al liberar el tracker sin finalize"""
+        import gc
+        from experimentation.time_tracker import TimeTracker
+        tracker = TimeTracker(output_dir=str(tmp_path), verbose=False, flush_interval=60.0)
+        tracker.start_process("sin finalizar")
+        events_path = tracker.events_path
+        assert events_path.read_text(encoding='utf-8') == ''
+        del tracker
+        gc.collect()
+        lines = events_path.read_text(encoding='utf-8').splitlines()
+        assert [json.loads(line)['event'] for line in lines] == ['start']
+
+    def test_counters_match_process_tree(self, tmp_path, clock):
+        """Test que los contadores incrementales coinciden con el recuento recursivo"""
+        from experimentation.time_tracker import TimeTracker
+        tracker = TimeTracker(output_dir=str(tmp_path), verbose=False)
+        for outer in range(3):
+            tracker.start_process(f"fase {outer}")
+            for inner in range(outer + 1):
+                tracker.start_process(f"tarea {inner}")
+                tracker.finish_process("Error" if inner == 1 else "Completado")
+            tracker.finish_process("Completado" if outer != 2 else "Error")
+        tracker.start_process("activa")
+
+        def count(processes):
+            return sum(1 + count(p.sub_processes) for p in processes)
+
+        def completed(processes):
+            return sum((p.status == "Completado") + completed(p.sub_processes) for p in processes)
+
+        assert tracker.total_processes == count(tracker.processes) == 10
+        assert tracker.completed_processes == completed(tracker.processes) == 6
+        tracker.write_report()
+        report = tracker.output_path.read_text(encoding='utf-8')
+        assert "| Procesos totales | 10 |" in report
+        assert "| Procesos completados | 6 |" in report
+        tracker.finalize()
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])